@@ -3,22 +3,49 @@ Career AI Agent - Flask API Application
 A comprehensive career analysis and guidance API using AI technologies.
 """
 
+import itertools
 import json
 import re
+import sqlite3
+import time
 import spacy
-import google.generativeai as genai
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, session, Response, stream_with_context
 from flask_cors import CORS
 from config import Config
 from datetime import datetime
 from auth import init_auth, require_auth
+from structured_output import generate_json, StructuredOutputError, flight_scope, llm_flights, get_metrics as get_structured_output_metrics
+from prompt_budget import dedupe_items, fit_profile
+from llm_transport import LLMDeadlineExceeded, llm_transport, request_deadline, set_request_deadline
+from job_queue import JobQueue, TERMINAL_STATUSES, current_job
+from llm_usage import llm_usage, set_usage_context, usage_context
+from batch_reports import DEFAULT_BATCH_SIZE, batch_stats, generate_batch
+from prefetch import Prefetcher
+from llm_provider import create_provider
+from model_router import create_model
+from cassette import cassette
+from skill_gaps import skill_gap_ranker
+from market_precompute import create_store as create_market_store
+from job_search import fan_out, iter_scrape_sites, parse_site_timeouts, scrape_sites
+from job_cache import JobSearchCache, search_key
+from job_pages import CursorError, ResultSetExpired, ResultSets
+from job_index import create_index as create_job_index, site_fetcher
+from job_frames import jobs_from_frame
+from job_dedup import dedupe_against, dedupe_jobs
+from job_ranking import rank_jobs
+from tiered_reports import TieredResponder, local_intelligence_report, local_upskilling_plan
 try:
     from jobspy import scrape_jobs
     JOBSPY_AVAILABLE = True
 except ImportError:
+    scrape_jobs = None
     JOBSPY_AVAILABLE = False
     print("⚠️  JobSpy not available. Install with: pip install python-jobspy")
 
+# Record or replay job board traffic (CASSETTE_MODE); replay works without JobSpy installed
+scrape_jobs = cassette.scraper(scrape_jobs)
+JOBSPY_AVAILABLE = JOBSPY_AVAILABLE or cassette.replaying
+
 # Initialize Flask app
 app = Flask(__name__)
 app.config.from_object(Config)
@@ -27,9 +54,30 @@ CORS(app)
 # Initialize authentication
 init_auth(app)
 
-# Initialize Google AI client
-genai.configure(api_key=Config.GOOGLE_API_KEY)
-google_model = genai.GenerativeModel(Config.GOOGLE_MODEL)
+@app.before_request
+def start_llm_deadline():
+    """Give every request one deadline shared by all of its LLM calls, and tag them for usage accounting."""
+    set_request_deadline(Config.LLM_REQUEST_DEADLINE_SECONDS)
+    set_usage_context(request.endpoint, session.get('username'))
+
+# Initialize the LLM provider (Gemini by default, see LLM_PROVIDER), routed per prompt type to a model tier
+# (LLM_ROUTING) and recorded or replayed per CASSETTE_MODE
+llm_model = create_model(lambda model_name: cassette.provider(lambda: create_provider(model_name=model_name)))
+
+# Precomputed market intelligence (read-only here; see market_precompute.py) backs the local report tier
+market_store = create_market_store()
+tiered = TieredResponder.from_config()
+
+# Job search results cached per normalized search (None when JOB_CACHE_BACKEND=off)
+job_cache = JobSearchCache.from_config()
+
+# Stored /search_jobs results, paged with cursors (JOB_RESULT_SET_*)
+job_result_sets = ResultSets.from_config()
+
+# Local job index (None when JOB_INDEX_DB is empty), crawled in the background every JOB_INDEX_CRAWL_MINUTES
+job_index = create_job_index()
+if job_index is not None and JOBSPY_AVAILABLE and Config.JOB_INDEX_CRAWL_MINUTES > 0:
+    job_index.start_crawler(site_fetcher(scrape_jobs), Config.JOB_INDEX_CRAWL_MINUTES * 60)
 
 # Initialize spaCy model
 try:
@@ -224,6 +272,23 @@ def parse_resume_text(text):
         'parsed_at': datetime.now().isoformat()
     }
 
+INTELLIGENCE_REPORT_FORMAT = """{
+            "market_intelligence_summary": "Recent trends, funding news, and notable startups in the user's primary industry",
+            "key_industry_skills": ["skill1", "skill2", "skill3", "skill4", "skill5"],
+            "macroeconomic_shifts": "Significant regulations, laws, or market forces impacting this industry/role",
+            "salary_insights": "Current salary ranges and compensation trends",
+            "growth_opportunities": "Emerging roles and career advancement paths"
+        }"""
+
+def _profile_summary(user_profile, prompt_type):
+    """Compact profile lines shared by the intelligence and job title prompts."""
+    profile = fit_profile(user_profile, prompt_type)
+    return f"""User Profile:
+        - Skills: {', '.join(profile.get('skills', []))}
+        - Experience: {len(user_profile.get('experience', []))} positions
+        - Industries: {', '.join(profile.get('industries', []))}
+        - Desired Roles: {', '.join(profile.get('desired_roles', []))}"""
+
 def generate_intelligence_report(user_profile):
     """
     Generate career intelligence report using OpenAI API.
@@ -241,63 +306,26 @@ def generate_intelligence_report(user_profile):
         
         Analyze the following user profile and provide comprehensive career intelligence:
         
-        User Profile:
-        - Skills: {', '.join(user_profile.get('skills', []))}
-        - Experience: {len(user_profile.get('experience', []))} positions
-        - Industries: {', '.join(user_profile.get('industries', []))}
-        - Desired Roles: {', '.join(user_profile.get('desired_roles', []))}
+        {_profile_summary(user_profile, 'intelligence_report')}
         
         Please provide a detailed analysis in the following JSON format:
-        {{
-            "market_intelligence_summary": "Recent trends, funding news, and notable startups in the user's primary industry",
-            "key_industry_skills": ["skill1", "skill2", "skill3", "skill4", "skill5"],
-            "macroeconomic_shifts": "Significant regulations, laws, or market forces impacting this industry/role",
-            "salary_insights": "Current salary ranges and compensation trends",
-            "growth_opportunities": "Emerging roles and career advancement paths"
-        }}
+        {INTELLIGENCE_REPORT_FORMAT}
         
         Focus on actionable insights and current market conditions. Be specific and data-driven in your recommendations.
         """
         
-        response = google_model.generate_content(prompt)
-        
-        # Parse the response
-        content = response.text
         try:
-            # Try to extract JSON from the response
-            json_start = content.find('{')
-            json_end = content.rfind('}') + 1
-            if json_start != -1 and json_end != 0:
-                json_str = content[json_start:json_end]
-                return json.loads(json_str)
-            else:
-                # Fallback: return structured response
-                return {
-                    "market_intelligence_summary": content,
-                    "key_industry_skills": user_profile.get('skills', [])[:5],
-                    "macroeconomic_shifts": "Analysis provided in summary",
-                    "salary_insights": "Contact for detailed salary information",
-                    "growth_opportunities": "See market intelligence summary"
-                }
-        except json.JSONDecodeError:
-            # Fallback: return structured response
-            return {
-                "market_intelligence_summary": content,
-                "key_industry_skills": user_profile.get('skills', [])[:5],
-                "macroeconomic_shifts": "Analysis provided in summary",
-                "salary_insights": "Contact for detailed salary information",
-                "growth_opportunities": "See market intelligence summary"
-            }
+            return generate_json(llm_model, prompt, 'intelligence_report')
+        except StructuredOutputError as error:
+            # Fallback: locally computed report, keeping any prose the model did return
+            report = local_intelligence_report(user_profile, market_store)
+            if error.raw_text:
+                report['market_intelligence_summary'] = error.raw_text
+            return report
             
     except Exception as e:
-        return {
-            "error": f"Failed to generate intelligence report: {str(e)}",
-            "market_intelligence_summary": "Unable to generate market intelligence at this time",
-            "key_industry_skills": user_profile.get('skills', [])[:5],
-            "macroeconomic_shifts": "Analysis temporarily unavailable",
-            "salary_insights": "Contact for detailed salary information",
-            "growth_opportunities": "See market intelligence summary"
-        }
+        return dict(local_intelligence_report(user_profile, market_store),
+                    error=f"Failed to generate intelligence report: {str(e)}")
 
 def generate_upskilling_plan(user_profile, in_demand_skills):
     """
@@ -311,19 +339,18 @@ def generate_upskilling_plan(user_profile, in_demand_skills):
         dict: Upskilling plan
     """
     try:
-        user_skills = set(skill.lower() for skill in user_profile.get('skills', []))
-        demand_skills = set(skill.lower() for skill in in_demand_skills)
-        
-        # Identify skill gaps
-        skill_gaps = list(demand_skills - user_skills)[:3]  # Top 3 gaps
+        # Rank skill gaps locally; the LLM only writes the plan for the top ones
+        ranked_gaps = skill_gap_ranker.rank(user_profile.get('skills', []), in_demand_skills, k=3)
+        skill_gaps = [gap['skill'] for gap in ranked_gaps]
         
         prompt = f"""
         You are an expert career development coach and learning strategist.
         
-        User's current skills: {', '.join(user_profile.get('skills', []))}
-        In-demand skills in their industry: {', '.join(in_demand_skills)}
-        Identified skill gaps: {', '.join(skill_gaps)}
+        User's current skills: {', '.join(fit_profile(user_profile, 'upskilling_plan').get('skills', []))}
+        In-demand skills in their industry: {', '.join(dedupe_items(in_demand_skills)[:15])}
+        Identified skill gaps (highest priority first): {', '.join(skill_gaps)}
         
+        Cover exactly these skill gaps, in this order; do not add or drop any.
         For each skill gap, provide:
         1. A personalized AI-generated project idea that builds a portfolio
         2. 1-2 specific online resources/tutorials (Coursera, documentation, blogs)
@@ -348,55 +375,13 @@ def generate_upskilling_plan(user_profile, in_demand_skills):
         }}
         """
         
-        response = google_model.generate_content(prompt)
-        
-        content = response.text
-        
         try:
-            # Try to extract JSON from the response
-            json_start = content.find('{')
-            json_end = content.rfind('}') + 1
-            if json_start != -1 and json_end != 0:
-                json_str = content[json_start:json_end]
-                return json.loads(json_str)
-            else:
-                # Fallback: return structured response
-                return {
-                    "skill_gaps": [
-                        {
-                            "skill": skill,
-                            "project_idea": f"Build a portfolio project demonstrating {skill}",
-                            "learning_resources": [
-                                {
-                                    "name": f"{skill} Tutorial",
-                                    "url": f"https://example.com/{skill.lower().replace(' ', '-')}",
-                                    "type": "course"
-                                }
-                            ]
-                        } for skill in skill_gaps
-                    ],
-                    "timeline": "3-6 months",
-                    "priority_order": "Start with the most in-demand skills first"
-                }
-        except json.JSONDecodeError:
-            # Fallback: return structured response
-            return {
-                "skill_gaps": [
-                    {
-                        "skill": skill,
-                        "project_idea": f"Build a portfolio project demonstrating {skill}",
-                        "learning_resources": [
-                            {
-                                "name": f"{skill} Tutorial",
-                                "url": f"https://example.com/{skill.lower().replace(' ', '-')}",
-                                "type": "course"
-                            }
-                        ]
-                    } for skill in skill_gaps
-                ],
-                "timeline": "3-6 months",
-                "priority_order": "Start with the most in-demand skills first"
-            }
+            plan = generate_json(llm_model, prompt, 'upskilling_plan')
+        except StructuredOutputError:
+            # Fallback: plan built from the local gap ranking
+            return local_upskilling_plan(user_profile, in_demand_skills)
+        plan['ranked_gaps'] = ranked_gaps
+        return plan
             
     except Exception as e:
         return {
@@ -406,73 +391,272 @@ def generate_upskilling_plan(user_profile, in_demand_skills):
             "priority_order": "Contact for personalized guidance"
         }
 
-def search_jobs_api(title=None, location=None, industry=None, limit=10):
+# Extra search terms per industry (any one of them must match)
+INDUSTRY_TERMS = {
+    "technology": ["software", "technology", "IT"],
+    "software": ["software", "technology", "IT"],
+    "it": ["software", "technology", "IT"],
+    "finance": ["finance", "banking"],
+    "banking": ["finance", "banking"],
+    "healthcare": ["healthcare", "medical"],
+    "medical": ["healthcare", "medical"],
+}
+
+def _search_index(title=None, location=None, industry=None, limit=10):
     """
-    Search for jobs using JobSpy library.
-    Supports LinkedIn, Indeed, Glassdoor, Google, ZipRecruiter & more.
+    Look a search up in the local job index.
+    
+    Returns:
+        tuple: (search_term, search_term with the industry expansion, indexed
+        jobs with alternate_urls; [] without an index)
+    """
+    search_term = title or "software engineer"  # Default search term
+    terms = INDUSTRY_TERMS.get((industry or "").lower())
+    expanded = f"{search_term} ({' OR '.join(terms)})" if terms else search_term
+    
+    indexed = []
+    if job_index is not None:
+        try:
+            rows = job_index.search(search_term, location, limit, terms, max_age_hours=JOB_MAX_AGE_HOURS)
+            indexed = [dict(job, alternate_urls=row['ALTERNATE_URLS']) if row.get('ALTERNATE_URLS') else job
+                       for job, row in zip(jobs_from_frame(rows), rows)]
+            # Searches users make are crawled from then on
+            job_index.add_query(expanded, location)
+        except sqlite3.Error as e:
+            print(f"⚠️  Job index search failed: {e}")
+    return search_term, expanded, indexed
+
+def _needs_topup(indexed, limit):
+    """Whether indexed results get a live scrape on top (JOB_INDEX_TOPUP)."""
+    return Config.JOB_INDEX_TOPUP == 'always' or (Config.JOB_INDEX_TOPUP == 'auto' and len(indexed) < limit)
+
+def search_jobs_by_site(title=None, location=None, industry=None, limit=10, fresh=False, min_results=None,
+                        scrape_limit=None):
     """
-    if not JOBSPY_AVAILABLE:
-        # Fallback to simulated data if JobSpy is not available
-        return search_jobs_fallback(title, location, industry, limit)
+    Search for jobs in the local job index, topped up by a live scrape.
+    
+    The index (job_index.py) answers in milliseconds. A live scrape runs when
+    it has fewer than min_results (default limit) matches
+    (JOB_INDEX_TOPUP=auto), on every search
+    (always) or when fresh is set; live postings are added to the index and
+    fill the remaining slots. The scrape asks each board for scrape_limit
+    (default limit) postings. Cross-board copies of a posting are collapsed
+    into one job with alternate_urls.
+    
+    Returns:
+        tuple: (jobs, info) where info has the result source (index, live or
+        index+live), the per-site report and the cache status of the live scrape
+    """
+    search_term, expanded, indexed = _search_index(title, location, industry, limit)
+    # The index only marks cross-board copies when it is maintained, so collapse them here too
+    indexed = dedupe_jobs(indexed)
+    if job_index is not None:
+        if indexed and not (fresh or _needs_topup(indexed, min_results or limit)):
+            print(f"✅ Found {len(indexed)} jobs in the job index")
+            return indexed[:limit], {'source': 'index', 'sites': {}, 'cache': 'off'}
+    
+    live, info = _scrape_jobs_live(expanded, location, scrape_limit or limit) if JOBSPY_AVAILABLE else ([], {'sites': {}, 'cache': 'off'})
+    # The same posting may come from the index and the live scrape, or from several boards
+    jobs_list = dedupe_jobs(indexed + live)[:limit]
     
+    if not jobs_list:
+        print("⚠️  No jobs found with JobSpy")
+        return search_jobs_fallback(title, location, industry, limit), dict(info, source='fallback')
+    
+    from_index = {job["url"] for job in indexed}
+    from_live = any(job["url"] not in from_index for job in jobs_list)
+    source = 'index+live' if indexed and from_live else 'index' if indexed else 'live'
+    print(f"✅ Found {len(jobs_list)} jobs ({source}, {info['cache']})")
+    return jobs_list, dict(info, source=source)
+
+# Postings older than this are neither scraped nor served from the index
+JOB_MAX_AGE_HOURS = 168
+
+def _index_scraped(frames):
+    """Add scraped {site: DataFrame} to the job index and keep it purged and deduplicated."""
+    job_index.add_frames(frames)
+    job_index.maintain(Config.JOB_INDEX_MAINTENANCE_MINUTES * 60, background=True)
+
+def _live_search_params(search_term, location=None, limit=10):
+    """JobSpy boards and shared search parameters of a live scrape."""
+    site_names = [site.strip() for site in Config.JOB_SITES.split(',') if site.strip()]  # Main job boards
+    
+    # Build search parameters
+    search_params = {
+        "search_term": search_term,
+        "results_wanted": min(limit, 50),  # JobSpy limit
+        "hours_old": JOB_MAX_AGE_HOURS,  # Jobs from last week
+        "country_indeed": "USA"
+    }
+    
+    # Add location if provided
+    if location:
+        search_params["location"] = location
+    return site_names, search_params
+
+def _live_search_key(site_names, search_params):
+    return search_key(search_params["search_term"], search_params.get("location"), site_names,
+                      search_params["hours_old"])
+
+def _scrape_all_sites(site_names, search_params):
+    """Scrape every board concurrently; returns the cacheable {jobs, sites, results_wanted}."""
+    print(f"🔍 Searching jobs with JobSpy on {', '.join(site_names)}: {search_params}")
+    
+    # Scrape every board concurrently
+    frames, sites = scrape_sites(scrape_jobs, site_names, search_params, Config.JOB_SITE_TIMEOUT_SECONDS,
+                                 parse_site_timeouts(Config.JOB_SITE_TIMEOUTS))
+    for site, entry in sites.items():
+        if entry['status'] != 'ok':
+            print(f"⚠️  {site} {entry['status']} after {entry['latency_ms']:.0f} ms: {entry.get('error')}")
+    if job_index is not None:
+        _index_scraped(frames)
+    
+    # Convert each board's DataFrame and interleave them in board order
+    wanted = search_params["results_wanted"]
+    per_site = [jobs_from_frame(frames[site], site, wanted) for site in site_names if site in frames]
+    jobs = [job for group in itertools.zip_longest(*per_site) for job in group if job is not None]
+    
+    # Copies of a posting on other boards collapse into the richest one (with alternate_urls)
+    jobs = dedupe_jobs(jobs)
+    
+    # Real postings feed the skill-gap ranker's demand counts
+    skill_gap_ranker.observe_postings(jobs)
+    return {'jobs': jobs, 'sites': sites, 'results_wanted': wanted}
+
+def _scrape_jobs_live(search_term, location=None, limit=10):
+    """
+    Scrape jobs with JobSpy, one concurrent scrape per job board.
+    
+    Each board has its own timeout (JOB_SITE_TIMEOUT_SECONDS, JOB_SITE_TIMEOUTS)
+    and a failing or slow board only loses its own postings. Postings are
+    interleaved board by board so one board can't crowd out the others.
+    Results are cached per normalized search (JOB_CACHE_*).
+    
+    Returns:
+        tuple: (jobs, info) where info has the per-site report
+        {site: {status, latency_ms, count, error?}} and the cache status
+    """
     try:
-        # Prepare search parameters
-        search_term = title or "software engineer"  # Default search term
-        site_names = ["indeed", "linkedin", "zip_recruiter"]  # Main job boards
-        
-        # Build search parameters
-        search_params = {
-            "site_name": site_names,
-            "search_term": search_term,
-            "results_wanted": min(limit, 50),  # JobSpy limit
-            "hours_old": 168,  # Jobs from last week
-            "country_indeed": "USA"
-        }
+        site_names, search_params = _live_search_params(search_term, location, limit)
         
-        # Add location if provided
-        if location:
-            search_params["location"] = location
-        
-        # Add job type filters based on industry
-        if industry:
-            if industry.lower() in ["technology", "software", "it"]:
-                search_params["search_term"] = f"{search_term} (software OR technology OR IT)"
-            elif industry.lower() in ["finance", "banking"]:
-                search_params["search_term"] = f"{search_term} (finance OR banking)"
-            elif industry.lower() in ["healthcare", "medical"]:
-                search_params["search_term"] = f"{search_term} (healthcare OR medical)"
-        
-        print(f"🔍 Searching jobs with JobSpy: {search_params}")
-        
-        # Scrape jobs using JobSpy
-        jobs_df = scrape_jobs(**search_params)
-        
-        if jobs_df.empty:
-            print("⚠️  No jobs found with JobSpy")
-            return search_jobs_fallback(title, location, industry, limit)
-        
-        # Convert DataFrame to list of dictionaries
-        jobs_list = []
-        for _, row in jobs_df.head(limit).iterrows():
-            job = {
-                "title": row.get("TITLE", "N/A"),
-                "company": row.get("COMPANY", "N/A"),
-                "location": f"{row.get('CITY', '')}, {row.get('STATE', '')}".strip(", "),
-                "description": row.get("DESCRIPTION", "No description available")[:500] + "...",
-                "salary": format_salary(row),
-                "url": row.get("JOB_URL", "#"),
-                "posted_date": str(row.get("DATE_POSTED", "N/A")),
-                "job_type": row.get("JOB_TYPE", "N/A"),
-                "is_remote": row.get("IS_REMOTE", False)
-            }
-            jobs_list.append(job)
-        
-        print(f"✅ Found {len(jobs_list)} jobs with JobSpy")
-        return jobs_list
+        def scrape():
+            return _scrape_all_sites(site_names, search_params)
+        
+        if job_cache is None:
+            result, cache_status = scrape(), 'off'
+        else:
+            # A cached search only serves requests that don't want more postings than it fetched
+            result, cache_status = job_cache.get_or_fetch(
+                _live_search_key(site_names, search_params),
+                scrape,
+                accept=lambda cached: cached['results_wanted'] >= search_params["results_wanted"],
+                store_if=lambda fresh: bool(fresh['jobs'])
+            )
+        return result['jobs'][:limit], {'sites': result['sites'], 'cache': cache_status}
         
     except Exception as e:
         print(f"❌ Error with JobSpy: {e}")
-        return search_jobs_fallback(title, location, industry, limit)
+        return [], {'sites': {}, 'cache': 'off'}
+
+def stream_jobs_by_site(title=None, location=None, industry=None, limit=10, fresh=False):
+    """
+    Search for jobs like search_jobs_by_site, yielding results as they arrive.
+    
+    Index matches come first, then one batch per job board as soon as that
+    board's scrape finishes (so the first jobs arrive within the fastest
+    board's latency). Jobs that copy an already sent job are dropped and
+    reported in the batch's alternates. A complete live scrape is stored in
+    the job search cache; a cached scrape (fresh, stale while it is
+    refreshed, or shared with an identical search in flight) is sent as
+    one batch.
+    
+    Yields:
+        dict: {"type": "jobs", "source": "index" | "cache" | site | "fallback",
+        "jobs", "alternates"?, "elapsed_ms"} frames (board frames also have the
+        board's status, latency_ms, count and error), then one
+        {"type": "summary", "total", "counts", "duplicates", "sites", "cache",
+        "first_result_ms", "elapsed_ms"} frame
+    """
+    started = time.monotonic()
+    sent, counts, sites = [], {}, {}
+    cache_status = 'off'
+    first_result_ms, duplicates = None, 0
+    
+    def elapsed_ms():
+        return round((time.monotonic() - started) * 1000, 1)
+    
+    def batch(source, jobs, **extra):
+        nonlocal first_result_ms, duplicates
+        new, alternates = dedupe_against(sent, jobs)
+        duplicates += len(jobs) - len(new)
+        new = new[:limit - len(sent)]
+        sent.extend(new)
+        counts[source] = len(new)
+        if new and first_result_ms is None:
+            first_result_ms = elapsed_ms()
+        frame = dict({'type': 'jobs', 'source': source, 'jobs': new, 'elapsed_ms': elapsed_ms()}, **extra)
+        if alternates:
+            frame['alternates'] = alternates
+        return frame
+    
+    search_term, expanded, indexed = _search_index(title, location, industry, limit)
+    if indexed:
+        yield batch('index', indexed)
+    
+    if JOBSPY_AVAILABLE and (not indexed or fresh or _needs_topup(indexed, limit)):
+        site_names, search_params = _live_search_params(expanded, location, limit)
+        key = _live_search_key(site_names, search_params)
+        wanted = search_params["results_wanted"]
+        cached = None
+        if job_cache is not None:
+            cached, cache_status = job_cache.lookup(
+                key,
+                lambda: _scrape_all_sites(site_names, search_params),
+                accept=lambda value: value['results_wanted'] >= wanted,
+                store_if=lambda value: bool(value['jobs'])
+            )
+        if cached is not None:
+            sites = cached['sites']
+            yield batch('cache', cached['jobs'])
+        else:
+            print(f"🔍 Streaming jobs with JobSpy from {', '.join(site_names)}: {search_params}")
+            live = []
+            try:
+                for site, jobs_df, entry in iter_scrape_sites(scrape_jobs, site_names, search_params,
+                                                              Config.JOB_SITE_TIMEOUT_SECONDS,
+                                                              parse_site_timeouts(Config.JOB_SITE_TIMEOUTS)):
+                    sites[site] = entry
+                    jobs = []
+                    if jobs_df is None:
+                        print(f"⚠️  {site} {entry['status']} after {entry['latency_ms']:.0f} ms: {entry.get('error')}")
+                    else:
+                        if job_index is not None:
+                            _index_scraped({site: jobs_df})
+                        jobs = jobs_from_frame(jobs_df, site, wanted)
+                        live.extend(jobs)
+                    # Every board gets a frame, with its status, latency and count (error if it failed)
+                    yield batch(site, jobs, **entry)
+            except Exception as e:
+                print(f"❌ Error with JobSpy: {e}")
+            live = dedupe_jobs(live)
+            skill_gap_ranker.observe_postings(live)
+            if job_cache is not None and live:
+                job_cache.put(key, {'jobs': live, 'sites': sites, 'results_wanted': wanted})
+    
+    if not sent:
+        print("⚠️  No jobs found with JobSpy")
+        yield batch('fallback', search_jobs_fallback(title, location, industry, limit))
+    
+    yield {'type': 'summary', 'total': len(sent), 'counts': counts, 'duplicates': duplicates, 'sites': sites,
+           'cache': cache_status, 'first_result_ms': first_result_ms, 'elapsed_ms': elapsed_ms()}
+
+def search_jobs_api(title=None, location=None, industry=None, limit=10):
+    """
+    Search for jobs using JobSpy library.
+    Supports LinkedIn, Indeed, Glassdoor, Google, ZipRecruiter & more.
+    """
+    jobs, _ = search_jobs_by_site(title, location, industry, limit)
+    return jobs
 
 def search_jobs_fallback(title=None, location=None, industry=None, limit=10):
     """Fallback job search with simulated data."""
@@ -549,28 +733,55 @@ def search_jobs_fallback(title=None, location=None, industry=None, limit=10):
     
     return filtered_jobs[:limit]
 
-def format_salary(row):
-    """Format salary information from JobSpy data."""
-    min_amount = row.get("MIN_AMOUNT")
-    max_amount = row.get("MAX_AMOUNT")
-    interval = row.get("INTERVAL", "yearly")
-    
-    if min_amount and max_amount:
-        if interval == "yearly":
-            return f"${min_amount:,} - ${max_amount:,}"
-        elif interval == "hourly":
-            return f"${min_amount}/hr - ${max_amount}/hr"
-        else:
-            return f"${min_amount:,} - ${max_amount:,} ({interval})"
-    elif min_amount:
-        if interval == "yearly":
-            return f"${min_amount:,}+"
-        elif interval == "hourly":
-            return f"${min_amount}/hr+"
+def build_job_recommendations(user_profile):
+    """
+    Recommend job titles and search live postings for the top three.
+    
+    The title searches run in parallel under one deadline
+    (JOB_SEARCH_DEADLINE_SECONDS); postings are merged as each search
+    finishes, and searches still running at the deadline are left out.
+    Each search returns JOB_RECOMMENDATION_CANDIDATES postings and the two
+    per title most relevant to the profile (BM25, job_ranking.py) are kept,
+    each with its score.
+    """
+    recommended_titles = get_job_recommendations(user_profile)
+    
+    # Search for jobs with recommended titles
+    results = {}
+    search_status = {}
+    searches = fan_out(lambda title: search_jobs_api(title=title, limit=Config.JOB_RECOMMENDATION_CANDIDATES),
+                       recommended_titles[:3], Config.JOB_SEARCH_DEADLINE_SECONDS)
+    for title, jobs, error in searches:
+        if error is None:
+            results[title] = jobs
+            search_status[title] = 'ok'
         else:
-            return f"${min_amount:,}+ ({interval})"
-    else:
-        return "Salary not specified"
+            print(f"⚠️  Job search for '{title}' failed: {error}")
+            search_status[title] = 'timeout' if isinstance(error, TimeoutError) else 'error'
+    
+    # Two per title, in title order; titles overlap, so a posting already
+    # picked for an earlier title (or a copy of it from another board) is skipped
+    recommended_jobs = []
+    picked_urls = set()
+    for title in recommended_titles[:3]:
+        kept = []
+        for job in rank_jobs(user_profile, dedupe_jobs(results.get(title, []))):
+            if len(kept) == 2:
+                break
+            urls = {job.get('url')} | {alternate.get('url') for alternate in job.get('alternate_urls') or []}
+            # Postings without a real URL ('#' placeholder) can't be matched by URL
+            urls -= {None, '', '#'}
+            if not urls & picked_urls:
+                kept.append(job)
+                picked_urls |= urls
+        recommended_jobs.extend(kept)
+    
+    return {
+        'recommended_titles': recommended_titles,
+        'recommended_jobs': recommended_jobs,
+        'search_status': search_status,
+        'partial': any(status != 'ok' for status in search_status.values())
+    }
 
 def get_job_recommendations(user_profile, limit=5):
     """
@@ -581,28 +792,14 @@ def get_job_recommendations(user_profile, limit=5):
         prompt = f"""
         Based on this user profile, suggest 5 job titles that would be a good fit:
         
-        User Profile:
-        - Skills: {', '.join(user_profile.get('skills', []))}
-        - Experience: {len(user_profile.get('experience', []))} positions
-        - Industries: {', '.join(user_profile.get('industries', []))}
-        - Desired Roles: {', '.join(user_profile.get('desired_roles', []))}
+        {_profile_summary(user_profile, 'job_titles')}
         
         Return only the job titles as a JSON array, like: ["Job Title 1", "Job Title 2", ...]
         """
         
-        response = google_model.generate_content(prompt)
-        
-        content = response.text
         try:
-            # Try to extract JSON from the response
-            import json
-            json_start = content.find('[')
-            json_end = content.rfind(']') + 1
-            if json_start != -1 and json_end != 0:
-                json_str = content[json_start:json_end]
-                recommended_titles = json.loads(json_str)
-                return recommended_titles
-        except:
+            return generate_json(llm_model, prompt, 'job_titles')
+        except StructuredOutputError:
             pass
         
         # Fallback to default recommendations
@@ -612,6 +809,42 @@ def get_job_recommendations(user_profile, limit=5):
         # Fallback to default recommendations
         return ["Software Engineer", "Data Analyst", "Product Manager", "DevOps Engineer", "UX Designer"]
 
+def generate_cohort_reports(user_profiles, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Intelligence reports and job titles for many profiles using batched prompts.
+    
+    Profiles whose batched result is missing or invalid fall back to the
+    per-profile generators.
+    
+    Returns:
+        list: {"intelligence_report": ..., "job_titles": [...]} per profile, in order
+    """
+    blocks = [_profile_summary(profile, 'intelligence_report') for profile in user_profiles]
+    reports = generate_batch(
+        llm_model, 'intelligence_report',
+        "You are a Senior Career Intelligence Analyst with expertise in market trends, industry analysis, "
+        "and career development. Provide comprehensive, data-driven career intelligence for each user profile.",
+        INTELLIGENCE_REPORT_FORMAT, blocks,
+        lambda position: generate_intelligence_report(user_profiles[position]),
+        batch_size=batch_size
+    )
+    blocks = [_profile_summary(profile, 'job_titles') for profile in user_profiles]
+    titles = generate_batch(
+        llm_model, 'job_titles',
+        "Suggest 5 job titles that would be a good fit for each user profile.",
+        '["Job Title 1", "Job Title 2", ...]', blocks,
+        lambda position: get_job_recommendations(user_profiles[position]),
+        batch_size=batch_size
+    )
+    return [{'intelligence_report': report, 'job_titles': job_titles}
+            for report, job_titles in zip(reports, titles)]
+
+# Speculative prefetch: start the stages users request right after a parse,
+# unless the LLM circuit breaker reports trouble
+prefetcher = Prefetcher.from_config(admit=lambda: llm_transport.breaker.state == 'closed')
+prefetcher.register('intelligence', generate_intelligence_report)
+prefetcher.register('recommendations', build_job_recommendations)
+
 # Web Interface
 @app.route('/')
 @require_auth
@@ -629,9 +862,35 @@ def health_check():
         'timestamp': datetime.now().isoformat(),
         'spacy_loaded': nlp is not None,
         'google_ai_configured': bool(Config.GOOGLE_API_KEY),
-        'jobspy_available': JOBSPY_AVAILABLE
+        'llm_provider': Config.LLM_PROVIDER,
+        'jobspy_available': JOBSPY_AVAILABLE,
+        'structured_output': get_structured_output_metrics(),
+        'single_flight': llm_flights.stats,
+        'llm_transport': dict(llm_transport.stats, circuit_state=llm_transport.breaker.state),
+        'job_queue': job_queue.stats(),
+        'cassette': cassette.summary(),
+        'batch_reports': batch_stats,
+        'prefetch': prefetcher.summary(),
+        'latency_slo': tiered.summary(),
+        'job_cache': job_cache.summary() if job_cache else None,
+        'job_result_sets': job_result_sets.summary(),
+        'job_index': job_index.summary() if job_index else None
     })
 
+@app.route('/metrics/llm', methods=['GET'])
+@require_auth
+def llm_metrics():
+    """
+    LLM usage aggregates: calls, tokens, latency percentiles, cache status,
+    retries and parse failures per endpoint/prompt type/model, per prompt
+    type and per user. Routes are sorted by total time spent. With model
+    routing on, "routing" adds latency and cost per prompt type and tier.
+    """
+    metrics = llm_usage.snapshot()
+    if hasattr(llm_model, 'report'):
+        metrics['routing'] = llm_model.report()
+    return jsonify(metrics)
+
 @app.route('/parse_resume', methods=['POST'])
 @require_auth
 def parse_resume():
@@ -661,9 +920,13 @@ def parse_resume():
         # Parse the resume
         parsed_data = parse_resume_text(resume_text)
         
+        # Start intelligence and recommendations now; the follow-up requests attach to them
+        prefetched = prefetcher.prefetch(parsed_data, owner=session.get('username'))
+        
         return jsonify({
             'success': True,
-            'data': parsed_data
+            'data': parsed_data,
+            'prefetched': prefetched
         })
         
     except ValueError as e:
@@ -702,12 +965,18 @@ def get_career_intelligence():
         
         user_profile = data['user_profile']
         
-        # Generate intelligence report
-        intelligence_report = generate_intelligence_report(user_profile)
+        # Generate intelligence report (or attach to the one prefetched after parsing) within the latency SLO
+        intelligence_report, upgrade = tiered.respond(
+            'get_career_intelligence',
+            lambda: prefetcher.get('intelligence', user_profile),
+            lambda: local_intelligence_report(user_profile, market_store),
+            lambda token: _schedule_upgrade('career_intelligence', {'user_profile': user_profile}, token)
+        )
         
         return jsonify({
             'success': True,
-            'data': intelligence_report
+            'data': intelligence_report,
+            'upgrade': upgrade
         })
         
     except Exception as e:
@@ -744,12 +1013,19 @@ def get_upskilling_plan():
         user_profile = data['user_profile']
         in_demand_skills = data.get('in_demand_skills', [])
         
-        # Generate upskilling plan
-        upskilling_plan = generate_upskilling_plan(user_profile, in_demand_skills)
+        # Generate upskilling plan within the latency SLO
+        upskilling_plan, upgrade = tiered.respond(
+            'get_upskilling_plan',
+            lambda: generate_upskilling_plan(user_profile, in_demand_skills),
+            lambda: local_upskilling_plan(user_profile, in_demand_skills),
+            lambda token: _schedule_upgrade('upskilling_plan', {'user_profile': user_profile,
+                                                                'in_demand_skills': in_demand_skills}, token)
+        )
         
         return jsonify({
             'success': True,
-            'data': upskilling_plan
+            'data': upskilling_plan,
+            'upgrade': upgrade
         })
         
     except Exception as e:
@@ -767,24 +1043,137 @@ def search_jobs():
     {
         "title": "Job title (optional)",
         "location": "Location (optional)",
-        "industry": "Industry (optional)"
+        "industry": "Industry (optional)",
+        "fresh": "Always top up with a live scrape (optional, default false)",
+        "page_size": "Jobs per page (optional, default JOB_PAGE_SIZE)",
+        "user_profile": "Parsed profile to rank the jobs against (optional, default the title)",
+        "cursor": "next_cursor of a previous page (optional; the search fields are then ignored)"
     }
     """
     try:
         data = request.get_json()
         
+        page_size = data.get('page_size') if data else None
+        
+        # Later pages come from the stored result set, without searching again
+        if data and data.get('cursor'):
+            try:
+                page = job_result_sets.page(data['cursor'], page_size)
+            except ResultSetExpired as e:
+                return jsonify({'error': str(e)}), 410
+            except CursorError as e:
+                return jsonify({'error': str(e)}), 400
+            return jsonify(dict(page, success=True))
+        
         title = data.get('title', '').strip() if data else ''
         location = data.get('location', '').strip() if data else ''
         industry = data.get('industry', '').strip() if data else ''
         
-        # Search for jobs
-        jobs = search_jobs_api(title=title, location=location, industry=industry)
+        fresh = bool(data.get('fresh')) if data else False
+        
+        # Search the job index, topped up by a live scrape (one concurrent scrape per board, cached).
+        # The whole result set is stored, but only the first page has to be filled from the index,
+        # and the scrape only fetches enough postings per board for that page.
+        first_page = job_result_sets.clamp_page_size(page_size)
+        jobs, info = search_jobs_by_site(title=title, location=location, industry=industry, fresh=fresh,
+                                         limit=Config.JOB_RESULT_SET_SIZE, min_results=first_page,
+                                         scrape_limit=max(Config.JOB_SCRAPE_SIZE, first_page))
+        
+        # The stored order is the relevance order (BM25 against the profile's skills and titles)
+        profile = data.get('user_profile') if data and isinstance(data.get('user_profile'), dict) else None
+        jobs = rank_jobs(profile or {'desired_roles': [title]}, jobs)
+        
+        page = job_result_sets.create(jobs, {'source': info['source'], 'sites': info['sites'],
+                                             'cache': info['cache']}, page_size)
+        return jsonify(dict(page, success=True))
+        
+    except Exception as e:
+        return jsonify({
+            'error': f'Internal server error: {str(e)}'
+        }), 500
+
+@app.route('/search_jobs/stream', methods=['GET', 'POST'])
+@require_auth
+def search_jobs_stream():
+    """
+    Search for jobs, streaming results as each source answers.
+    
+    Takes the /search_jobs payload (or the same fields as query parameters
+    for GET, e.g. for EventSource). Frames are newline-delimited JSON, or
+    Server-Sent Events with the frame type as the event name when the client
+    accepts text/event-stream or passes format=sse. See stream_jobs_by_site
+    for the frames.
+    """
+    data = request.get_json(silent=True) or request.args
+    frames = stream_jobs_by_site(
+        title=(data.get('title') or '').strip(),
+        location=(data.get('location') or '').strip(),
+        industry=(data.get('industry') or '').strip(),
+        fresh=str(data.get('fresh', '')).lower() in ('1', 'true', 'yes')
+    )
+    sse = (request.args.get('format') == 'sse' or
+           request.accept_mimetypes.best_match(['application/x-ndjson', 'text/event-stream']) == 'text/event-stream')
+    
+    def stream():
+        try:
+            for frame in frames:
+                body = json.dumps(frame, default=str)
+                yield f"event: {frame['type']}\ndata: {body}\n\n" if sse else body + "\n"
+        except Exception as e:
+            frame = {'type': 'error', 'error': f'Internal server error: {str(e)}'}
+            yield f"event: error\ndata: {json.dumps(frame)}\n\n" if sse else json.dumps(frame) + "\n"
+    
+    return Response(stream_with_context(stream()),
+                    mimetype='text/event-stream' if sse else 'application/x-ndjson',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/match_jobs', methods=['POST'])
+@require_auth
+def match_jobs():
+    """
+    Match a profile against every posting in the local job index.
+    
+    Postings and the profile are compared as hashed-embedding vectors
+    (job_vectors.py), so this covers the whole index, not one search.
+    
+    Expected JSON payload:
+    {
+        "user_profile": {...} (as returned by /parse_resume),
+        "resume_text": "Raw resume text (alternative to user_profile)",
+        "limit": "Number of jobs (optional, default JOB_PAGE_SIZE, at most JOB_MAX_PAGE_SIZE)"
+    }
+    """
+    try:
+        data = request.get_json()
+        
+        if not data or not (data.get('user_profile') or data.get('resume_text')):
+            return jsonify({
+                'error': 'Missing user_profile or resume_text in request body'
+            }), 400
+        
+        if job_index is None or job_index.vectors is None:
+            return jsonify({
+                'error': 'Job matching needs the job index (JOB_INDEX_DB) and JOB_VECTORS_PATH'
+            }), 503
+        
+        user_profile = data.get('user_profile') or parse_resume_text(data['resume_text'])
+        limit = job_result_sets.clamp_page_size(data.get('limit'))
+        
+        rows = job_index.match(user_profile, limit)
+        jobs = [dict(job, score=row['SCORE'], alternate_urls=row.get('ALTERNATE_URLS') or [])
+                for job, row in zip(jobs_from_frame(rows), rows)]
         
         return jsonify({
             'success': True,
-            'data': jobs
+            'data': jobs,
+            'source': 'vectors',
+            'indexed': len(job_index.vectors)
         })
         
+    except ValueError as e:
+        return jsonify({
+            'error': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'error': f'Internal server error: {str(e)}'
@@ -817,28 +1206,181 @@ def get_job_recommendations_endpoint():
         
         user_profile = data['user_profile']
         
-        # Get job recommendations
-        recommended_titles = get_job_recommendations(user_profile)
+        # Get job recommendations and matching postings (or attach to the prefetched ones)
+        return jsonify({
+            'success': True,
+            'data': prefetcher.get('recommendations', user_profile)
+        })
         
-        # Search for jobs with recommended titles
-        recommended_jobs = []
-        for title in recommended_titles[:3]:  # Top 3 recommendations
-            jobs = search_jobs_api(title=title, limit=2)
-            recommended_jobs.extend(jobs)
+    except LLMDeadlineExceeded as e:
+        return jsonify({
+            'error': str(e)
+        }), 504
+    except Exception as e:
+        return jsonify({
+            'error': f'Internal server error: {str(e)}'
+        }), 500
+
+# Background Jobs
+
+def _llm_job(handler):
+    """
+    Run a job handler under the (longer) background LLM deadline. Its LLM
+    calls only share flights with other jobs, never with a request's call
+    that the request deadline would cut short.
+    
+    An upgrade job (payload "upgrade_of") returns the result of the LLM call
+    its provisional report was served for, still running in this process,
+    and only calls the LLM itself when that call is gone or failed.
+    """
+    def run(payload):
+        job = current_job() or {}
+        token = payload.pop('upgrade_of', None)
+        if token is not None:
+            try:
+                return tiered.result(token, timeout=Config.JOB_LLM_DEADLINE_SECONDS)
+            except KeyError:
+                pass
+            except Exception as e:
+                print(f"⚠️  LLM call for {job.get('kind')} failed, retrying in the upgrade job: {e}")
+        with request_deadline(Config.JOB_LLM_DEADLINE_SECONDS), flight_scope('job'), \
+                usage_context(f"job:{job.get('kind')}", job.get('owner')):
+            return handler(payload)
+    return run
+
+job_queue = JobQueue(
+    Config.JOB_QUEUE_DB,
+    max_workers=Config.JOB_QUEUE_WORKERS,
+    retention_seconds=Config.JOB_RETENTION_SECONDS,
+    lane_limits={'low': Config.JOB_QUEUE_LOW_PRIORITY_MAX_CONCURRENCY}
+)
+job_queue.register('career_intelligence', _llm_job(
+    lambda payload: generate_intelligence_report(payload['user_profile'])))
+job_queue.register('upskilling_plan', _llm_job(
+    lambda payload: generate_upskilling_plan(payload['user_profile'], payload.get('in_demand_skills', []))))
+job_queue.register('job_recommendations', _llm_job(
+    lambda payload: build_job_recommendations(payload['user_profile'])))
+job_queue.register('cohort_report', _llm_job(
+    lambda payload: generate_cohort_reports(payload['user_profiles'],
+                                            payload.get('batch_size', DEFAULT_BATCH_SIZE))))
+job_queue.start()
+
+def _schedule_upgrade(kind, payload, token):
+    """
+    Queue the LLM version of a provisional report. The job picks up the LLM
+    call the SLO wait gave up on (TieredResponder token) rather than making
+    a second one (see _llm_job).
+    """
+    job_id = job_queue.submit(kind, dict(payload, upgrade_of=token), priority='high',
+                              owner=session.get('username'))
+    return {
+        'job_id': job_id,
+        'status_url': f'/jobs/{job_id}',
+        'events_url': f'/jobs/{job_id}/events'
+    }
+
+def _owned_job(job_id):
+    """Return the job if it exists and belongs to the current user."""
+    job = job_queue.get(job_id)
+    if job is None or job.get('owner') != session.get('username'):
+        return None
+    return job
+
+@app.route('/jobs/<kind>', methods=['POST'])
+@require_auth
+def submit_job(kind):
+    """
+    Queue an LLM report and return a job id immediately.
+    
+    Kinds: career_intelligence, upskilling_plan, job_recommendations.
+    The JSON payload is the same as the matching synchronous endpoint, plus
+    an optional "priority": "high" | "normal" | "low".
+    
+    Kind cohort_report takes {"user_profiles": [...], "batch_size": 8} and
+    returns an intelligence report and job titles per profile.
+    """
+    try:
+        data = request.get_json()
+        profile_key = 'user_profiles' if kind == 'cohort_report' else 'user_profile'
+        
+        if not data or profile_key not in data:
+            return jsonify({
+                'error': f'Missing {profile_key} in request body'
+            }), 400
+        
+        if kind not in job_queue.handlers:
+            return jsonify({
+                'error': f'Unknown job type: {kind}'
+            }), 404
+        
+        priority = data.pop('priority', 'normal')
+        job_id = job_queue.submit(kind, data, priority=priority, owner=session.get('username'))
         
         return jsonify({
             'success': True,
-            'data': {
-                'recommended_titles': recommended_titles,
-                'recommended_jobs': recommended_jobs
-            }
-        })
+            'job_id': job_id,
+            'status_url': f'/jobs/{job_id}',
+            'events_url': f'/jobs/{job_id}/events'
+        }), 202
         
+    except ValueError as e:
+        return jsonify({
+            'error': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'error': f'Internal server error: {str(e)}'
         }), 500
 
+@app.route('/jobs/<job_id>', methods=['GET'])
+@require_auth
+def get_job(job_id):
+    """
+    Poll a background job. Pass ?wait=<seconds> (max 30) to long-poll until
+    the job finishes.
+    """
+    job = _owned_job(job_id)
+    if job is None:
+        return jsonify({
+            'error': 'Job not found'
+        }), 404
+    
+    wait_seconds = min(request.args.get('wait', 0, type=float), 30)
+    if wait_seconds > 0:
+        job = job_queue.wait(job_id, wait_seconds)
+    
+    return jsonify({
+        'success': True,
+        'data': job
+    })
+
+@app.route('/jobs/<job_id>/events', methods=['GET'])
+@require_auth
+def job_events(job_id):
+    """Subscribe to a background job as Server-Sent Events until it finishes."""
+    if _owned_job(job_id) is None:
+        return jsonify({
+            'error': 'Job not found'
+        }), 404
+    
+    def stream():
+        last_status = None
+        while True:
+            job = job_queue.wait(job_id, 15)
+            if job is None:
+                yield "event: error\ndata: {\"error\": \"Job not found\"}\n\n"
+                return
+            if job['status'] != last_status or job['status'] in TERMINAL_STATUSES:
+                last_status = job['status']
+                yield f"event: {job['status']}\ndata: {json.dumps(job)}\n\n"
+            else:
+                yield ": keep-alive\n\n"
+            if job['status'] in TERMINAL_STATUSES:
+                return
+    
+    return Response(stream_with_context(stream()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache'})
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({
@@ -862,7 +1404,9 @@ if __name__ == '__main__':
     
     print("🚀 Starting Career AI Agent API...")
     print(f"📊 spaCy model: {Config.SPACY_MODEL}")
-    print(f"🤖 Google AI model: {Config.GOOGLE_MODEL}")
+    print(f"🤖 LLM provider: {Config.LLM_PROVIDER} ({llm_model.model_name})")
+    if cassette.mode != 'off':
+        print(f"📼 Cassette: {cassette.mode} {cassette.path}")
     print(f"💼 JobSpy integration: {'✅ Available' if JOBSPY_AVAILABLE else '❌ Not available'}")
     print(f"🌐 API will be available at: http://localhost:5000")
     
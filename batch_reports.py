@@ -0,0 +1,128 @@
+"""
+Batched LLM reports for Career AI Agent
+Packs several small profiles into one prompt with an indexed JSON array
+reply, keeps the items that validate and retries the rest one at a time
+"""
+
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from structured_output import SCHEMAS, StructuredOutputError, extract_json, generate_json, validate
+
+# Profiles packed into one prompt by default (keeps replies inside the batch output cap)
+DEFAULT_BATCH_SIZE = 8
+
+_stats_lock = threading.Lock()
+batch_stats = {'batches': 0, 'items': 0, 'batched_ok': 0, 'retried_singly': 0, 'failed_batches': 0}
+
+
+def _count(**counts):
+    with _stats_lock:
+        for key, amount in counts.items():
+            batch_stats[key] += amount
+
+
+def batch_prompt_type(prompt_type):
+    """SCHEMAS key of the batched variant of a prompt type."""
+    return f"{prompt_type}_batch"
+
+
+def build_batch_prompt(instructions, item_format, blocks):
+    """
+    Pack per-item prompt blocks into one prompt.
+
+    Each block is introduced by an "[index N]" header; the reply must be a
+    JSON array of {"index": N, "result": <item_format>} objects.
+    """
+    packed = "\n\n".join(f"[index {index}]\n{block.strip()}" for index, block in enumerate(blocks))
+    return (
+        f"{instructions.strip()}\n\n"
+        f"There are {len(blocks)} independent items below. Analyze each one on its own.\n"
+        f"Return ONLY a JSON array with exactly one element per item, in this format:\n"
+        f'[{{"index": <item index>, "result": {item_format.strip()}}}]\n\n'
+        f"{packed}"
+    )
+
+
+def parse_batch_items(value, prompt_type, indices):
+    """
+    Pick the valid per-item results out of a batched reply.
+
+    Returns:
+        dict: index -> result for every requested index whose result validates
+    """
+    schema = SCHEMAS[prompt_type]
+    wanted = set(indices)
+    results = {}
+    for item in value if isinstance(value, list) else []:
+        if not isinstance(item, dict):
+            continue
+        index = item.get('index')
+        if index in wanted and index not in results and 'result' in item and not validate(item['result'], schema):
+            results[index] = item['result']
+    return results
+
+
+def _run_batch(model, prompt_type, instructions, item_format, blocks, indices):
+    # Items are numbered 0..n-1 within each batch, whatever their position in the cohort
+    prompt = build_batch_prompt(instructions, item_format, [blocks[i] for i in indices])
+    local = list(range(len(indices)))
+    try:
+        value = generate_json(model, prompt, batch_prompt_type(prompt_type), max_reasks=0)
+    except StructuredOutputError as error:
+        # Salvage whatever items did come back valid; the rest are retried singly
+        _count(failed_batches=1)
+        try:
+            value, _ = extract_json(error.raw_text, 'array')
+        except StructuredOutputError:
+            value = []
+    parsed = parse_batch_items(value, prompt_type, local)
+    return {indices[position]: result for position, result in parsed.items()}
+
+
+def generate_batch(model, prompt_type, instructions, item_format, blocks, single_fn,
+                   batch_size=DEFAULT_BATCH_SIZE, max_workers=4):
+    """
+    Generate one result per block using batched prompts.
+
+    Args:
+        model: Gemini-style provider
+        prompt_type (str): Item prompt type; its *_batch variant must be in SCHEMAS
+        instructions (str): Task instructions shared by every item
+        item_format (str): Example JSON of one item's result
+        blocks (list): Per-item prompt text (e.g. a profile summary)
+        single_fn (callable): single_fn(position) -> result, used for items the batch did not return validly
+        batch_size (int): Items per prompt
+        max_workers (int): Batches in flight at once
+
+    Returns:
+        list: Results in block order
+    """
+    chunks = [list(range(start, min(start + batch_size, len(blocks))))
+              for start in range(0, len(blocks), batch_size)]
+    results = {}
+
+    def run(indices):
+        try:
+            return _run_batch(model, prompt_type, instructions, item_format, blocks, indices)
+        except Exception as e:
+            # Transport errors, circuit open, ...: every item falls back to a single call
+            print(f"⚠️  Batch of {len(indices)} {prompt_type} items failed: {e}")
+            _count(failed_batches=1)
+            return {}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks) or 1))) as pool:
+        # Keep the request deadline and usage tags inside the worker threads
+        futures = [pool.submit(contextvars.copy_context().run, run, indices) for indices in chunks]
+        for future in futures:
+            results.update(future.result())
+
+    missing = [position for position in range(len(blocks)) if position not in results]
+    _count(batches=len(chunks), items=len(blocks), batched_ok=len(blocks) - len(missing),
+           retried_singly=len(missing))
+    if missing:
+        print(f"🔁 Retrying {len(missing)} of {len(blocks)} {prompt_type} items one at a time")
+    for position in missing:
+        results[position] = single_fn(position)
+    return [results[position] for position in range(len(blocks))]
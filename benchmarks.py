@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks for Career AI Agent
+Run with: python benchmarks.py <benchmark> [options]
+"""
+
+import argparse
+import io
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def print_latency_report(title, latencies_ms, elapsed, errors=0):
+    """Print throughput and latency percentiles for a run."""
+    count = len(latencies_ms)
+    print(f"\n📊 {title}")
+    print(f"   Requests:   {count} ({errors} failed)")
+    print(f"   Throughput: {count / elapsed:.1f} req/s")
+    if latencies_ms:
+        print(f"   Latency:    mean {statistics.mean(latencies_ms):.1f} ms | p50 {percentile(latencies_ms, 50):.1f} ms"
+              f" | p95 {percentile(latencies_ms, 95):.1f} ms | p99 {percentile(latencies_ms, 99):.1f} ms")
+
+
+def run_concurrently(fn, jobs, concurrency):
+    """Run fn(job) for every job on a thread pool; returns (latencies_ms, errors, elapsed)."""
+    latencies, errors = [], []
+
+    def timed(job):
+        started = time.perf_counter()
+        try:
+            fn(job)
+        except Exception as e:
+            errors.append(e)
+            return
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(timed, jobs))
+    return latencies, errors, time.perf_counter() - started
+
+
+def bench_llm(args):
+    """Throughput and tail latency of generate_json against the fake provider."""
+    from llm_provider import FakeProvider
+    from structured_output import SCHEMAS, generate_json
+
+    provider = FakeProvider(latency=args.latency, latency_ms=args.latency_ms, error_rate=args.error_rate,
+                            rate_limit_rate=args.rate_limit_rate, seed=args.seed)
+    prompt_types = sorted(SCHEMAS)
+    unique = max(1, int(args.requests * (1 - args.duplicate_ratio)))
+    jobs = [(prompt_types[i % len(prompt_types)], f"benchmark prompt {i % unique}") for i in range(args.requests)]
+
+    with redirect_stdout(io.StringIO()):
+        latencies, errors, elapsed = run_concurrently(
+            lambda job: generate_json(provider, job[1], job[0]), jobs, args.concurrency)
+
+    print_latency_report(f"generate_json via fake provider ({args.latency}, {args.latency_ms:.0f} ms)",
+                         latencies, elapsed, len(errors))
+    print(f"   Provider calls: {provider.stats['calls']} "
+          f"({provider.stats['errors']} errors, {provider.stats['rate_limited']} rate limited)")
+
+
+def bench_replay(args):
+    """Replay a recorded cassette through the LLM transport and the JobSpy wrapper."""
+    from cassette import Cassette
+    from llm_transport import llm_transport
+
+    cassette = Cassette(args.cassette, mode='replay', speed=args.speed)
+    provider = cassette.provider(lambda: None)
+    scrape = cassette.scraper(None)
+    jobs = [entry for entry in cassette.entries() if 'request' in entry] * args.repeat
+
+    def run(entry):
+        if entry['kind'] == 'llm':
+            llm_transport.generate_content(provider, entry['request']['prompt'],
+                                           entry['request'].get('generation_config'))
+        else:
+            scrape(**entry['request'])
+
+    with redirect_stdout(io.StringIO()):
+        latencies, errors, elapsed = run_concurrently(run, jobs, args.concurrency)
+
+    print_latency_report(f"Cassette replay of {args.cassette} ({args.speed} speed)", latencies, elapsed, len(errors))
+    print(f"   Replayed: {cassette.stats['replayed']} | misses: {cassette.stats['misses']}")
+
+
+def bench_templates(args):
+    """Prefix reuse and input tokens saved by prompt template context caching."""
+    from llm_provider import FakeProvider
+    from prompt_templates import TemplateRegistry, prompt_templates
+
+    fields = {
+        'career_surprise_insights': lambda i: dict(
+            responses_text=f"Q: What worries you most?\nA: Answer {i}", skills=['python', 'sql', f'skill {i}'],
+            years_exp=i % 15, job_titles=['Analyst'], education='Bachelor', industries=['technology']),
+        'career_analysis': lambda i: dict(
+            skills=['python', 'sql', f'skill {i}'], job_titles=['Analyst'], years_experience=i % 15,
+            education='Bachelor', industries=['technology'], raw_text=f"Resume {i}", location='Remote',
+            salary_min=90000 + i, job_type='Full-time', sponsorship=False, values=['growth'], company_size='Any'),
+        'training_recommendations': lambda i: dict(
+            current_skills=['python', f'skill {i}'], years_experience=i % 15, education='Bachelor',
+            job_titles=['Data Engineer'], required_skills=['spark', 'airflow'], preferred_skills=['dbt']),
+    }
+
+    for cached in (False, True):
+        provider = FakeProvider(latency='fixed', latency_ms=args.latency_ms)
+        if not cached:
+            # Same prompts without provider-side caching (every call sends the full prompt)
+            provider.cache_prefix = None
+        registry = TemplateRegistry()
+        for template in prompt_templates.templates.values():
+            registry.register(template)
+        with redirect_stdout(io.StringIO()):
+            registry.precompile(provider)
+            started = time.perf_counter()
+            for i in range(args.calls):
+                for name, make_fields in fields.items():
+                    registry.generate(provider, name, **make_fields(i))
+            elapsed = time.perf_counter() - started
+
+        stats = provider.stats
+        billed = stats['input_tokens'] - stats['cached_input_tokens']
+        print(f"\n📊 Prompt templates {'with' if cached else 'without'} prefix caching")
+        print(f"   Calls: {stats['calls']} in {elapsed:.2f}s")
+        print(f"   Input tokens: {stats['input_tokens']} ({stats['cached_input_tokens']} cached, {billed} uncached)")
+        for name, summary in registry.summary().items():
+            print(f"   {name}: prefix ~{summary['prefix_tokens']} tokens, reuse {summary['prefix_reuse']:.0%}, "
+                  f"~{summary['tokens_saved']} tokens saved")
+
+
+def bench_batch(args):
+    """Profiles per second for batched intelligence reports versus one call per profile."""
+    from batch_reports import generate_batch
+    from llm_provider import FakeProvider
+    from structured_output import generate_json
+
+    instructions = "Provide comprehensive, data-driven career intelligence for each user profile."
+    item_format = '{"market_intelligence_summary": "...", "key_industry_skills": ["..."], ...}'
+    blocks = [f"User Profile:\n- Skills: python, sql, skill {i}\n- Experience: {i % 7} positions"
+              for i in range(args.profiles)]
+
+    def provider():
+        return FakeProvider(latency='lognormal', latency_ms=args.latency_ms, sigma=0.3,
+                            ms_per_output_token=args.ms_per_token, seed=args.seed)
+
+    def single(model, position):
+        return generate_json(model, f"{instructions}\n\n{blocks[position]}", 'intelligence_report')
+
+    runs = [('per-profile calls', None)] + [(f"batches of {size}", size) for size in args.batch_sizes]
+    for label, batch_size in runs:
+        model = provider()
+        with redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            if batch_size is None:
+                with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                    list(pool.map(lambda position: single(model, position), range(len(blocks))))
+            else:
+                generate_batch(model, 'intelligence_report', instructions, item_format, blocks,
+                               lambda position: single(model, position), batch_size=batch_size,
+                               max_workers=args.concurrency)
+            elapsed = time.perf_counter() - started
+        print(f"📊 {label:>18}: {len(blocks) / elapsed:7.1f} profiles/s | {model.stats['calls']:4d} LLM calls | "
+              f"{model.stats['input_tokens'] + model.stats['output_tokens']:7d} tokens | {elapsed:.2f}s")
+
+
+def bench_route(args):
+    """Latency and cost of per-prompt-type model routing versus one large model for everything."""
+    from llm_provider import FakeProvider
+    from model_router import TIER_LIMITS, TIER_ORDER, ModelRouter, ModelTier
+    from structured_output import generate_json
+
+    latency_ms = {'fast': args.fast_ms, 'standard': args.standard_ms, 'large': args.large_ms}
+    mix = ['job_titles'] * 4 + ['intelligence_report'] * 2 + ['upskilling_plan', 'career_analysis',
+                                                                'market_intelligence']
+    jobs = [(mix[i % len(mix)], f"routing benchmark prompt {i}") for i in range(args.requests)]
+
+    # Fake providers named after real models, so the report prices them
+    models = {'fast': 'gemini-2.5-flash-lite', 'standard': 'gemini-2.5-flash', 'large': 'gemini-2.5-pro'}
+
+    def tier(name):
+        provider = FakeProvider(model_name=models[name], latency='lognormal', latency_ms=latency_ms[name],
+                                sigma=0.3, ms_per_output_token=args.ms_per_token, seed=args.seed)
+        limits = dict(TIER_LIMITS[name], max_in_flight=args.max_in_flight)
+        return ModelTier(name, provider, **limits)
+
+    runs = [('one large model', ['large']), ('routed', TIER_ORDER)]
+    for label, tier_names in runs:
+        # With only the large tier there is nothing to route or fall back to
+        router = ModelRouter([tier(name) for name in tier_names])
+        with redirect_stdout(io.StringIO()):
+            latencies, errors, elapsed = run_concurrently(
+                lambda job: generate_json(router, job[1], job[0]), jobs, args.concurrency)
+        print_latency_report(f"{label} ({args.concurrency} concurrent, max {args.max_in_flight} in flight per tier)",
+                             latencies, elapsed, len(errors))
+        report = router.report()
+        print(f"   Cost: ${report['total_cost_usd']:.4f} (saved ${report['total_saved_usd']:.4f} "
+              f"versus the {report['baseline_tier']} tier)")
+        for route in report['routes']:
+            print(f"   {route['prompt_type']:>20} -> {route['tier']:<8} {route['calls']:4d} calls "
+                  f"({route['fallbacks']} fallbacks) | mean {route['latency_ms']['mean']:7.1f} ms "
+                  f"| p95 {route['latency_ms']['p95']:7.1f} ms | ${route['cost_usd']:.4f}")
+
+
+def _synthetic_jobs_frame(rows, seed):
+    """A JobSpy-shaped DataFrame with realistic gaps (missing salaries, locations, descriptions)."""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    titles = np.array(['Software Engineer', 'Data Scientist', 'Product Manager', 'Registered Nurse', 'Analyst'])
+    cities = np.array(['Austin', 'Boston', 'New York', 'Seattle', None], dtype=object)
+    low = np.where(rng.random(rows) < 0.4, np.nan, rng.integers(40, 160, rows) * 1000.0)
+    interval = rng.choice(np.array(['yearly', 'hourly', 'monthly', None], dtype=object), rows, p=[0.7, 0.2, 0.05, 0.05])
+    low = np.where(interval == 'hourly', low / 2000, low)
+    return pd.DataFrame({
+        'TITLE': rng.choice(titles, rows),
+        'COMPANY': [f"Company {i % 97}" for i in range(rows)],
+        'CITY': rng.choice(cities, rows),
+        'STATE': rng.choice(np.array(['TX', 'MA', 'NY', 'WA']), rows),
+        'MIN_AMOUNT': low,
+        'MAX_AMOUNT': np.where(rng.random(rows) < 0.2, np.nan, low * 1.3),
+        'INTERVAL': interval,
+        'DESCRIPTION': [("Build and operate services. " * (1 + i % 60)) if i % 11 else None for i in range(rows)],
+        'JOB_URL': [f"https://jobs.example/{i}" for i in range(rows)],
+        'DATE_POSTED': pd.Timestamp('2026-10-01').date(),
+        'JOB_TYPE': rng.choice(np.array(['fulltime', 'contract', None], dtype=object), rows),
+        'IS_REMOTE': rng.random(rows) < 0.3,
+    })
+
+
+def bench_frames(args):
+    """Row-by-row (iterrows) versus columnar conversion of JobSpy DataFrames to job dicts."""
+    from job_frames import DESCRIPTION_CHARS, format_salary, jobs_from_frame
+
+    def row_by_row(frame):
+        return [{
+            "title": row.get("TITLE", "N/A"),
+            "company": row.get("COMPANY", "N/A"),
+            "location": f"{row.get('CITY', '')}, {row.get('STATE', '')}".strip(", "),
+            "description": str(row.get("DESCRIPTION", "No description available"))[:DESCRIPTION_CHARS] + "...",
+            "salary": format_salary(row),
+            "url": row.get("JOB_URL", "#"),
+            "posted_date": str(row.get("DATE_POSTED", "N/A")),
+            "job_type": row.get("JOB_TYPE", "N/A"),
+            "is_remote": row.get("IS_REMOTE", False),
+            "site": "indeed",
+        } for _, row in frame.iterrows()]
+
+    for rows in args.rows:
+        frame = _synthetic_jobs_frame(rows, args.seed)
+        timings = {}
+        for label, convert in [('iterrows', row_by_row), ('columnar', lambda df: jobs_from_frame(df, 'indeed'))]:
+            runs = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                jobs = convert(frame)
+                runs.append((time.perf_counter() - started) * 1000)
+            assert len(jobs) == rows
+            timings[label] = statistics.median(runs)
+        print(f"📊 {rows:>6} rows: iterrows {timings['iterrows']:8.1f} ms | columnar {timings['columnar']:7.1f} ms "
+              f"({rows / timings['columnar'] * 1000:9.0f} rows/s) | {timings['iterrows'] / timings['columnar']:5.1f}x")
+
+
+def bench_vectors(args):
+    """Hashed-embedding encoding throughput and blocked top-k search versus a full sort, up to 1M postings."""
+    import os
+    import tempfile
+
+    import numpy as np
+    from job_frames import jobs_from_frame
+    from job_vectors import JobVectorStore, job_vectors, profile_vector
+
+    jobs = jobs_from_frame(_synthetic_jobs_frame(args.encode_rows, args.seed), 'indeed')
+    started = time.perf_counter()
+    job_vectors(jobs, args.dimensions)
+    elapsed = time.perf_counter() - started
+    print(f"📊 Encoding: {len(jobs) / elapsed:,.0f} postings/s ({args.dimensions} dims)")
+
+    rng = np.random.default_rng(args.seed)
+    query = profile_vector({'skills': ['Python', 'SQL'], 'desired_roles': ['Data Scientist']}, args.dimensions)
+    queries = rng.standard_normal((args.batch, args.dimensions)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        for postings in args.postings:
+            store = JobVectorStore(os.path.join(tmp, f'vectors_{postings}.f32'), args.dimensions, args.block_rows)
+
+            def batches():
+                # Random unit vectors, written in blocks so 1M rows never sit in memory at once
+                for start in range(0, postings, args.block_rows):
+                    block = rng.standard_normal((min(args.block_rows, postings - start), args.dimensions))
+                    block /= np.linalg.norm(block, axis=1, keepdims=True)
+                    yield np.arange(start, start + len(block)), block.astype(np.float32)
+
+            started = time.perf_counter()
+            store.write(batches())
+            build = time.perf_counter() - started
+            single, batched, full = [], [], []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                ids, _ = store.search(query, args.k)
+                single.append((time.perf_counter() - started) * 1000)
+                started = time.perf_counter()
+                store.search(queries, args.k)
+                batched.append((time.perf_counter() - started) * 1000 / args.batch)
+                if postings <= args.full_sort_max:
+                    started = time.perf_counter()
+                    matrix = np.asarray(store._matrix)
+                    expected = np.argsort(-(matrix @ query), kind='stable')[:args.k]
+                    full.append((time.perf_counter() - started) * 1000)
+                    assert set(store._ids[expected].tolist()) == set(ids.tolist())
+            line = (f"📊 {postings:>9,} postings: write {build:6.1f} s | top-{args.k} "
+                    f"{statistics.median(single):7.1f} ms/query | batch of {args.batch} "
+                    f"{statistics.median(batched):6.1f} ms/query")
+            if full:
+                line += f" | full sort {statistics.median(full):7.1f} ms/query"
+            print(line)
+            del store
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Career AI Agent offline benchmarks")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    llm = subparsers.add_parser('llm', help="LLM call path throughput and p99 with the fake provider")
+    llm.add_argument('--requests', type=int, default=200)
+    llm.add_argument('--concurrency', type=int, default=16)
+    llm.add_argument('--latency', choices=['fixed', 'lognormal', 'heavy_tail'], default='lognormal')
+    llm.add_argument('--latency-ms', type=float, default=50)
+    llm.add_argument('--error-rate', type=float, default=0.0)
+    llm.add_argument('--rate-limit-rate', type=float, default=0.0)
+    llm.add_argument('--duplicate-ratio', type=float, default=0.0,
+                     help="Fraction of requests repeating an earlier prompt (exercises single-flight)")
+    llm.add_argument('--seed', type=int, default=42)
+    llm.set_defaults(func=bench_llm)
+
+    templates = subparsers.add_parser('templates', help="Prompt prefix reuse and tokens saved by context caching")
+    templates.add_argument('--calls', type=int, default=50, help="Calls per template")
+    templates.add_argument('--latency-ms', type=float, default=0)
+    templates.set_defaults(func=bench_templates)
+
+    batch = subparsers.add_parser('batch', help="Batched multi-profile reports versus per-profile calls")
+    batch.add_argument('--profiles', type=int, default=200)
+    batch.add_argument('--batch-sizes', type=int, nargs='+', default=[4, 8, 16])
+    batch.add_argument('--concurrency', type=int, default=4, help="LLM calls in flight (provider rate limit)")
+    batch.add_argument('--latency-ms', type=float, default=300, help="Median time to first token")
+    batch.add_argument('--ms-per-token', type=float, default=0.5, help="Generation time per output token")
+    batch.add_argument('--seed', type=int, default=42)
+    batch.set_defaults(func=bench_batch)
+
+    route = subparsers.add_parser('route', help="Per-prompt-type model routing versus one large model")
+    route.add_argument('--requests', type=int, default=300)
+    route.add_argument('--concurrency', type=int, default=24)
+    route.add_argument('--max-in-flight', type=int, default=8, help="Per-tier load limit before falling back")
+    route.add_argument('--fast-ms', type=float, default=150)
+    route.add_argument('--standard-ms', type=float, default=500)
+    route.add_argument('--large-ms', type=float, default=1500)
+    route.add_argument('--ms-per-token', type=float, default=0.5)
+    route.add_argument('--seed', type=int, default=42)
+    route.set_defaults(func=bench_route)
+
+    frames = subparsers.add_parser('frames', help="JobSpy DataFrame to job dict conversion, iterrows versus columnar")
+    frames.add_argument('--rows', type=int, nargs='+', default=[50, 500, 2000, 10000])
+    frames.add_argument('--repeat', type=int, default=5, help="Runs per size (the median is reported)")
+    frames.add_argument('--seed', type=int, default=42)
+    frames.set_defaults(func=bench_frames)
+
+    vectors = subparsers.add_parser('vectors', help="Hashed-embedding job matching, blocked top-k versus a full sort")
+    vectors.add_argument('--postings', type=int, nargs='+', default=[10000, 100000, 1000000])
+    vectors.add_argument('--dimensions', type=int, default=512)
+    vectors.add_argument('--block-rows', type=int, default=65536)
+    vectors.add_argument('--k', type=int, default=10)
+    vectors.add_argument('--batch', type=int, default=32, help="Queries searched together")
+    vectors.add_argument('--encode-rows', type=int, default=2000, help="Synthetic postings encoded to time encoding")
+    vectors.add_argument('--full-sort-max', type=int, default=100000, help="Largest corpus also timed with a full sort")
+    vectors.add_argument('--repeat', type=int, default=5, help="Searches per size (the median is reported)")
+    vectors.add_argument('--seed', type=int, default=42)
+    vectors.set_defaults(func=bench_vectors)
+
+    replay = subparsers.add_parser('replay', help="Replay a recorded cassette (CASSETTE_MODE=record)")
+    replay.add_argument('cassette', help="Path to a .jsonl.gz cassette")
+    replay.add_argument('--speed', choices=['recorded', 'max'], default='max')
+    replay.add_argument('--concurrency', type=int, default=8)
+    replay.add_argument('--repeat', type=int, default=1)
+    replay.set_defaults(func=bench_replay)
+
+    return parser
+
+
+def main():
+    """Run the selected benchmark."""
+    args = build_parser().parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
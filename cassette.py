@@ -0,0 +1,236 @@
+"""
+Record/replay cassettes for Career AI Agent
+Records LLM prompts/responses and JobSpy DataFrames during a normal session
+and replays them deterministically for offline benchmarks
+"""
+
+import atexit
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+from config import Config
+from llm_provider import _response
+from llm_transport import accepts_request_options
+from llm_usage import set_cache_status
+
+CASSETTE_VERSION = 1
+
+
+class CassetteMiss(LookupError):
+    """A replayed session made a request that was never recorded."""
+
+
+def normalize_prompt(prompt):
+    """Collapse whitespace so re-indented prompt templates still match."""
+    return ' '.join(str(prompt).split())
+
+
+def _normalize_value(value):
+    if isinstance(value, str):
+        return ' '.join(value.split()).lower()
+    if isinstance(value, (list, tuple, set)):
+        items = [_normalize_value(item) for item in value]
+        return sorted(items, key=json.dumps) if isinstance(value, (list, set)) else items
+    if isinstance(value, dict):
+        return {str(key): _normalize_value(item) for key, item in value.items()}
+    return value
+
+
+def interaction_key(kind, prompt=None, params=None):
+    """Match key for one interaction: kind, normalized prompt and normalized parameters."""
+    payload = json.dumps([kind, normalize_prompt(prompt) if prompt is not None else None,
+                          _normalize_value(params or {})], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class Cassette:
+    """
+    On-disk recording of LLM and job-board traffic (gzip-compressed JSON lines).
+
+    In record mode every interaction is appended with its measured latency
+    and the file is rewritten every flush_every entries and at exit. In
+    replay mode interactions are looked up by interaction_key; repeated
+    requests replay their recordings in order (the last one repeats), and
+    replies are delayed by the recorded latency unless speed is 'max'.
+    """
+
+    def __init__(self, path, mode='off', speed='recorded', flush_every=20, sleep=time.sleep):
+        if mode not in ('off', 'record', 'replay'):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        if speed not in ('recorded', 'max'):
+            raise ValueError(f"Unknown replay speed: {speed}")
+        self.path = path
+        self.mode = mode
+        self.speed = speed
+        self.flush_every = flush_every
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._entries = []
+        self._by_key = defaultdict(list)
+        self._cursor = defaultdict(int)
+        self._unsaved = 0
+        self.stats = {'recorded': 0, 'replayed': 0, 'misses': 0}
+        if mode != 'off' and os.path.exists(path):
+            self._load()
+        if mode == 'replay' and not self._entries:
+            print(f"⚠️  Cassette {path} is empty; every replayed request will miss")
+        if mode == 'record':
+            atexit.register(self.save)
+
+    @classmethod
+    def from_config(cls):
+        return cls(Config.CASSETTE_PATH, Config.CASSETTE_MODE, Config.CASSETTE_REPLAY_SPEED)
+
+    @property
+    def recording(self):
+        return self.mode == 'record'
+
+    @property
+    def replaying(self):
+        return self.mode == 'replay'
+
+    def _load(self):
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                entry = json.loads(line)
+                if 'cassette' in entry:
+                    continue
+                self._entries.append(entry)
+                self._by_key[entry['key']].append(entry)
+
+    def save(self):
+        """Write all recorded interactions to disk."""
+        with self._lock:
+            if not self._unsaved:
+                return
+            entries = list(self._entries)
+            self._unsaved = 0
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+            f.write(json.dumps({'cassette': CASSETTE_VERSION, 'saved_at': time.time()}) + '\n')
+            for entry in entries:
+                f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        os.replace(temp_path, self.path)
+
+    def record(self, kind, key, latency, response, request=None):
+        """Append one interaction."""
+        entry = {'kind': kind, 'key': key, 'latency': round(latency, 4), 'response': response}
+        if request is not None:
+            entry['request'] = request
+        with self._lock:
+            self._entries.append(entry)
+            self._by_key[key].append(entry)
+            self._unsaved += 1
+            self.stats['recorded'] += 1
+            flush = self._unsaved >= self.flush_every
+        if flush:
+            self.save()
+
+    def replay(self, kind, key):
+        """
+        Return the recorded response for a key, after the recorded latency.
+
+        Raises:
+            CassetteMiss: If the interaction was never recorded
+        """
+        with self._lock:
+            recordings = self._by_key.get(key)
+            if not recordings:
+                self.stats['misses'] += 1
+                raise CassetteMiss(f"No recorded {kind} interaction matches this request")
+            index = self._cursor[key]
+            self._cursor[key] = index + 1
+            entry = recordings[min(index, len(recordings) - 1)]
+            self.stats['replayed'] += 1
+        if self.speed == 'recorded' and entry['latency'] > 0:
+            self.sleep(entry['latency'])
+        return entry['response']
+
+    def provider(self, factory):
+        """
+        Wrap the provider built by factory() for the current mode.
+
+        Replay never calls factory, so no API key or SDK is needed offline.
+        """
+        if self.mode == 'off':
+            return factory()
+        return CassetteProvider(self, None if self.replaying else factory())
+
+    def scraper(self, scrape_fn):
+        """Wrap a JobSpy-style scrape_jobs(**params) -> DataFrame function."""
+        if self.mode == 'off':
+            return scrape_fn
+
+        def scrape(**params):
+            import pandas as pd
+
+            key = interaction_key('jobspy', params=params)
+            if self.replaying:
+                return pd.read_json(io.StringIO(self.replay('jobspy', key)), orient='split',
+                                    dtype=False, convert_dates=False)
+            started = time.perf_counter()
+            jobs_df = scrape_fn(**params)
+            self.record('jobspy', key, time.perf_counter() - started,
+                        jobs_df.to_json(orient='split', date_format='iso', index=False),
+                        request=_normalize_value(params))
+            return jobs_df
+
+        return scrape
+
+    def entries(self, kind=None):
+        """Recorded interactions, optionally only one kind ('llm' or 'jobspy')."""
+        with self._lock:
+            return [entry for entry in self._entries if kind is None or entry['kind'] == kind]
+
+    def summary(self):
+        """Mode, path, entry count and record/replay counters (for /health)."""
+        return {'mode': self.mode, 'path': self.path, 'speed': self.speed,
+                'entries': len(self._entries), **self.stats}
+
+
+class CassetteProvider:
+    """Gemini-style provider that records to or replays from a cassette."""
+
+    def __init__(self, cassette, inner=None):
+        self.cassette = cassette
+        self.inner = inner
+        self.model_name = getattr(inner, 'model_name', None) or 'cassette-replay'
+
+    def generate_content(self, prompt, generation_config=None, request_options=None):
+        key = interaction_key('llm', prompt, generation_config)
+        if self.cassette.replaying:
+            recorded = self.cassette.replay('llm', key)
+            set_cache_status('replay')
+            return _response(recorded['text'], recorded.get('model_name', self.model_name),
+                             recorded.get('input_tokens'), recorded.get('output_tokens'))
+
+        kwargs = {}
+        if generation_config is not None:
+            kwargs['generation_config'] = generation_config
+        if request_options is not None and accepts_request_options(self.inner):
+            kwargs['request_options'] = request_options
+        started = time.perf_counter()
+        response = self.inner.generate_content(prompt, **kwargs)
+        latency = time.perf_counter() - started
+
+        usage = getattr(response, 'usage_metadata', None)
+        self.cassette.record('llm', key, latency, {
+            'text': response.text,
+            'model_name': self.model_name,
+            'input_tokens': getattr(usage, 'prompt_token_count', None),
+            'output_tokens': getattr(usage, 'candidates_token_count', None),
+        }, request={'prompt': normalize_prompt(prompt), 'generation_config': generation_config})
+        return response
+
+
+# Shared cassette used by the app, the Streamlit UI and benchmarks
+cassette = Cassette.from_config()
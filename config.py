@@ -12,9 +12,37 @@ load_dotenv()
 class Config:
     """Configuration class for the Career AI Agent application."""
     
+    # LLM Provider Configuration (gemini, openai or fake)
+    LLM_PROVIDER = os.getenv('LLM_PROVIDER', 'gemini').lower()
+    
     # Google AI Configuration
     GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
-    GOOGLE_MODEL = os.getenv('GOOGLE_MODEL', 'gemini-pro')
+    GOOGLE_MODEL = os.getenv('GOOGLE_MODEL', 'gemini-2.5-flash')
+    
+    # OpenAI Configuration
+    OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+    OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo')
+    
+    # Fake LLM Configuration (offline load tests and benchmarks)
+    FAKE_LLM_LATENCY = os.getenv('FAKE_LLM_LATENCY', 'lognormal')  # fixed, lognormal or heavy_tail
+    FAKE_LLM_LATENCY_MS = float(os.getenv('FAKE_LLM_LATENCY_MS', '800'))
+    FAKE_LLM_SIGMA = float(os.getenv('FAKE_LLM_SIGMA', '0.5'))
+    FAKE_LLM_ERROR_RATE = float(os.getenv('FAKE_LLM_ERROR_RATE', '0'))
+    FAKE_LLM_RATE_LIMIT_RATE = float(os.getenv('FAKE_LLM_RATE_LIMIT_RATE', '0'))
+    FAKE_LLM_SEED = int(os.getenv('FAKE_LLM_SEED', '42'))
+    
+    # Model Routing: each prompt type goes to a fast, standard or large tier (see model_router.py)
+    LLM_ROUTING = os.getenv('LLM_ROUTING', 'False').lower() == 'true'
+    LLM_FAST_MODEL = os.getenv('LLM_FAST_MODEL', '')  # empty: GOOGLE_MODEL / OPENAI_MODEL
+    LLM_STANDARD_MODEL = os.getenv('LLM_STANDARD_MODEL', '')
+    LLM_LARGE_MODEL = os.getenv('LLM_LARGE_MODEL', '')
+    LLM_ROUTES = os.getenv('LLM_ROUTES', '')  # overrides, e.g. "intelligence_report:fast,career_pathway:large"
+    LLM_MODEL_PRICES = os.getenv('LLM_MODEL_PRICES', '')  # USD per million input/output tokens, e.g. "my-model:0.5/1.5"
+    
+    # Record/Replay Cassette Configuration (off, record or replay)
+    CASSETTE_MODE = os.getenv('CASSETTE_MODE', 'off').lower()
+    CASSETTE_PATH = os.getenv('CASSETTE_PATH', 'cassettes/session.jsonl.gz')
+    CASSETTE_REPLAY_SPEED = os.getenv('CASSETTE_REPLAY_SPEED', 'recorded').lower()  # recorded or max
     
     # Flask Configuration
     SECRET_KEY = os.getenv('SECRET_KEY', 'your-secret-key-change-this-in-production')
@@ -26,10 +54,122 @@ class Config:
     # API Configuration
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     
+    # Prompt Budget Configuration
+    PROMPT_INPUT_TOKEN_BUDGET = int(os.getenv('PROMPT_INPUT_TOKEN_BUDGET', '3000'))
+    DEFAULT_MAX_OUTPUT_TOKENS = int(os.getenv('DEFAULT_MAX_OUTPUT_TOKENS', '2048'))
+    
+    # Prompt Template Context Caching (lifetime of provider-side prefix caches)
+    PROMPT_CACHE_TTL_SECONDS = int(os.getenv('PROMPT_CACHE_TTL_SECONDS', '3600'))
+    
+    # Single-flight Configuration (set a path to coalesce LLM calls across processes)
+    SINGLE_FLIGHT_DB = os.getenv('SINGLE_FLIGHT_DB')
+    SINGLE_FLIGHT_LEASE_SECONDS = int(os.getenv('SINGLE_FLIGHT_LEASE_SECONDS', '120'))
+    
+    # LLM Transport Configuration
+    LLM_REQUEST_DEADLINE_SECONDS = float(os.getenv('LLM_REQUEST_DEADLINE_SECONDS', '30'))
+    LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', '2'))
+    LLM_RETRY_BASE_DELAY = float(os.getenv('LLM_RETRY_BASE_DELAY', '0.5'))
+    LLM_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('LLM_CIRCUIT_FAILURE_THRESHOLD', '5'))
+    LLM_CIRCUIT_RESET_SECONDS = float(os.getenv('LLM_CIRCUIT_RESET_SECONDS', '30'))
+    LLM_HEDGE_AFTER_SECONDS = float(os.getenv('LLM_HEDGE_AFTER_SECONDS', '0')) or None  # 0 disables hedging
+    # LLM calls running at once, including ones abandoned at their deadline; more fail fast
+    LLM_MAX_IN_FLIGHT = int(os.getenv('LLM_MAX_IN_FLIGHT', '16'))
+    
+    # LLM Usage Accounting (compact JSON-lines log per call; empty disables the log)
+    LLM_USAGE_LOG = os.getenv('LLM_USAGE_LOG', 'llm_usage.jsonl')
+    
+    # Background Job Queue Configuration
+    JOB_QUEUE_DB = os.getenv('JOB_QUEUE_DB', 'career_jobs.db')
+    JOB_QUEUE_WORKERS = int(os.getenv('JOB_QUEUE_WORKERS', '2'))
+    JOB_QUEUE_LOW_PRIORITY_MAX_CONCURRENCY = int(os.getenv('JOB_QUEUE_LOW_PRIORITY_MAX_CONCURRENCY', '1'))
+    JOB_RETENTION_SECONDS = int(os.getenv('JOB_RETENTION_SECONDS', '86400'))
+    JOB_LLM_DEADLINE_SECONDS = float(os.getenv('JOB_LLM_DEADLINE_SECONDS', '120'))
+    
+    # Speculative Prefetch Configuration (off, all, or comma separated stages: intelligence,recommendations)
+    PREFETCH_POLICY = os.getenv('PREFETCH_POLICY', 'all')
+    PREFETCH_TTL_SECONDS = int(os.getenv('PREFETCH_TTL_SECONDS', '600'))
+    PREFETCH_MAX_ENTRIES = int(os.getenv('PREFETCH_MAX_ENTRIES', '500'))
+    PREFETCH_MAX_IN_FLIGHT = int(os.getenv('PREFETCH_MAX_IN_FLIGHT', '8'))
+    PREFETCH_WORKERS = int(os.getenv('PREFETCH_WORKERS', '4'))
+    
+    # Latency SLOs (endpoint:seconds; past the SLO a provisional local report is served and upgraded in the background)
+    LATENCY_SLO_SECONDS = os.getenv('LATENCY_SLO_SECONDS', 'get_career_intelligence:8,get_upskilling_plan:8')
+    LATENCY_SLO_WORKERS = int(os.getenv('LATENCY_SLO_WORKERS', '16'))
+    
+    # Job Search Fan-out (title searches for job recommendations share one deadline)
+    JOB_SEARCH_WORKERS = int(os.getenv('JOB_SEARCH_WORKERS', '6'))
+    JOB_SEARCH_DEADLINE_SECONDS = float(os.getenv('JOB_SEARCH_DEADLINE_SECONDS', '25'))
+    
+    # Job Boards (one concurrent scrape per board, each with its own timeout)
+    JOB_SITES = os.getenv('JOB_SITES', 'indeed,linkedin,zip_recruiter')
+    JOB_SITE_WORKERS = int(os.getenv('JOB_SITE_WORKERS', '9'))
+    JOB_SITE_TIMEOUT_SECONDS = float(os.getenv('JOB_SITE_TIMEOUT_SECONDS', '20'))
+    JOB_SITE_TIMEOUTS = os.getenv('JOB_SITE_TIMEOUTS', '')  # per-board overrides, e.g. "linkedin:30"
+    
+    # Job Search Cache (memory, sqlite or off); stale results are served for JOB_CACHE_STALE_SECONDS while refreshing
+    JOB_CACHE_BACKEND = os.getenv('JOB_CACHE_BACKEND', 'memory').lower()
+    JOB_CACHE_DB = os.getenv('JOB_CACHE_DB', 'job_cache.db')
+    JOB_CACHE_TTL_SECONDS = float(os.getenv('JOB_CACHE_TTL_SECONDS', '900'))
+    JOB_CACHE_STALE_SECONDS = float(os.getenv('JOB_CACHE_STALE_SECONDS', '3600'))
+    JOB_CACHE_MAX_ENTRIES = int(os.getenv('JOB_CACHE_MAX_ENTRIES', '1000'))
+    
+    # Local Job Index (SQLite FTS5; empty JOB_INDEX_DB disables it). JOB_INDEX_TOPUP: auto, always or never
+    JOB_INDEX_DB = os.getenv('JOB_INDEX_DB', 'job_index.db')
+    JOB_INDEX_TOPUP = os.getenv('JOB_INDEX_TOPUP', 'auto').lower()
+    JOB_INDEX_CRAWL_MINUTES = float(os.getenv('JOB_INDEX_CRAWL_MINUTES', '0'))  # 0: no crawler in the app
+    JOB_INDEX_RESULTS_PER_SITE = int(os.getenv('JOB_INDEX_RESULTS_PER_SITE', '50'))
+    JOB_INDEX_RETENTION_DAYS = float(os.getenv('JOB_INDEX_RETENTION_DAYS', '30'))
+    JOB_INDEX_MAINTENANCE_MINUTES = float(os.getenv('JOB_INDEX_MAINTENANCE_MINUTES', '60'))  # purge + dedupe
+    JOB_INDEX_MAX_QUERIES = int(os.getenv('JOB_INDEX_MAX_QUERIES', '50'))
+    JOB_INDEX_QUERIES = os.getenv(
+        'JOB_INDEX_QUERIES',
+        'Software Engineer,Data Scientist,Product Manager,Financial Analyst,Registered Nurse,Marketing Manager'
+    )
+    
+    # Hashed-embedding job matching over the job index (float32 memmap; empty JOB_VECTORS_PATH disables it)
+    JOB_VECTORS_PATH = os.getenv('JOB_VECTORS_PATH', 'job_vectors.f32')
+    JOB_VECTOR_DIMENSIONS = int(os.getenv('JOB_VECTOR_DIMENSIONS', '512'))
+    JOB_VECTOR_BLOCK_ROWS = int(os.getenv('JOB_VECTOR_BLOCK_ROWS', '65536'))
+    
+    # Job Search Result Sets (paged with cursors; kept in JOB_CACHE_DB when JOB_CACHE_BACKEND=sqlite)
+    JOB_RESULT_SET_SIZE = int(os.getenv('JOB_RESULT_SET_SIZE', '100'))
+    JOB_RESULT_SET_TTL_SECONDS = float(os.getenv('JOB_RESULT_SET_TTL_SECONDS', '1800'))
+    JOB_RESULT_SET_MAX_ENTRIES = int(os.getenv('JOB_RESULT_SET_MAX_ENTRIES', '1000'))
+    JOB_PAGE_SIZE = int(os.getenv('JOB_PAGE_SIZE', '10'))
+    JOB_MAX_PAGE_SIZE = int(os.getenv('JOB_MAX_PAGE_SIZE', '50'))
+    # Postings a /search_jobs live scrape asks each board for (at least the page size)
+    JOB_SCRAPE_SIZE = int(os.getenv('JOB_SCRAPE_SIZE', '10'))
+    
+    # Postings fetched per recommended title before the most relevant two are kept
+    JOB_RECOMMENDATION_CANDIDATES = int(os.getenv('JOB_RECOMMENDATION_CANDIDATES', '5'))
+    
+    # Market Intelligence Precompute Configuration
+    MARKET_INTEL_DB = os.getenv('MARKET_INTEL_DB', 'market_intelligence.db')
+    MARKET_INTEL_MAX_AGE_HOURS = float(os.getenv('MARKET_INTEL_MAX_AGE_HOURS', '24'))
+    MARKET_INTEL_REFRESH_MINUTES = float(os.getenv('MARKET_INTEL_REFRESH_MINUTES', '60'))
+    MARKET_INTEL_PAIRS = os.getenv(
+        'MARKET_INTEL_PAIRS',
+        'Technology:Software Engineer,Technology:Data Scientist,Technology:Product Manager,'
+        'Finance:Financial Analyst,Healthcare:Registered Nurse,Marketing:Marketing Manager'
+    )
+    
     @staticmethod
     def validate_config():
         """Validate that required configuration is present."""
-        if not Config.GOOGLE_API_KEY:
+        if Config.JOB_CACHE_BACKEND not in ('memory', 'sqlite', 'off'):
+            raise ValueError(f"Unknown JOB_CACHE_BACKEND '{Config.JOB_CACHE_BACKEND}'. Use memory, sqlite or off.")
+        if Config.JOB_INDEX_TOPUP not in ('auto', 'always', 'never'):
+            raise ValueError(f"Unknown JOB_INDEX_TOPUP '{Config.JOB_INDEX_TOPUP}'. Use auto, always or never.")
+        if Config.CASSETTE_MODE not in ('off', 'record', 'replay'):
+            raise ValueError(f"Unknown CASSETTE_MODE '{Config.CASSETTE_MODE}'. Use off, record or replay.")
+        if Config.CASSETTE_MODE == 'replay':
+            # Replayed sessions never reach a real provider
+            return True
+        if Config.LLM_PROVIDER == 'gemini' and not Config.GOOGLE_API_KEY:
             raise ValueError("GOOGLE_API_KEY is required. Please set it in your .env file.")
+        if Config.LLM_PROVIDER == 'openai' and not Config.OPENAI_API_KEY:
+            raise ValueError("OPENAI_API_KEY is required when LLM_PROVIDER=openai.")
+        if Config.LLM_PROVIDER not in ('gemini', 'openai', 'fake'):
+            raise ValueError(f"Unknown LLM_PROVIDER '{Config.LLM_PROVIDER}'. Use gemini, openai or fake.")
         
         return True
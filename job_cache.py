@@ -0,0 +1,264 @@
+"""
+Job search result cache for Career AI Agent
+TTL cache keyed by the normalized search, with stale-while-revalidate
+refreshes and single-flight stampede protection, in memory or SQLite
+"""
+
+import copy
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+
+from config import Config
+from single_flight import SingleFlight, flight_key
+
+
+def _normalize(value):
+    return ' '.join(str(value or '').lower().split())
+
+
+def search_key(search_term, location=None, sites=(), hours_old=None):
+    """
+    Cache key of a job search.
+
+    search_term must already include the industry expansion; case,
+    whitespace and board order don't matter.
+    """
+    return flight_key('job_search', _normalize(search_term), _normalize(location),
+                      sorted(_normalize(site) for site in sites), hours_old)
+
+
+def _json_default(value):
+    # numpy / pandas scalars from JobSpy DataFrames
+    return value.item() if hasattr(value, 'item') else str(value)
+
+
+class MemoryBackend:
+    """LRU dict of key -> (value, stored_at)."""
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, value, stored_at):
+        with self._lock:
+            self._entries[key] = (value, stored_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def purge(self, older_than):
+        with self._lock:
+            for key in [key for key, (_, stored_at) in self._entries.items() if stored_at < older_than]:
+                del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """Key -> JSON value table, shared by every process using the same file."""
+
+    def __init__(self, db_path, max_entries=1000, table='job_search_cache'):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.table = table
+        with closing(self._connect()) as conn:
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    stored_at REAL NOT NULL
+                )
+            """)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def get(self, key):
+        with closing(self._connect()) as conn:
+            row = conn.execute(f"SELECT value, stored_at FROM {self.table} WHERE key = ?", (key,)).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def set(self, key, value, stored_at):
+        with closing(self._connect()) as conn:
+            conn.execute(f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?)",
+                         (key, json.dumps(value, default=_json_default), stored_at))
+            conn.execute(f"""
+                DELETE FROM {self.table} WHERE key NOT IN (
+                    SELECT key FROM {self.table} ORDER BY stored_at DESC LIMIT ?
+                )
+            """, (self.max_entries,))
+
+    def purge(self, older_than):
+        with closing(self._connect()) as conn:
+            conn.execute(f"DELETE FROM {self.table} WHERE stored_at < ?", (older_than,))
+
+    def __len__(self):
+        with closing(self._connect()) as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+class JobSearchCache:
+    """
+    Serves job searches from a backend for ttl_seconds.
+
+    For stale_seconds after that, the old results are still returned while
+    one background refresh runs (stale-while-revalidate). Concurrent misses
+    for the same key share one scrape. lookup() serves the same way but
+    leaves a miss to the caller (e.g. a streamed scrape, stored with put()).
+    """
+
+    def __init__(self, backend, ttl_seconds=900, stale_seconds=3600, refresh_workers=2):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self._flights = SingleFlight()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix='job-cache')
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'shared': 0, 'refreshes': 0, 'refresh_errors': 0}
+
+    @classmethod
+    def from_config(cls):
+        """Cache configured by JOB_CACHE_* (None when JOB_CACHE_BACKEND=off)."""
+        backend = Config.JOB_CACHE_BACKEND
+        if backend == 'off':
+            return None
+        if backend == 'sqlite':
+            store = SQLiteBackend(Config.JOB_CACHE_DB, Config.JOB_CACHE_MAX_ENTRIES)
+        else:
+            store = MemoryBackend(Config.JOB_CACHE_MAX_ENTRIES)
+        return cls(store, Config.JOB_CACHE_TTL_SECONDS, Config.JOB_CACHE_STALE_SECONDS)
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _fetch(self, key, fetch, store_if):
+        """Fetch once per key across concurrent callers; returns (value, True if this caller fetched)."""
+        fetched = []
+
+        def run():
+            fetched.append(True)
+            value = fetch()
+            if store_if is None or store_if(value):
+                self.backend.set(key, value, time.time())
+                self.purge_expired()
+            return value
+
+        value = self._flights.do(key, run)
+        return value, bool(fetched)
+
+    def _refresh(self, key, fetch, store_if):
+        try:
+            self._fetch(key, fetch, store_if)
+            self._count('refreshes')
+        except Exception as e:
+            self._count('refresh_errors')
+            print(f"⚠️  Background job search refresh failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _cached(self, key, fetch, accept, store_if):
+        """(value, 'hit' | 'stale') from the backend, starting one refresh for a stale value; None on a miss."""
+        entry = self.backend.get(key)
+        if entry is None or (accept is not None and not accept(entry[0])):
+            return None
+        value, stored_at = entry
+        age = time.time() - stored_at
+        if age < self.ttl_seconds:
+            self._count('hits')
+            return copy.deepcopy(value), 'hit'
+        if age < self.ttl_seconds + self.stale_seconds:
+            self._count('stale_hits')
+            with self._lock:
+                start = fetch is not None and key not in self._refreshing
+                if start:
+                    self._refreshing.add(key)
+            if start:
+                self._executor.submit(self._refresh, key, fetch, store_if)
+            return copy.deepcopy(value), 'stale'
+        return None
+
+    def lookup(self, key, fetch=None, accept=None, store_if=None):
+        """
+        Cached value for key, without fetching on a miss.
+
+        A stale value is served while fetch() refreshes it in the background
+        (when given), and a miss while another caller is fetching key waits
+        for that fetch instead of starting a second one.
+
+        Args:
+            key (str): See search_key
+            fetch, accept, store_if: As for get_or_fetch
+
+        Returns:
+            tuple: (value, status) with status hit, stale or shared, or (None, 'miss')
+        """
+        cached = self._cached(key, fetch, accept, store_if)
+        if cached is not None:
+            return cached
+        try:
+            value = self._flights.wait(key)
+        except Exception:
+            value = None
+        if value is not None and (accept is None or accept(value)):
+            self._count('shared')
+            return copy.deepcopy(value), 'shared'
+        self._count('misses')
+        return None, 'miss'
+
+    def get_or_fetch(self, key, fetch, accept=None, store_if=None):
+        """
+        Cached value for key, or fetch() it.
+
+        Args:
+            key (str): See search_key
+            fetch (callable): Scrapes and returns a JSON-serialisable value
+            accept (callable): accept(value) -> False treats a cached value as a miss
+            store_if (callable): store_if(value) -> False keeps a fetched value out of the cache
+
+        Returns:
+            tuple: (value, status) with status hit, stale, miss or shared
+        """
+        cached = self._cached(key, fetch, accept, store_if)
+        if cached is not None:
+            return cached
+
+        value, fetched = self._fetch(key, fetch, store_if)
+        self._count('misses' if fetched else 'shared')
+        # Cached and shared values must stay intact whatever callers do with theirs
+        return copy.deepcopy(value), 'miss' if fetched else 'shared'
+
+    def put(self, key, value):
+        """Store a value fetched outside get_or_fetch (e.g. by a streamed search after a lookup miss)."""
+        self.backend.set(key, value, time.time())
+        self.purge_expired()
+
+    def purge_expired(self):
+        """Drop entries too old to be served even as stale."""
+        self.backend.purge(time.time() - self.ttl_seconds - self.stale_seconds)
+
+    def summary(self):
+        """Counters, hit rate and size (for /health)."""
+        with self._lock:
+            stats = dict(self.stats)
+        served = stats['hits'] + stats['stale_hits'] + stats['misses'] + stats['shared']
+        return dict(stats, entries=len(self.backend), ttl_seconds=self.ttl_seconds,
+                    hit_rate=(stats['hits'] + stats['stale_hits'] + stats['shared']) / served if served else 0.0)
@@ -0,0 +1,233 @@
+"""
+Cross-board job deduplication for Career AI Agent
+The same posting scraped from several boards is detected with normalized
+title/company keys plus SimHash over the description, using banded LSH
+so candidates are found in near-linear time
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+
+FINGERPRINT_BITS = 64
+SHINGLE_WORDS = 3
+
+# 8 bands of 8 bits: fingerprints within 7 bits of each other share at least one band
+LSH_BANDS = 8
+BAND_BITS = FINGERPRINT_BITS // LSH_BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+# Max Hamming distance between description fingerprints of the same posting
+MAX_DISTANCE = 6
+
+# Looser limit when title and company keys match exactly (boards trim descriptions differently)
+SAME_KEY_MAX_DISTANCE = 12
+
+# Title word overlap (Jaccard) needed when only the descriptions match
+MIN_TITLE_OVERLAP = 0.5
+
+COMPANY_SUFFIXES = {'inc', 'incorporated', 'llc', 'ltd', 'limited', 'corp', 'corporation', 'co', 'company',
+                    'plc', 'gmbh', 'lp', 'llp', 'the'}
+TITLE_ABBREVIATIONS = {'sr': 'senior', 'jr': 'junior', 'eng': 'engineer', 'engr': 'engineer', 'mgr': 'manager',
+                       'dev': 'developer', 'swe': 'software engineer', 'rn': 'registered nurse', 'ii': '2', 'iii': '3'}
+
+# Values that don't count as information when picking the richest copy
+PLACEHOLDERS = {'', 'N/A', '#', 'nan', 'Salary not specified', 'No description available...'}
+
+_BITS = np.arange(FINGERPRINT_BITS, dtype=np.uint64)
+
+
+def _words(text):
+    return re.findall(r'[a-z0-9]+', str(text or '').lower())
+
+
+def normalize_title(title):
+    """Title key: lower case, punctuation dropped, common abbreviations expanded."""
+    return ' '.join(TITLE_ABBREVIATIONS.get(word, word) for word in _words(title))
+
+
+def normalize_company(company):
+    """Company key: lower case, punctuation and legal suffixes (Inc, LLC, ...) dropped."""
+    return ' '.join(word for word in _words(company) if word not in COMPANY_SUFFIXES)
+
+
+@lru_cache(maxsize=200000)
+def _word_hash(word):
+    # Stable across processes (fingerprints are stored in the job index)
+    return int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def simhash(text):
+    """64-bit SimHash of the word 3-shingles of text (0 for empty text)."""
+    words = _words(text)
+    if not words:
+        return 0
+    hashes = np.array([_word_hash(word) for word in words], dtype=np.uint64)
+    if len(hashes) >= SHINGLE_WORDS:
+        # Mix consecutive word hashes into one hash per shingle
+        shingles = hashes[:1 - SHINGLE_WORDS].copy()
+        for offset in range(1, SHINGLE_WORDS):
+            following = hashes[offset:len(hashes) - SHINGLE_WORDS + 1 + offset]
+            shingles = (shingles * np.uint64(0x100000001B3)) ^ ((following << np.uint64(offset * 7)) |
+                                                                (following >> np.uint64(64 - offset * 7)))
+        hashes = shingles
+    votes = ((hashes[:, None] >> _BITS) & np.uint64(1)).sum(axis=0)
+    bits = (votes * 2 > len(hashes)).astype(np.uint64) << _BITS
+    return int(np.bitwise_or.reduce(bits))
+
+
+def hamming(a, b):
+    """Number of differing bits between two fingerprints."""
+    return bin(a ^ b).count('1')
+
+
+def richness(job, description_length=None):
+    """
+    How much a copy tells about the posting: filled-in fields, then
+    description length (description_length when only the length is known).
+    """
+    if description_length is None:
+        description_length = len(str(job.get('description') or ''))
+    filled = sum(1 for key, value in job.items()
+                 if key != 'simhash' and value is not None and value is not False and str(value) not in PLACEHOLDERS)
+    return filled + min(description_length, 10000) / 10001
+
+
+def _locations_compatible(a, b):
+    # Word sets; "Austin" matches "Austin, TX"
+    return not a or not b or a <= b or b <= a
+
+
+def find_duplicates(records, max_distance=MAX_DISTANCE):
+    """
+    Group copies of the same posting.
+
+    Candidates share a URL, a (title, company) key, or a SimHash band
+    within the same company. Other than same-URL copies, they are
+    confirmed when companies match, locations are compatible and either
+    the keys match (descriptions within SAME_KEY_MAX_DISTANCE bits, or
+    missing) or the descriptions are within max_distance bits and the
+    titles overlap.
+
+    Args:
+        records (list): Dicts with title, company, location, description and
+            url; a precomputed 'simhash' is used instead of the description
+
+    Returns:
+        list: Clusters of record positions (only groups of two or more), each
+        in input order
+    """
+    keys, fingerprints, companies, titles, locations = [], [], [], [], []
+    buckets = defaultdict(list)
+    for position, record in enumerate(records):
+        title, company = normalize_title(record.get('title')), normalize_company(record.get('company'))
+        fingerprint = record['simhash'] if record.get('simhash') is not None else simhash(record.get('description'))
+        keys.append((title, company))
+        fingerprints.append(fingerprint)
+        companies.append(company)
+        titles.append(set(title.split()))
+        locations.append(set(_words(record.get('location'))))
+        url = record.get('url')
+        if url and url != '#':
+            buckets[('url', url)].append(position)
+        if title and company:
+            buckets[('key', title, company)].append(position)
+        if fingerprint:
+            for band in range(LSH_BANDS):
+                buckets[('band', band, (fingerprint >> (band * BAND_BITS)) & BAND_MASK, company)].append(position)
+
+    parent = list(range(len(records)))
+
+    def find(position):
+        while parent[position] != position:
+            parent[position] = parent[parent[position]]
+            position = parent[position]
+        return position
+
+    def duplicates(a, b):
+        if records[a].get('url') and records[a].get('url') == records[b].get('url') != '#':
+            return True
+        if companies[a] != companies[b]:
+            return False
+        distance = hamming(fingerprints[a], fingerprints[b]) if fingerprints[a] and fingerprints[b] else None
+        if keys[a] == keys[b] and companies[a]:
+            similar = distance is None or distance <= SAME_KEY_MAX_DISTANCE
+        else:
+            overlap = len(titles[a] & titles[b]) / max(len(titles[a] | titles[b]), 1)
+            similar = distance is not None and distance <= max_distance and overlap >= MIN_TITLE_OVERLAP
+        return similar and _locations_compatible(locations[a], locations[b])
+
+    for members in buckets.values():
+        for i, a in enumerate(members):
+            for b in members[i + 1:]:
+                root_a, root_b = find(a), find(b)
+                if root_a != root_b and duplicates(a, b):
+                    parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    clusters = defaultdict(list)
+    for position in range(len(records)):
+        clusters[find(position)].append(position)
+    return [members for members in clusters.values() if len(members) > 1]
+
+
+def dedupe_jobs(jobs, max_distance=MAX_DISTANCE):
+    """
+    Collapse copies of the same posting into one job dict.
+
+    The richest copy is kept at the position of the first copy, with the
+    other copies' boards and URLs in alternate_urls ([{site, url}]).
+    Jobs without duplicates are returned as they are.
+    """
+    replacements, dropped = {}, set()
+    for members in find_duplicates(jobs, max_distance):
+        best = max(members, key=lambda position: (richness(jobs[position]), -position))
+        alternates = list(jobs[best].get('alternate_urls') or [])
+        for position in members:
+            if position == best:
+                continue
+            copy = jobs[position]
+            alternates.append({'site': copy.get('site'), 'url': copy.get('url')})
+            alternates.extend(copy.get('alternate_urls') or [])
+        seen = {jobs[best].get('url')}
+        unique = [alternate for alternate in alternates
+                  if alternate['url'] not in seen and not seen.add(alternate['url'])]
+        replacements[members[0]] = dict(jobs[best], alternate_urls=unique)
+        dropped.update(members[1:])
+    return [replacements.get(position, job) for position, job in enumerate(jobs) if position not in dropped]
+
+
+def dedupe_against(sent, jobs, max_distance=MAX_DISTANCE):
+    """
+    Deduplicate a new batch of jobs against jobs already sent (streamed results).
+
+    Sent jobs can't change any more, so batch copies of a sent posting are
+    dropped and reported as its alternates instead; copies within the batch
+    are collapsed as in dedupe_jobs.
+
+    Returns:
+        tuple: (new jobs to send, {url of a sent job: [{site, url}] alternates})
+    """
+    jobs = dedupe_jobs(jobs, max_distance)
+    if not sent or not jobs:
+        return jobs, {}
+    combined = list(sent) + jobs
+    dropped, alternates = set(), defaultdict(list)
+    for members in find_duplicates(combined, max_distance):
+        kept = combined[members[0]]
+        if members[0] >= len(sent):
+            continue
+        seen = {kept.get('url')} | {alternate['url'] for alternate in kept.get('alternate_urls') or []}
+        for position in members[1:]:
+            if position < len(sent):
+                continue
+            dropped.add(position)
+            copy = combined[position]
+            for alternate in [{'site': copy.get('site'), 'url': copy.get('url')}] + list(copy.get('alternate_urls') or []):
+                if alternate['url'] not in seen:
+                    seen.add(alternate['url'])
+                    alternates[kept.get('url')].append(alternate)
+    new = [job for position, job in enumerate(combined) if position >= len(sent) and position not in dropped]
+    return new, dict(alternates)
@@ -0,0 +1,115 @@
+"""
+JobSpy DataFrame conversion for Career AI Agent
+Turns scraped or indexed postings into API job dicts column by column
+instead of row by row
+"""
+
+import numpy as np
+import pandas as pd
+
+DESCRIPTION_CHARS = 500
+
+# JobSpy columns a job dict is built from
+COLUMNS = ['TITLE', 'COMPANY', 'CITY', 'STATE', 'DESCRIPTION', 'MIN_AMOUNT', 'MAX_AMOUNT', 'INTERVAL',
+           'JOB_URL', 'DATE_POSTED', 'JOB_TYPE', 'IS_REMOTE']
+
+
+def _amount(value):
+    return f"{value:,.0f}" if round(value, 2) == round(value) else f"{value:,.2f}"
+
+
+def format_salary(row):
+    """Format salary information from one JobSpy row (see format_salaries)."""
+    min_amount = row.get("MIN_AMOUNT")
+    max_amount = row.get("MAX_AMOUNT")
+    interval = row.get("INTERVAL")
+    interval = interval if isinstance(interval, str) else "yearly"
+    unit = "/hr" if interval == "hourly" else ""
+    suffix = "" if interval in ("yearly", "hourly") else f" ({interval})"
+
+    if not pd.isna(min_amount) and min_amount:
+        if not pd.isna(max_amount) and max_amount:
+            return f"${_amount(min_amount)}{unit} - ${_amount(max_amount)}{unit}{suffix}"
+        return f"${_amount(min_amount)}{unit}+{suffix}"
+    return "Salary not specified"
+
+
+def _numbers(values):
+    """Float array with 0 for missing or unparsable values."""
+    return np.nan_to_num(pd.to_numeric(values, errors='coerce').astype('float64'), nan=0.0)
+
+
+def _amounts(amounts):
+    """Salary amounts as text, each distinct amount formatted once."""
+    distinct, positions = np.unique(np.round(amounts, 2), return_inverse=True)
+    return np.array([_amount(amount) for amount in distinct.tolist()], dtype=object)[positions.reshape(-1)]
+
+
+def _text(values, default):
+    """Object array of strings with default for missing values, each distinct value converted once."""
+    codes, distinct = pd.factorize(values)
+    # Missing values have code -1, which picks the default appended last
+    return np.array([str(value) for value in distinct] + [default], dtype=object)[codes]
+
+
+def format_salaries(values):
+    """format_salary for every row, given object arrays per JobSpy column (MIN_AMOUNT, MAX_AMOUNT, INTERVAL)."""
+    low_amounts, high_amounts = _numbers(values['MIN_AMOUNT']), _numbers(values['MAX_AMOUNT'])
+    has_min, has_max = low_amounts != 0, high_amounts != 0
+    interval = _text(values['INTERVAL'], 'yearly')
+    unit = np.where(interval == 'hourly', '/hr', '').astype(object)
+    suffix = np.where(np.isin(interval, ['yearly', 'hourly']), '', ' (' + interval + ')').astype(object)
+    low = '$' + _amounts(low_amounts) + unit
+    high = '$' + _amounts(high_amounts) + unit
+    return np.select([has_min & has_max, has_min], [low + ' - ' + high + suffix, low + '+' + suffix],
+                     'Salary not specified')
+
+
+def jobs_from_frame(jobs_df, site=None, limit=None):
+    """
+    Convert JobSpy postings to job dicts.
+
+    Only the needed columns are projected and every field is formatted for
+    all rows at once (location, salary, truncated description); missing
+    columns and values get the usual placeholders.
+
+    Args:
+        jobs_df: DataFrame or list of row dicts with JobSpy's column names
+            (any case)
+        site (str): Board every posting came from; None uses the SITE column
+        limit (int): Convert only the first limit postings
+
+    Returns:
+        list: Job dicts (title, company, location, description, salary, url,
+        posted_date, job_type, is_remote, site) with plain Python values
+    """
+    if not isinstance(jobs_df, pd.DataFrame):
+        jobs_df = pd.DataFrame(list(jobs_df))
+    if limit is not None:
+        jobs_df = jobs_df.head(limit)
+    if jobs_df.empty:
+        return []
+    # Project only the needed columns; missing ones are all None
+    present = {str(column).upper(): column for column in jobs_df.columns}
+    values = {column: jobs_df[present[column]].to_numpy(dtype=object) if column in present
+              else np.full(len(jobs_df), None, dtype=object) for column in COLUMNS + ['SITE']}
+
+    location = np.char.strip((_text(values['CITY'], '') + ', ' + _text(values['STATE'], '')).astype(str), ', ')
+    description = pd.Series(values['DESCRIPTION']).fillna('No description available').astype(object)
+    is_remote = values['IS_REMOTE']
+    columns = {
+        'title': _text(values['TITLE'], 'N/A'),
+        'company': _text(values['COMPANY'], 'N/A'),
+        'location': location,
+        'description': description.str.slice(0, DESCRIPTION_CHARS) + '...',
+        'salary': format_salaries(values),
+        'url': _text(values['JOB_URL'], '#'),
+        'posted_date': _text(values['DATE_POSTED'], 'N/A'),
+        'job_type': _text(values['JOB_TYPE'], 'N/A'),
+        'is_remote': np.where(pd.isna(is_remote), False, is_remote).astype(bool),
+        'site': [site] * len(jobs_df) if site is not None else _text(values['SITE'], 'N/A'),
+    }
+    # zip over plain lists emits the records faster than to_dict('records') and gives native Python values
+    names = list(columns)
+    return [dict(zip(names, record)) for record in zip(*(
+        column.tolist() if hasattr(column, 'tolist') else column for column in columns.values()))]
@@ -0,0 +1,576 @@
+#!/usr/bin/env python3
+"""
+Local job index for Career AI Agent
+Scraped postings are kept in SQLite with structured columns and an FTS5
+index on title and description, filled by a background crawler, so job
+searches are answered locally in milliseconds
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+from config import Config
+from job_dedup import find_duplicates, richness, simhash
+from job_vectors import JobVectorStore, job_vectors, profile_vector
+from single_flight import flight_key
+
+# JobSpy column -> jobs table column
+COLUMNS = {
+    'TITLE': 'title',
+    'COMPANY': 'company',
+    'CITY': 'city',
+    'STATE': 'state',
+    'MIN_AMOUNT': 'salary_min',
+    'MAX_AMOUNT': 'salary_max',
+    'INTERVAL': 'salary_interval',
+    'JOB_TYPE': 'job_type',
+    'IS_REMOTE': 'is_remote',
+    'DATE_POSTED': 'date_posted',
+    'DESCRIPTION': 'description',
+    'JOB_URL': 'url',
+}
+
+# bm25 weights of the FTS columns (title, description)
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+# Ids are never reused (AUTOINCREMENT): the vector store refers to postings by id
+JOBS_TABLE = """
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_key TEXT NOT NULL UNIQUE,
+    site TEXT,
+    title TEXT,
+    company TEXT,
+    city TEXT,
+    state TEXT,
+    salary_min REAL,
+    salary_max REAL,
+    salary_interval TEXT,
+    job_type TEXT,
+    is_remote INTEGER,
+    date_posted TEXT,
+    description TEXT,
+    url TEXT,
+    indexed_at REAL NOT NULL,
+    simhash INTEGER,
+    duplicate_of INTEGER,
+    alternate_urls TEXT
+"""
+
+
+def parse_queries(spec):
+    """Parse "search term[:location],..." into a list of (search_term, location) tuples."""
+    queries = []
+    for item in (spec or '').split(','):
+        search_term, _, location = item.partition(':')
+        if search_term.strip():
+            queries.append((search_term.strip(), location.strip()))
+    return queries
+
+
+def match_expression(text, any_terms=None):
+    """
+    FTS5 query matching every word of text and at least one of any_terms.
+
+    Words are quoted, so user input can't inject FTS5 syntax.
+    """
+    words = re.findall(r'\w+', (text or '').lower())
+    clauses = [f'"{word}"' for word in words]
+    alternatives = [f'"{word}"' for term in any_terms or [] for word in re.findall(r'\w+', term.lower())]
+    if alternatives:
+        clauses.append(f"({' OR '.join(alternatives)})")
+    return ' AND '.join(clauses)
+
+
+def _signed(fingerprint):
+    # SQLite integers are signed 64-bit
+    return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+
+def _value(value):
+    """SQLite-friendly version of a DataFrame cell (None for missing values)."""
+    try:
+        if value is None or value != value:  # NaN / NaT
+            return None
+    except TypeError:  # pd.NA
+        return None
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, bool):
+        return int(value)
+    return value if isinstance(value, (int, float, str)) else str(value)
+
+
+class JobIndex:
+    """
+    Searchable store of scraped job postings.
+
+    Postings are upserted by URL, so re-crawling a query refreshes them in
+    place. The crawl list holds the configured queries plus the searches
+    users made recently; postings not seen again within retention_days
+    are dropped. With a JobVectorStore, every crawl also rebuilds the
+    posting vectors that match() searches.
+    """
+
+    def __init__(self, db_path, retention_days=30, max_queries=50, queries=None, vectors=None):
+        self.db_path = db_path
+        self.retention_days = retention_days
+        self.max_queries = max_queries
+        self.vectors = vectors
+        self._lock = threading.Lock()
+        self._crawler = None
+        self._stop = threading.Event()
+        self._maintained_at = time.monotonic()
+        self._maintaining = False
+        self.stats = {'searches': 0, 'crawls': 0, 'crawl_errors': 0, 'indexed': 0, 'duplicates': 0, 'matches': 0}
+        self._init_db()
+        for search_term, location in queries or []:
+            self.add_query(search_term, location)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _init_db(self):
+        with closing(self._connect()) as conn:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS jobs ({JOBS_TABLE})")
+            # Indexes created before cross-board deduplication
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, kind in [('simhash', 'INTEGER'), ('duplicate_of', 'INTEGER'), ('alternate_urls', 'TEXT')]:
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+            # Indexes created without AUTOINCREMENT hand purged ids to new postings, which stored
+            # vectors would then point at; rebuild the table keeping every id
+            schema = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'jobs'").fetchone()[0]
+            if 'AUTOINCREMENT' not in schema.upper():
+                columns = ', '.join(row[1] for row in conn.execute("PRAGMA table_info(jobs)"))
+                conn.executescript(f"""
+                    BEGIN;
+                    DROP TRIGGER IF EXISTS jobs_fts_insert;
+                    DROP TRIGGER IF EXISTS jobs_fts_delete;
+                    DROP TRIGGER IF EXISTS jobs_fts_update;
+                    CREATE TABLE jobs_autoincrement ({JOBS_TABLE});
+                    INSERT INTO jobs_autoincrement ({columns}) SELECT {columns} FROM jobs;
+                    DROP TABLE jobs;
+                    ALTER TABLE jobs_autoincrement RENAME TO jobs;
+                    COMMIT;
+                """)
+            conn.executescript("""
+                CREATE INDEX IF NOT EXISTS jobs_date_posted ON jobs (date_posted);
+                CREATE INDEX IF NOT EXISTS jobs_indexed_at ON jobs (indexed_at);
+                CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+                    title, description, content='jobs', content_rowid='id', tokenize='porter unicode61'
+                );
+                CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+                    INSERT INTO jobs_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+                END;
+                CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+                    INSERT INTO jobs_fts (jobs_fts, rowid, title, description)
+                    VALUES ('delete', old.id, old.title, old.description);
+                END;
+                CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title, description ON jobs BEGIN
+                    INSERT INTO jobs_fts (jobs_fts, rowid, title, description)
+                    VALUES ('delete', old.id, old.title, old.description);
+                    INSERT INTO jobs_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+                END;
+                CREATE TABLE IF NOT EXISTS index_queries (
+                    query_key TEXT PRIMARY KEY,
+                    search_term TEXT NOT NULL,
+                    location TEXT NOT NULL,
+                    requested_at REAL NOT NULL,
+                    crawled_at REAL
+                );
+            """)
+
+    def add_query(self, search_term, location=''):
+        """Add a search to the crawl list (or mark it as requested again)."""
+        search_term, location = search_term.strip(), (location or '').strip()
+        key = flight_key(search_term.lower(), location.lower())
+        with closing(self._connect()) as conn:
+            conn.execute("""
+                INSERT INTO index_queries (query_key, search_term, location, requested_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT (query_key) DO UPDATE SET requested_at = excluded.requested_at
+            """, (key, search_term, location, time.time()))
+
+    def queries(self):
+        """The max_queries most recently requested searches, as (search_term, location) tuples."""
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT search_term, location FROM index_queries ORDER BY requested_at DESC LIMIT ?",
+                                (self.max_queries,)).fetchall()
+
+    def add_frame(self, jobs_df, site):
+        """
+        Upsert one board's JobSpy DataFrame.
+
+        Returns:
+            int: Number of postings written
+        """
+        if jobs_df is None or len(jobs_df) == 0:
+            return 0
+        frame = jobs_df.rename(columns=str.upper).reindex(columns=list(COLUMNS))
+        now = time.time()
+        rows = []
+        for values in frame.itertuples(index=False, name=None):
+            values = [_value(value) for value in values]
+            record = dict(zip(COLUMNS.values(), values))
+            if not record['title']:
+                continue
+            key = record['url'] or flight_key(site, record['title'], record['company'], record['city'])
+            rows.append((key, site, *values, now, _signed(simhash(record['description']))))
+        columns = ', '.join(COLUMNS.values())
+        updates = ', '.join(f'{column} = excluded.{column}'
+                            for column in ['site', *COLUMNS.values(), 'indexed_at', 'simhash'])
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN")
+            conn.executemany(f"""
+                INSERT INTO jobs (job_key, site, {columns}, indexed_at, simhash)
+                VALUES ({', '.join('?' * (len(COLUMNS) + 4))})
+                ON CONFLICT (job_key) DO UPDATE SET {updates}
+            """, rows)
+            conn.execute("COMMIT")
+        with self._lock:
+            self.stats['indexed'] += len(rows)
+        return len(rows)
+
+    def add_frames(self, frames):
+        """Upsert {site: DataFrame} as returned by job_search.scrape_sites."""
+        return sum(self.add_frame(jobs_df, site) for site, jobs_df in frames.items())
+
+    def search(self, text=None, location=None, limit=10, any_terms=None, max_age_hours=None):
+        """
+        Postings matching every word of text (and one of any_terms), best first.
+
+        Only postings seen within retention_days (and posted within
+        max_age_hours, when given and known) are returned, whether or not
+        purge_expired has run since.
+
+        Copies of a posting found on other boards are left out; the kept
+        copy lists them in ALTERNATE_URLS (see dedupe).
+
+        Title matches weigh TITLE_WEIGHT times description matches; ties
+        go to the most recently posted. location ("City, ST") must match
+        the city or state of the posting.
+
+        Returns:
+            list: Row dicts with JobSpy's column names plus SITE, so they
+            convert like scraped rows (missing values are left out)
+        """
+        match = match_expression(text, any_terms)
+        now = time.time()
+        clauses = ["jobs.duplicate_of IS NULL", "jobs.indexed_at >= ?"]
+        params = [now - self.retention_days * 86400]
+        if max_age_hours:
+            # date_posted is an ISO date, so the cutoff day is included
+            clauses.append("(jobs.date_posted IS NULL OR jobs.date_posted >= ?)")
+            params.append(time.strftime('%Y-%m-%d', time.gmtime(now - max_age_hours * 3600)))
+        if match:
+            clauses.append("jobs_fts MATCH ?")
+            params.append(match)
+        for part in [part.strip().lower() for part in (location or '').split(',') if part.strip()]:
+            clauses.append("? IN (lower(jobs.city), lower(jobs.state))")
+            params.append(part)
+        selected = ', '.join(f'jobs.{column} AS {name}' for name, column in COLUMNS.items())
+        sql = f"SELECT jobs.site AS SITE, {selected}, jobs.alternate_urls AS ALTERNATE_URLS FROM jobs"
+        if match:
+            sql += " JOIN jobs_fts ON jobs_fts.rowid = jobs.id"
+        sql += " WHERE " + " AND ".join(clauses)
+        order = f"bm25(jobs_fts, {TITLE_WEIGHT}, {DESCRIPTION_WEIGHT}), " if match else ""
+        sql += f" ORDER BY {order}jobs.date_posted DESC LIMIT ?"
+        with closing(self._connect()) as conn:
+            jobs = self._rows(conn.execute(sql, (*params, limit)))
+        with self._lock:
+            self.stats['searches'] += 1
+        return jobs
+
+    @staticmethod
+    def _rows(cursor):
+        """Row dicts of a jobs query, missing values left out."""
+        names = [description[0] for description in cursor.description]
+        jobs = []
+        for row in cursor.fetchall():
+            job = {name: value for name, value in zip(names, row) if value is not None}
+            if 'IS_REMOTE' in job:
+                job['IS_REMOTE'] = bool(job['IS_REMOTE'])
+            if 'ALTERNATE_URLS' in job:
+                job['ALTERNATE_URLS'] = json.loads(job['ALTERNATE_URLS'])
+            jobs.append(job)
+        return jobs
+
+    def get(self, ids):
+        """Row dicts (as in search, plus ID) of postings by id, in the given order; unknown ids are left out."""
+        ids = [int(job_id) for job_id in ids]
+        if not ids:
+            return []
+        selected = ', '.join(f'{column} AS {name}' for name, column in COLUMNS.items())
+        with closing(self._connect()) as conn:
+            rows = self._rows(conn.execute(
+                f"SELECT id AS ID, site AS SITE, {selected}, alternate_urls AS ALTERNATE_URLS FROM jobs "
+                f"WHERE id IN ({', '.join('?' * len(ids))})", ids))
+        by_id = {row['ID']: row for row in rows}
+        return [by_id[job_id] for job_id in ids if job_id in by_id]
+
+    def vectorize(self, chunk_size=4096):
+        """
+        Rebuild the posting vectors (duplicates left out), chunk_size postings at a time.
+
+        Returns:
+            int: Number of postings vectorized (0 without a vector store)
+        """
+        if self.vectors is None:
+            return 0
+
+        def batches():
+            last_id = 0
+            while True:
+                with closing(self._connect()) as conn:
+                    rows = conn.execute("""
+                        SELECT id, title, description FROM jobs
+                        WHERE duplicate_of IS NULL AND id > ? ORDER BY id LIMIT ?
+                    """, (last_id, chunk_size)).fetchall()
+                if not rows:
+                    return
+                last_id = rows[-1][0]
+                yield ([row[0] for row in rows],
+                       job_vectors([{'title': row[1], 'description': row[2]} for row in rows], self.vectors.dimensions))
+
+        return self.vectors.write(batches())
+
+    def match(self, profile, limit=10):
+        """
+        Postings closest to a profile (see job_vectors), best first.
+
+        Returns:
+            list: Row dicts as in get, with the cosine similarity in SCORE
+            ([] without a vector store or for a profile without features)
+        """
+        if self.vectors is None:
+            return []
+        vector = profile_vector(profile, self.vectors.dimensions)
+        if not vector.any():
+            return []
+        # Postings purged or deduplicated since the last rebuild are skipped, so ask for a few extra
+        ids, scores = self.vectors.search(vector, limit * 2)
+        score_by_id = dict(zip(ids.tolist(), scores.tolist()))
+        rows = self.get(ids.tolist())[:limit]
+        with self._lock:
+            self.stats['matches'] += 1
+        return [dict(row, SCORE=round(score_by_id[row['ID']], 4)) for row in rows]
+
+    def purge_expired(self):
+        """Drop postings not seen by a crawl or live scrape within retention_days."""
+        with closing(self._connect()) as conn:
+            return conn.execute("DELETE FROM jobs WHERE indexed_at < ?",
+                                (time.time() - self.retention_days * 86400,)).rowcount
+
+    def dedupe(self):
+        """
+        Mark copies of the same posting across the whole index (see job_dedup).
+
+        The richest copy of each group stays searchable with the others'
+        boards and URLs in alternate_urls; the rest get duplicate_of.
+
+        Returns:
+            int: Number of postings marked as duplicates
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute("""
+                SELECT id, site, url, title, company, city, state, salary_min, salary_interval, job_type,
+                       is_remote, date_posted, length(description), simhash
+                FROM jobs ORDER BY id
+            """).fetchall()
+        ids = [row[0] for row in rows]
+        lengths = [row[12] or 0 for row in rows]
+        records = [{'site': row[1], 'url': row[2], 'title': row[3], 'company': row[4],
+                    'location': f"{row[5] or ''}, {row[6] or ''}".strip(', '), 'salary': row[7],
+                    'salary_interval': row[8], 'job_type': row[9], 'is_remote': row[10], 'date_posted': row[11],
+                    'simhash': row[13] % (1 << 64) if row[13] else 0} for row in rows]
+        marks, alternates = [], []
+        for members in find_duplicates(records):
+            best = max(members, key=lambda position: (richness(records[position], lengths[position]), -position))
+            marks.extend((ids[best], ids[position]) for position in members if position != best)
+            alternates.append((json.dumps([{'site': records[position]['site'], 'url': records[position]['url']}
+                                           for position in members if position != best]), ids[best]))
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN")
+            conn.execute("UPDATE jobs SET duplicate_of = NULL, alternate_urls = NULL "
+                         "WHERE duplicate_of IS NOT NULL OR alternate_urls IS NOT NULL")
+            conn.executemany("UPDATE jobs SET duplicate_of = ? WHERE id = ?", marks)
+            conn.executemany("UPDATE jobs SET alternate_urls = ? WHERE id = ?", alternates)
+            conn.execute("COMMIT")
+        return len(marks)
+
+    def crawl(self, fetch_fn):
+        """
+        Re-scrape every query on the crawl list.
+
+        Args:
+            fetch_fn (callable): fetch_fn(search_term, location) -> {site: DataFrame}
+
+        Returns:
+            int: Number of postings indexed
+        """
+        indexed = 0
+        for search_term, location in self.queries():
+            if self._stop.is_set():
+                break
+            try:
+                indexed += self.add_frames(fetch_fn(search_term, location))
+            except Exception as e:
+                with self._lock:
+                    self.stats['crawl_errors'] += 1
+                print(f"⚠️  Job index crawl failed for '{search_term}' {location}: {e}")
+                continue
+            with closing(self._connect()) as conn:
+                conn.execute("UPDATE index_queries SET crawled_at = ? WHERE query_key = ?",
+                             (time.time(), flight_key(search_term.lower(), location.lower())))
+        self.purge_expired()
+        duplicates = self.dedupe()
+        self.vectorize()
+        with self._lock:
+            self.stats['crawls'] += 1
+            self.stats['duplicates'] = duplicates
+        return indexed
+
+    def maintain(self, min_interval_seconds=3600, background=False):
+        """
+        Purge expired postings and re-run cross-board dedupe, at most once
+        per min_interval_seconds, for apps that index live scrapes without
+        running the crawler (which does this after every crawl).
+
+        Returns:
+            bool: Whether maintenance was started
+        """
+        with self._lock:
+            if self._maintaining or time.monotonic() - self._maintained_at < min_interval_seconds:
+                return False
+            self._maintaining = True
+        if background:
+            threading.Thread(target=self._maintain, name='job-index-maintenance', daemon=True).start()
+        else:
+            self._maintain()
+        return True
+
+    def _maintain(self):
+        try:
+            purged = self.purge_expired()
+            duplicates = self.dedupe()
+            with self._lock:
+                self.stats['duplicates'] = duplicates
+            if purged:
+                print(f"🗂️  Purged {purged} expired job posting(s)")
+        except Exception as e:
+            print(f"⚠️  Job index maintenance failed: {e}")
+        finally:
+            with self._lock:
+                self._maintaining = False
+                self._maintained_at = time.monotonic()
+
+    def start_crawler(self, fetch_fn, interval_seconds):
+        """Crawl in a background thread every interval_seconds (idempotent)."""
+        with self._lock:
+            if self._crawler is not None:
+                return
+            self._stop.clear()
+            self._crawler = threading.Thread(target=self._run_crawler, args=(fetch_fn, interval_seconds),
+                                             name='job-index-crawler', daemon=True)
+        self._crawler.start()
+
+    def _run_crawler(self, fetch_fn, interval_seconds):
+        while not self._stop.is_set():
+            # One failed crawl (SQLite, numpy, ...) must not end the crawler
+            try:
+                indexed = self.crawl(fetch_fn)
+                if indexed:
+                    print(f"🗂️  Indexed {indexed} job posting(s)")
+            except Exception as e:
+                with self._lock:
+                    self.stats['crawl_errors'] += 1
+                print(f"⚠️  Job index crawl failed: {e}")
+            self._stop.wait(interval_seconds)
+
+    def stop_crawler(self):
+        self._stop.set()
+        if self._crawler is not None:
+            self._crawler.join(timeout=5)
+        self._crawler = None
+
+    def summary(self):
+        """Counters, size and last crawl (for /health)."""
+        with closing(self._connect()) as conn:
+            postings = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            queries, last_crawl = conn.execute("SELECT COUNT(*), MAX(crawled_at) FROM index_queries").fetchone()
+        with self._lock:
+            return dict(self.stats, postings=postings, queries=queries, last_crawl_at=last_crawl,
+                        crawling=self._crawler is not None,
+                        vectors=self.vectors.summary() if self.vectors is not None else None)
+
+
+def create_index():
+    """Index configured from Config (None when JOB_INDEX_DB is empty)."""
+    if not Config.JOB_INDEX_DB:
+        return None
+    vectors = JobVectorStore(Config.JOB_VECTORS_PATH, Config.JOB_VECTOR_DIMENSIONS,
+                             Config.JOB_VECTOR_BLOCK_ROWS) if Config.JOB_VECTORS_PATH else None
+    return JobIndex(Config.JOB_INDEX_DB, retention_days=Config.JOB_INDEX_RETENTION_DAYS,
+                    max_queries=Config.JOB_INDEX_MAX_QUERIES, queries=parse_queries(Config.JOB_INDEX_QUERIES),
+                    vectors=vectors)
+
+
+def site_fetcher(scrape_fn):
+    """fetch_fn for JobIndex.crawl that scrapes every board in JOB_SITES concurrently."""
+    from job_search import parse_site_timeouts, scrape_sites
+    sites = [site.strip() for site in Config.JOB_SITES.split(',') if site.strip()]
+
+    def fetch(search_term, location):
+        params = {'search_term': search_term, 'results_wanted': Config.JOB_INDEX_RESULTS_PER_SITE,
+                  'hours_old': 168, 'country_indeed': 'USA'}
+        if location:
+            params['location'] = location
+        frames, _ = scrape_sites(scrape_fn, sites, params, Config.JOB_SITE_TIMEOUT_SECONDS,
+                                 parse_site_timeouts(Config.JOB_SITE_TIMEOUTS))
+        return frames
+
+    return fetch
+
+
+def main():
+    """Fill the job index from the command line."""
+    parser = argparse.ArgumentParser(description="Crawl job boards into the local job index")
+    parser.add_argument('--loop', action='store_true', help="Keep crawling every --minutes")
+    parser.add_argument('--minutes', type=float, default=Config.JOB_INDEX_CRAWL_MINUTES or 60,
+                        help="Crawl interval with --loop (default JOB_INDEX_CRAWL_MINUTES, or 60)")
+    parser.add_argument('--vectorize', action='store_true', help="Only rebuild the posting vectors (JOB_VECTORS_PATH)")
+    args = parser.parse_args()
+
+    index = create_index()
+    if index is None:
+        print("❌ JOB_INDEX_DB is empty; the job index is disabled")
+        return
+    if args.vectorize:
+        started = time.monotonic()
+        print(f"✅ Vectorized {index.vectorize()} posting(s) in {time.monotonic() - started:.1f}s")
+        return
+
+    from jobspy import scrape_jobs
+    fetch = site_fetcher(scrape_jobs)
+
+    print(f"🗂️  Crawling {len(index.queries())} quer(ies) into {index.db_path}...")
+    if not args.loop:
+        print(f"✅ Indexed {index.crawl(fetch)} posting(s)")
+        return
+    index.start_crawler(fetch, max(args.minutes, 1) * 60)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        index.stop_crawler()
+
+
+if __name__ == "__main__":
+    main()
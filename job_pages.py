@@ -0,0 +1,122 @@
+"""
+Job search result sets for Career AI Agent
+A search's results are stored once under a result set id and paged
+through with opaque cursors, so later pages never scrape again
+"""
+
+import base64
+import binascii
+import time
+import uuid
+
+from config import Config
+from job_cache import MemoryBackend, SQLiteBackend
+
+
+class CursorError(ValueError):
+    """A cursor is malformed or points at an unknown result set."""
+
+
+class ResultSetExpired(CursorError):
+    """A cursor's result set has expired; the search must be run again."""
+
+
+def encode_cursor(set_id, offset):
+    """Opaque cursor for the page of set_id starting at offset."""
+    return base64.urlsafe_b64encode(f"{set_id}:{offset}".encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(set_id, offset) of a cursor; raises CursorError when it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(str(cursor) + '=' * (-len(str(cursor)) % 4)).decode()
+        set_id, offset = raw.split(':')
+        offset = int(offset)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise CursorError("Invalid cursor")
+    if not set_id or offset < 0:
+        raise CursorError("Invalid cursor")
+    return set_id, offset
+
+
+class ResultSets:
+    """
+    Stores the jobs of a search for ttl_seconds and serves them in pages.
+
+    The order is fixed when the set is stored, so pages never overlap or
+    skip jobs. Page sizes default to page_size and are capped at
+    max_page_size; they may change from one page to the next.
+    """
+
+    def __init__(self, backend, ttl_seconds=1800, page_size=10, max_page_size=50):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+
+    @classmethod
+    def from_config(cls):
+        """Result sets configured by JOB_RESULT_SET_* and JOB_*PAGE_SIZE."""
+        if Config.JOB_CACHE_BACKEND == 'sqlite':
+            store = SQLiteBackend(Config.JOB_CACHE_DB, Config.JOB_RESULT_SET_MAX_ENTRIES, table='job_result_sets')
+        else:
+            store = MemoryBackend(Config.JOB_RESULT_SET_MAX_ENTRIES)
+        return cls(store, Config.JOB_RESULT_SET_TTL_SECONDS, Config.JOB_PAGE_SIZE, Config.JOB_MAX_PAGE_SIZE)
+
+    def clamp_page_size(self, page_size):
+        """Requested page size, defaulted and capped at max_page_size."""
+        try:
+            page_size = int(page_size) if page_size is not None else self.page_size
+        except (TypeError, ValueError):
+            page_size = self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def _page(self, set_id, result_set, stored_at, offset, page_size):
+        jobs = result_set['jobs']
+        end = offset + self.clamp_page_size(page_size)
+        return dict(result_set['info'], data=jobs[offset:end], total=len(jobs), offset=offset,
+                    result_set=set_id, next_cursor=encode_cursor(set_id, end) if end < len(jobs) else None,
+                    expires_at=stored_at + self.ttl_seconds)
+
+    def create(self, jobs, info=None, page_size=None):
+        """
+        Store a search's jobs and return its first page.
+
+        Args:
+            jobs (list): Job dicts in their final order (JSON-serialisable)
+            info (dict): Search metadata returned with every page (source, sites, ...)
+            page_size (int): Jobs on the first page
+
+        Returns:
+            dict: info plus data (the page's jobs), total, offset, result_set,
+            next_cursor (None on the last page) and expires_at
+        """
+        set_id, stored_at = uuid.uuid4().hex, time.time()
+        result_set = {'jobs': list(jobs), 'info': dict(info or {})}
+        self.backend.set(set_id, result_set, stored_at)
+        self.backend.purge(stored_at - self.ttl_seconds)
+        return self._page(set_id, result_set, stored_at, 0, page_size)
+
+    def page(self, cursor, page_size=None):
+        """
+        The page a cursor points at, from the stored set (see create).
+
+        Raises:
+            CursorError: The cursor is malformed
+            ResultSetExpired: The set is older than ttl_seconds or unknown
+        """
+        set_id, offset = decode_cursor(cursor)
+        entry = self.backend.get(set_id)
+        if entry is None:
+            raise ResultSetExpired("Result set not found or expired; run the search again")
+        result_set, stored_at = entry
+        if time.time() - stored_at >= self.ttl_seconds:
+            raise ResultSetExpired("Result set expired; run the search again")
+        if offset > len(result_set['jobs']):
+            raise CursorError("Invalid cursor")
+        return self._page(set_id, result_set, stored_at, offset, page_size)
+
+    def summary(self):
+        """Size and settings (for /health)."""
+        return {'entries': len(self.backend), 'ttl_seconds': self.ttl_seconds, 'page_size': self.page_size,
+                'max_page_size': self.max_page_size}
@@ -0,0 +1,264 @@
+"""
+Background job queue for Career AI Agent
+Persistent SQLite-backed queue with priority lanes and a local worker pool,
+so long LLM reports don't hold HTTP workers
+"""
+
+import contextvars
+import json
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from contextlib import closing
+
+PRIORITIES = {'high': 0, 'normal': 1, 'low': 2}
+TERMINAL_STATUSES = ('succeeded', 'failed')
+
+_current_job = contextvars.ContextVar('current_job', default=None)
+
+
+def current_job():
+    """The job being run by the calling worker thread ({'job_id', 'kind', 'owner'}), or None."""
+    return _current_job.get()
+
+
+class JobQueue:
+    """
+    SQLite-backed job queue processed by a pool of worker threads.
+
+    Jobs are claimed highest priority first, oldest first. lane_limits caps
+    how many jobs of a priority lane may run at once (e.g. {'low': 1}) so
+    bulk work cannot starve interactive requests. Finished jobs are purged
+    after retention_seconds.
+    """
+
+    def __init__(self, db_path, max_workers=2, retention_seconds=86400, lane_limits=None, poll_interval=0.5,
+                 stale_seconds=600):
+        self.db_path = db_path
+        self.max_workers = max_workers
+        self.retention_seconds = retention_seconds
+        self.lane_limits = lane_limits or {}
+        self.poll_interval = poll_interval
+        self.stale_seconds = stale_seconds
+        self.handlers = {}
+        self._threads = []
+        self._stop = threading.Event()
+        self._wakeup = threading.Condition()
+        self._claim_lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self):
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    priority INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    owner TEXT,
+                    payload TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, priority, created_at)")
+
+    def register(self, kind, handler):
+        """Register handler(payload) -> JSON-serialisable result for a job kind."""
+        self.handlers[kind] = handler
+
+    def submit(self, kind, payload, priority='normal', owner=None):
+        """
+        Queue a job and return its id immediately.
+
+        Raises:
+            ValueError: If the kind has no handler or the priority is unknown
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority '{priority}', expected one of {', '.join(PRIORITIES)}")
+
+        job_id = uuid.uuid4().hex
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, priority, status, owner, payload, created_at) "
+                "VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, PRIORITIES[priority], owner, json.dumps(payload), time.time()),
+            )
+        with self._wakeup:
+            self._wakeup.notify_all()
+        return job_id
+
+    def get(self, job_id):
+        """Return the public view of a job, or None if unknown/purged."""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        priority_names = {value: name for name, value in PRIORITIES.items()}
+        job = {
+            'job_id': row['id'],
+            'kind': row['kind'],
+            'priority': priority_names.get(row['priority'], row['priority']),
+            'status': row['status'],
+            'owner': row['owner'],
+            'created_at': row['created_at'],
+            'started_at': row['started_at'],
+            'finished_at': row['finished_at'],
+        }
+        if row['status'] == 'queued':
+            job['queue_position'] = self._queue_position(row)
+        if row['result'] is not None:
+            job['result'] = json.loads(row['result'])
+        if row['error'] is not None:
+            job['error'] = row['error']
+        return job
+
+    def _queue_position(self, row):
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND "
+                "(priority < ? OR (priority = ? AND created_at < ?))",
+                (row['priority'], row['priority'], row['created_at']),
+            ).fetchone()[0]
+
+    def wait(self, job_id, timeout):
+        """Block until the job finishes or timeout passes; returns the job view."""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job['status'] in TERMINAL_STATUSES:
+                return job
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return job
+            with self._wakeup:
+                self._wakeup.wait(min(remaining, self.poll_interval))
+
+    def stats(self):
+        """Job counts by status and the configured pool size."""
+        with closing(self._connect()) as conn:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {'workers': self.max_workers, 'lane_limits': self.lane_limits, 'jobs': counts}
+
+    def _claim(self):
+        """Atomically move the next eligible queued job to running."""
+        with self._claim_lock, closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                running = dict(conn.execute(
+                    "SELECT priority, COUNT(*) FROM jobs WHERE status = 'running' GROUP BY priority"
+                ).fetchall())
+                blocked = [PRIORITIES[lane] for lane, limit in self.lane_limits.items()
+                           if running.get(PRIORITIES[lane], 0) >= limit]
+                placeholders = ','.join('?' * len(blocked))
+                query = "SELECT * FROM jobs WHERE status = 'queued'"
+                if blocked:
+                    query += f" AND priority NOT IN ({placeholders})"
+                row = conn.execute(query + " ORDER BY priority, created_at LIMIT 1", blocked).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE jobs SET status = 'running', started_at = ?, attempts = attempts + 1 WHERE id = ?",
+                        (time.time(), row['id']),
+                    )
+                conn.execute("COMMIT")
+                return row
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _finish(self, job_id, result=None, error=None):
+        """Store a finished job; result is the JSON-encoded handler result."""
+        status = 'failed' if error is not None else 'succeeded'
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                (status, None if error is not None else result, error, time.time(), job_id),
+            )
+        with self._wakeup:
+            self._wakeup.notify_all()
+
+    def run_next(self):
+        """Claim and run one job in the calling thread. Returns False if none was eligible."""
+        row = self._claim()
+        if row is None:
+            return False
+        token = _current_job.set({'job_id': row['id'], 'kind': row['kind'], 'owner': row['owner']})
+        try:
+            # Serialized here so a result that isn't JSON fails the job instead of leaving it running
+            result = json.dumps(self.handlers[row['kind']](json.loads(row['payload'])))
+        except Exception as e:
+            print(f"❌ Job {row['id']} ({row['kind']}) failed: {e}")
+            traceback.print_exc()
+            self._finish(row['id'], error=f"{type(e).__name__}: {e}")
+        else:
+            self._finish(row['id'], result=result)
+        finally:
+            _current_job.reset(token)
+        return True
+
+    def purge_expired(self):
+        """Delete finished jobs older than the retention period."""
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "DELETE FROM jobs WHERE status IN ('succeeded', 'failed') AND finished_at < ?",
+                (time.time() - self.retention_seconds,),
+            ).rowcount
+
+    def _recover(self):
+        """Requeue jobs left running by a crashed process (running longer than stale_seconds)."""
+        with closing(self._connect()) as conn:
+            recovered = conn.execute("UPDATE jobs SET status = 'queued', started_at = NULL "
+                                     "WHERE status = 'running' AND started_at < ?",
+                                     (time.time() - self.stale_seconds,)).rowcount
+        if recovered:
+            print(f"♻️  Requeued {recovered} interrupted job(s)")
+
+    def _worker(self):
+        last_purge = 0
+        while not self._stop.is_set():
+            try:
+                if time.monotonic() - last_purge > 60:
+                    last_purge = time.monotonic()
+                    self.purge_expired()
+                ran = self.run_next()
+            except Exception as e:
+                # Keep the worker alive; the job stays running until _recover requeues it
+                print(f"⚠️  Job queue error: {e}")
+                ran = False
+            if not ran:
+                with self._wakeup:
+                    self._wakeup.wait(self.poll_interval)
+
+    def start(self):
+        """Start the worker pool (idempotent)."""
+        if self._threads:
+            return
+        self._recover()
+        self._stop.clear()
+        for index in range(self.max_workers):
+            thread = threading.Thread(target=self._worker, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=5):
+        """Stop the workers after their current job."""
+        self._stop.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
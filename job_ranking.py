@@ -0,0 +1,158 @@
+"""
+Resume-to-job relevance ranking for Career AI Agent
+Scores job postings against a parsed profile's canonical skills and titles
+with BM25 over an inverted index of titles and descriptions, kept as
+sparse numpy arrays
+"""
+
+import math
+import re
+
+import numpy as np
+
+from skill_gaps import SKILL_ALIASES, normalize_skill
+
+# BM25 term frequency saturation and length normalization
+K1 = 1.2
+B = 0.75
+
+# A title word counts as this many description words
+TITLE_BOOST = 3.0
+
+# Query weights of profile terms
+SKILL_WEIGHT = 1.0
+TITLE_WEIGHT = 1.0
+
+STOPWORDS = {'a', 'an', 'and', 'as', 'at', 'by', 'for', 'in', 'of', 'on', 'or', 'the', 'to', 'with'}
+
+_NON_TOKEN = re.compile(r'[^a-z0-9+#./]+')
+
+
+def _tokens(text):
+    """
+    Lower-case word tokens, keeping skills like c++, c#, node.js and ci/cd
+    intact, with skill aliases (k8s, js, ml, ...) spelled out canonically.
+    """
+    text = _NON_TOKEN.sub(' ', str(text or '').lower())
+    # Drop sentence-final dots ("python." -> "python") but keep "node.js"
+    tokens = []
+    for token in re.sub(r'\.(?=\s|$)', '', text).split():
+        if token not in STOPWORDS:
+            tokens.extend(SKILL_ALIASES[token].split() if token in SKILL_ALIASES else [token])
+    return tokens
+
+
+def _terms(tokens):
+    """Index terms of a token list: the words and every adjacent pair (so phrases like "machine learning" match)."""
+    return tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+
+
+def _phrase_terms(phrase):
+    """Query terms of a skill or title: the word itself, or the word pairs of a longer phrase."""
+    tokens = _tokens(phrase)
+    return tokens if len(tokens) < 2 else _terms(tokens)[len(tokens):]
+
+
+def profile_terms(profile):
+    """
+    Weighted query terms of a profile.
+
+    Skills are canonicalized (aliases like k8s or js resolved) and matched
+    as phrases; desired roles and experience titles contribute their words
+    and word pairs.
+
+    Returns:
+        dict: term -> query weight
+    """
+    query = {}
+    for skill in profile.get('skills') or []:
+        for term in _phrase_terms(normalize_skill(skill)):
+            query[term] = query.get(term, 0.0) + SKILL_WEIGHT
+    titles = list(profile.get('desired_roles') or [])
+    titles += [entry.get('title') for entry in profile.get('experience') or [] if isinstance(entry, dict)]
+    for title in titles:
+        for term in _terms(_tokens(title)):
+            query[term] = query.get(term, 0.0) + TITLE_WEIGHT
+    return query
+
+
+class JobTermIndex:
+    """
+    Inverted index over the titles and descriptions of a list of jobs.
+
+    Postings are stored term by term in CSR form (indptr into doc ids and
+    precomputed BM25 term weights), so scoring a query gathers the
+    postings of its terms and sums them per job with one bincount.
+    """
+
+    def __init__(self, jobs, k1=K1, b=B, title_boost=TITLE_BOOST):
+        self.size = len(jobs)
+        self.vocabulary = {}
+        term_ids, doc_ids, counts = [], [], []
+        lengths = np.zeros(self.size)
+        for doc, job in enumerate(jobs):
+            for field, boost in (('title', title_boost), ('description', 1.0)):
+                tokens = _tokens(job.get(field))
+                lengths[doc] += boost * len(tokens)
+                ids = [self.vocabulary.setdefault(term, len(self.vocabulary)) for term in _terms(tokens)]
+                term_ids.extend(ids)
+                doc_ids.extend([doc] * len(ids))
+                counts.extend([boost] * len(ids))
+
+        # One posting per (term, doc), sorted by term then doc
+        keys, positions = np.unique(np.array(term_ids, dtype=np.int64) * max(self.size, 1) +
+                                    np.array(doc_ids, dtype=np.int64), return_inverse=True)
+        frequencies = np.bincount(positions.reshape(-1), weights=np.array(counts, dtype=float), minlength=len(keys))
+        terms = keys // max(self.size, 1)
+        self.docs = keys % max(self.size, 1)
+        self.indptr = np.searchsorted(terms, np.arange(len(self.vocabulary) + 1))
+
+        document_frequency = np.diff(self.indptr)
+        self.idf = np.log1p((self.size - document_frequency + 0.5) / (document_frequency + 0.5))
+        average_length = lengths.mean() if self.size and lengths.mean() > 0 else 1.0
+        norms = k1 * (1 - b + b * lengths[self.docs] / average_length)
+        self.weights = self.idf[terms] * frequencies * (k1 + 1) / (frequencies + norms)
+
+    def score(self, query):
+        """BM25 score of every job for a {term: weight} query (0 for jobs matching no term)."""
+        matched = [(self.vocabulary[term], weight) for term, weight in query.items() if term in self.vocabulary]
+        if not matched:
+            return np.zeros(self.size)
+        ids = np.array([term for term, _ in matched])
+        starts, ends = self.indptr[ids], self.indptr[ids + 1]
+        lengths = ends - starts
+        # Positions of every posting of the matched terms, as one flat array
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        query_weights = np.repeat(np.array([weight for _, weight in matched]), lengths)
+        return np.bincount(self.docs[offsets], weights=self.weights[offsets] * query_weights, minlength=self.size)
+
+
+def top_k(scores, k=None):
+    """Positions of the k best scores, best first; ties keep input order."""
+    k = len(scores) if k is None else max(0, min(int(k), len(scores)))
+    candidates = np.arange(len(scores))
+    if k < len(scores):
+        # Everything scoring at least the k-th best, so ties at the cut keep input order
+        threshold = np.partition(scores, len(scores) - k)[len(scores) - k] if k else math.inf
+        candidates = np.flatnonzero(scores >= threshold)
+    order = candidates[np.lexsort((candidates, -scores[candidates]))]
+    return order[:k]
+
+
+def rank_jobs(profile, jobs, k=None):
+    """
+    Rank jobs by BM25 relevance to a parsed profile.
+
+    Args:
+        profile (dict): Parsed resume / user profile (skills, desired_roles, experience)
+        jobs (list): Job dicts with title and description
+        k (int): Return only the k most relevant jobs (default all)
+
+    Returns:
+        list: Copies of the jobs with a 'score', most relevant first (ties keep
+        their original order)
+    """
+    if not jobs:
+        return []
+    scores = JobTermIndex(jobs).score(profile_terms(profile or {}))
+    return [dict(jobs[position], score=round(float(scores[position]), 4)) for position in top_k(scores, k)]
@@ -0,0 +1,117 @@
+"""
+Concurrent job search helpers for Career AI Agent
+Fans title searches and per-board scrapes out on bounded thread pools
+under deadlines, yielding results as they arrive
+"""
+
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from config import Config
+
+
+class SearchTimeout(TimeoutError):
+    """A search did not finish before its deadline."""
+
+
+# Title searches for /get_job_recommendations
+search_pool = ThreadPoolExecutor(max_workers=Config.JOB_SEARCH_WORKERS, thread_name_prefix='job-search')
+
+# Per-board scrapes (separate from search_pool, whose tasks wait on these)
+site_pool = ThreadPoolExecutor(max_workers=Config.JOB_SITE_WORKERS, thread_name_prefix='job-site')
+
+
+def fan_out(fn, items, timeout, executor=None, timeouts=None):
+    """
+    Run fn(item) for every item concurrently and yield outcomes as they complete.
+
+    Every item is yielded exactly once as (item, result, error). Items still
+    running when their timeout expires (timeouts[item], capped by the shared
+    timeout) are yielded with a SearchTimeout error; their work is
+    abandoned, not cancelled.
+    """
+    executor = executor or search_pool
+    # Workers keep the request's deadline and usage tags
+    futures = {executor.submit(contextvars.copy_context().run, fn, item): item for item in items}
+    started = time.monotonic()
+    limits = {future: min(timeout, (timeouts or {}).get(item, timeout)) for future, item in futures.items()}
+    pending = set(futures)
+    while pending:
+        now = time.monotonic()
+        expired = [future for future in futures if future in pending and started + limits[future] <= now]
+        for future in expired:
+            pending.discard(future)
+            future.cancel()
+            yield futures[future], None, SearchTimeout(f"No result within {limits[future]:g}s")
+        if not pending:
+            break
+        remaining = min(started + limits[future] for future in pending) - now
+        done, pending = wait(pending, timeout=max(0.0, remaining), return_when=FIRST_COMPLETED)
+        for future in done:
+            error = future.exception()
+            yield futures[future], None if error else future.result(), error
+
+
+def parse_site_timeouts(spec):
+    """Parse "site:seconds,site:seconds" into a dict of per-site scrape timeouts."""
+    timeouts = {}
+    for item in (spec or '').split(','):
+        if ':' in item:
+            site, seconds = item.split(':', 1)
+            try:
+                timeouts[site.strip()] = float(seconds)
+            except ValueError:
+                print(f"⚠️  Ignoring invalid site timeout '{item.strip()}'")
+    return timeouts
+
+
+def iter_scrape_sites(scrape_fn, sites, params, timeout, timeouts=None, executor=None):
+    """
+    Scrape every job board in its own task, yielding boards as they finish.
+
+    A slow, blocked or failing board only loses its own results.
+
+    Args:
+        scrape_fn (callable): JobSpy-style scrape_jobs(**params) -> DataFrame
+        sites (list): Board names, one scrape_fn call each (site_name=[site])
+        params (dict): Shared search parameters
+        timeout (float): Default per-site timeout in seconds
+        timeouts (dict): Per-site overrides
+
+    Yields:
+        tuple: (site, DataFrame or None if the board didn't answer, report
+        entry {"status", "latency_ms", "count", "error"?})
+    """
+    started = time.monotonic()
+    limit = max([timeout] + list((timeouts or {}).values()))
+
+    def scrape(site):
+        return scrape_fn(**dict(params, site_name=[site]))
+
+    for site, jobs_df, error in fan_out(scrape, sites, limit, executor or site_pool,
+                                        {site: (timeouts or {}).get(site, timeout) for site in sites}):
+        entry = {'latency_ms': round((time.monotonic() - started) * 1000, 1)}
+        if error is None:
+            entry.update(status='ok', count=len(jobs_df))
+        else:
+            jobs_df = None
+            entry.update(status='timeout' if isinstance(error, TimeoutError) else 'error', count=0,
+                         error=str(error))
+        yield site, jobs_df, entry
+
+
+def scrape_sites(scrape_fn, sites, params, timeout, timeouts=None, executor=None):
+    """
+    Scrape every job board in its own task (see iter_scrape_sites).
+
+    Returns:
+        tuple: (DataFrames by site for boards that answered, per-site report
+        {site: {"status", "latency_ms", "count", "error"?}})
+    """
+    frames, report = {}, {}
+    for site, jobs_df, entry in iter_scrape_sites(scrape_fn, sites, params, timeout, timeouts, executor):
+        if jobs_df is not None:
+            frames[site] = jobs_df
+        report[site] = entry
+    return frames, report
@@ -0,0 +1,266 @@
+"""
+Hashed-embedding job matching for Career AI Agent
+Profiles and postings become fixed-width vectors by feature hashing over
+canonical skills, words, word pairs and character trigrams; postings are
+kept in a float32 memory-mapped matrix and searched with blocked matrix
+multiplies and argpartition top-k (no GPU, no network)
+"""
+
+import hashlib
+import math
+import os
+import threading
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+
+from job_ranking import _terms, _tokens
+from skill_gaps import normalize_skill
+
+DIMENSIONS = 512
+
+# Rows multiplied at a time (64k rows x 512 dims = 128 MB of float32)
+BLOCK_ROWS = 65536
+
+# Store file header: magic, dimensions, row count (little-endian int64s)
+MAGIC = b'JOBVEC01'
+HEADER_BYTES = 32
+
+# Feature weights: profile skills and titles, posting titles; character trigrams only add fuzziness
+SKILL_WEIGHT = 2.0
+TITLE_WEIGHT = 1.5
+INDUSTRY_WEIGHT = 0.5
+TRIGRAM_WEIGHT = 0.25
+
+
+@lru_cache(maxsize=500000)
+def _feature_hash(feature):
+    # Stable across processes (vectors are stored on disk)
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+@lru_cache(maxsize=200000)
+def _trigrams(token):
+    padded = f"<{token}>"
+    return tuple('#' + padded[start:start + 3] for start in range(len(padded) - 2))
+
+
+def _add_text(features, tokens, weight, phrases_only=False):
+    """Add the words, word pairs and character trigrams of tokens to a feature counter."""
+    terms = _terms(tokens)
+    if phrases_only and len(tokens) > 1:
+        terms = terms[len(tokens):]
+    for term, count in Counter(terms).items():
+        features[term] += weight * count
+    # Descriptions repeat words, so each distinct word's trigrams are added once
+    for token, count in Counter(tokens).items():
+        for trigram in _trigrams(token):
+            features[trigram] += weight * count * TRIGRAM_WEIGHT
+
+
+def _weighted(features):
+    # Repeated features count sublinearly
+    return {feature: 1 + math.log(weight) if weight >= 1 else weight for feature, weight in features.items()}
+
+
+def profile_features(profile):
+    """
+    Hashed features of a profile from parse_resume_text: canonical skills
+    (as phrases), desired roles and experience titles, and industries.
+    """
+    features = Counter()
+    for skill in profile.get('skills') or []:
+        _add_text(features, _tokens(normalize_skill(skill)), SKILL_WEIGHT, phrases_only=True)
+    titles = list(profile.get('desired_roles') or [])
+    titles += [entry.get('title') for entry in profile.get('experience') or [] if isinstance(entry, dict)]
+    for title in titles:
+        _add_text(features, _tokens(title), TITLE_WEIGHT)
+    for industry in profile.get('industries') or []:
+        _add_text(features, _tokens(industry), INDUSTRY_WEIGHT)
+    return _weighted(features)
+
+
+def job_features(job):
+    """Hashed features of a job dict (title and description)."""
+    features = Counter()
+    _add_text(features, _tokens(job.get('title')), TITLE_WEIGHT)
+    _add_text(features, _tokens(job.get('description')), 1.0)
+    return _weighted(features)
+
+
+def encode(feature_maps, dimensions=DIMENSIONS):
+    """
+    Feature-hash {feature: weight} maps into L2-normalized float32 rows.
+
+    Each feature lands in one of dimensions buckets with a hash-derived
+    sign, so collisions cancel out on average instead of piling up.
+    """
+    feature_maps = list(feature_maps)
+    rows, hashes, weights = [], [], []
+    for row, features in enumerate(feature_maps):
+        rows.extend([row] * len(features))
+        hashes.extend(_feature_hash(feature) for feature in features)
+        weights.extend(features.values())
+    count = len(feature_maps)
+    hashes = np.array(hashes, dtype=np.uint64)
+    columns = (hashes % np.uint64(dimensions)).astype(np.int64)
+    signs = np.where((hashes >> np.uint64(63)) == 1, 1.0, -1.0)
+    matrix = np.bincount(np.array(rows, dtype=np.int64) * dimensions + columns, weights=signs * np.array(weights),
+                         minlength=count * dimensions).reshape(count, dimensions)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return (matrix / np.where(norms > 0, norms, 1)).astype(np.float32)
+
+
+def profile_vector(profile, dimensions=DIMENSIONS):
+    """Vector of one profile (see profile_features)."""
+    return encode([profile_features(profile)], dimensions)[0]
+
+
+def job_vectors(jobs, dimensions=DIMENSIONS):
+    """(len(jobs), dimensions) float32 matrix of job dicts (see job_features)."""
+    return encode([job_features(job) for job in jobs], dimensions)
+
+
+class JobVectorStore:
+    """
+    Memory-mapped float32 matrix of job vectors with their job ids.
+
+    One file holds a header (width and row count), the float32 matrix and
+    then the int64 job ids. write() builds a new file and renames it into
+    place in one step, so a reader sees either the previous store or the
+    new one, never a matrix with another build's ids. search() reloads
+    when the file was replaced (e.g. by `job_index.py --vectorize` in
+    another process); a search already running keeps the matrix it started
+    with.
+    """
+
+    def __init__(self, path, dimensions=DIMENSIONS, block_rows=BLOCK_ROWS):
+        self.path = path
+        self.dimensions = dimensions
+        self.block_rows = block_rows
+        self._lock = threading.Lock()
+        self._matrix = np.zeros((0, dimensions), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._loaded = None
+        self._load()
+
+    def _signature(self, stat):
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def reload_if_changed(self):
+        """Load the store again if its file was replaced since the last load."""
+        try:
+            signature = self._signature(os.stat(self.path))
+        except OSError:
+            signature = None
+        if signature != self._loaded:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                # Remembered even for an unusable file, so it is only reported once
+                self._loaded = self._signature(os.fstat(f.fileno()))
+                header = f.read(HEADER_BYTES)
+                if len(header) < HEADER_BYTES or header[:8] != MAGIC:
+                    print(f"⚠️  {self.path} is not a job vector store; rebuild it")
+                    return
+                dimensions, count = np.frombuffer(header[8:24], dtype='<i8')
+                if dimensions != self.dimensions:
+                    print(f"⚠️  {self.path} has {dimensions} dimensions, not {self.dimensions}; rebuild it")
+                    return
+                count = int(count)
+                ids = np.fromfile(f, dtype='<i8', count=count, offset=count * self.dimensions * 4)
+                # Mapped from the same open file as the ids; the mapping outlives a later rename
+                matrix = np.memmap(f, dtype='<f4', mode='r', offset=HEADER_BYTES, shape=(count, self.dimensions)) \
+                    if count else np.zeros((0, self.dimensions), dtype=np.float32)
+        except OSError:
+            self._loaded = None
+            return
+        with self._lock:
+            self._matrix, self._ids = matrix, ids.astype(np.int64)
+
+    def write(self, batches):
+        """
+        Replace the stored vectors.
+
+        Args:
+            batches (iterable): (ids, vectors) pairs, vectors a (len(ids), dimensions) matrix
+
+        Returns:
+            int: Number of vectors stored
+        """
+        all_ids = []
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(bytes(HEADER_BYTES))
+                for ids, vectors in batches:
+                    vectors = np.ascontiguousarray(vectors, dtype='<f4')
+                    if vectors.shape != (len(ids), self.dimensions):
+                        raise ValueError(f"Expected {len(ids)} x {self.dimensions} vectors, got {vectors.shape}")
+                    f.write(vectors.tobytes())
+                    all_ids.append(np.asarray(ids, dtype='<i8'))
+                ids = np.concatenate(all_ids) if all_ids else np.zeros(0, dtype='<i8')
+                f.write(ids.tobytes())
+                f.seek(0)
+                f.write(MAGIC + np.array([self.dimensions, len(ids)], dtype='<i8').tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            # The only step readers can observe: the whole new store replaces the old one
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._load()
+        return len(ids)
+
+    def search(self, queries, k=10):
+        """
+        The k stored vectors most similar (dot product, i.e. cosine) to each query.
+
+        The matrix is scanned block_rows rows at a time; each block's k best
+        are picked with argpartition and merged into the running top k, so
+        memory stays at one block whatever the corpus size.
+
+        Args:
+            queries: One vector or a (queries, dimensions) matrix
+
+        Returns:
+            tuple: (ids, scores), best first; 1-D for one vector, else one row per query
+        """
+        self.reload_if_changed()
+        with self._lock:
+            matrix, ids = self._matrix, self._ids
+        single = np.ndim(queries) == 1
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        k = max(0, min(k, len(ids)))
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        for start in range(0, len(ids) if k else 0, self.block_rows):
+            scores = queries @ np.asarray(matrix[start:start + self.block_rows]).T
+            if scores.shape[1] > k:
+                rows = np.argpartition(scores, -k, axis=1)[:, -k:]
+                scores = np.take_along_axis(scores, rows, axis=1)
+            else:
+                rows = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+            best_scores = np.concatenate([best_scores, scores], axis=1)
+            best_rows = np.concatenate([best_rows, rows + start], axis=1)
+            if best_scores.shape[1] > k:
+                keep = np.argpartition(best_scores, -k, axis=1)[:, -k:]
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+                best_rows = np.take_along_axis(best_rows, keep, axis=1)
+        order = np.argsort(-best_scores, axis=1, kind='stable')
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_ids = ids[np.take_along_axis(best_rows, order, axis=1)]
+        return (best_ids[0], best_scores[0]) if single else (best_ids, best_scores)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def summary(self):
+        """Size and width (for /health)."""
+        self.reload_if_changed()
+        return {'vectors': len(self), 'dimensions': self.dimensions, 'path': self.path}
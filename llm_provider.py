@@ -0,0 +1,301 @@
+"""
+LLM provider abstraction for Career AI Agent
+Gemini, OpenAI and a deterministic local fake behind one generate_content API
+"""
+
+import datetime
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+from config import Config
+from llm_transport import TransientLLMError
+from prompt_budget import estimate_tokens
+from structured_output import SCHEMAS
+
+
+class RateLimitError(TransientLLMError):
+    """Provider rejected the call with HTTP 429."""
+    code = 429
+
+
+class ProviderUnavailableError(TransientLLMError):
+    """Provider failed with HTTP 503."""
+    code = 503
+
+
+def _response(text, model_name, input_tokens=None, output_tokens=None, cached_tokens=None):
+    """Gemini-shaped response object (``.text`` plus ``.usage_metadata``)."""
+    return SimpleNamespace(
+        text=text,
+        model_name=model_name,
+        usage_metadata=SimpleNamespace(prompt_token_count=input_tokens, candidates_token_count=output_tokens,
+                                       cached_content_token_count=cached_tokens),
+    )
+
+
+# Smallest prompt prefix (tokens) Gemini will create a context cache for
+GEMINI_MIN_CACHE_TOKENS = {'pro': 4096, 'flash': 1024}
+
+
+def _prefix_id(prefix):
+    return hashlib.sha256(prefix.encode('utf-8')).hexdigest()[:12]
+
+
+class GeminiProvider:
+    """Google Gemini through google-generativeai."""
+
+    def __init__(self, model_name=None, api_key=None):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key or Config.GOOGLE_API_KEY)
+        self.model_name = model_name or Config.GOOGLE_MODEL
+        self._model = genai.GenerativeModel(self.model_name)
+
+    def generate_content(self, prompt, generation_config=None, request_options=None):
+        return self._model.generate_content(prompt, generation_config=generation_config,
+                                            request_options=request_options)
+
+    @property
+    def min_cache_tokens(self):
+        """Smallest prefix the API accepts for a context cache (smaller ones are rejected)."""
+        return GEMINI_MIN_CACHE_TOKENS['pro' if '-pro' in self.model_name else 'flash']
+
+    def cache_prefix(self, prefix, ttl_seconds):
+        """
+        Create a Gemini context cache for a static prompt prefix.
+
+        Returns a provider that only needs the dynamic suffix. Raises if the
+        API rejects the cache (e.g. the prefix is below the minimum size).
+        """
+        import google.generativeai as genai
+        from google.generativeai import caching
+
+        model = self.model_name if self.model_name.startswith('models/') else f"models/{self.model_name}"
+        cache = caching.CachedContent.create(model=model, contents=[prefix],
+                                             ttl=datetime.timedelta(seconds=ttl_seconds))
+        bound = GeminiProvider.__new__(GeminiProvider)
+        bound.model_name = f"{self.model_name}#{_prefix_id(prefix)}"
+        bound._model = genai.GenerativeModel.from_cached_content(cached_content=cache)
+        return bound
+
+
+class OpenAIProvider:
+    """OpenAI chat completions exposed through the Gemini-style interface."""
+
+    def __init__(self, model_name=None, api_key=None):
+        import openai
+
+        self.model_name = model_name or Config.OPENAI_MODEL
+        self._client = openai.OpenAI(api_key=api_key or Config.OPENAI_API_KEY)
+
+    def generate_content(self, prompt, generation_config=None, request_options=None):
+        config = generation_config or {}
+        kwargs = {}
+        if config.get('max_output_tokens'):
+            kwargs['max_tokens'] = config['max_output_tokens']
+        # OpenAI JSON mode only supports top-level objects
+        if config.get('response_schema', {}).get('type') == 'object':
+            kwargs['response_format'] = {"type": "json_object"}
+        if request_options and request_options.get('timeout'):
+            kwargs['timeout'] = request_options['timeout']
+
+        completion = self._client.chat.completions.create(
+            model=self.model_name,
+            messages=[{"role": "user", "content": prompt}],
+            **kwargs
+        )
+        usage = completion.usage
+        # OpenAI caches long shared prompt prefixes automatically and reports the cached part
+        details = getattr(usage, 'prompt_tokens_details', None)
+        return _response(completion.choices[0].message.content, self.model_name,
+                         usage.prompt_tokens if usage else None, usage.completion_tokens if usage else None,
+                         getattr(details, 'cached_tokens', None))
+
+
+def detect_prompt_type(prompt):
+    """Guess which SCHEMAS entry a prompt asks for from the JSON keys it mentions."""
+    best_type, best_score = None, 0
+    for prompt_type, schema in SCHEMAS.items():
+        if schema['type'] != 'object':
+            continue
+        score = sum(1 for key in schema['properties'] if f'"{key}"' in prompt)
+        if score > best_score:
+            best_type, best_score = prompt_type, score
+    if best_type is None and 'JSON array' in prompt:
+        return 'job_titles'
+    return best_type
+
+
+# "[index N]" headers mark the items of a batched prompt (see batch_reports.py)
+BATCH_INDEX = re.compile(r'^\[index (\d+)\]', re.MULTILINE)
+
+
+def fake_instance(schema, name='value', index=0):
+    """Build a deterministic value that validates against a SCHEMAS-style schema."""
+    schema_type = schema.get('type')
+    if schema_type == 'object':
+        return {key: fake_instance(sub_schema, key, index) for key, sub_schema in schema['properties'].items()}
+    if schema_type == 'array':
+        return [fake_instance(schema['items'], name, i) for i in range(3)]
+    if schema_type in ('number', 'integer'):
+        return index + 1
+    if schema_type == 'boolean':
+        return index % 2 == 0
+    label = name.replace('_', ' ').capitalize()
+    return f"{label} {index + 1}" if index else label
+
+
+class FakeProvider:
+    """
+    Deterministic offline LLM for load tests and benchmarks.
+
+    Replies are schema-valid JSON for the requested response_schema (or the
+    prompt type detected from the prompt), plain text otherwise. Latency is
+    drawn from a fixed, lognormal or heavy-tailed (Pareto) distribution, plus
+    ms_per_output_token for each reply token, and a seeded RNG decides which
+    calls fail with 503s or 429s.
+    """
+
+    def __init__(self, model_name='fake-llm', latency='fixed', latency_ms=50.0, sigma=0.5, tail_alpha=1.5,
+                 max_latency_ms=60000.0, error_rate=0.0, rate_limit_rate=0.0, seed=0, ms_per_output_token=0.0,
+                 sleep=time.sleep, min_cache_tokens=0):
+        if latency not in ('fixed', 'lognormal', 'heavy_tail'):
+            raise ValueError(f"Unknown latency distribution: {latency}")
+        self.model_name = model_name
+        self.latency = latency
+        self.latency_ms = latency_ms
+        self.sigma = sigma
+        self.tail_alpha = tail_alpha
+        self.max_latency_ms = max_latency_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.ms_per_output_token = ms_per_output_token
+        self.sleep = sleep
+        self.min_cache_tokens = min_cache_tokens
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {'calls': 0, 'errors': 0, 'rate_limited': 0, 'input_tokens': 0, 'output_tokens': 0,
+                      'cached_input_tokens': 0, 'prefix_caches': 0}
+        self.prompts = []
+
+    def sample_latency_ms(self):
+        """Draw one latency from the configured distribution."""
+        with self._lock:
+            if self.latency == 'fixed':
+                value = self.latency_ms
+            elif self.latency == 'lognormal':
+                # latency_ms is the median
+                value = self._rng.lognormvariate(math.log(self.latency_ms), self.sigma)
+            else:
+                # Pareto with scale latency_ms: most calls are fast, a few are very slow
+                value = self.latency_ms * self._rng.paretovariate(self.tail_alpha)
+        return min(value, self.max_latency_ms)
+
+    def _draw_failure(self):
+        with self._lock:
+            roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            return RateLimitError("Fake provider: 429 rate limit exceeded")
+        if roll < self.rate_limit_rate + self.error_rate:
+            return ProviderUnavailableError("Fake provider: 503 service unavailable")
+        return None
+
+    def cache_prefix(self, prefix, ttl_seconds=None):
+        """Simulated context cache: the returned provider bills the prefix as cached input."""
+        with self._lock:
+            self.stats['prefix_caches'] += 1
+        return _CachedPrefixFake(self, prefix)
+
+    def generate_content(self, prompt, generation_config=None, request_options=None):
+        return self._generate(prompt, generation_config, request_options)
+
+    def _reply(self, prompt, generation_config):
+        schema = (generation_config or {}).get('response_schema')
+        if schema is None:
+            schema = SCHEMAS.get(detect_prompt_type(prompt))
+        if schema is None:
+            return f"Fake reply from {self.model_name}."
+        indices = BATCH_INDEX.findall(prompt)
+        if indices and schema['type'] == 'array' and 'index' in schema['items'].get('properties', {}):
+            # Batched prompt: one item per "[index N]" block, echoing its index
+            return json.dumps([dict(fake_instance(schema['items'], 'item', position), index=int(index))
+                               for position, index in enumerate(indices)])
+        return json.dumps(fake_instance(schema))
+
+    def _generate(self, prompt, generation_config=None, request_options=None, cached_prefix=''):
+        text = self._reply(prompt, generation_config)
+        cached_tokens = estimate_tokens(cached_prefix) if cached_prefix else 0
+        input_tokens, output_tokens = cached_tokens + estimate_tokens(prompt), estimate_tokens(text)
+
+        # Fixed/sampled time to first token plus generation time for the reply
+        latency = (self.sample_latency_ms() + output_tokens * self.ms_per_output_token) / 1000.0
+        timeout = (request_options or {}).get('timeout')
+        if timeout is not None and latency > timeout:
+            self.sleep(timeout)
+            raise TimeoutError(f"Fake provider: no reply within {timeout:.2f}s")
+        self.sleep(latency)
+
+        failure = self._draw_failure()
+        with self._lock:
+            self.stats['calls'] += 1
+            self.prompts.append(prompt)
+            if isinstance(failure, RateLimitError):
+                self.stats['rate_limited'] += 1
+            elif failure is not None:
+                self.stats['errors'] += 1
+        if failure is not None:
+            raise failure
+
+        with self._lock:
+            self.stats['input_tokens'] += input_tokens
+            self.stats['output_tokens'] += output_tokens
+            self.stats['cached_input_tokens'] += cached_tokens
+        return _response(text, self.model_name, input_tokens, output_tokens, cached_tokens)
+
+
+class _CachedPrefixFake:
+    """A FakeProvider bound to a cached prefix; callers send only the suffix."""
+
+    def __init__(self, provider, prefix):
+        self.provider = provider
+        self.prefix = prefix
+        self.model_name = f"{provider.model_name}#{_prefix_id(prefix)}"
+
+    def generate_content(self, prompt, generation_config=None, request_options=None):
+        return self.provider._generate(prompt, generation_config, request_options, cached_prefix=self.prefix)
+
+
+def create_fake_provider(model_name='fake-llm'):
+    """FakeProvider configured from the FAKE_LLM_* settings."""
+    return FakeProvider(
+        model_name=model_name,
+        latency=Config.FAKE_LLM_LATENCY,
+        latency_ms=Config.FAKE_LLM_LATENCY_MS,
+        sigma=Config.FAKE_LLM_SIGMA,
+        error_rate=Config.FAKE_LLM_ERROR_RATE,
+        rate_limit_rate=Config.FAKE_LLM_RATE_LIMIT_RATE,
+        seed=Config.FAKE_LLM_SEED,
+    )
+
+
+def create_provider(name=None, model_name=None, api_key=None):
+    """
+    Create the LLM provider selected by LLM_PROVIDER (gemini, openai or fake).
+
+    Raises:
+        ValueError: If the provider name is unknown
+    """
+    name = (name or Config.LLM_PROVIDER).lower()
+    if name == 'gemini':
+        return GeminiProvider(model_name, api_key)
+    if name == 'openai':
+        return OpenAIProvider(model_name, api_key)
+    if name == 'fake':
+        return create_fake_provider(model_name or 'fake-llm')
+    raise ValueError(f"Unknown LLM provider: {name}")
@@ -0,0 +1,320 @@
+"""
+Resilient LLM transport for Career AI Agent
+Deadlines, jittered retries, a circuit breaker and optional hedged requests
+around every generate_content call
+"""
+
+import contextvars
+import inspect
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+
+from config import Config
+from llm_usage import note_retry
+
+
+class TransientLLMError(Exception):
+    """Retryable provider failure (rate limit, overload, timeout)."""
+
+
+class CircuitOpenError(RuntimeError):
+    """The circuit breaker is open; callers should use their local fallback."""
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    """The request deadline passed before the LLM answered."""
+
+
+class LLMOverloaded(RuntimeError):
+    """Every LLM call slot is taken (including calls the caller gave up on); use the local fallback."""
+
+
+# Provider exception names and HTTP codes that are worth retrying
+TRANSIENT_ERROR_NAMES = {
+    'ResourceExhausted', 'ServiceUnavailable', 'InternalServerError', 'DeadlineExceeded', 'TooManyRequests',
+    'GatewayTimeout', 'RateLimitError', 'APITimeoutError', 'APIConnectionError',
+}
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+def is_transient(error):
+    """Return True if an exception from the provider is worth retrying."""
+    if isinstance(error, (TransientLLMError, TimeoutError, ConnectionError)):
+        return True
+    if type(error).__name__ in TRANSIENT_ERROR_NAMES:
+        return True
+    code = getattr(error, 'code', None) or getattr(error, 'status_code', None)
+    return isinstance(code, int) and code in TRANSIENT_STATUS_CODES
+
+
+class Deadline:
+    """An absolute point in time by which an LLM answer is needed."""
+
+    def __init__(self, seconds):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+
+_current_deadline = contextvars.ContextVar('llm_deadline', default=None)
+
+
+def current_deadline():
+    """The deadline set for the current request, if any."""
+    return _current_deadline.get()
+
+
+def set_request_deadline(seconds):
+    """Start a deadline for the rest of the current request (e.g. in before_request)."""
+    _current_deadline.set(Deadline(seconds))
+
+
+@contextmanager
+def request_deadline(seconds):
+    """Scope a deadline to a block of code."""
+    token = _current_deadline.set(Deadline(seconds))
+    try:
+        yield _current_deadline.get()
+    finally:
+        _current_deadline.reset(token)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Opens after failure_threshold transient failures in a row, fails fast
+    while open, and lets a single probe through after reset_seconds. The
+    probe closes the breaker on success and reopens it on any error; a
+    probe that hasn't reported back after probe_timeout seconds is given
+    up on and another one is let through.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_seconds=30.0, clock=time.monotonic, probe_timeout=None):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.probe_timeout = probe_timeout or reset_seconds
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started_at = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Return True if a request may go to the provider."""
+        with self._lock:
+            now = self.clock()
+            if (self.state == self.OPEN and now - self.opened_at >= self.reset_seconds or
+                    self.state == self.HALF_OPEN and now - self.probe_started_at >= self.probe_timeout):
+                self.state = self.HALF_OPEN
+                self.probe_started_at = now
+                return True
+            return self.state == self.CLOSED
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    print(f"🔌 LLM circuit breaker opened after {self.failures} failures")
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+    def record_error(self):
+        """
+        A non-transient error: the provider answered, so it doesn't count
+        toward opening, but a half-open probe has still failed and reopens.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+
+def accepts_request_options(model):
+    try:
+        return 'request_options' in inspect.signature(model.generate_content).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+class ResilientTransport:
+    """
+    Wraps Gemini-style generate_content calls.
+
+    Each call gets a deadline (the request's, or default_deadline seconds),
+    transient errors are retried with full-jitter exponential backoff while
+    time remains, the circuit breaker fails fast under sustained errors and,
+    if hedge_after is set, a duplicate request is fired when the first one is
+    slower than hedge_after seconds.
+
+    A call abandoned at its deadline keeps its worker until the SDK returns,
+    so at most max_workers calls run at once and further calls fail fast with
+    LLMOverloaded instead of queueing behind stuck ones. Local deadline
+    expiry and overload say nothing about the provider's health and are not
+    counted by the breaker.
+    """
+
+    def __init__(self, default_deadline=30.0, max_retries=2, base_delay=0.5, max_delay=4.0,
+                 breaker=None, hedge_after=None, max_workers=16, sleep=time.sleep, rng=None):
+        self.default_deadline = default_deadline
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker()
+        self.hedge_after = hedge_after
+        self.sleep = sleep
+        self.rng = rng or random.Random()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='llm')
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self.stats = {'calls': 0, 'retries': 0, 'hedges': 0, 'hedge_wins': 0, 'timeouts': 0, 'short_circuited': 0,
+                      'overloaded': 0}
+        self._stats_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls):
+        return cls(
+            default_deadline=Config.LLM_REQUEST_DEADLINE_SECONDS,
+            max_retries=Config.LLM_MAX_RETRIES,
+            base_delay=Config.LLM_RETRY_BASE_DELAY,
+            # A probe may be a background job's call, so it gets the longest LLM deadline
+            breaker=CircuitBreaker(Config.LLM_CIRCUIT_FAILURE_THRESHOLD, Config.LLM_CIRCUIT_RESET_SECONDS,
+                                   probe_timeout=max(Config.LLM_REQUEST_DEADLINE_SECONDS,
+                                                     Config.JOB_LLM_DEADLINE_SECONDS)),
+            hedge_after=Config.LLM_HEDGE_AFTER_SECONDS,
+            max_workers=Config.LLM_MAX_IN_FLIGHT,
+        )
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def backoff(self, attempt):
+        """Full-jitter backoff delay for a retry attempt (0-based)."""
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def generate_content(self, model, prompt, generation_config=None, deadline=None):
+        """
+        Call model.generate_content with deadline, retries, breaker and hedging.
+
+        Raises:
+            CircuitOpenError: If the breaker is open
+            LLMDeadlineExceeded: If no answer arrived before the deadline
+            LLMOverloaded: If max_workers calls are already running
+            Exception: Non-transient provider errors, or the last transient one
+        """
+        deadline = deadline or current_deadline() or Deadline(self.default_deadline)
+        # Routed model tiers bring their own, possibly tighter, latency limit
+        limit = getattr(model, 'latency_limit_seconds', None)
+        if limit and limit < deadline.remaining():
+            deadline = Deadline(limit)
+        self._count('calls')
+
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                self._count('short_circuited')
+                raise CircuitOpenError("LLM circuit breaker is open")
+            if deadline.expired():
+                self._count('timeouts')
+                raise LLMDeadlineExceeded("LLM request deadline exceeded")
+
+            try:
+                response = self._attempt(model, prompt, generation_config, deadline)
+            except LLMDeadlineExceeded:
+                # Our deadline, not a provider failure: the breaker isn't told
+                self._count('timeouts')
+                raise
+            except LLMOverloaded:
+                self._count('overloaded')
+                raise
+            except Exception as error:
+                if not is_transient(error):
+                    self.breaker.record_error()
+                    raise
+                self.breaker.record_failure()
+                delay = self.backoff(attempt)
+                if attempt == self.max_retries or delay >= deadline.remaining():
+                    print(f"❌ LLM call failed after {attempt + 1} attempt(s): {type(error).__name__}: {error}")
+                    raise
+                print(f"🔁 Transient LLM error ({type(error).__name__}), retrying in {delay:.2f}s")
+                self._count('retries')
+                note_retry()
+                self.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            return response
+
+    def _submit(self, model, prompt, generation_config, deadline):
+        kwargs = {}
+        if generation_config is not None:
+            kwargs['generation_config'] = generation_config
+        if accepts_request_options(model):
+            kwargs['request_options'] = {'timeout': deadline.remaining()}
+        # A slot is held until the SDK call returns, even after its caller gave up on it
+        if not self._slots.acquire(blocking=False):
+            raise LLMOverloaded("Too many LLM calls still running")
+        context = contextvars.copy_context()
+        try:
+            future = self._executor.submit(context.run, model.generate_content, prompt, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _attempt(self, model, prompt, generation_config, deadline):
+        primary = self._submit(model, prompt, generation_config, deadline)
+        if not self.hedge_after or self.hedge_after >= deadline.remaining():
+            try:
+                return primary.result(timeout=deadline.remaining())
+            except FutureTimeoutError:
+                raise LLMDeadlineExceeded("LLM request deadline exceeded") from None
+
+        done, _ = wait([primary], timeout=self.hedge_after)
+        if done:
+            return primary.result()
+
+        # Primary is slow: fire a hedge and take whichever answers first
+        try:
+            hedge = self._submit(model, prompt, generation_config, deadline)
+        except LLMOverloaded:
+            # No slot for a hedge: keep waiting on the primary
+            try:
+                return primary.result(timeout=deadline.remaining())
+            except FutureTimeoutError:
+                raise LLMDeadlineExceeded("LLM request deadline exceeded") from None
+        self._count('hedges')
+        pending = {primary, hedge}
+        last_error = None
+        while pending:
+            done, pending = wait(pending, timeout=deadline.remaining(), return_when=FIRST_COMPLETED)
+            if not done:
+                raise LLMDeadlineExceeded("LLM request deadline exceeded")
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self._count('hedge_wins')
+                    return future.result()
+                last_error = future.exception()
+        raise last_error
+
+
+# Shared transport used by every LLM call site
+llm_transport = ResilientTransport.from_config()
@@ -0,0 +1,211 @@
+"""
+LLM usage and latency accounting for Career AI Agent
+Records prompt type, model, tokens, latency, cache status, retries and
+parse failures for every LLM call, tagged by endpoint and session user
+"""
+
+import contextvars
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+from config import Config
+from prompt_budget import estimate_tokens
+
+# Latency samples kept per aggregate for percentiles
+LATENCY_WINDOW = 1000
+
+_usage_context = contextvars.ContextVar('llm_usage_context', default=('unknown', None))
+_current_call = contextvars.ContextVar('llm_usage_call', default=None)
+
+
+def set_usage_context(endpoint, user=None):
+    """Tag LLM calls made by the rest of the current request (e.g. in before_request)."""
+    _usage_context.set((endpoint or 'unknown', user))
+
+
+@contextmanager
+def usage_context(endpoint, user=None):
+    """Tag LLM calls made inside a block (background jobs, schedulers, CLIs)."""
+    token = _usage_context.set((endpoint or 'unknown', user))
+    try:
+        yield
+    finally:
+        _usage_context.reset(token)
+
+
+def note_retry():
+    """Count a transport retry against the LLM call in progress."""
+    call = _current_call.get()
+    if call is not None:
+        call['retries'] += 1
+
+
+def note_parse_failure():
+    """Count an unparseable or invalid reply against the LLM call in progress."""
+    call = _current_call.get()
+    if call is not None:
+        call['parse_failures'] += 1
+
+
+def note_response(response, prompt):
+    """Add a provider response's token counts (estimated if the provider reports none)."""
+    call = _current_call.get()
+    if call is None:
+        return
+    usage = getattr(response, 'usage_metadata', None)
+    input_tokens = getattr(usage, 'prompt_token_count', None)
+    output_tokens = getattr(usage, 'candidates_token_count', None)
+    call['input_tokens'] += input_tokens if input_tokens is not None else estimate_tokens(prompt)
+    call['output_tokens'] += output_tokens if output_tokens is not None else estimate_tokens(
+        getattr(response, 'text', '') or '')
+    call['cached_tokens'] += getattr(usage, 'cached_content_token_count', None) or 0
+    call['requests'] += 1
+
+
+def set_cache_status(status):
+    """Mark how the call in progress was served: miss, shared, hit, replay, ..."""
+    call = _current_call.get()
+    if call is not None:
+        call['cache'] = status
+
+
+def _percentile(ordered, pct):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+class UsageAccountant:
+    """
+    Aggregates LLM usage in memory and appends one compact JSON line per call.
+
+    Aggregates are kept per (endpoint, prompt_type, model) and per user;
+    log lines use short keys: t, ep, u, pt, m, in, cin (cached input), out,
+    ms, c, r, pf, ok.
+    """
+
+    def __init__(self, log_path=None):
+        self.log_path = log_path
+        self._lock = threading.Lock()
+        self._log_file = None
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._routes = defaultdict(self._empty)
+            self._users = defaultdict(self._empty)
+
+    @staticmethod
+    def _empty():
+        return {'calls': 0, 'errors': 0, 'input_tokens': 0, 'output_tokens': 0, 'cached_tokens': 0,
+                'retries': 0, 'parse_failures': 0, 'latency_ms_total': 0.0, 'cache': defaultdict(int),
+                'latencies': deque(maxlen=LATENCY_WINDOW)}
+
+    @contextmanager
+    def track(self, prompt_type, model_name):
+        """
+        Account one logical LLM call (including re-asks and retries).
+
+        Nested tracking is ignored so only the outermost call is counted.
+        """
+        if _current_call.get() is not None:
+            yield _current_call.get()
+            return
+        endpoint, user = _usage_context.get()
+        call = {'endpoint': endpoint, 'user': user, 'prompt_type': prompt_type, 'model': model_name,
+                'input_tokens': 0, 'output_tokens': 0, 'cached_tokens': 0, 'requests': 0, 'retries': 0,
+                'parse_failures': 0, 'cache': 'miss', 'ok': True}
+        token = _current_call.set(call)
+        started = time.perf_counter()
+        try:
+            yield call
+        except BaseException:
+            call['ok'] = False
+            raise
+        finally:
+            _current_call.reset(token)
+            call['latency_ms'] = (time.perf_counter() - started) * 1000
+            self.record(call)
+
+    def record(self, call):
+        """Fold one finished call into the aggregates and the log."""
+        with self._lock:
+            for entry in (self._routes[(call['endpoint'], call['prompt_type'], call['model'])],
+                          self._users[call['user'] or 'anonymous']):
+                entry['calls'] += 1
+                entry['errors'] += 0 if call['ok'] else 1
+                entry['input_tokens'] += call['input_tokens']
+                entry['output_tokens'] += call['output_tokens']
+                entry['cached_tokens'] += call['cached_tokens']
+                entry['retries'] += call['retries']
+                entry['parse_failures'] += call['parse_failures']
+                entry['latency_ms_total'] += call['latency_ms']
+                entry['cache'][call['cache']] += 1
+                entry['latencies'].append(call['latency_ms'])
+            self._write(call)
+
+    def _write(self, call):
+        if not self.log_path:
+            return
+        line = json.dumps({
+            't': round(time.time(), 3), 'ep': call['endpoint'], 'u': call['user'], 'pt': call['prompt_type'],
+            'm': call['model'], 'in': call['input_tokens'], 'cin': call['cached_tokens'],
+            'out': call['output_tokens'], 'ms': round(call['latency_ms'], 1), 'c': call['cache'], 'r': call['retries'],
+            'pf': call['parse_failures'], 'ok': int(call['ok']),
+        }, separators=(',', ':'))
+        try:
+            if self._log_file is None:
+                self._log_file = open(self.log_path, 'a', encoding='utf-8')
+            self._log_file.write(line + '\n')
+            self._log_file.flush()
+        except OSError as e:
+            print(f"⚠️  Could not write LLM usage log: {e}")
+
+    @staticmethod
+    def _summarize(entry):
+        ordered = sorted(entry['latencies'])
+        calls = entry['calls']
+        return {
+            'calls': calls,
+            'errors': entry['errors'],
+            'input_tokens': entry['input_tokens'],
+            'output_tokens': entry['output_tokens'],
+            'cached_tokens': entry['cached_tokens'],
+            'retries': entry['retries'],
+            'parse_failures': entry['parse_failures'],
+            'cache': dict(entry['cache']),
+            'latency_ms': {
+                'mean': round(entry['latency_ms_total'] / calls, 1) if calls else 0.0,
+                'p50': round(_percentile(ordered, 50), 1),
+                'p95': round(_percentile(ordered, 95), 1),
+                'max': round(ordered[-1], 1) if ordered else 0.0,
+            },
+        }
+
+    def snapshot(self):
+        """Aggregates by route (endpoint / prompt type / model), by prompt type and by user."""
+        with self._lock:
+            routes = [{'endpoint': endpoint, 'prompt_type': prompt_type, 'model': model, **self._summarize(entry)}
+                      for (endpoint, prompt_type, model), entry in self._routes.items()]
+            by_type = defaultdict(self._empty)
+            for (_, prompt_type, _), entry in self._routes.items():
+                merged = by_type[prompt_type]
+                for key in ('calls', 'errors', 'input_tokens', 'output_tokens', 'cached_tokens', 'retries',
+                            'parse_failures',
+                            'latency_ms_total'):
+                    merged[key] += entry[key]
+                for status, count in entry['cache'].items():
+                    merged['cache'][status] += count
+                merged['latencies'].extend(entry['latencies'])
+            return {
+                'routes': sorted(routes, key=lambda route: -route['latency_ms']['mean'] * route['calls']),
+                'prompt_types': {prompt_type: self._summarize(entry) for prompt_type, entry in by_type.items()},
+                'users': {user: self._summarize(entry) for user, entry in self._users.items()},
+            }
+
+
+# Shared accountant used by every LLM call site
+llm_usage = UsageAccountant(Config.LLM_USAGE_LOG or None)
@@ -7,8 +7,10 @@ A Python application for career analysis and guidance using AI.
 import os
 import spacy
 import requests
-import openai
 from dotenv import load_dotenv
+from llm_provider import create_provider
+from llm_transport import llm_transport
+from llm_usage import llm_usage, note_response
 
 # Load environment variables
 load_dotenv()
@@ -18,19 +20,20 @@ class CareerAIAgent:
     
     def __init__(self):
         """Initialize the Career AI Agent."""
-        self.openai_client = None
+        self.llm = None
         self.nlp_model = None
         self.setup_openai()
         self.setup_spacy()
     
     def setup_openai(self):
-        """Set up OpenAI client with API key."""
-        api_key = os.getenv('OPENAI_API_KEY')
-        if api_key:
-            self.openai_client = openai.OpenAI(api_key=api_key)
-            print("OpenAI client initialized successfully.")
-        else:
+        """Set up the LLM provider (OpenAI unless LLM_PROVIDER selects another backend)."""
+        provider = os.getenv('LLM_PROVIDER', 'openai')
+        if provider == 'openai' and not os.getenv('OPENAI_API_KEY'):
             print("Warning: OPENAI_API_KEY not found in environment variables.")
+            return
+        self.llm = create_provider(provider, model_name=os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo')
+                                   if provider == 'openai' else None)
+        print(f"LLM provider '{provider}' initialized successfully.")
     
     def setup_spacy(self):
         """Set up spaCy NLP model for text processing."""
@@ -60,21 +63,20 @@ class CareerAIAgent:
         return analysis
     
     def get_career_advice(self, query):
-        """Get career advice using OpenAI API."""
-        if not self.openai_client:
-            print("OpenAI client not available. Please set OPENAI_API_KEY.")
+        """Get career advice using the configured LLM provider."""
+        if not self.llm:
+            print("LLM provider not available. Please set OPENAI_API_KEY or LLM_PROVIDER=fake.")
             return None
         
         try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a helpful career advisor with expertise in job searching, resume writing, and professional development."},
-                    {"role": "user", "content": query}
-                ],
-                max_tokens=500
+            prompt = (
+                "You are a helpful career advisor with expertise in job searching, resume writing, "
+                f"and professional development.\n\n{query}"
             )
-            return response.choices[0].message.content
+            with llm_usage.track('career_advice', self.llm.model_name):
+                response = llm_transport.generate_content(self.llm, prompt, generation_config={'max_output_tokens': 500})
+                note_response(response, prompt)
+            return response.text
         except Exception as e:
             print(f"Error getting career advice: {e}")
             return None
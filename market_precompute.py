@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Precomputed market intelligence for Career AI Agent
+Market intelligence depends only on (industry, role), so it is generated
+offline on a schedule and served from memory
+"""
+
+import argparse
+import json
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+from config import Config
+from llm_usage import usage_context
+from structured_output import generate_json
+
+
+def build_market_intelligence_prompt(industry, role):
+    """Prompt for the market intelligence report of one (industry, role) pair."""
+    return f"""
+        As a market intelligence expert, provide comprehensive market data for {industry} industry and {role} roles.
+
+        Return JSON with:
+        {{
+            "startup_landscape": {{
+                "funding_trends": "Recent funding activity and trends",
+                "hot_startups": ["List of notable startups"],
+                "investment_focus": "What investors are focusing on"
+            }},
+            "job_market": {{
+                "hiring_trends": "Current hiring patterns",
+                "layoff_impact": "Recent layoffs and their impact",
+                "demand_forecast": "Future demand predictions",
+                "competition_level": "How competitive the market is"
+            }},
+            "macroeconomic_factors": {{
+                "regulations": "New laws and regulations affecting the industry",
+                "market_forces": "Economic forces shaping the industry",
+                "ai_impact": "How AI is changing the landscape",
+                "global_trends": "International market trends"
+            }},
+            "compensation_insights": {{
+                "salary_trends": "Current salary trends and changes",
+                "benefits_evolution": "How benefits are changing",
+                "equity_trends": "Stock options and equity trends",
+                "remote_work_impact": "How remote work affects compensation"
+            }},
+            "culture_alignment": {{
+                "company_cultures": "Types of company cultures in this space",
+                "work_life_balance": "WLB trends and expectations",
+                "value_alignment": "How to find culture fit",
+                "diversity_initiatives": "DEI trends and initiatives"
+            }},
+            "newsletter_content": {{
+                "key_headlines": ["Important industry news"],
+                "trending_topics": ["What's trending in the industry"],
+                "expert_insights": "Insights from industry experts"
+            }}
+        }}
+        """
+
+
+def generate_market_intelligence_report(model, industry, role):
+    """Call the LLM for one pair's market intelligence (raises StructuredOutputError)."""
+    return generate_json(model, build_market_intelligence_prompt(industry, role), 'market_intelligence')
+
+
+def parse_pairs(spec):
+    """Parse "Industry:Role,Industry:Role" into a list of (industry, role) tuples."""
+    pairs = []
+    for item in (spec or '').split(','):
+        if ':' in item:
+            industry, role = item.split(':', 1)
+            if industry.strip() and role.strip():
+                pairs.append((industry.strip(), role.strip()))
+    return pairs
+
+
+def _key(industry, role):
+    return (industry or '').strip().lower(), (role or '').strip().lower()
+
+
+class MarketIntelligenceStore:
+    """
+    Market intelligence per (industry, role), persisted in SQLite and held in memory.
+
+    Reads are plain dict lookups. Pairs that are requested but missing are
+    added to the pair table so the scheduler keeps them warm from then on.
+    Returned reports are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, db_path, max_age_seconds=86400, pairs=None):
+        self.db_path = db_path
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._reports = {}
+        self._pairs = {}
+        self._scheduler = None
+        self._stop = threading.Event()
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'generated': 0, 'failed': 0}
+        self._load()
+        for industry, role in pairs or []:
+            self.add_pair(industry, role)
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def _load(self):
+        with closing(self._connect()) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS market_pairs (
+                    industry_key TEXT NOT NULL,
+                    role_key TEXT NOT NULL,
+                    industry TEXT NOT NULL,
+                    role TEXT NOT NULL,
+                    added_at REAL NOT NULL,
+                    PRIMARY KEY (industry_key, role_key)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS market_reports (
+                    industry_key TEXT NOT NULL,
+                    role_key TEXT NOT NULL,
+                    report TEXT NOT NULL,
+                    generated_at REAL NOT NULL,
+                    PRIMARY KEY (industry_key, role_key)
+                )
+            """)
+            for industry_key, role_key, industry, role in conn.execute(
+                    "SELECT industry_key, role_key, industry, role FROM market_pairs"):
+                self._pairs[(industry_key, role_key)] = (industry, role)
+            for industry_key, role_key, report, generated_at in conn.execute(
+                    "SELECT industry_key, role_key, report, generated_at FROM market_reports"):
+                self._reports[(industry_key, role_key)] = (json.loads(report), generated_at)
+
+    def add_pair(self, industry, role):
+        """Add an (industry, role) pair to the precompute table."""
+        key = _key(industry, role)
+        with self._lock:
+            if key in self._pairs:
+                return
+            self._pairs[key] = (industry.strip(), role.strip())
+        with closing(self._connect()) as conn:
+            conn.execute("INSERT OR IGNORE INTO market_pairs VALUES (?, ?, ?, ?, ?)",
+                         (*key, industry.strip(), role.strip(), time.time()))
+
+    def pairs(self):
+        with self._lock:
+            return list(self._pairs.values())
+
+    def put(self, industry, role, report, generated_at=None):
+        """Store a freshly generated report."""
+        key = _key(industry, role)
+        generated_at = generated_at or time.time()
+        with self._lock:
+            self._reports[key] = (report, generated_at)
+        with closing(self._connect()) as conn:
+            conn.execute("INSERT OR REPLACE INTO market_reports VALUES (?, ?, ?, ?)",
+                         (*key, json.dumps(report), generated_at))
+
+    def is_stale(self, industry, role, now=None):
+        """True if the pair has no report or its report is older than max_age_seconds."""
+        entry = self._reports.get(_key(industry, role))
+        return entry is None or (now or time.time()) - entry[1] > self.max_age_seconds
+
+    def freshness(self, industry, role):
+        """Metadata about the stored report: generated_at, age_seconds and stale."""
+        entry = self._reports.get(_key(industry, role))
+        if entry is None:
+            return None
+        age = time.time() - entry[1]
+        return {'generated_at': entry[1], 'age_seconds': age, 'stale': age > self.max_age_seconds}
+
+    def get(self, industry, role):
+        """
+        Return the stored report for a pair, or None.
+
+        Stale reports are still returned (the scheduler refreshes them);
+        missing pairs are registered for the next refresh.
+        """
+        entry = self._reports.get(_key(industry, role))
+        if entry is None:
+            self.stats['misses'] += 1
+            self.add_pair(industry, role)
+            return None
+        if time.time() - entry[1] > self.max_age_seconds:
+            self.stats['stale_hits'] += 1
+        else:
+            self.stats['hits'] += 1
+        return entry[0]
+
+    def get_or_generate(self, industry, role, generate_fn):
+        """Serve from memory, calling generate_fn(industry, role) only for missing pairs."""
+        report = self.get(industry, role)
+        if report is None:
+            report = generate_fn(industry, role)
+            if report and 'error' not in report:
+                self.put(industry, role, report)
+                self.stats['generated'] += 1
+        return report
+
+    def refresh(self, generate_fn, force=False):
+        """
+        Regenerate reports for pairs that are missing or stale.
+
+        Returns:
+            int: Number of reports generated
+        """
+        generated = 0
+        for industry, role in self.pairs():
+            if self._stop.is_set():
+                break
+            if not force and not self.is_stale(industry, role):
+                continue
+            try:
+                report = generate_fn(industry, role)
+            except Exception as e:
+                self.stats['failed'] += 1
+                print(f"⚠️  Market intelligence refresh failed for {industry} / {role}: {e}")
+                continue
+            if report and 'error' not in report:
+                self.put(industry, role, report)
+                self.stats['generated'] += 1
+                generated += 1
+        return generated
+
+    def start_scheduler(self, generate_fn, interval_seconds):
+        """Refresh stale pairs in a background thread every interval_seconds (idempotent)."""
+        with self._lock:
+            if self._scheduler is not None:
+                return
+            self._stop.clear()
+            self._scheduler = threading.Thread(
+                target=self._run_scheduler, args=(generate_fn, interval_seconds),
+                name='market-precompute', daemon=True,
+            )
+        self._scheduler.start()
+
+    def _run_scheduler(self, generate_fn, interval_seconds):
+        while not self._stop.is_set():
+            with usage_context('market_precompute'):
+                generated = self.refresh(generate_fn)
+            if generated:
+                print(f"📈 Precomputed market intelligence for {generated} (industry, role) pair(s)")
+            self._stop.wait(interval_seconds)
+
+    def stop_scheduler(self):
+        self._stop.set()
+        if self._scheduler is not None:
+            self._scheduler.join(timeout=5)
+        self._scheduler = None
+
+
+def create_store():
+    """Store configured from Config (database path, max age and seeded pairs)."""
+    return MarketIntelligenceStore(
+        Config.MARKET_INTEL_DB,
+        max_age_seconds=Config.MARKET_INTEL_MAX_AGE_HOURS * 3600,
+        pairs=parse_pairs(Config.MARKET_INTEL_PAIRS),
+    )
+
+
+def main():
+    """Warm up the market intelligence table from the command line."""
+    parser = argparse.ArgumentParser(description="Precompute market intelligence per (industry, role)")
+    parser.add_argument('--force', action='store_true', help="Regenerate every pair, not only stale ones")
+    parser.add_argument('--loop', action='store_true', help="Keep refreshing on the configured schedule")
+    args = parser.parse_args()
+
+    from llm_provider import create_provider
+    from model_router import create_model
+    Config.validate_config()
+    model = create_model(lambda model_name: create_provider(model_name=model_name))
+    store = create_store()
+    generate = lambda industry, role: generate_market_intelligence_report(model, industry, role)
+
+    print(f"📈 Precomputing market intelligence for {len(store.pairs())} pair(s)...")
+    with usage_context('market_precompute'):
+        print(f"✅ Generated {store.refresh(generate, force=args.force)} report(s)")
+    if args.loop:
+        store.start_scheduler(generate, Config.MARKET_INTEL_REFRESH_MINUTES * 60)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            store.stop_scheduler()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+Model routing for Career AI Agent
+Maps each prompt type to a model tier (fast, standard, large) with its own
+latency and output-token limits, steps down to a cheaper tier under load
+and reports latency and cost per route
+"""
+
+import threading
+import time
+from collections import defaultdict, deque
+
+from config import Config
+from llm_transport import accepts_request_options
+from prompt_budget import estimate_tokens
+
+# Cheapest first; an overloaded tier falls back to the one before it
+TIER_ORDER = ['fast', 'standard', 'large']
+
+
+# Per-tier limits
+TIER_LIMITS = {
+    'fast': {'latency_limit_seconds': 10, 'max_output_tokens': 2048, 'max_in_flight': 32},
+    'standard': {'latency_limit_seconds': 25, 'max_output_tokens': 8192, 'max_in_flight': 16},
+    'large': {'latency_limit_seconds': 45, 'max_output_tokens': 8192, 'max_in_flight': 8},
+}
+
+# List prices per model (USD per million input / output tokens); LLM_MODEL_PRICES adds or overrides
+MODEL_PRICES = {
+    'gemini-2.5-flash-lite': (0.10, 0.40),
+    'gemini-2.5-flash': (0.30, 2.50),
+    'gemini-2.5-pro': (1.25, 10.00),
+    'gpt-3.5-turbo': (0.50, 1.50),
+    'gpt-4o-mini': (0.15, 0.60),
+    'gpt-4o': (2.50, 10.00),
+}
+
+# Short structured lists go to the fast tier, long narratives to the large one
+DEFAULT_ROUTES = {
+    'job_titles': 'fast',
+    'job_titles_batch': 'fast',
+    'intelligence_report': 'standard',
+    'intelligence_report_batch': 'standard',
+    'upskilling_plan': 'standard',
+    'job_recommendations': 'standard',
+    'training_recommendations': 'standard',
+    'career_pathway': 'standard',
+    'career_analysis': 'large',
+    'career_surprise_insights': 'large',
+    'market_intelligence': 'large',
+}
+
+# Tier the cost/latency impact is measured against (one large model for everything)
+BASELINE_TIER = 'large'
+
+# Seconds a tier is avoided after the provider rate-limits it
+RATE_LIMIT_COOLDOWN_SECONDS = 30
+
+LATENCY_WINDOW = 1000
+
+
+def parse_routes(spec):
+    """Parse "prompt_type:tier,prompt_type:tier" (unknown tiers are ignored)."""
+    routes = {}
+    for item in (spec or '').split(','):
+        if ':' in item:
+            prompt_type, tier = (part.strip() for part in item.split(':', 1))
+            if prompt_type and tier in TIER_ORDER:
+                routes[prompt_type] = tier
+    return routes
+
+
+def parse_prices(spec):
+    """Parse "model:input/output,model:input/output" (USD per million tokens; malformed items are ignored)."""
+    prices = {}
+    for item in (spec or '').split(','):
+        model_name, _, price = item.rpartition(':')
+        try:
+            usd_input, usd_output = (float(part) for part in price.split('/'))
+        except ValueError:
+            continue
+        if model_name.strip():
+            prices[model_name.strip()] = (usd_input, usd_output)
+    return prices
+
+
+def model_price(model_name, prices):
+    """(input, output) USD per million tokens for a model, matching versioned names by prefix; None if unknown."""
+    if model_name in prices:
+        return prices[model_name]
+    known = [name for name in prices if (model_name or '').startswith(name)]
+    return prices[max(known, key=len)] if known else None
+
+
+def configured_model():
+    """The provider's configured model (GOOGLE_MODEL / OPENAI_MODEL), used by every tier without its own."""
+    return {'gemini': Config.GOOGLE_MODEL, 'openai': Config.OPENAI_MODEL}.get(Config.LLM_PROVIDER.lower())
+
+
+def route_model(model, prompt_type):
+    """The provider a call of this prompt type should use (model itself unless it is a ModelRouter)."""
+    route = getattr(model, 'route', None)
+    return route(prompt_type) if route is not None else model
+
+
+def _is_rate_limit(error):
+    code = getattr(error, 'code', None) or getattr(error, 'status_code', None)
+    return code == 429 or type(error).__name__ in ('RateLimitError', 'ResourceExhausted', 'TooManyRequests')
+
+
+class ModelTier:
+    """One model tier: a provider plus its limits and load."""
+
+    def __init__(self, name, provider, latency_limit_seconds, max_output_tokens, max_in_flight):
+        self.name = name
+        self.provider = provider
+        self.latency_limit_seconds = latency_limit_seconds
+        self.max_output_tokens = max_output_tokens
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.cooldown_until = 0.0
+
+    @property
+    def model_name(self):
+        return getattr(self.provider, 'model_name', self.name)
+
+    def overloaded(self):
+        return self.in_flight >= self.max_in_flight or time.monotonic() < self.cooldown_until
+
+
+class RoutedModel:
+    """
+    A tier's provider bound to one prompt type.
+
+    Caps max_output_tokens at the tier's limit, exposes the tier's latency
+    limit to the transport and records load, latency, tokens and cost.
+    """
+
+    def __init__(self, router, tier, prompt_type, routed_tier, provider=None):
+        self.router = router
+        self.tier = tier
+        self.prompt_type = prompt_type
+        self.routed_tier = routed_tier
+        self.provider = provider or tier.provider
+        self.model_name = getattr(self.provider, 'model_name', tier.name)
+        self.latency_limit_seconds = tier.latency_limit_seconds
+
+    def generate_content(self, prompt, generation_config=None, request_options=None):
+        kwargs = {'request_options': request_options} if request_options and accepts_request_options(
+            self.provider) else {}
+        config = dict(generation_config or {})
+        config['max_output_tokens'] = min(config.get('max_output_tokens') or self.tier.max_output_tokens,
+                                          self.tier.max_output_tokens)
+        with self.router._lock:
+            self.tier.in_flight += 1
+        started = time.perf_counter()
+        response, error = None, None
+        try:
+            response = self.provider.generate_content(prompt, generation_config=config, **kwargs)
+            return response
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.router._finish(self, prompt, response, error, (time.perf_counter() - started) * 1000)
+
+    @property
+    def min_cache_tokens(self):
+        return getattr(self.provider, 'min_cache_tokens', 0)
+
+    def cache_prefix(self, prefix, ttl_seconds):
+        """Cache a prompt prefix with this tier's provider (see prompt_templates)."""
+        cache_prefix = getattr(self.provider, 'cache_prefix', None)
+        bound = cache_prefix(prefix, ttl_seconds) if cache_prefix is not None else None
+        return RoutedModel(self.router, self.tier, self.prompt_type, self.routed_tier, bound) if bound else None
+
+
+class ModelRouter:
+    """
+    Routes prompt types to model tiers.
+
+    route(prompt_type) picks the routed tier, or the closest cheaper tier
+    while the routed one is at its in-flight limit or cooling down after a
+    rate limit. When every cheaper tier is busy too, the routed tier is
+    used anyway. Costs are priced by each tier's model name (MODEL_PRICES
+    plus prices), so tiers sharing a model cost the same.
+    """
+
+    def __init__(self, tiers, routes=None, default_tier='standard', prices=None):
+        self.tiers = {tier.name: tier for tier in tiers}
+        self.prices = dict(MODEL_PRICES, **(prices or {}))
+        self.order = [name for name in TIER_ORDER if name in self.tiers]
+        self.routes = dict(DEFAULT_ROUTES, **(routes or {}))
+        self.default_tier = default_tier if default_tier in self.tiers else self.order[-1]
+        self._lock = threading.Lock()
+        self._stats = defaultdict(lambda: {'calls': 0, 'fallbacks': 0, 'errors': 0, 'input_tokens': 0,
+                                           'output_tokens': 0, 'cost_usd': 0.0,
+                                           'latencies': deque(maxlen=LATENCY_WINDOW)})
+
+    @classmethod
+    def from_config(cls, make_provider):
+        """
+        Router over the configured tiers.
+
+        A tier without its own model (LLM_FAST_MODEL / LLM_STANDARD_MODEL /
+        LLM_LARGE_MODEL) uses the provider's configured model.
+
+        Args:
+            make_provider (callable): make_provider(model_name) -> provider
+        """
+        overrides = {'fast': Config.LLM_FAST_MODEL, 'standard': Config.LLM_STANDARD_MODEL,
+                     'large': Config.LLM_LARGE_MODEL}
+        providers = {}
+        tiers = []
+        for name in TIER_ORDER:
+            model_name = overrides[name] or configured_model()
+            # Tiers that share a model share one provider (and its context caches)
+            if model_name not in providers:
+                providers[model_name] = make_provider(model_name)
+            tiers.append(ModelTier(name, providers[model_name], **TIER_LIMITS[name]))
+        return cls(tiers, parse_routes(Config.LLM_ROUTES), prices=parse_prices(Config.LLM_MODEL_PRICES))
+
+    @property
+    def model_name(self):
+        return self.tiers[self.default_tier].model_name
+
+    def cost(self, model_name, input_tokens, output_tokens):
+        """USD list price of a call (0 for models without a known price)."""
+        usd_input, usd_output = model_price(model_name, self.prices) or (0.0, 0.0)
+        return (input_tokens * usd_input + output_tokens * usd_output) / 1_000_000
+
+    def route(self, prompt_type):
+        """Provider for one call of prompt_type."""
+        routed = self.routes.get(prompt_type, self.default_tier)
+        if routed not in self.tiers:
+            routed = self.default_tier
+        tier = self.tiers[routed]
+        with self._lock:
+            if tier.overloaded():
+                for name in reversed(self.order[:self.order.index(routed)]):
+                    if not self.tiers[name].overloaded():
+                        tier = self.tiers[name]
+                        break
+        return RoutedModel(self, tier, prompt_type, routed)
+
+    def generate_content(self, prompt, generation_config=None):
+        """Direct calls without a prompt type use the default tier."""
+        return self.route(None).generate_content(prompt, generation_config=generation_config)
+
+    def _finish(self, routed_model, prompt, response, error, latency_ms):
+        tier = routed_model.tier
+        usage = getattr(response, 'usage_metadata', None)
+        input_tokens = getattr(usage, 'prompt_token_count', None)
+        output_tokens = getattr(usage, 'candidates_token_count', None)
+        if input_tokens is None:
+            input_tokens = estimate_tokens(prompt)
+        if output_tokens is None:
+            output_tokens = estimate_tokens(getattr(response, 'text', '') or '') if response is not None else 0
+        with self._lock:
+            tier.in_flight -= 1
+            if error is not None and _is_rate_limit(error):
+                tier.cooldown_until = time.monotonic() + RATE_LIMIT_COOLDOWN_SECONDS
+            entry = self._stats[(routed_model.prompt_type or 'default', tier.name)]
+            entry['calls'] += 1
+            entry['fallbacks'] += 0 if tier.name == routed_model.routed_tier else 1
+            entry['errors'] += 0 if error is None else 1
+            entry['input_tokens'] += input_tokens
+            entry['output_tokens'] += output_tokens
+            entry['cost_usd'] += self.cost(tier.model_name, input_tokens, output_tokens)
+            entry['latencies'].append(latency_ms)
+
+    def report(self):
+        """
+        Latency and cost per route (prompt type / tier), with the impact
+        versus sending the same calls to the baseline tier's model.
+        """
+        with self._lock:
+            baseline = self.tiers.get(BASELINE_TIER) or self.tiers[self.order[-1]]
+            baseline_latencies = [latency for (_, tier), entry in self._stats.items() if tier == baseline.name
+                                  for latency in entry['latencies']]
+            baseline_mean = sum(baseline_latencies) / len(baseline_latencies) if baseline_latencies else None
+            routes = []
+            for (prompt_type, tier), entry in sorted(self._stats.items()):
+                ordered = sorted(entry['latencies'])
+                mean = sum(ordered) / len(ordered) if ordered else 0.0
+                baseline_cost = self.cost(baseline.model_name, entry['input_tokens'], entry['output_tokens'])
+                routes.append({
+                    'prompt_type': prompt_type,
+                    'tier': tier,
+                    'model': self.tiers[tier].model_name,
+                    'calls': entry['calls'],
+                    'fallbacks': entry['fallbacks'],
+                    'errors': entry['errors'],
+                    'input_tokens': entry['input_tokens'],
+                    'output_tokens': entry['output_tokens'],
+                    'latency_ms': {
+                        'mean': round(mean, 1),
+                        'p95': round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 1) if ordered else 0.0,
+                    },
+                    'cost_usd': round(entry['cost_usd'], 6),
+                    'baseline_cost_usd': round(baseline_cost, 6),
+                    'cost_saved_usd': round(baseline_cost - entry['cost_usd'], 6),
+                    'latency_vs_baseline_ms': round(mean - baseline_mean, 1) if baseline_mean is not None else None,
+                })
+            return {
+                'baseline_tier': baseline.name,
+                'baseline_model': baseline.model_name,
+                # Priced at 0, so their savings are unknown
+                'unpriced_models': sorted({tier.model_name for tier in self.tiers.values()
+                                           if model_price(tier.model_name, self.prices) is None}),
+                'tiers': {name: {'model': tier.model_name, 'in_flight': tier.in_flight,
+                                 'overloaded': tier.overloaded(),
+                                 'latency_limit_seconds': tier.latency_limit_seconds,
+                                 'max_output_tokens': tier.max_output_tokens} for name, tier in self.tiers.items()},
+                'routes': routes,
+                'total_cost_usd': round(sum(route['cost_usd'] for route in routes), 6),
+                'total_saved_usd': round(sum(route['cost_saved_usd'] for route in routes), 6),
+            }
+
+
+def create_model(make_provider, default_model=None):
+    """
+    The app's LLM: a ModelRouter when LLM_ROUTING is on, otherwise the
+    single provider make_provider(default_model).
+    """
+    if Config.LLM_ROUTING:
+        return ModelRouter.from_config(make_provider)
+    return make_provider(default_model)
@@ -0,0 +1,182 @@
+"""
+Speculative prefetch for Career AI Agent
+Starts the LLM stages users almost always request next (intelligence,
+recommendations) as soon as a resume is parsed, keyed by profile
+"""
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from config import Config
+from llm_transport import LLMDeadlineExceeded, current_deadline, request_deadline
+from llm_usage import usage_context
+from prompt_budget import DROPPED_KEYS
+
+
+def profile_key(user_profile):
+    """Stable key for a parsed profile (ignores volatile fields like parsed_at)."""
+    stable = {key: value for key, value in (user_profile or {}).items() if key not in DROPPED_KEYS}
+    return hashlib.sha256(json.dumps(stable, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def parse_policy(spec, stages):
+    """Stages enabled by a policy string: 'off', 'all' or a comma separated list of stage names."""
+    spec = (spec or 'off').strip().lower()
+    if spec == 'off':
+        return []
+    if spec == 'all':
+        return list(stages)
+    return [stage.strip() for stage in spec.split(',') if stage.strip() in stages]
+
+
+def is_degraded(result):
+    """True for fallback results (an 'error' key, or marked provisional) that must not be reused."""
+    return isinstance(result, dict) and ('error' in result or bool(result.get('provisional')))
+
+
+class Prefetcher:
+    """
+    Runs registered stages in the background and lets later requests attach.
+
+    prefetch() starts every enabled stage for a profile; get() returns the
+    prefetched result (waiting for it if still in flight) or runs the stage
+    inline on a miss. Fallback results are never served from a prefetch;
+    the stage is run again instead. Prefetches that expire or are evicted without being
+    used are counted as waste, with the worker time they consumed.
+    """
+
+    def __init__(self, policy='all', ttl_seconds=600, max_entries=500, max_in_flight=8, max_workers=4,
+                 deadline_seconds=60, admit=None):
+        self.policy = policy
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_in_flight = max_in_flight
+        self.deadline_seconds = deadline_seconds
+        self.admit = admit
+        self.stages = {}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prefetch')
+        self.stats = {'started': 0, 'skipped': 0, 'hits_in_flight': 0, 'hits_ready': 0, 'misses': 0,
+                      'errors': 0, 'wasted': 0, 'wasted_seconds': 0.0}
+
+    @classmethod
+    def from_config(cls, admit=None):
+        return cls(
+            policy=Config.PREFETCH_POLICY,
+            ttl_seconds=Config.PREFETCH_TTL_SECONDS,
+            max_entries=Config.PREFETCH_MAX_ENTRIES,
+            max_in_flight=Config.PREFETCH_MAX_IN_FLIGHT,
+            max_workers=Config.PREFETCH_WORKERS,
+            deadline_seconds=Config.LLM_REQUEST_DEADLINE_SECONDS,
+            admit=admit,
+        )
+
+    def register(self, stage, fn):
+        """Register fn(user_profile) -> result as a prefetchable stage."""
+        self.stages[stage] = fn
+
+    def enabled_stages(self):
+        return parse_policy(self.policy, self.stages)
+
+    def _in_flight(self):
+        return sum(1 for entry in self._entries.values() if not entry['future'].done())
+
+    def _discard(self, key):
+        entry = self._entries.pop(key)
+        if not entry['used']:
+            self.stats['wasted'] += 1
+            finished = entry['finished_at'] or time.monotonic()
+            self.stats['wasted_seconds'] += finished - entry['started_at']
+
+    def _sweep(self):
+        now = time.monotonic()
+        for key in [key for key, entry in self._entries.items() if now - entry['started_at'] > self.ttl_seconds]:
+            self._discard(key)
+        while len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+
+    def _run(self, stage, user_profile, owner, entry):
+        try:
+            with usage_context(f"prefetch:{stage}", owner), request_deadline(self.deadline_seconds):
+                return self.stages[stage](user_profile)
+        finally:
+            entry['finished_at'] = time.monotonic()
+
+    def prefetch(self, user_profile, owner=None):
+        """
+        Start every enabled stage for a profile in the background.
+
+        Returns:
+            list: Stages started (already prefetched or skipped stages are left out)
+        """
+        key = profile_key(user_profile)
+        started = []
+        with self._lock:
+            self._sweep()
+            for stage in self.enabled_stages():
+                if (stage, key) in self._entries:
+                    continue
+                if self._in_flight() >= self.max_in_flight or (self.admit and not self.admit()):
+                    self.stats['skipped'] += 1
+                    continue
+                entry = {'started_at': time.monotonic(), 'finished_at': None, 'used': False}
+                # The profile is copied so later mutations by the caller can't leak into the prefetch
+                entry['future'] = self._executor.submit(self._run, stage, copy.deepcopy(user_profile), owner, entry)
+                self._entries[(stage, key)] = entry
+                self.stats['started'] += 1
+                started.append(stage)
+        return started
+
+    def get(self, stage, user_profile):
+        """
+        Result of a stage for a profile: prefetched if available, computed inline otherwise.
+
+        Waits for an in-flight prefetch up to the current request deadline.
+
+        Raises:
+            LLMDeadlineExceeded: If the deadline passes while waiting for the prefetch
+        """
+        key = profile_key(user_profile)
+        with self._lock:
+            entry = self._entries.get((stage, key))
+            if entry is not None and time.monotonic() - entry['started_at'] > self.ttl_seconds:
+                self._discard((stage, key))
+                entry = None
+            if entry is not None:
+                entry['used'] = True
+                self.stats['hits_ready' if entry['future'].done() else 'hits_in_flight'] += 1
+            else:
+                self.stats['misses'] += 1
+
+        if entry is not None:
+            deadline = current_deadline()
+            try:
+                result = entry['future'].result(timeout=deadline.remaining() if deadline else None)
+                if not is_degraded(result):
+                    return copy.deepcopy(result)
+                print(f"⚠️  Prefetched {stage} is a fallback result, recomputing")
+            except FutureTimeoutError:
+                # The deadline is spent, so a recompute could only return a fallback;
+                # the prefetch keeps running for later requests
+                raise LLMDeadlineExceeded(f"Prefetched {stage} not ready before the request deadline")
+            except Exception as e:
+                print(f"⚠️  Prefetched {stage} failed, recomputing: {e}")
+            with self._lock:
+                self.stats['errors'] += 1
+                if self._entries.get((stage, key)) is entry:
+                    del self._entries[(stage, key)]
+        return self.stages[stage](user_profile)
+
+    def summary(self):
+        """Policy, counters and waste rate (for /health)."""
+        with self._lock:
+            started = self.stats['started']
+            return dict(self.stats, policy=self.enabled_stages(), entries=len(self._entries),
+                        waste_rate=self.stats['wasted'] / started if started else 0.0)
@@ -0,0 +1,220 @@
+"""
+Prompt token budgeting for Career AI Agent
+Trims profile payloads so prompts stay inside a per-call input budget
+"""
+
+import math
+import re
+
+from config import Config
+
+# Rough characters-per-token ratio for English text with Gemini/GPT tokenizers
+CHARS_PER_TOKEN = 4
+
+# Token budget for the profile payload interpolated into each prompt type
+PROFILE_TOKEN_BUDGETS = {
+    'job_recommendations': 900,
+    'career_pathway': 700,
+    'career_analysis': 900,
+    'career_surprise_insights': 600,
+    'training_recommendations': 500,
+    'intelligence_report': 400,
+    'upskilling_plan': 400,
+    'job_titles': 300,
+}
+
+# Output cap per prompt type, passed to the model as max_output_tokens
+MAX_OUTPUT_TOKENS = {
+    'job_titles': 256,
+    'intelligence_report': 1024,
+    'upskilling_plan': 2048,
+    'market_intelligence': 2048,
+    'career_pathway': 2048,
+    'career_surprise_insights': 2048,
+    'career_analysis': 3072,
+    'job_recommendations': 4096,
+    'training_recommendations': 4096,
+    'intelligence_report_batch': 8192,
+    'job_titles_batch': 2048,
+}
+
+# Resume sections, most important first
+SECTION_PRIORITY = ['summary', 'experience', 'skills', 'header', 'projects', 'certifications', 'education', 'other']
+
+SECTION_HEADINGS = {
+    'summary': ['summary', 'profile', 'objective', 'about'],
+    'experience': ['experience', 'employment', 'work history', 'professional background'],
+    'skills': ['skills', 'technologies', 'technical', 'competencies', 'tools'],
+    'projects': ['projects', 'portfolio'],
+    'certifications': ['certifications', 'certificates', 'licenses', 'awards'],
+    'education': ['education', 'academic', 'degrees'],
+}
+
+# Progressively smaller (list cap, raw text tokens) settings tried by fit_profile
+SHRINK_STEPS = [(25, 600), (15, 300), (10, 120), (5, 0)]
+
+# Fields that add tokens without helping the model
+DROPPED_KEYS = {'parsed_at'}
+
+
+def estimate_tokens(text):
+    """Estimate the token count of a string (or anything with a str form)."""
+    if not isinstance(text, str):
+        text = str(text)
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def dedupe_items(items):
+    """Case-insensitive de-duplication that keeps the first spelling and order."""
+    seen = set()
+    unique = []
+    for item in items:
+        key = item.strip().lower() if isinstance(item, str) else repr(item)
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(item.strip() if isinstance(item, str) else item)
+    return unique
+
+
+def _truncate(text, max_chars):
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars].rsplit(' ', 1)[0]
+    return cut + '…'
+
+
+def _section_for_heading(line):
+    stripped = line.strip().rstrip(':').lower()
+    if not stripped or len(stripped) > 40:
+        return None
+    for section, keywords in SECTION_HEADINGS.items():
+        if any(stripped == keyword or stripped.startswith(keyword + ' ') or stripped.endswith(' ' + keyword)
+               for keyword in keywords):
+            return section
+    if line.strip().isupper() and len(stripped.split()) <= 4:
+        return 'other'
+    return None
+
+
+def split_sections(text):
+    """
+    Split resume text into (section, text) chunks in document order.
+
+    Text before the first recognised heading is treated as the header
+    (name, title, contact details).
+    """
+    sections = []
+    current_name = 'header'
+    current_lines = []
+
+    for line in text.splitlines():
+        heading = _section_for_heading(line)
+        if heading:
+            if current_lines:
+                sections.append((current_name, '\n'.join(current_lines)))
+            current_name = heading
+            current_lines = [line.strip()]
+        elif line.strip():
+            current_lines.append(re.sub(r'\s+', ' ', line.strip()))
+
+    if current_lines:
+        sections.append((current_name, '\n'.join(current_lines)))
+    return sections
+
+
+def truncate_resume_text(text, max_tokens):
+    """
+    Shrink raw resume text to roughly max_tokens, keeping important sections.
+
+    Sections get budget in SECTION_PRIORITY order; the result keeps the
+    original section order so the model still reads a coherent resume.
+    """
+    if not text or max_tokens <= 0:
+        return ''
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    sections = split_sections(text)
+    remaining = max_tokens * CHARS_PER_TOKEN
+    allowance = {}
+    for section in SECTION_PRIORITY:
+        for index, (name, body) in enumerate(sections):
+            if name != section or remaining <= 0:
+                continue
+            allowance[index] = min(len(body), remaining)
+            remaining -= allowance[index]
+
+    kept = [_truncate(body, allowance[index]) for index, (_, body) in enumerate(sections) if allowance.get(index)]
+    return '\n'.join(kept)
+
+
+def compact_profile(profile, max_items=25, raw_text_tokens=600, max_string_chars=300):
+    """
+    Return a copy of a profile dict that is cheaper to send to the LLM.
+
+    String lists (skills, titles, industries) are de-duplicated and capped,
+    other lists are capped, long strings are truncated and raw_text is cut
+    down by section priority.
+    """
+    compact = {}
+    for key, value in (profile or {}).items():
+        if key in DROPPED_KEYS:
+            continue
+        if key == 'raw_text':
+            if raw_text_tokens and value:
+                compact[key] = truncate_resume_text(value, raw_text_tokens)
+        elif isinstance(value, list):
+            if all(isinstance(item, str) for item in value):
+                value = dedupe_items(value)
+            compact[key] = [
+                compact_profile(item, max_items, 0, max_string_chars) if isinstance(item, dict)
+                else _truncate(item, max_string_chars) if isinstance(item, str) else item
+                for item in value[:max_items]
+            ]
+        elif isinstance(value, dict):
+            compact[key] = compact_profile(value, max_items, raw_text_tokens, max_string_chars)
+        elif isinstance(value, str):
+            compact[key] = _truncate(value, max_string_chars)
+        else:
+            compact[key] = value
+    return compact
+
+
+def fit_profile(profile, prompt_type, budget=None):
+    """
+    Compact a profile until its rendered form fits the prompt type's budget.
+
+    Args:
+        profile (dict): Resume data or user profile
+        prompt_type (str): Key into PROFILE_TOKEN_BUDGETS
+        budget (int): Optional override for the payload token budget
+
+    Returns:
+        dict: Compacted profile (the smallest step is returned if nothing fits)
+    """
+    budget = budget or PROFILE_TOKEN_BUDGETS.get(prompt_type, Config.PROMPT_INPUT_TOKEN_BUDGET)
+    for max_items, raw_text_tokens in SHRINK_STEPS:
+        compact = compact_profile(profile, max_items=max_items, raw_text_tokens=raw_text_tokens)
+        if estimate_tokens(compact) <= budget:
+            break
+    return compact
+
+
+def max_output_tokens(prompt_type):
+    """Output token cap for a prompt type."""
+    return MAX_OUTPUT_TOKENS.get(prompt_type, Config.DEFAULT_MAX_OUTPUT_TOKENS)
+
+
+def check_prompt(prompt_type, prompt):
+    """
+    Log the estimated input tokens of a prompt against the per-call budget.
+
+    Returns:
+        int: Estimated input tokens
+    """
+    tokens = estimate_tokens(prompt)
+    budget = Config.PROMPT_INPUT_TOKEN_BUDGET
+    marker = '⚠️ ' if tokens > budget else '🔢'
+    print(f"{marker} {prompt_type}: ~{tokens} input tokens (budget {budget}), "
+          f"max {max_output_tokens(prompt_type)} output tokens")
+    return tokens
@@ -0,0 +1,380 @@
+"""
+Prompt template registry for Career AI Agent
+Each prompt is a static prefix (instructions and JSON shape, cached by the
+provider where possible) followed by a small per-call dynamic suffix
+"""
+
+import hashlib
+import string
+import textwrap
+import threading
+import time
+
+from config import Config
+from model_router import route_model
+from prompt_budget import estimate_tokens
+from single_flight import SingleFlight
+from structured_output import generate_json
+
+
+class PromptTemplate:
+    """
+    A prompt split into a static prefix and a str.format suffix.
+
+    The prefix is sent verbatim (no placeholders, so braces need no
+    escaping) and never changes between calls, which lets providers cache
+    it; only the suffix is rendered per call.
+    """
+
+    def __init__(self, name, prompt_type, prefix, suffix):
+        self.name = name
+        self.prompt_type = prompt_type
+        self.prefix = textwrap.dedent(prefix).strip()
+        self.suffix = textwrap.dedent(suffix).strip()
+        self.fields = set()
+        self.prefix_hash = None
+        self.prefix_tokens = 0
+
+    def compile(self):
+        """Check the suffix placeholders and fingerprint the prefix."""
+        self.fields = {field for _, field, _, _ in string.Formatter().parse(self.suffix) if field}
+        self.prefix_hash = hashlib.sha256(self.prefix.encode('utf-8')).hexdigest()[:12]
+        self.prefix_tokens = estimate_tokens(self.prefix)
+        return self
+
+    def render_suffix(self, **fields):
+        """
+        Render the dynamic part of the prompt.
+
+        Raises:
+            KeyError: If a placeholder has no value
+        """
+        missing = self.fields - set(fields)
+        if missing:
+            raise KeyError(f"Template '{self.name}' is missing field(s): {', '.join(sorted(missing))}")
+        return self.suffix.format(**fields)
+
+    def render(self, **fields):
+        """Full prompt text: prefix followed by the rendered suffix."""
+        return f"{self.prefix}\n\n{self.render_suffix(**fields)}"
+
+
+class TemplateRegistry:
+    """
+    Named prompt templates plus the provider-side caches of their prefixes.
+
+    precompile(model) compiles every template and asks the provider to
+    cache each prefix (model.cache_prefix(prefix, ttl_seconds) returning a
+    provider bound to that cache, or None). generate() then sends only the
+    suffix to the bound provider, falling back to the full prompt when the
+    provider has no context caching, the prefix is below the provider's
+    minimum cacheable size (min_cache_tokens) or the cache could not be
+    created. Concurrent first calls share one cache creation.
+    """
+
+    def __init__(self, cache_ttl_seconds=3600):
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.templates = {}
+        self._caches = {}
+        self._too_small = set()
+        self._flights = SingleFlight()
+        self._lock = threading.Lock()
+        self.stats = {}
+
+    def register(self, template):
+        self.templates[template.name] = template.compile()
+        self.stats[template.name] = {'calls': 0, 'cached_calls': 0, 'prefix_tokens': template.prefix_tokens,
+                                     'suffix_tokens': 0, 'tokens_saved': 0}
+        return template
+
+    def get(self, name):
+        return self.templates[name]
+
+    def _cache_key(self, model, template):
+        return getattr(model, 'model_name', type(model).__name__), template.prefix_hash
+
+    def _bound_model(self, model, template):
+        """The provider bound to this template's cached prefix, creating the cache if needed."""
+        cache_prefix = getattr(model, 'cache_prefix', None)
+        if cache_prefix is None:
+            return None
+        key = self._cache_key(model, template)
+        minimum = getattr(model, 'min_cache_tokens', 0) or 0
+        if template.prefix_tokens < minimum:
+            with self._lock:
+                first = key not in self._too_small
+                self._too_small.add(key)
+            if first:
+                print(f"ℹ️  Template '{template.name}' prefix (~{template.prefix_tokens} tokens) is below "
+                      f"{key[0]}'s {minimum}-token cache minimum; sending full prompts")
+            return None
+        with self._lock:
+            entry = self._caches.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                return entry[0]
+        # The provider call runs outside the lock; concurrent callers wait for one creation
+        return self._flights.do(key, lambda: self._create_cache(cache_prefix, key, template))
+
+    def _create_cache(self, cache_prefix, key, template):
+        try:
+            bound = cache_prefix(template.prefix, self.cache_ttl_seconds)
+        except Exception as e:
+            print(f"⚠️  Context cache unavailable for template '{template.name}': {e}")
+            bound = None
+        with self._lock:
+            # Refresh a little before the provider expires the cache; remember failures too
+            self._caches[key] = (bound, time.monotonic() + self.cache_ttl_seconds * 0.9)
+        return bound
+
+    def precompile(self, model=None):
+        """Compile all templates and warm the provider's prefix caches."""
+        cached = 0
+        for template in self.templates.values():
+            template.compile()
+            if model is not None and self._bound_model(route_model(model, template.prompt_type), template) is not None:
+                cached += 1
+        total_tokens = sum(template.prefix_tokens for template in self.templates.values())
+        print(f"🧩 Compiled {len(self.templates)} prompt templates (~{total_tokens} prefix tokens, "
+              f"{cached} cached by the provider)")
+        return cached
+
+    def generate(self, model, name, max_reasks=1, **fields):
+        """
+        Render a template and ask the model for its JSON.
+
+        Raises:
+            StructuredOutputError: If no valid JSON was produced
+        """
+        template = self.templates[name]
+        suffix = template.render_suffix(**fields)
+        # Route first so the prefix is cached with the tier that will serve the call
+        model = route_model(model, template.prompt_type)
+        bound = self._bound_model(model, template)
+
+        stats = self.stats[name]
+        with self._lock:
+            stats['calls'] += 1
+            stats['suffix_tokens'] += estimate_tokens(suffix)
+            if bound is not None:
+                stats['cached_calls'] += 1
+                stats['tokens_saved'] += template.prefix_tokens
+
+        if bound is not None:
+            return generate_json(bound, suffix, template.prompt_type, max_reasks)
+        return generate_json(model, f"{template.prefix}\n\n{suffix}", template.prompt_type, max_reasks)
+
+    def summary(self):
+        """Per-template calls, prefix reuse and estimated tokens saved."""
+        with self._lock:
+            return {name: dict(stats, prefix_reuse=stats['cached_calls'] / stats['calls'] if stats['calls'] else 0.0)
+                    for name, stats in self.stats.items()}
+
+
+prompt_templates = TemplateRegistry(Config.PROMPT_CACHE_TTL_SECONDS)
+
+prompt_templates.register(PromptTemplate(
+    'career_surprise_insights', 'career_surprise_insights',
+    prefix="""
+        As a career AI expert, analyze the person's responses and resume given at the end of this prompt to provide surprising, insightful career revelations.
+
+        Use the EXACT years of professional experience provided with the resume data. It is calculated from work experience only, excluding education years. Do NOT recalculate or estimate differently.
+
+        IMPORTANT: You must respond with ONLY valid JSON. No additional text, explanations, or formatting outside the JSON structure.
+
+        Provide surprising insights in this exact JSON format:
+        {
+            "surprising_strengths": [
+                {
+                    "strength": "Specific strength",
+                    "evidence": "Why this is surprising based on their profile",
+                    "market_value": "How this strength is valued in the market"
+                }
+            ],
+            "hidden_talents": [
+                {
+                    "talent": "Hidden talent",
+                    "description": "Why this is a hidden gem",
+                    "career_applications": "How this can be leveraged"
+                }
+            ],
+            "market_revelations": [
+                {
+                    "insight": "Surprising market insight",
+                    "impact": "How this affects their career",
+                    "action": "What they should do about it"
+                }
+            ],
+            "career_surprises": [
+                {
+                    "surprise": "Unexpected career possibility",
+                    "reason": "Why this is surprising for them",
+                    "feasibility": "How achievable this is"
+                }
+            ],
+            "value_proposition": {
+                "unique_value": "What makes them uniquely valuable with their years of professional experience",
+                "employer_perception": "How employers likely see them based on their years of experience",
+                "salary_potential": "Their earning potential considering their years of professional experience"
+            },
+            "next_surprises": "What other surprising insights await them"
+        }
+
+        Focus on insights that will genuinely surprise and excite them about their potential. Make sure to return ONLY the JSON object.
+    """,
+    suffix="""
+        USER RESPONSES:
+        {responses_text}
+
+        RESUME DATA:
+        Skills: {skills}
+        Professional Experience: {years_exp} years (EXACTLY - do not calculate differently)
+        Job Titles: {job_titles}
+        Education: {education}
+        Industries: {industries}
+    """,
+))
+
+prompt_templates.register(PromptTemplate(
+    'career_analysis', 'career_analysis',
+    prefix="""
+        As a career AI expert, analyze the professional profile given at the end of this prompt and provide comprehensive career guidance.
+
+        Please provide a comprehensive analysis in JSON format with these sections:
+        1. "self_assessment": {
+            "strengths": ["list of key strengths"],
+            "market_value": "assessment of market value",
+            "perceived_value": "how employers likely perceive this candidate"
+        }
+        2. "industry_alignment": {
+            "primary_industries": ["industries that align with skills"],
+            "adjacent_industries": ["industries where skills could transfer"],
+            "growth_opportunities": ["emerging areas of opportunity"]
+        }
+        3. "role_recommendations": {
+            "immediate_roles": ["roles to apply for now"],
+            "growth_roles": ["roles for career advancement"],
+            "transition_roles": ["roles for career pivots"]
+        }
+        4. "market_intelligence": {
+            "salary_insights": "current salary ranges and trends",
+            "demand_forecast": "job market outlook",
+            "ai_impact": "how AI affects this career path",
+            "key_trends": ["important industry trends"]
+        }
+        5. "action_plan": {
+            "immediate_actions": ["steps to take now"],
+            "skill_gaps": ["areas to develop"],
+            "networking_strategy": "how to build relevant connections",
+            "timeline": "realistic timeline for career goals"
+        }
+        6. "resume_improvements": {
+            "strengths_to_highlight": ["what to emphasize"],
+            "weaknesses_to_address": ["what to improve"],
+            "formatting_suggestions": ["resume structure advice"],
+            "keyword_optimization": ["important keywords to include"]
+        }
+
+        Focus on actionable, specific advice that addresses career transition concerns and AI impact.
+    """,
+    suffix="""
+        RESUME DATA:
+        - Skills: {skills}
+        - Job Titles: {job_titles}
+        - Years Experience: {years_experience}
+        - Education: {education}
+        - Industries: {industries}
+        - Raw Text: {raw_text}
+
+        USER PREFERENCES:
+        - Location: {location}
+        - Salary Min: ${salary_min:,}
+        - Job Type: {job_type}
+        - Sponsorship: {sponsorship}
+        - Values: {values}
+        - Company Size: {company_size}
+    """,
+))
+
+prompt_templates.register(PromptTemplate(
+    'training_recommendations', 'training_recommendations',
+    prefix="""
+        As a career development expert, create a comprehensive learning and project plan for the candidate described at the end of this prompt.
+
+        Create a personalized learning plan in JSON format:
+        {
+            "skill_gaps": [
+                {
+                    "skill": "Skill Name",
+                    "current_level": "Beginner/Intermediate/Advanced",
+                    "target_level": "Intermediate/Advanced/Expert",
+                    "priority": "High/Medium/Low",
+                    "time_to_learn": "2-4 weeks",
+                    "learning_resources": [
+                        {
+                            "type": "Course/Book/Video/Tutorial",
+                            "title": "Resource Title",
+                            "provider": "Coursera/YouTube/Book/etc",
+                            "url": "https://example.com",
+                            "duration": "10 hours",
+                            "cost": "Free/$99/etc",
+                            "description": "What you'll learn"
+                        }
+                    ]
+                }
+            ],
+            "simulated_projects": [
+                {
+                    "project_name": "Project Title",
+                    "description": "What this project demonstrates",
+                    "skills_demonstrated": ["skill1", "skill2"],
+                    "difficulty": "Beginner/Intermediate/Advanced",
+                    "time_required": "2-4 weeks",
+                    "deliverables": ["deliverable1", "deliverable2"],
+                    "github_template": "https://github.com/example/template",
+                    "portfolio_impact": "How this improves your resume",
+                    "step_by_step_guide": [
+                        "Step 1: Setup and planning",
+                        "Step 2: Implementation",
+                        "Step 3: Testing and deployment"
+                    ]
+                }
+            ],
+            "learning_timeline": {
+                "week_1_2": ["Focus on high-priority skills"],
+                "week_3_4": ["Start first project"],
+                "week_5_6": ["Complete project, start second"],
+                "week_7_8": ["Portfolio building and refinement"]
+            },
+            "portfolio_enhancement": {
+                "resume_additions": ["What to add to resume"],
+                "linkedin_updates": ["How to update LinkedIn"],
+                "github_showcase": ["How to present projects"],
+                "case_studies": ["What case studies to create"]
+            },
+            "certification_recommendations": [
+                {
+                    "certification": "Certification Name",
+                    "provider": "AWS/Google/Microsoft/etc",
+                    "relevance": "Why this matters for target roles",
+                    "cost": "$99",
+                    "duration": "3 months",
+                    "exam_info": "What the exam covers"
+                }
+            ]
+        }
+
+        Focus on practical, actionable learning that directly improves job prospects.
+        Prioritize skills that appear in multiple job requirements.
+    """,
+    suffix="""
+        CANDIDATE PROFILE:
+        - Current Skills: {current_skills}
+        - Years Experience: {years_experience}
+        - Education: {education}
+        - Target Job Titles: {job_titles}
+
+        TARGET JOB REQUIREMENTS:
+        - Required Skills: {required_skills}
+        - Preferred Skills: {preferred_skills}
+    """,
+))
@@ -0,0 +1,213 @@
+"""
+Single-flight request coalescing for Career AI Agent
+Concurrent callers asking for the same thing share one in-flight call
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from contextlib import closing
+
+
+class FlightCancelled(Exception):
+    """The leader of a flight was interrupted before producing a result."""
+
+
+class SharedFlightError(RuntimeError):
+    """The leader of a cross-process flight failed; carries its error message."""
+
+
+def flight_key(*parts):
+    """Build a stable key from any JSON-serialisable parts."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SQLiteLease:
+    """
+    Cross-process flight coordination through a SQLite lease table.
+
+    The first process to insert a key holds the lease and runs the call;
+    the others poll for the stored result. Expired leases (crashed leader)
+    are taken over. A finished flight is only read by callers that were
+    already waiting for it; a caller arriving later runs the call again, so
+    the table never acts as a result or error cache. Finished rows are
+    deleted after result_seconds. Results must be JSON-serialisable.
+    """
+
+    def __init__(self, db_path, lease_seconds=120, result_seconds=10, poll_interval=0.05):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.result_seconds = result_seconds
+        self.poll_interval = poll_interval
+        with closing(self._connect()) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS flights (
+                    key TEXT PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    finished_at REAL
+                )
+            """)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _try_acquire(self, conn, key, owner, arrived_at):
+        """Return True if this owner, waiting since arrived_at, now holds the lease for key."""
+        now = time.time()
+        conn.execute("DELETE FROM flights WHERE finished_at IS NOT NULL AND finished_at < ?",
+                     (now - self.result_seconds,))
+        inserted = conn.execute(
+            "INSERT OR IGNORE INTO flights (key, owner, expires_at) VALUES (?, ?, ?)",
+            (key, owner, now + self.lease_seconds),
+        ).rowcount
+        if inserted:
+            return True
+        # Take over a lease whose leader died without finishing, or a flight that finished before we arrived
+        taken = conn.execute(
+            "UPDATE flights SET owner = ?, expires_at = ?, result = NULL, error = NULL, finished_at = NULL "
+            "WHERE key = ? AND ((finished_at IS NULL AND expires_at < ?) OR finished_at < ?)",
+            (owner, now + self.lease_seconds, key, now, arrived_at),
+        ).rowcount
+        return bool(taken)
+
+    def do(self, key, fn, timeout=None):
+        """Run fn once across processes for key and return its result."""
+        owner = f"{os.getpid()}:{uuid.uuid4().hex}"
+        arrived_at = time.time()
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with closing(self._connect()) as conn:
+            while True:
+                if self._try_acquire(conn, key, owner, arrived_at):
+                    return self._lead(conn, key, owner, fn)
+
+                row = conn.execute("SELECT result, error, finished_at FROM flights WHERE key = ?", (key,)).fetchone()
+                if row and row[2] is not None and row[2] >= arrived_at:
+                    if row[1] is not None:
+                        raise SharedFlightError(row[1])
+                    return json.loads(row[0])
+
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(f"Timed out waiting for shared flight {key[:12]}")
+                time.sleep(self.poll_interval)
+
+    def _lead(self, conn, key, owner, fn):
+        try:
+            result = fn()
+        except Exception as error:
+            conn.execute("UPDATE flights SET error = ?, finished_at = ? WHERE key = ? AND owner = ?",
+                         (f"{type(error).__name__}: {error}", time.time(), key, owner))
+            raise
+        except BaseException:
+            # Interrupted: release the lease so another caller can take over
+            conn.execute("DELETE FROM flights WHERE key = ? AND owner = ?", (key, owner))
+            raise
+        conn.execute("UPDATE flights SET result = ?, finished_at = ? WHERE key = ? AND owner = ?",
+                     (json.dumps(result), time.time(), key, owner))
+        return result
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key.
+
+    Within a process, the first caller (the leader) runs the function and the
+    others wait on its future. A follower that times out only stops waiting;
+    the leader keeps going. If the leader is interrupted, a waiting follower
+    takes over instead of inheriting the interruption. With a SQLiteLease the
+    leader also coordinates with other processes.
+    """
+
+    def __init__(self, lease=None):
+        self.lease = lease
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.stats = {'leaders': 0, 'shared': 0, 'takeovers': 0}
+
+    def in_flight(self):
+        """Number of keys currently being computed in this process."""
+        with self._lock:
+            return len(self._flights)
+
+    def wait(self, key, timeout=None):
+        """
+        Result of the call in flight for key in this process, without starting one.
+
+        Raises:
+            KeyError: If no call is in flight for key (or its leader was interrupted)
+        """
+        with self._lock:
+            future = self._flights.get(key)
+            if future is not None:
+                self.stats['shared'] += 1
+        if future is None:
+            raise KeyError(key)
+        try:
+            return future.result(timeout)
+        except FlightCancelled:
+            raise KeyError(key) from None
+
+    def do(self, key, fn, timeout=None):
+        """
+        Run fn for key, or wait for the call already in flight.
+
+        Args:
+            key (str): Coalescing key (see flight_key)
+            fn (callable): Zero-argument function producing the result
+            timeout (float): Max seconds a follower waits for the leader
+
+        Returns:
+            The leader's result (the same object for every caller)
+        """
+        while True:
+            with self._lock:
+                future = self._flights.get(key)
+                leader = future is None
+                if leader:
+                    future = Future()
+                    future.set_running_or_notify_cancel()
+                    self._flights[key] = future
+                    self.stats['leaders'] += 1
+                else:
+                    self.stats['shared'] += 1
+
+            if leader:
+                return self._lead(key, future, fn, timeout)
+
+            try:
+                return future.result(timeout)
+            except FlightCancelled:
+                with self._lock:
+                    self.stats['takeovers'] += 1
+                continue
+
+    def _lead(self, key, future, fn, timeout):
+        try:
+            if self.lease is not None:
+                result = self.lease.do(key, fn, timeout)
+            else:
+                result = fn()
+        except Exception as error:
+            future.set_exception(error)
+            raise
+        except BaseException:
+            future.set_exception(FlightCancelled(key))
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                if self._flights.get(key) is future:
+                    del self._flights[key]
@@ -0,0 +1,203 @@
+"""
+Local skill-gap ranking for Career AI Agent
+Deterministically ranks missing skills by posting demand, adjacency to the
+user's skills and skill-graph distance, using vectorized numpy operations
+"""
+
+import re
+import threading
+from collections import deque
+
+import numpy as np
+
+# Undirected "closely related" edges between common skills
+SKILL_GRAPH = [
+    ('python', 'django'), ('python', 'flask'), ('python', 'data science'), ('python', 'machine learning'),
+    ('python', 'data analysis'), ('machine learning', 'ai'), ('machine learning', 'data science'),
+    ('data science', 'data analysis'), ('data analysis', 'sql'), ('data analysis', 'business analysis'),
+    ('sql', 'postgresql'), ('sql', 'mysql'), ('sql', 'nosql'), ('nosql', 'mongodb'), ('nosql', 'redis'),
+    ('javascript', 'typescript'), ('javascript', 'react'), ('javascript', 'node.js'), ('javascript', 'angular'),
+    ('javascript', 'vue'), ('react', 'angular'), ('react', 'vue'), ('node.js', 'express'), ('typescript', 'angular'),
+    ('rest', 'api'), ('api', 'graphql'), ('rest', 'microservices'), ('microservices', 'docker'),
+    ('microservices', 'kubernetes'), ('docker', 'kubernetes'), ('docker', 'devops'), ('kubernetes', 'devops'),
+    ('devops', 'ci/cd'), ('ci/cd', 'jenkins'), ('ci/cd', 'git'), ('linux', 'docker'), ('linux', 'unix'),
+    ('aws', 'azure'), ('aws', 'gcp'), ('azure', 'gcp'), ('aws', 'devops'), ('aws', 'docker'),
+    ('java', 'spring'), ('java', 'kotlin'), ('kotlin', 'swift'), ('c#', 'java'), ('c++', 'c#'), ('go', 'rust'),
+    ('go', 'microservices'), ('ruby', 'python'), ('php', 'laravel'), ('php', 'javascript'),
+    ('agile', 'scrum'), ('scrum', 'kanban'), ('agile', 'jira'), ('project management', 'agile'),
+    ('project management', 'pmp'), ('project management', 'risk management'),
+    ('product management', 'business analysis'), ('product management', 'agile'), ('product management', 'ux'),
+    ('ux', 'ui'), ('ux', 'design'), ('leadership', 'team management'), ('leadership', 'communication'),
+    ('team management', 'project management'), ('strategic planning', 'leadership'),
+    ('cybersecurity', 'network security'), ('cybersecurity', 'information security'),
+    ('information security', 'compliance'), ('compliance', 'audit'), ('compliance', 'gdpr'),
+    ('compliance', 'hipaa'), ('quality assurance', 'testing'), ('testing', 'ci/cd'), ('qa', 'testing'),
+    ('marketing', 'seo'), ('seo', 'sem'), ('marketing', 'social media'), ('marketing', 'content creation'),
+    ('marketing', 'email marketing'), ('finance', 'accounting'), ('finance', 'investment'),
+    ('blockchain', 'cryptocurrency'), ('lean', 'six sigma'), ('operations', 'supply chain'),
+    ('supply chain', 'logistics'),
+]
+
+SKILL_ALIASES = {
+    'js': 'javascript', 'ts': 'typescript', 'node': 'node.js', 'nodejs': 'node.js', 'k8s': 'kubernetes',
+    'ml': 'machine learning', 'postgres': 'postgresql', 'golang': 'go', 'reactjs': 'react', 'react.js': 'react',
+    'vue.js': 'vue', 'artificial intelligence': 'ai', 'amazon web services': 'aws', 'google cloud': 'gcp',
+    'ci / cd': 'ci/cd', 'cicd': 'ci/cd',
+}
+
+# Score weights: demand in postings, direct neighbours among the user's skills, graph closeness
+DEFAULT_WEIGHTS = {'demand': 0.5, 'adjacency': 0.3, 'proximity': 0.2}
+
+_NON_TOKEN = re.compile(r'[^a-z0-9+#./]+')
+
+
+def normalize_skill(skill):
+    """Lowercase, trim and resolve common aliases."""
+    skill = ' '.join(str(skill).lower().split())
+    return SKILL_ALIASES.get(skill, skill)
+
+
+def _posting_text(posting):
+    """Space-padded token text of a posting, so skills can be matched as whole words."""
+    if isinstance(posting, dict):
+        posting = ' '.join(str(posting.get(field) or '') for field in ('title', 'description'))
+    text = _NON_TOKEN.sub(' ', str(posting).lower())
+    # Drop sentence-final dots ("python." -> "python") but keep "node.js"
+    text = re.sub(r'\.(?=\s|$)', '', text)
+    return f" {text} "
+
+
+class SkillGapRanker:
+    """
+    Ranks candidate skill gaps for a user.
+
+    Graph distances between all known skills are precomputed once with
+    boolean matrix powers; demand frequencies are counted over the most
+    recent job postings observed. Ranking is a weighted sum of normalized
+    demand, adjacency and proximity, ties broken by skill name, so the
+    same inputs always give the same gaps.
+    """
+
+    def __init__(self, edges=SKILL_GRAPH, weights=None, max_distance=4, max_postings=2000):
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.max_distance = max_distance
+        self.skills = sorted({normalize_skill(skill) for edge in edges for skill in edge})
+        self.index = {skill: i for i, skill in enumerate(self.skills)}
+
+        size = len(self.skills)
+        self.adjacency = np.zeros((size, size), dtype=bool)
+        rows = [self.index[normalize_skill(a)] for a, _ in edges]
+        cols = [self.index[normalize_skill(b)] for _, b in edges]
+        self.adjacency[rows, cols] = True
+        self.adjacency[cols, rows] = True
+        self.distance = self._all_pairs_distance()
+
+        self._postings = deque(maxlen=max_postings)
+        self._texts = None
+        self._lock = threading.Lock()
+
+    def _all_pairs_distance(self):
+        """Hop distance between every pair of skills (inf beyond max_distance)."""
+        size = len(self.skills)
+        distance = np.full((size, size), np.inf)
+        np.fill_diagonal(distance, 0)
+        reach = np.eye(size, dtype=bool)
+        step = self.adjacency.astype(np.int32)
+        for hops in range(1, self.max_distance + 1):
+            reach = (reach.astype(np.int32) @ step) > 0
+            distance[reach & np.isinf(distance)] = hops
+        return distance
+
+    def observe_postings(self, postings):
+        """Add job postings (dicts with title/description, or plain text) to the demand sample."""
+        texts = [_posting_text(posting) for posting in postings or []]
+        if not texts:
+            return
+        with self._lock:
+            self._postings.extend(texts)
+            self._texts = None
+
+    def demand_counts(self, skills):
+        """Number of observed postings mentioning each skill (whole-word match)."""
+        with self._lock:
+            if self._texts is None:
+                self._texts = np.array(self._postings, dtype=str)
+            texts = self._texts
+        if not len(texts):
+            return np.zeros(len(skills))
+        return np.array([(np.char.find(texts, f" {skill} ") >= 0).sum() for skill in skills], dtype=float)
+
+    def postings_observed(self):
+        with self._lock:
+            return len(self._postings)
+
+    def top_skills(self, k=10):
+        """
+        Skill-demand table: the known skills mentioned in the most observed postings.
+
+        Returns:
+            list: Up to k (skill, postings) pairs, most requested first
+        """
+        counts = self.demand_counts(self.skills)
+        order = np.lexsort((np.array(self.skills), -counts))[:k]
+        return [(self.skills[i], int(counts[i])) for i in order if counts[i] > 0]
+
+    def rank(self, user_skills, in_demand_skills, k=3):
+        """
+        Rank in-demand skills the user does not have.
+
+        Returns:
+            list: Up to k dicts (skill, score, demand, adjacent_to, distance), best first
+        """
+        owned = {normalize_skill(skill) for skill in user_skills or []}
+        names, candidates = {}, []
+        for skill in in_demand_skills or []:
+            key = normalize_skill(skill)
+            if key and key not in owned and key not in names:
+                names[key] = str(skill).strip()
+                candidates.append(key)
+        if not candidates:
+            return []
+
+        count = len(candidates)
+        # Demand: share of observed postings; with no postings, the order the skills were listed in
+        postings_demand = self.demand_counts(candidates)
+        listed_demand = 1.0 - np.arange(count) / count
+        if postings_demand.max() > 0:
+            demand = 0.75 * postings_demand / postings_demand.max() + 0.25 * listed_demand
+        else:
+            demand = listed_demand
+
+        known = np.array([skill in self.index for skill in candidates])
+        candidate_ids = np.array([self.index.get(skill, 0) for skill in candidates])
+        owned_ids = np.array(sorted(self.index[skill] for skill in owned if skill in self.index), dtype=int)
+
+        if len(owned_ids):
+            adjacent = self.adjacency[np.ix_(candidate_ids, owned_ids)] & known[:, None]
+            adjacency = adjacent.sum(axis=1) / len(owned_ids)
+            distance = np.where(known, self.distance[np.ix_(candidate_ids, owned_ids)].min(axis=1), np.inf)
+        else:
+            adjacent = np.zeros((count, 0), dtype=bool)
+            adjacency = np.zeros(count)
+            distance = np.full(count, np.inf)
+        if adjacency.max() > 0:
+            adjacency = adjacency / adjacency.max()
+        proximity = np.where(np.isinf(distance), 0.0, 1.0 / np.maximum(distance, 1))
+
+        scores = (self.weights['demand'] * demand + self.weights['adjacency'] * adjacency
+                  + self.weights['proximity'] * proximity)
+        # Highest score first, then alphabetical for a stable order
+        order = np.lexsort((np.array(candidates), -np.round(scores, 9)))[:k]
+
+        owned_names = [self.skills[i] for i in owned_ids]
+        return [{
+            'skill': names[candidates[i]],
+            'score': round(float(scores[i]), 4),
+            'demand': int(postings_demand[i]),
+            'adjacent_to': [owned_names[j] for j in np.flatnonzero(adjacent[i])],
+            'distance': None if np.isinf(distance[i]) else int(distance[i]),
+        } for i in order]
+
+
+# Shared ranker; search results feed its demand sample
+skill_gap_ranker = SkillGapRanker()
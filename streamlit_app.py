@@ -6,11 +6,19 @@ Career AI Agent - Streamlit Version
 import streamlit as st
 import json
 import os
-import google.generativeai as genai
 from datetime import datetime
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
+from structured_output import generate_json, StructuredOutputError
+from prompt_budget import dedupe_items, fit_profile
+from config import Config
+from market_precompute import create_store as create_market_store, generate_market_intelligence_report
+from llm_provider import create_provider
+from model_router import create_model
+from cassette import cassette
+from llm_usage import set_usage_context
+from prompt_templates import prompt_templates
 
 # Page configuration
 st.set_page_config(
@@ -361,90 +369,24 @@ def generate_career_surprise_insights(user_responses, resume_data):
         responses_text = "\n\n".join(formatted_responses)
         
         # Extract key resume details for accurate analysis
-        years_exp = resume_data.get('years_experience', 0)
-        skills = resume_data.get('skills', [])
-        job_titles = resume_data.get('job_titles', [])
-        education = resume_data.get('education_level', 'Unknown')
-        industries = resume_data.get('industries', [])
-        
-        prompt = f"""
-        As a career AI expert, analyze this person's responses and resume to provide surprising, insightful career revelations.
-        
-        USER RESPONSES:
-        {responses_text}
-        
-        RESUME DATA:
-        Skills: {skills}
-        Professional Experience: {years_exp} years (EXACTLY - do not calculate differently)
-        Job Titles: {job_titles}
-        Education: {education}
-        Industries: {industries}
-        
-        CRITICAL: Use the EXACT years of professional experience provided: {years_exp} years. This is calculated from work experience only, excluding education years. Do NOT recalculate or estimate differently.
-        
-        IMPORTANT: You must respond with ONLY valid JSON. No additional text, explanations, or formatting outside the JSON structure.
-        
-        Provide surprising insights in this exact JSON format:
-        {{
-            "surprising_strengths": [
-                {{
-                    "strength": "Specific strength",
-                    "evidence": "Why this is surprising based on their profile",
-                    "market_value": "How this strength is valued in the market"
-                }}
-            ],
-            "hidden_talents": [
-                {{
-                    "talent": "Hidden talent",
-                    "description": "Why this is a hidden gem",
-                    "career_applications": "How this can be leveraged"
-                }}
-            ],
-            "market_revelations": [
-                {{
-                    "insight": "Surprising market insight",
-                    "impact": "How this affects their career",
-                    "action": "What they should do about it"
-                }}
-            ],
-            "career_surprises": [
-                {{
-                    "surprise": "Unexpected career possibility",
-                    "reason": "Why this is surprising for them",
-                    "feasibility": "How achievable this is"
-                }}
-            ],
-            "value_proposition": {{
-                "unique_value": "What makes them uniquely valuable with {years_exp} years of professional experience",
-                "employer_perception": "How employers likely see them based on their {years_exp} years of experience",
-                "salary_potential": "Their earning potential considering {years_exp} years of professional experience"
-            }},
-            "next_surprises": "What other surprising insights await them"
-        }}
-        
-        Focus on insights that will genuinely surprise and excite them about their potential. Make sure to return ONLY the JSON object.
-        """
-        
-        response = st.session_state.google_model.generate_content(prompt)
-        
-        # Clean the response text
-        response_text = response.text.strip()
-        
-        # Remove any markdown formatting if present
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        
-        response_text = response_text.strip()
-        
-        # Try to parse the JSON
+        profile = fit_profile(resume_data, 'career_surprise_insights')
+        years_exp = profile.get('years_experience', 0)
+        skills = profile.get('skills', [])
+        job_titles = profile.get('job_titles', [])
+        education = profile.get('education_level', 'Unknown')
+        industries = profile.get('industries', [])
+        
+        # Ask for schema-constrained JSON; the static instructions are a cached prompt prefix
         try:
-            return json.loads(response_text)
-        except json.JSONDecodeError as json_error:
+            return prompt_templates.generate(
+                st.session_state.google_model, 'career_surprise_insights',
+                responses_text=responses_text, skills=skills, years_exp=years_exp,
+                job_titles=job_titles, education=education, industries=industries
+            )
+        except StructuredOutputError as json_error:
             # If JSON parsing fails, return a fallback response
             st.error(f"JSON parsing error: {json_error}")
-            st.error(f"Raw response: {response_text}")
+            st.error(f"Raw response: {json_error.raw_text}")
             
             # Return a structured fallback
             return {
@@ -488,75 +430,29 @@ def generate_career_surprise_insights(user_responses, resume_data):
         st.error(f"Error in generate_career_surprise_insights: {str(e)}")
         return {'error': f'Failed to generate insights: {str(e)}'}
 
+@st.cache_resource
+def get_market_store():
+    """Process-wide precomputed market intelligence, shared by all sessions"""
+    return create_market_store()
+
 def generate_market_intelligence(industry, role):
     """Generate comprehensive market intelligence"""
+    # Market intelligence only depends on (industry, role): serve the precomputed copy
+    cached = get_market_store().get(industry, role)
+    if cached is not None:
+        return cached
+    
     if not st.session_state.google_ai_configured:
         return {'error': 'Google AI not configured'}
     
     try:
-        prompt = f"""
-        As a market intelligence expert, provide comprehensive market data for {industry} industry and {role} roles.
-        
-        Return JSON with:
-        {{
-            "startup_landscape": {{
-                "funding_trends": "Recent funding activity and trends",
-                "hot_startups": ["List of notable startups"],
-                "investment_focus": "What investors are focusing on"
-            }},
-            "job_market": {{
-                "hiring_trends": "Current hiring patterns",
-                "layoff_impact": "Recent layoffs and their impact",
-                "demand_forecast": "Future demand predictions",
-                "competition_level": "How competitive the market is"
-            }},
-            "macroeconomic_factors": {{
-                "regulations": "New laws and regulations affecting the industry",
-                "market_forces": "Economic forces shaping the industry",
-                "ai_impact": "How AI is changing the landscape",
-                "global_trends": "International market trends"
-            }},
-            "compensation_insights": {{
-                "salary_trends": "Current salary trends and changes",
-                "benefits_evolution": "How benefits are changing",
-                "equity_trends": "Stock options and equity trends",
-                "remote_work_impact": "How remote work affects compensation"
-            }},
-            "culture_alignment": {{
-                "company_cultures": "Types of company cultures in this space",
-                "work_life_balance": "WLB trends and expectations",
-                "value_alignment": "How to find culture fit",
-                "diversity_initiatives": "DEI trends and initiatives"
-            }},
-            "newsletter_content": {{
-                "key_headlines": ["Important industry news"],
-                "trending_topics": ["What's trending in the industry"],
-                "expert_insights": "Insights from industry experts"
-            }}
-        }}
-        """
-        
-        response = st.session_state.google_model.generate_content(prompt)
-        
-        # Clean the response text
-        response_text = response.text.strip()
-        
-        # Remove any markdown formatting if present
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        
-        response_text = response_text.strip()
-        
-        # Try to parse the JSON
-        try:
-            return json.loads(response_text)
-        except json.JSONDecodeError as json_error:
-            st.error(f"JSON parsing error in market intelligence: {json_error}")
-            st.error(f"Raw response: {response_text}")
-            return {'error': f'Failed to parse market intelligence response: {str(json_error)}'}
-        
+        report = generate_market_intelligence_report(st.session_state.google_model, industry, role)
+        get_market_store().put(industry, role, report)
+        return report
+    except StructuredOutputError as json_error:
+        st.error(f"JSON parsing error in market intelligence: {json_error}")
+        st.error(f"Raw response: {json_error.raw_text}")
+        return {'error': f'Failed to parse market intelligence response: {str(json_error)}'}
     except Exception as e:
         return {'error': f'Failed to generate market intelligence: {str(e)}'}
 
@@ -569,7 +465,7 @@ def generate_career_pathway_simulation(user_profile, target_role):
         prompt = f"""
         Create a career pathway simulation showing what this person's career could look like.
         
-        USER PROFILE: {user_profile}
+        USER PROFILE: {fit_profile(user_profile, 'career_pathway')}
         TARGET ROLE: {target_role}
         
         Return JSON with:
@@ -607,25 +503,12 @@ def generate_career_pathway_simulation(user_profile, target_role):
         }}
         """
         
-        response = st.session_state.google_model.generate_content(prompt)
-        
-        # Clean the response text
-        response_text = response.text.strip()
-        
-        # Remove any markdown formatting if present
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        
-        response_text = response_text.strip()
-        
-        # Try to parse the JSON
+        # Ask for schema-constrained JSON; near-valid replies are repaired locally
         try:
-            return json.loads(response_text)
-        except json.JSONDecodeError as json_error:
+            return generate_json(st.session_state.google_model, prompt, 'career_pathway')
+        except StructuredOutputError as json_error:
             st.error(f"JSON parsing error in career pathway: {json_error}")
-            st.error(f"Raw response: {response_text}")
+            st.error(f"Raw response: {json_error.raw_text}")
             return {'error': f'Failed to parse career pathway response: {str(json_error)}'}
         
     except Exception as e:
@@ -634,16 +517,30 @@ def generate_career_pathway_simulation(user_profile, target_role):
 # Initialize Google AI
 def init_google_ai():
     try:
-        # Try to get API key from Streamlit secrets first, then environment
-        api_key = st.secrets.get('GOOGLE_API_KEY') or os.environ.get('GOOGLE_API_KEY')
-        if not api_key:
-            st.error("❌ GOOGLE_API_KEY not found. Please add it to Streamlit secrets or environment variables.")
-            return False
-        
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-2.5-flash')
+        if Config.LLM_PROVIDER != 'gemini' or cassette.replaying:
+            # Offline/alternative provider selected via LLM_PROVIDER, or a replayed cassette
+            model = create_model(lambda model_name: cassette.provider(lambda: create_provider(model_name=model_name)))
+        else:
+            # Try to get API key from Streamlit secrets first, then environment
+            api_key = st.secrets.get('GOOGLE_API_KEY') or os.environ.get('GOOGLE_API_KEY')
+            if not api_key:
+                st.error("❌ GOOGLE_API_KEY not found. Please add it to Streamlit secrets or environment variables.")
+                return False
+            
+            model = create_model(lambda model_name: cassette.provider(
+                lambda: create_provider('gemini', model_name=model_name, api_key=api_key)
+            ))
         st.session_state.google_model = model
         st.session_state.google_ai_configured = True
+        
+        # Compile prompt templates and cache their static prefixes with the provider
+        prompt_templates.precompile(model)
+        
+        # Keep precomputed market intelligence warm in the background
+        get_market_store().start_scheduler(
+            lambda industry, role: generate_market_intelligence_report(model, industry, role),
+            Config.MARKET_INTEL_REFRESH_MINUTES * 60
+        )
         st.success("✅ Google AI configured")
         return True
     except Exception as e:
@@ -846,82 +743,27 @@ def generate_career_analysis(resume_data, manual_preferences):
         return {'error': 'Google AI not configured'}
     
     try:
-        prompt = f"""
-        As a career AI expert, analyze this professional profile and provide comprehensive career guidance.
-        
-        RESUME DATA:
-        - Skills: {resume_data.get('skills', [])}
-        - Job Titles: {resume_data.get('job_titles', [])}
-        - Years Experience: {resume_data.get('years_experience', 0)}
-        - Education: {resume_data.get('education_level', 'Unknown')}
-        - Industries: {resume_data.get('industries', [])}
-        - Raw Text: {resume_data.get('raw_text', '')[:1000]}...
-        
-        USER PREFERENCES:
-        - Location: {manual_preferences.get('location', 'Not specified')}
-        - Salary Min: ${manual_preferences.get('salary_min', 0):,}
-        - Job Type: {manual_preferences.get('job_type', 'Not specified')}
-        - Sponsorship: {manual_preferences.get('sponsorship', False)}
-        - Values: {manual_preferences.get('value_alignment', [])}
-        - Company Size: {manual_preferences.get('company_size', 'Not specified')}
-        
-        Please provide a comprehensive analysis in JSON format with these sections:
-        1. "self_assessment": {{
-            "strengths": ["list of key strengths"],
-            "market_value": "assessment of market value",
-            "perceived_value": "how employers likely perceive this candidate"
-        }}
-        2. "industry_alignment": {{
-            "primary_industries": ["industries that align with skills"],
-            "adjacent_industries": ["industries where skills could transfer"],
-            "growth_opportunities": ["emerging areas of opportunity"]
-        }}
-        3. "role_recommendations": {{
-            "immediate_roles": ["roles to apply for now"],
-            "growth_roles": ["roles for career advancement"],
-            "transition_roles": ["roles for career pivots"]
-        }}
-        4. "market_intelligence": {{
-            "salary_insights": "current salary ranges and trends",
-            "demand_forecast": "job market outlook",
-            "ai_impact": "how AI affects this career path",
-            "key_trends": ["important industry trends"]
-        }}
-        5. "action_plan": {{
-            "immediate_actions": ["steps to take now"],
-            "skill_gaps": ["areas to develop"],
-            "networking_strategy": "how to build relevant connections",
-            "timeline": "realistic timeline for career goals"
-        }}
-        6. "resume_improvements": {{
-            "strengths_to_highlight": ["what to emphasize"],
-            "weaknesses_to_address": ["what to improve"],
-            "formatting_suggestions": ["resume structure advice"],
-            "keyword_optimization": ["important keywords to include"]
-        }}
-        
-        Focus on actionable, specific advice that addresses career transition concerns and AI impact.
-        """
-        
-        response = st.session_state.google_model.generate_content(prompt)
-        
-        # Clean the response text
-        response_text = response.text.strip()
-        
-        # Remove any markdown formatting if present
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        
-        response_text = response_text.strip()
-        
-        # Try to parse the JSON
+        profile = fit_profile(resume_data, 'career_analysis')
+        # Ask for schema-constrained JSON; the static instructions are a cached prompt prefix
         try:
-            return json.loads(response_text)
-        except json.JSONDecodeError as json_error:
+            return prompt_templates.generate(
+                st.session_state.google_model, 'career_analysis',
+                skills=profile.get('skills', []),
+                job_titles=profile.get('job_titles', []),
+                years_experience=profile.get('years_experience', 0),
+                education=profile.get('education_level', 'Unknown'),
+                industries=profile.get('industries', []),
+                raw_text=profile.get('raw_text', ''),
+                location=manual_preferences.get('location', 'Not specified'),
+                salary_min=manual_preferences.get('salary_min', 0),
+                job_type=manual_preferences.get('job_type', 'Not specified'),
+                sponsorship=manual_preferences.get('sponsorship', False),
+                values=manual_preferences.get('value_alignment', []),
+                company_size=manual_preferences.get('company_size', 'Not specified')
+            )
+        except StructuredOutputError as json_error:
             st.error(f"JSON parsing error in career analysis: {json_error}")
-            st.error(f"Raw response: {response_text}")
+            st.error(f"Raw response: {json_error.raw_text}")
             return {'error': f'Failed to parse career analysis response: {str(json_error)}'}
         
     except Exception as e:
@@ -936,7 +778,7 @@ def generate_job_recommendations(resume_data, manual_preferences):
         prompt = f"""
         Based on this profile, recommend specific jobs this person should apply to RIGHT NOW.
         
-        PROFILE: {resume_data}
+        PROFILE: {fit_profile(resume_data, 'job_recommendations')}
         PREFERENCES: {manual_preferences}
         
         Return JSON with:
@@ -962,25 +804,12 @@ def generate_job_recommendations(resume_data, manual_preferences):
         }}
         """
         
-        response = st.session_state.google_model.generate_content(prompt)
-        
-        # Clean the response text
-        response_text = response.text.strip()
-        
-        # Remove any markdown formatting if present
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        
-        response_text = response_text.strip()
-        
-        # Try to parse the JSON
+        # Ask for schema-constrained JSON; near-valid replies are repaired locally
         try:
-            return json.loads(response_text)
-        except json.JSONDecodeError as json_error:
+            return generate_json(st.session_state.google_model, prompt, 'job_recommendations')
+        except StructuredOutputError as json_error:
             st.error(f"JSON parsing error in job recommendations: {json_error}")
-            st.error(f"Raw response: {response_text}")
+            st.error(f"Raw response: {json_error.raw_text}")
             return {'error': f'Failed to parse job recommendations response: {str(json_error)}'}
         
     except Exception as e:
@@ -1003,108 +832,23 @@ def generate_training_recommendations(resume_data, job_recommendations):
                 all_preferred_skills.extend(job.get('preferred_skills', []))
                 job_titles.append(job.get('title', ''))
         
-        current_skills = resume_data.get('skills', [])
+        current_skills = dedupe_items(resume_data.get('skills', []))[:25]
         years_experience = resume_data.get('years_experience', 0)
         
-        prompt = f"""
-        As a career development expert, create a comprehensive learning and project plan for this candidate.
-        
-        CANDIDATE PROFILE:
-        - Current Skills: {current_skills}
-        - Years Experience: {years_experience}
-        - Education: {resume_data.get('education_level', 'Unknown')}
-        - Target Job Titles: {job_titles}
-        
-        TARGET JOB REQUIREMENTS:
-        - Required Skills: {list(set(all_required_skills))}
-        - Preferred Skills: {list(set(all_preferred_skills))}
-        
-        Create a personalized learning plan in JSON format:
-        {{
-            "skill_gaps": [
-                {{
-                    "skill": "Skill Name",
-                    "current_level": "Beginner/Intermediate/Advanced",
-                    "target_level": "Intermediate/Advanced/Expert",
-                    "priority": "High/Medium/Low",
-                    "time_to_learn": "2-4 weeks",
-                    "learning_resources": [
-                        {{
-                            "type": "Course/Book/Video/Tutorial",
-                            "title": "Resource Title",
-                            "provider": "Coursera/YouTube/Book/etc",
-                            "url": "https://example.com",
-                            "duration": "10 hours",
-                            "cost": "Free/$99/etc",
-                            "description": "What you'll learn"
-                        }}
-                    ]
-                }}
-            ],
-            "simulated_projects": [
-                {{
-                    "project_name": "Project Title",
-                    "description": "What this project demonstrates",
-                    "skills_demonstrated": ["skill1", "skill2"],
-                    "difficulty": "Beginner/Intermediate/Advanced",
-                    "time_required": "2-4 weeks",
-                    "deliverables": ["deliverable1", "deliverable2"],
-                    "github_template": "https://github.com/example/template",
-                    "portfolio_impact": "How this improves your resume",
-                    "step_by_step_guide": [
-                        "Step 1: Setup and planning",
-                        "Step 2: Implementation",
-                        "Step 3: Testing and deployment"
-                    ]
-                }}
-            ],
-            "learning_timeline": {{
-                "week_1_2": ["Focus on high-priority skills"],
-                "week_3_4": ["Start first project"],
-                "week_5_6": ["Complete project, start second"],
-                "week_7_8": ["Portfolio building and refinement"]
-            }},
-            "portfolio_enhancement": {{
-                "resume_additions": ["What to add to resume"],
-                "linkedin_updates": ["How to update LinkedIn"],
-                "github_showcase": ["How to present projects"],
-                "case_studies": ["What case studies to create"]
-            }},
-            "certification_recommendations": [
-                {{
-                    "certification": "Certification Name",
-                    "provider": "AWS/Google/Microsoft/etc",
-                    "relevance": "Why this matters for target roles",
-                    "cost": "$99",
-                    "duration": "3 months",
-                    "exam_info": "What the exam covers"
-                }}
-            ]
-        }}
-        
-        Focus on practical, actionable learning that directly improves job prospects.
-        Prioritize skills that appear in multiple job requirements.
-        """
-        
-        response = st.session_state.google_model.generate_content(prompt)
-        
-        # Clean the response text
-        response_text = response.text.strip()
-        
-        # Remove any markdown formatting if present
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        
-        response_text = response_text.strip()
-        
-        # Try to parse the JSON
+        # Ask for schema-constrained JSON; the static instructions are a cached prompt prefix
         try:
-            return json.loads(response_text)
-        except json.JSONDecodeError as json_error:
+            return prompt_templates.generate(
+                st.session_state.google_model, 'training_recommendations',
+                current_skills=current_skills,
+                years_experience=years_experience,
+                education=resume_data.get('education_level', 'Unknown'),
+                job_titles=job_titles,
+                required_skills=dedupe_items(all_required_skills)[:30],
+                preferred_skills=dedupe_items(all_preferred_skills)[:20]
+            )
+        except StructuredOutputError as json_error:
             st.error(f"JSON parsing error in training recommendations: {json_error}")
-            st.error(f"Raw response: {response_text}")
+            st.error(f"Raw response: {json_error.raw_text}")
             return {'error': f'Failed to parse training recommendations response: {str(json_error)}'}
         
     except Exception as e:
@@ -1112,6 +856,9 @@ def generate_training_recommendations(resume_data, job_recommendations):
 
 # Main app
 def main():
+    # Tag this script run's LLM calls for usage accounting
+    set_usage_context('streamlit')
+    
     # Main header with gradient styling
     st.markdown("""
     <div class="main-header">
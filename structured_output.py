@@ -0,0 +1,476 @@
+"""
+Structured output helpers for Career AI Agent
+One place to ask the LLM for JSON, parse it, repair it and validate it
+"""
+
+import contextvars
+import copy
+import json
+import re
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from config import Config
+from llm_transport import llm_transport
+from llm_usage import llm_usage, note_parse_failure, note_response, set_cache_status
+from model_router import route_model
+from prompt_budget import check_prompt, max_output_tokens
+from single_flight import SingleFlight, SQLiteLease, flight_key
+
+
+class StructuredOutputError(ValueError):
+    """Raised when the LLM reply cannot be turned into schema-valid JSON."""
+
+    def __init__(self, message, raw_text=""):
+        super().__init__(message)
+        self.raw_text = raw_text
+
+
+# Schema helpers (OpenAPI subset understood by Gemini's response_schema)
+STRING = {"type": "string"}
+STRING_LIST = {"type": "array", "items": STRING}
+
+
+def _object(required=None, **properties):
+    schema = {"type": "object", "properties": properties}
+    schema["required"] = list(required if required is not None else properties)
+    return schema
+
+
+def _array(items):
+    return {"type": "array", "items": items}
+
+
+# Per prompt type response schemas
+SCHEMAS = {
+    'intelligence_report': _object(
+        market_intelligence_summary=STRING,
+        key_industry_skills=STRING_LIST,
+        macroeconomic_shifts=STRING,
+        salary_insights=STRING,
+        growth_opportunities=STRING,
+    ),
+    'upskilling_plan': _object(
+        skill_gaps=_array(_object(
+            skill=STRING,
+            project_idea=STRING,
+            learning_resources=_array(_object(name=STRING, url=STRING, type=STRING)),
+        )),
+        timeline=STRING,
+        priority_order=STRING,
+    ),
+    'job_titles': STRING_LIST,
+    'career_surprise_insights': _object(
+        surprising_strengths=_array(_object(strength=STRING, evidence=STRING, market_value=STRING)),
+        hidden_talents=_array(_object(talent=STRING, description=STRING, career_applications=STRING)),
+        market_revelations=_array(_object(insight=STRING, impact=STRING, action=STRING)),
+        career_surprises=_array(_object(surprise=STRING, reason=STRING, feasibility=STRING)),
+        value_proposition=_object(unique_value=STRING, employer_perception=STRING, salary_potential=STRING),
+        next_surprises=STRING,
+    ),
+    'market_intelligence': _object(
+        startup_landscape=_object(funding_trends=STRING, hot_startups=STRING_LIST, investment_focus=STRING),
+        job_market=_object(hiring_trends=STRING, layoff_impact=STRING, demand_forecast=STRING,
+                           competition_level=STRING),
+        macroeconomic_factors=_object(regulations=STRING, market_forces=STRING, ai_impact=STRING,
+                                      global_trends=STRING),
+        compensation_insights=_object(salary_trends=STRING, benefits_evolution=STRING, equity_trends=STRING,
+                                      remote_work_impact=STRING),
+        culture_alignment=_object(company_cultures=STRING, work_life_balance=STRING, value_alignment=STRING,
+                                  diversity_initiatives=STRING),
+        newsletter_content=_object(key_headlines=STRING_LIST, trending_topics=STRING_LIST,
+                                   expert_insights=STRING),
+    ),
+    'career_pathway': _object(
+        career_trajectory=_object(**{
+            year: _object(title=STRING, salary=STRING, skills=STRING_LIST)
+            for year in ('year_1', 'year_3', 'year_5', 'year_10')
+        }),
+        similar_profiles=_array(_object(name=STRING, background=STRING, current_role=STRING, journey=STRING,
+                                        key_insights=STRING)),
+        milestones=_array(_object(milestone=STRING, timeline=STRING, importance=STRING, preparation=STRING)),
+        risk_factors=_array(_object(risk=STRING, mitigation=STRING, probability=STRING)),
+    ),
+    'career_analysis': _object(
+        self_assessment=_object(strengths=STRING_LIST, market_value=STRING, perceived_value=STRING),
+        industry_alignment=_object(primary_industries=STRING_LIST, adjacent_industries=STRING_LIST,
+                                   growth_opportunities=STRING_LIST),
+        role_recommendations=_object(immediate_roles=STRING_LIST, growth_roles=STRING_LIST,
+                                     transition_roles=STRING_LIST),
+        market_intelligence=_object(salary_insights=STRING, demand_forecast=STRING, ai_impact=STRING,
+                                    key_trends=STRING_LIST),
+        action_plan=_object(immediate_actions=STRING_LIST, skill_gaps=STRING_LIST, networking_strategy=STRING,
+                            timeline=STRING),
+        resume_improvements=_object(strengths_to_highlight=STRING_LIST, weaknesses_to_address=STRING_LIST,
+                                    formatting_suggestions=STRING_LIST, keyword_optimization=STRING_LIST),
+    ),
+    'job_recommendations': _object(
+        recommended_jobs=_array(_object(
+            required=['title', 'company', 'location'],
+            title=STRING, company=STRING, location=STRING, salary_range=STRING, match_score=STRING,
+            application_tips=STRING, company_culture=STRING, growth_potential=STRING, ai_relevance=STRING,
+            job_description=STRING, required_skills=STRING_LIST, preferred_skills=STRING_LIST,
+        )),
+        application_strategy=STRING,
+        timeline=STRING,
+    ),
+    'training_recommendations': _object(
+        required=['skill_gaps', 'simulated_projects', 'learning_timeline'],
+        skill_gaps=_array(_object(
+            required=['skill', 'priority', 'learning_resources'],
+            skill=STRING, current_level=STRING, target_level=STRING, priority=STRING, time_to_learn=STRING,
+            learning_resources=_array(_object(
+                required=['type', 'title'],
+                type=STRING, title=STRING, provider=STRING, url=STRING, duration=STRING, cost=STRING,
+                description=STRING,
+            )),
+        )),
+        simulated_projects=_array(_object(
+            required=['project_name', 'description'],
+            project_name=STRING, description=STRING, skills_demonstrated=STRING_LIST, difficulty=STRING,
+            time_required=STRING, deliverables=STRING_LIST, github_template=STRING, portfolio_impact=STRING,
+            step_by_step_guide=STRING_LIST,
+        )),
+        learning_timeline=_object(required=[], week_1_2=STRING_LIST, week_3_4=STRING_LIST,
+                                  week_5_6=STRING_LIST, week_7_8=STRING_LIST),
+        portfolio_enhancement=_object(required=[], resume_additions=STRING_LIST, linkedin_updates=STRING_LIST,
+                                      github_showcase=STRING_LIST, case_studies=STRING_LIST),
+        certification_recommendations=_array(_object(
+            required=['certification'],
+            certification=STRING, provider=STRING, relevance=STRING, cost=STRING, duration=STRING,
+            exam_info=STRING,
+        )),
+    ),
+}
+
+# Batched variants: an indexed array with one result per packed profile (see batch_reports.py)
+for _prompt_type in ('intelligence_report', 'job_titles'):
+    SCHEMAS[f'{_prompt_type}_batch'] = _array(_object(index={"type": "integer"}, result=SCHEMAS[_prompt_type]))
+
+# Ask the model for JSON mode plus a response schema; switched off if the SDK rejects it
+USE_RESPONSE_SCHEMA = True
+
+# Identical concurrent requests share one LLM call (optionally across processes)
+llm_flights = SingleFlight(
+    SQLiteLease(Config.SINGLE_FLIGHT_DB, Config.SINGLE_FLIGHT_LEASE_SECONDS) if Config.SINGLE_FLIGHT_DB else None
+)
+
+# Calls only share a flight within one scope, so a background job (longer
+# deadline) never waits on a request's call that its deadline will cut short
+_flight_scope = contextvars.ContextVar('llm_flight_scope', default='request')
+
+
+@contextmanager
+def flight_scope(scope):
+    """Share in-flight LLM calls only with callers in the same scope (e.g. 'job')."""
+    token = _flight_scope.set(scope)
+    try:
+        yield
+    finally:
+        _flight_scope.reset(token)
+
+_metrics_lock = threading.Lock()
+_metrics = defaultdict(lambda: {'calls': 0, 'clean': 0, 'repaired': 0, 'reasks': 0, 'failures': 0})
+
+
+def _record(prompt_type, **counts):
+    with _metrics_lock:
+        entry = _metrics[prompt_type]
+        for key, value in counts.items():
+            entry[key] += value
+
+
+def get_metrics():
+    """Return parse/repair/re-ask counters per prompt type."""
+    with _metrics_lock:
+        return {prompt_type: dict(counts) for prompt_type, counts in _metrics.items()}
+
+
+def reset_metrics():
+    """Clear all counters (mainly for tests)."""
+    with _metrics_lock:
+        _metrics.clear()
+
+
+def validate(data, schema, path='$'):
+    """
+    Validate data against a (small subset of) JSON schema.
+
+    Returns:
+        list: Human readable error strings, empty when valid
+    """
+    expected = schema.get('type')
+    checks = {
+        'object': lambda v: isinstance(v, dict),
+        'array': lambda v: isinstance(v, list),
+        'string': lambda v: isinstance(v, str),
+        'number': lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+        'integer': lambda v: isinstance(v, int) and not isinstance(v, bool),
+        'boolean': lambda v: isinstance(v, bool),
+    }
+    if expected in checks and not checks[expected](data):
+        return [f"{path}: expected {expected}, got {type(data).__name__}"]
+
+    errors = []
+    if expected == 'object':
+        for key in schema.get('required', []):
+            if key not in data:
+                errors.append(f"{path}: missing required key '{key}'")
+        for key, sub_schema in schema.get('properties', {}).items():
+            if key in data:
+                errors.extend(validate(data[key], sub_schema, f"{path}.{key}"))
+    elif expected == 'array' and 'items' in schema:
+        for index, item in enumerate(data):
+            errors.extend(validate(item, schema['items'], f"{path}[{index}]"))
+    return errors
+
+
+def _scan(text):
+    """
+    Walk JSON-ish text once, dropping trailing commas.
+
+    Returns:
+        tuple: (cleaned text, stack of unclosed brackets, still inside a string,
+                offsets of structural commas in the cleaned text)
+    """
+    out = []
+    stack = []
+    commas = []
+    in_string = False
+    escaped = False
+
+    for ch in text:
+        if in_string:
+            out.append(ch)
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+
+        if ch == '"':
+            in_string = True
+            out.append(ch)
+        elif ch in '{[':
+            stack.append('}' if ch == '{' else ']')
+            out.append(ch)
+        elif ch in '}]':
+            # Drop a trailing comma before the closing bracket
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ',':
+                out.pop()
+                commas.pop()
+            if stack and stack[-1] == ch:
+                stack.pop()
+                out.append(ch)
+                if not stack:
+                    break
+        elif ch == ',':
+            commas.append(len(out))
+            out.append(ch)
+        else:
+            out.append(ch)
+
+    return ''.join(out), stack, in_string, commas
+
+
+def _close(text, stack, in_string):
+    """Close an unterminated string and any open brackets."""
+    if in_string:
+        text += '"'
+    text = text.rstrip()
+    if text.endswith(','):
+        text = text[:-1]
+    return text + ''.join(reversed(stack))
+
+
+def repair_json(text):
+    """
+    Repair near-valid JSON: trailing commas and truncated output.
+
+    Truncated replies are closed; if that is still invalid, the last partial
+    element is dropped until the document parses.
+
+    Returns:
+        The parsed value
+
+    Raises:
+        json.JSONDecodeError: If the text cannot be repaired
+    """
+    cleaned, stack, in_string, commas = _scan(text)
+    try:
+        return json.loads(_close(cleaned, stack, in_string))
+    except json.JSONDecodeError as error:
+        last_error = error
+
+    # Cut back to earlier element boundaries (e.g. a key without a value)
+    for offset in reversed(commas[-20:]):
+        head, head_stack, head_in_string, _ = _scan(cleaned[:offset])
+        try:
+            return json.loads(_close(head, head_stack, head_in_string))
+        except json.JSONDecodeError as error:
+            last_error = error
+    raise last_error
+
+
+def extract_json(text, expected_type='object'):
+    """
+    Pull a JSON value out of an LLM reply.
+
+    Handles ```json fences, prose around the payload, trailing commas and
+    truncated arrays/objects.
+
+    Returns:
+        tuple: (parsed value, True if a local repair was needed)
+
+    Raises:
+        StructuredOutputError: If no JSON value can be recovered
+    """
+    if not text or not text.strip():
+        raise StructuredOutputError("Empty response", raw_text=text or "")
+
+    candidate = text.strip()
+    fenced = re.search(r"```(?:json)?\s*(.*?)(?:```|$)", candidate, re.DOTALL)
+    if fenced and fenced.group(1).strip():
+        candidate = fenced.group(1).strip()
+
+    opener = '[' if expected_type == 'array' else '{'
+    start = candidate.find(opener)
+    if start == -1:
+        raise StructuredOutputError(f"No JSON {expected_type} found in response", raw_text=text)
+    candidate = candidate[start:]
+
+    try:
+        value, _ = json.JSONDecoder().raw_decode(candidate)
+        return value, False
+    except json.JSONDecodeError:
+        pass
+
+    try:
+        return repair_json(candidate), True
+    except json.JSONDecodeError as error:
+        raise StructuredOutputError(f"Invalid JSON in response: {error}", raw_text=text) from error
+
+
+def _generation_config(prompt_type):
+    config = {"max_output_tokens": max_output_tokens(prompt_type)}
+    if USE_RESPONSE_SCHEMA:
+        config["response_mime_type"] = "application/json"
+        config["response_schema"] = SCHEMAS[prompt_type]
+    return config
+
+
+def _rejects_json_mode(error):
+    """
+    True when the SDK or API refused the JSON-mode fields, e.g. an older
+    google-generativeai without response_schema, or a model that only
+    allows text/plain. Any other error is a real failure.
+    """
+    if not isinstance(error, (TypeError, ValueError, AttributeError, KeyError)) and getattr(error, 'code', None) != 400:
+        return False
+    return any(field in str(error) for field in ('response_mime_type', 'response_schema'))
+
+
+def _call_model(model, prompt, prompt_type):
+    """Call generate_content through the resilient transport, dropping JSON mode if the SDK rejects it."""
+    global USE_RESPONSE_SCHEMA
+
+    config = _generation_config(prompt_type)
+    try:
+        response = llm_transport.generate_content(model, prompt, generation_config=config)
+    except Exception as error:
+        if not USE_RESPONSE_SCHEMA or not _rejects_json_mode(error):
+            raise
+        print(f"⚠️  JSON mode not supported by model SDK, falling back to plain prompts: {error}")
+        USE_RESPONSE_SCHEMA = False
+        response = llm_transport.generate_content(model, prompt, generation_config=_generation_config(prompt_type))
+    note_response(response, prompt)
+    return response.text
+
+
+def _reask_prompt(prompt, previous_text, errors):
+    problems = '; '.join(errors[:5])
+    return (
+        f"{prompt}\n\n"
+        f"Your previous reply could not be used ({problems}).\n"
+        f"Previous reply:\n{previous_text[:2000]}\n\n"
+        "Respond again with ONLY the corrected JSON. No markdown, no explanations."
+    )
+
+
+def parse_structured(text, prompt_type):
+    """
+    Parse and validate a reply for a prompt type without calling the model.
+
+    Returns:
+        tuple: (parsed value, True if repaired)
+
+    Raises:
+        StructuredOutputError: If the reply cannot be parsed or fails validation
+    """
+    schema = SCHEMAS[prompt_type]
+    data, repaired = extract_json(text, schema['type'])
+    errors = validate(data, schema)
+    if errors:
+        raise StructuredOutputError('; '.join(errors[:5]), raw_text=text)
+    return data, repaired
+
+
+def generate_json(model, prompt, prompt_type, max_reasks=1):
+    """
+    Ask the model for schema-constrained JSON and return the parsed value.
+
+    Local repair is tried first; the model is re-asked only when the reply
+    cannot be repaired or fails schema validation. Concurrent calls with the
+    same model, prompt type and prompt share a single in-flight request
+    (within one flight_scope).
+
+    Args:
+        model: Object with a Gemini-style generate_content(prompt, generation_config=...)
+        prompt (str): Prompt text
+        prompt_type (str): Key into SCHEMAS
+        max_reasks (int): Extra LLM round trips allowed for invalid replies
+
+    Returns:
+        dict or list: Validated JSON value
+
+    Raises:
+        StructuredOutputError: If no valid JSON was produced
+    """
+    # A ModelRouter picks the tier for this prompt type; plain providers pass through
+    model = route_model(model, prompt_type)
+    model_name = getattr(model, 'model_name', type(model).__name__)
+    key = flight_key(_flight_scope.get(), model_name, prompt_type, prompt, max_reasks)
+    with llm_usage.track(prompt_type, model_name):
+        # Followers of another caller's in-flight request are accounted as 'shared'
+        set_cache_status('shared')
+        result = llm_flights.do(key, lambda: _generate_json(model, prompt, prompt_type, max_reasks))
+    # Callers may mutate their copy; the shared result must stay intact
+    return copy.deepcopy(result)
+
+
+def _generate_json(model, prompt, prompt_type, max_reasks):
+    set_cache_status('miss')
+    _record(prompt_type, calls=1)
+    check_prompt(prompt_type, prompt)
+
+    current_prompt = prompt
+    for attempt in range(max_reasks + 1):
+        text = _call_model(model, current_prompt, prompt_type)
+        try:
+            data, repaired = parse_structured(text, prompt_type)
+        except StructuredOutputError as error:
+            note_parse_failure()
+            if attempt == max_reasks:
+                _record(prompt_type, failures=1)
+                raise
+            _record(prompt_type, reasks=1)
+            current_prompt = _reask_prompt(prompt, text, [str(error)])
+            continue
+
+        _record(prompt_type, **({'repaired': 1} if repaired else {'clean': 1}))
+        return data
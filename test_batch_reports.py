@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for batched multi-profile LLM reports
+"""
+
+import json
+
+from batch_reports import build_batch_prompt, generate_batch, parse_batch_items
+from llm_provider import BATCH_INDEX, FakeProvider
+from structured_output import SCHEMAS, validate
+
+BLOCKS = [f"User Profile:\n- Skills: skill {i}" for i in range(10)]
+
+
+def _no_sleep(seconds):
+    pass
+
+
+def _single(position):
+    return ["Single call", str(position)]
+
+
+class CorruptingProvider(FakeProvider):
+    """Fake provider that breaks the result of chosen batch indices (or the whole reply)."""
+
+    def __init__(self, broken_indices=(), garble=False):
+        super().__init__(model_name=f"corrupt-{sorted(broken_indices)}-{garble}", sleep=_no_sleep)
+        self.broken_indices = set(broken_indices)
+        self.garble = garble
+
+    def generate_content(self, prompt, generation_config=None, request_options=None):
+        response = super().generate_content(prompt, generation_config, request_options)
+        if self.garble:
+            response.text = response.text[:len(response.text) // 2] + ' not json ]]'
+            return response
+        items = json.loads(response.text)
+        for item in items:
+            if item['index'] in self.broken_indices:
+                item['result'] = {'unexpected': True}
+        response.text = json.dumps(items)
+        return response
+
+
+def test_batch_prompt_is_indexed():
+    prompt = build_batch_prompt("Suggest job titles.", '["Title"]', BLOCKS[:3])
+    assert BATCH_INDEX.findall(prompt) == ['0', '1', '2']
+    assert '"index": <item index>' in prompt
+    print("✅ Batch prompts index every item")
+
+
+def test_batches_cover_every_profile_in_order():
+    provider = FakeProvider(sleep=_no_sleep)
+    results = generate_batch(provider, 'job_titles', "Suggest job titles.", '["Title"]', BLOCKS, _single,
+                             batch_size=4)
+    assert len(results) == 10 and provider.stats['calls'] == 3
+    assert all(validate(result, SCHEMAS['job_titles']) == [] for result in results)
+    assert not any(result[0] == 'Single call' for result in results)
+    print("✅ Batches cover every profile with ceil(n / size) calls")
+
+
+def test_invalid_items_are_retried_singly():
+    provider = CorruptingProvider(broken_indices={1})
+    results = generate_batch(provider, 'intelligence_report', "Analyze.", '{}', BLOCKS[:6],
+                             lambda position: {'single': position}, batch_size=3)
+    # Local index 1 is broken in both batches: cohort positions 1 and 4
+    assert results[1] == {'single': 1} and results[4] == {'single': 4}
+    assert all(validate(results[i], SCHEMAS['intelligence_report']) == [] for i in (0, 2, 3, 5))
+    print("✅ Invalid items are split out and retried singly")
+
+
+def test_unparseable_batch_falls_back():
+    provider = CorruptingProvider(garble=True)
+    results = generate_batch(provider, 'job_titles', "Suggest job titles.", '["Title"]', BLOCKS[:4], _single,
+                             batch_size=4)
+    assert all(result[0] == 'Single call' or validate(result, SCHEMAS['job_titles']) == [] for result in results)
+    assert any(result[0] == 'Single call' for result in results)
+    print("✅ Unparseable batches fall back to single calls")
+
+
+def test_parse_batch_items_ignores_unknown_and_duplicates():
+    value = [{'index': 0, 'result': ['A']}, {'index': 0, 'result': ['B']}, {'index': 7, 'result': ['C']},
+             {'index': 1, 'result': 'not a list'}, 'junk']
+    assert parse_batch_items(value, 'job_titles', [0, 1]) == {0: ['A']}
+    print("✅ Batch parsing keeps the first valid result per index")
+
+
+def main():
+    """Run all batch tests."""
+    print("🧪 Batch Report Test Suite")
+    print("=" * 50)
+    test_batch_prompt_is_indexed()
+    test_batches_cover_every_profile_in_order()
+    test_invalid_items_are_retried_singly()
+    test_unparseable_batch_falls_back()
+    test_parse_batch_items_ignores_unknown_and_duplicates()
+    print("\n🎉 All batch tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for record/replay cassettes
+Records fake LLM and job board traffic to a temporary cassette and replays it
+"""
+
+import os
+import tempfile
+
+import pandas as pd
+
+from cassette import Cassette, CassetteMiss
+from llm_provider import FakeProvider
+from structured_output import generate_json
+
+
+def _path():
+    return os.path.join(tempfile.mkdtemp(), 'session.jsonl.gz')
+
+
+def test_llm_round_trip():
+    """Recorded replies replay for prompts that differ only in whitespace."""
+    path = _path()
+    recorder = Cassette(path, mode='record')
+    provider = recorder.provider(lambda: FakeProvider(latency='fixed', latency_ms=30))
+    recorded = generate_json(provider, "Cassette test:\n    list skill gaps", 'upskilling_plan')
+    recorder.save()
+    assert os.path.getsize(path) > 0
+
+    slept = []
+    player = Cassette(path, mode='replay', speed='recorded', sleep=slept.append)
+    replayed = generate_json(player.provider(lambda: None), "Cassette test: list skill gaps", 'upskilling_plan')
+    assert replayed == recorded
+    assert len(slept) == 1 and slept[0] >= 0.03
+    print("✅ LLM replies replay with recorded latency")
+
+
+def test_replay_miss_and_max_speed():
+    """Unrecorded prompts miss; max speed never sleeps."""
+    path = _path()
+    recorder = Cassette(path, mode='record')
+    provider = recorder.provider(lambda: FakeProvider(latency='fixed', latency_ms=10))
+    provider.generate_content("first prompt")
+    recorder.save()
+
+    slept = []
+    player = Cassette(path, mode='replay', speed='max', sleep=slept.append)
+    replay_provider = player.provider(lambda: None)
+    assert replay_provider.generate_content("first  prompt").text
+    try:
+        replay_provider.generate_content("another prompt")
+    except CassetteMiss:
+        pass
+    else:
+        raise AssertionError("expected CassetteMiss")
+    assert slept == [] and player.stats == {'recorded': 0, 'replayed': 1, 'misses': 1}
+    print("✅ Misses are reported and max speed skips delays")
+
+
+def test_jobspy_dataframes_round_trip():
+    """Scraped DataFrames replay for the same normalized search parameters."""
+    path = _path()
+    frame = pd.DataFrame([
+        {'TITLE': 'Data Engineer', 'COMPANY': 'Acme', 'ZIP': '02134', 'IS_REMOTE': True},
+        {'TITLE': 'ML Engineer', 'COMPANY': 'Globex', 'ZIP': '10001', 'IS_REMOTE': False},
+    ])
+    calls = []
+
+    def scrape_jobs(**params):
+        calls.append(params)
+        return frame
+
+    recorder = Cassette(path, mode='record')
+    recorder.scraper(scrape_jobs)(site_name=['indeed', 'linkedin'], search_term='Data Engineer', results_wanted=2)
+    recorder.save()
+
+    player = Cassette(path, mode='replay', speed='max')
+    replayed = player.scraper(None)(site_name=['linkedin', 'indeed'], search_term='data  engineer', results_wanted=2)
+    assert len(calls) == 1
+    assert replayed.to_dict('records') == frame.to_dict('records')
+    print("✅ JobSpy DataFrames replay")
+
+
+def main():
+    """Run all cassette tests."""
+    print("🧪 Cassette Test Suite")
+    print("=" * 50)
+    test_llm_round_trip()
+    test_replay_miss_and_max_speed()
+    test_jobspy_dataframes_round_trip()
+    print("\n🎉 All cassette tests passed!")
+
+
+if __name__ == "__main__":
+    main()
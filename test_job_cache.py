@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Test script for the job search cache
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from job_cache import JobSearchCache, MemoryBackend, SQLiteBackend, search_key
+
+
+def test_search_key_normalizes_queries():
+    key = search_key('Data  Engineer', 'New York', ['indeed', 'linkedin'], 168)
+    assert key == search_key(' data engineer', 'new york ', ['LinkedIn', 'Indeed'], 168)
+    assert key != search_key('data engineer', 'Boston', ['indeed', 'linkedin'], 168)
+    assert key != search_key('data engineer', 'New York', ['indeed', 'linkedin'], 24)
+    print("✅ Search keys ignore case, whitespace and board order")
+
+
+def test_hits_and_misses():
+    cache = JobSearchCache(MemoryBackend(), ttl_seconds=60)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {'jobs': [{'title': 'Engineer'}]}
+
+    value, status = cache.get_or_fetch('k', fetch)
+    assert status == 'miss' and len(calls) == 1
+    value['jobs'].append({'title': 'Mutated'})
+    value, status = cache.get_or_fetch('k', fetch)
+    assert status == 'hit' and len(calls) == 1 and len(value['jobs']) == 1
+    assert cache.summary()['hit_rate'] == 0.5
+    print("✅ Fresh entries are hits and callers can't mutate them")
+
+
+def test_stale_entry_refreshes_once_in_background():
+    cache = JobSearchCache(MemoryBackend(), ttl_seconds=60, stale_seconds=600)
+    cache.backend.set('k', {'jobs': ['old']}, time.time() - 120)
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(2)
+        return {'jobs': ['new']}
+
+    for _ in range(3):
+        assert cache.get_or_fetch('k', fetch) == ({'jobs': ['old']}, 'stale')
+    release.set()
+    cache._executor.shutdown(wait=True)
+    assert len(calls) == 1 and cache.stats['refreshes'] == 1
+    assert cache.get_or_fetch('k', fetch) == ({'jobs': ['new']}, 'hit')
+
+    # Too old even for stale-while-revalidate: refetched inline
+    cache.backend.set('k', {'jobs': ['ancient']}, time.time() - 1000)
+    assert cache.get_or_fetch('k', lambda: {'jobs': ['fresh']}) == ({'jobs': ['fresh']}, 'miss')
+    print("✅ Stale entries are served while one background refresh runs")
+
+
+def test_concurrent_misses_share_one_scrape():
+    cache = JobSearchCache(MemoryBackend())
+    calls = []
+    statuses = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        return {'jobs': ['shared']}
+
+    threads = [threading.Thread(target=lambda: statuses.append(cache.get_or_fetch('k', fetch)[1]))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert sorted(statuses) == ['miss'] + ['shared'] * 4
+    print("✅ Concurrent misses share one scrape")
+
+
+def test_accept_and_store_if():
+    cache = JobSearchCache(MemoryBackend())
+    cache.get_or_fetch('k', lambda: {'jobs': [], 'results_wanted': 10}, store_if=lambda value: bool(value['jobs']))
+    assert len(cache.backend) == 0
+
+    cache.get_or_fetch('k', lambda: {'jobs': ['a'], 'results_wanted': 10})
+    value, status = cache.get_or_fetch('k', lambda: {'jobs': ['a', 'b'], 'results_wanted': 50},
+                                       accept=lambda cached: cached['results_wanted'] >= 50)
+    assert status == 'miss' and value['results_wanted'] == 50
+    print("✅ Unacceptable cached values and empty scrapes are not served")
+
+
+def test_lookup_leaves_misses_to_the_caller():
+    cache = JobSearchCache(MemoryBackend(), ttl_seconds=60, stale_seconds=600)
+    assert cache.lookup('k') == (None, 'miss')
+    cache.put('k', {'jobs': ['streamed'], 'results_wanted': 10})
+    assert cache.lookup('k') == ({'jobs': ['streamed'], 'results_wanted': 10}, 'hit')
+    assert cache.lookup('k', accept=lambda value: value['results_wanted'] >= 50) == (None, 'miss')
+
+    # Stale values are served while the given fetch refreshes them
+    cache.backend.set('k', {'jobs': ['old'], 'results_wanted': 10}, time.time() - 120)
+    assert cache.lookup('k', lambda: {'jobs': ['new'], 'results_wanted': 10})[1] == 'stale'
+    cache._executor.shutdown(wait=True)
+    assert cache.lookup('k')[0]['jobs'] == ['new']
+
+    # A miss while an identical search is in flight waits for it
+    started, release, results = threading.Event(), threading.Event(), []
+
+    def fetch():
+        started.set()
+        release.wait(2)
+        return {'jobs': ['shared'], 'results_wanted': 10}
+
+    thread = threading.Thread(target=lambda: cache.get_or_fetch('other', fetch))
+    thread.start()
+    started.wait(2)
+    waiter = threading.Thread(target=lambda: results.append(cache.lookup('other')))
+    waiter.start()
+    time.sleep(0.05)
+    release.set()
+    thread.join()
+    waiter.join()
+    assert results == [({'jobs': ['shared'], 'results_wanted': 10}, 'shared')]
+    assert cache.stats['misses'] == 3 and cache.stats['shared'] == 1 and cache.stats['stale_hits'] == 1
+    print("✅ Lookups serve fresh, stale and in-flight values and leave misses to the caller")
+
+
+def test_sqlite_backend_is_shared():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'job_cache.db')
+        first = JobSearchCache(SQLiteBackend(path))
+        first.get_or_fetch('k', lambda: {'jobs': [{'remote': np.bool_(True), 'count': np.int64(3)}]})
+        second = JobSearchCache(SQLiteBackend(path))
+        value, status = second.get_or_fetch('k', lambda: {'jobs': []})
+        assert status == 'hit' and value == {'jobs': [{'remote': True, 'count': 3}]}
+
+        backend = SQLiteBackend(path, max_entries=2)
+        for i in range(4):
+            backend.set(f'key-{i}', i, time.time() + i)
+        assert len(backend) == 2 and backend.get('key-3')[0] == 3
+    print("✅ SQLite backend is shared between instances and bounded")
+
+
+def main():
+    """Run all job search cache tests."""
+    print("🧪 Job Search Cache Test Suite")
+    print("=" * 50)
+    test_search_key_normalizes_queries()
+    test_hits_and_misses()
+    test_stale_entry_refreshes_once_in_background()
+    test_concurrent_misses_share_one_scrape()
+    test_accept_and_store_if()
+    test_lookup_leaves_misses_to_the_caller()
+    test_sqlite_backend_is_shared()
+    print("\n🎉 All job search cache tests passed!")
+
+
+if __name__ == "__main__":
+    main()
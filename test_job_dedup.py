@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test script for cross-board job deduplication
+"""
+
+import os
+import random
+import tempfile
+import time
+
+import pandas as pd
+
+from job_dedup import dedupe_against, dedupe_jobs, find_duplicates, hamming, normalize_company, normalize_title, simhash
+from job_index import JobIndex
+
+_rng = random.Random(3)
+VOCABULARY = [f"term{i}" for i in range(3000)]
+
+
+def _description(words=250):
+    return ' '.join(_rng.choice(VOCABULARY) for _ in range(words))
+
+
+def _job(title, company, url, site, description, location='Austin, TX', **extra):
+    return dict({'title': title, 'company': company, 'location': location, 'description': description,
+                 'url': url, 'site': site, 'salary': 'Salary not specified'}, **extra)
+
+
+def test_keys_and_fingerprints():
+    assert normalize_title('Sr. Software Eng (Backend)') == 'senior software engineer backend'
+    assert normalize_company('The Acme Company, Inc.') == normalize_company('ACME') == 'acme'
+    description = _description()
+    words = description.split()
+    edited = ' '.join(words[:100] + ['apply', 'today'] + words[100:])
+    assert hamming(simhash(description), simhash(edited)) <= 8
+    assert hamming(simhash(description), simhash(_description())) > 16
+    assert simhash('') == 0 and simhash(description) == simhash(description.upper())
+    print("✅ Titles and companies normalize and SimHash tracks description similarity")
+
+
+def test_copies_collapse_into_richest():
+    description = _description()
+    jobs = [
+        _job('Sr. Data Engineer', 'Acme, Inc.', 'https://indeed/1', 'indeed', description[:len(description) * 9 // 10]),
+        _job('Nurse', 'Acme', 'https://indeed/2', 'indeed', _description()),
+        _job('Senior Data Engineer', 'ACME', 'https://linkedin/1', 'linkedin', description,
+             location='Austin', salary='$120,000 - $150,000'),
+        _job('Senior Data Engineer', 'Acme', 'https://indeed/3', 'indeed', description, location='Boston, MA'),
+        _job('Senior Data Engineer', 'Other Co', 'https://zip/1', 'zip_recruiter', description),
+    ]
+    deduped = dedupe_jobs(jobs)
+    assert [job['url'] for job in deduped] == ['https://linkedin/1', 'https://indeed/2', 'https://indeed/3',
+                                               'https://zip/1']
+    assert deduped[0]['alternate_urls'] == [{'site': 'indeed', 'url': 'https://indeed/1'}]
+    assert deduped[0]['salary'] == '$120,000 - $150,000' and 'alternate_urls' not in deduped[1]
+    assert dedupe_jobs([jobs[1], dict(jobs[1])]) == [dict(jobs[1], alternate_urls=[])]
+    print("✅ Cross-board copies collapse into the richest one with alternate URLs")
+
+
+def test_streamed_batches_dedupe_against_sent_jobs():
+    description = _description()
+    sent = [_job('Data Engineer', 'Acme', 'https://indeed/1', 'indeed', description)]
+    batch = [
+        _job('Data Engineer', 'Acme Inc', 'https://linkedin/1', 'linkedin', description, salary='$100,000+'),
+        _job('Nurse', 'Acme', 'https://linkedin/2', 'linkedin', _description()),
+        _job('Nurse', 'Acme', 'https://linkedin/2', 'linkedin', _description()),
+    ]
+    new, alternates = dedupe_against(sent, batch)
+    assert [job['url'] for job in new] == ['https://linkedin/2']
+    assert alternates == {'https://indeed/1': [{'site': 'linkedin', 'url': 'https://linkedin/1'}]}
+    assert dedupe_against(sent, [dict(batch[0], alternate_urls=[{'site': 'indeed', 'url': 'https://indeed/1'}])])[1] \
+        == alternates
+    assert dedupe_against([], batch[:2]) == (batch[:2], {})
+    print("✅ Streamed batches drop copies of jobs already sent")
+
+
+def test_banded_lsh_stays_near_linear():
+    jobs = []
+    for i in range(3000):
+        description = _description(200)
+        jobs.append(_job(f"Engineer {i}", f"Company {i % 300}", f"https://indeed/{i}", 'indeed', description))
+        if i % 10 == 0:
+            words = description.split()
+            jobs.append(_job(f"Engineer {i} (Remote)", f"Company {i % 300} LLC", f"https://linkedin/{i}",
+                             'linkedin', ' '.join(words[:100] + ['now'] + words[100:])))
+    started = time.perf_counter()
+    clusters = find_duplicates(jobs)
+    elapsed = time.perf_counter() - started
+    assert all(len(members) == 2 for members in clusters)
+    assert len(clusters) >= 240 and elapsed < 10
+    print(f"✅ {len(jobs)} postings deduplicated in {elapsed:.2f}s ({len(clusters)} copies found)")
+
+
+def test_index_wide_dedupe():
+    description = _description()
+    frame = lambda title, company, url, text: pd.DataFrame({
+        'title': [title], 'company': [company], 'city': ['Austin'], 'state': ['TX'],
+        'description': [text], 'job_url': [url]})
+    with tempfile.TemporaryDirectory() as tmp:
+        index = JobIndex(os.path.join(tmp, 'job_index.db'))
+        index.add_frame(frame('Data Engineer', 'Acme', 'https://indeed/1', description[:len(description) * 9 // 10]),
+                        'indeed')
+        index.add_frame(frame('Data Engineer', 'Acme Inc', 'https://linkedin/1', description), 'linkedin')
+        index.add_frame(frame('Data Analyst', 'Acme', 'https://indeed/2', _description()), 'indeed')
+        assert len(index.search('data')) == 3
+        assert index.dedupe() == 1
+        results = index.search('data')
+        assert len(results) == 2
+        kept = next(row for row in results if row['TITLE'] == 'Data Engineer')
+        assert kept['JOB_URL'] == 'https://linkedin/1'
+        assert kept['ALTERNATE_URLS'] == [{'site': 'indeed', 'url': 'https://indeed/1'}]
+        assert index.dedupe() == 1  # idempotent
+    print("✅ The whole job index is deduplicated and searches skip the copies")
+
+
+def main():
+    """Run all job deduplication tests."""
+    print("🧪 Job Deduplication Test Suite")
+    print("=" * 50)
+    test_keys_and_fingerprints()
+    test_copies_collapse_into_richest()
+    test_streamed_batches_dedupe_against_sent_jobs()
+    test_banded_lsh_stays_near_linear()
+    test_index_wide_dedupe()
+    print("\n🎉 All job deduplication tests passed!")
+
+
+if __name__ == "__main__":
+    main()
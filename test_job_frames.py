@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test script for columnar JobSpy DataFrame conversion
+"""
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import _synthetic_jobs_frame
+from job_frames import format_salaries, format_salary, jobs_from_frame
+
+
+def test_salaries_match_row_by_row_formatting():
+    frame = _synthetic_jobs_frame(500, seed=7)
+    expected = [format_salary(row) for _, row in frame.iterrows()]
+    values = {column: frame[column].to_numpy(dtype=object) for column in frame.columns}
+    assert format_salaries(values).tolist() == expected
+    assert format_salary({'MIN_AMOUNT': 120000.0, 'MAX_AMOUNT': 150000.0}) == "$120,000 - $150,000"
+    assert format_salary({'MIN_AMOUNT': 25.5, 'MAX_AMOUNT': 40.0, 'INTERVAL': 'hourly'}) == "$25.50/hr - $40/hr"
+    assert format_salary({'MIN_AMOUNT': 5000.0, 'MAX_AMOUNT': np.nan, 'INTERVAL': 'monthly'}) == "$5,000+ (monthly)"
+    assert format_salary({'MIN_AMOUNT': np.nan, 'MAX_AMOUNT': 90000.0}) == "Salary not specified"
+    print("✅ Columnar salaries match row-by-row formatting")
+
+
+def test_jobs_from_frame_fills_placeholders():
+    frame = pd.DataFrame({
+        'title': ['Data Engineer', None],
+        'company': ['Acme', np.nan],
+        'city': ['Austin', np.nan],
+        'state': ['TX', 'CA'],
+        'description': ['x' * 600, None],
+        'date_posted': [pd.Timestamp('2026-10-01').date(), None],
+        'is_remote': [np.True_, None],
+    })
+    first, second = jobs_from_frame(frame, 'indeed')
+    assert first['location'] == 'Austin, TX' and second['location'] == 'CA'
+    assert len(first['description']) == 503 and second['description'] == 'No description available...'
+    assert first['posted_date'] == '2026-10-01' and second['posted_date'] == 'N/A'
+    assert second['title'] == 'N/A' and second['url'] == '#' and second['job_type'] == 'N/A'
+    assert first['is_remote'] is True and second['is_remote'] is False
+    assert {type(value) for value in first.values()} == {str, bool}
+    assert list(first) == ['title', 'company', 'location', 'description', 'salary', 'url', 'posted_date',
+                           'job_type', 'is_remote', 'site']
+    print("✅ Missing columns and values get placeholders and plain Python types")
+
+
+def test_rows_and_limits():
+    rows = [{'TITLE': 'Nurse', 'SITE': 'indeed'}, {'TITLE': 'Analyst', 'SITE': 'linkedin'}]
+    assert [job['site'] for job in jobs_from_frame(rows)] == ['indeed', 'linkedin']
+    assert [job['title'] for job in jobs_from_frame(rows, 'google', limit=1)] == ['Nurse']
+    assert jobs_from_frame([]) == [] and jobs_from_frame(pd.DataFrame(), 'indeed') == []
+    assert len(jobs_from_frame(_synthetic_jobs_frame(10000, seed=1), 'indeed', limit=2500)) == 2500
+    print("✅ Row dicts, per-row sites and limits are supported")
+
+
+def main():
+    """Run all DataFrame conversion tests."""
+    print("🧪 Job Frame Conversion Test Suite")
+    print("=" * 50)
+    test_salaries_match_row_by_row_formatting()
+    test_jobs_from_frame_fills_placeholders()
+    test_rows_and_limits()
+    print("\n🎉 All job frame conversion tests passed!")
+
+
+if __name__ == "__main__":
+    main()
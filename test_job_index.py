@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test script for the local job index
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from job_index import JobIndex, match_expression, parse_queries
+
+
+def _frame(*titles, city='Austin', state='TX', description='Build services in Python'):
+    return pd.DataFrame({
+        'title': list(titles),
+        'company': ['Acme'] * len(titles),
+        'city': [city] * len(titles),
+        'state': [state] * len(titles),
+        'min_amount': [100000.0] + [np.nan] * (len(titles) - 1),
+        'max_amount': [150000.0] + [np.nan] * (len(titles) - 1),
+        'interval': ['yearly'] * len(titles),
+        'is_remote': np.array([True] + [False] * (len(titles) - 1)),
+        'date_posted': [pd.Timestamp('2026-10-01').date()] * len(titles),
+        'description': [description] * len(titles),
+        'job_url': [f'https://jobs.example/{city}/{title}' for title in titles],
+    })
+
+
+def _index(tmp, **kwargs):
+    return JobIndex(os.path.join(tmp, 'job_index.db'), **kwargs)
+
+
+def test_parse_queries_and_match_expression():
+    assert parse_queries('Software Engineer, Data Scientist:New York') == [
+        ('Software Engineer', ''), ('Data Scientist', 'New York')]
+    assert match_expression('Data "Engineer"') == '"data" AND "engineer"'
+    assert match_expression('nurse', ['healthcare', 'medical']) == '"nurse" AND ("healthcare" OR "medical")'
+    assert match_expression('') == ''
+    print("✅ Crawl queries parse and search text becomes a quoted FTS5 query")
+
+
+def test_search_ranks_title_matches_first():
+    with tempfile.TemporaryDirectory() as tmp:
+        index = _index(tmp)
+        assert index.add_frame(_frame('Data Engineer', 'Accountant'), 'indeed') == 2
+        index.add_frame(_frame('Backend Developer', description='Data engineer team, Python'), 'linkedin')
+        results = index.search('data engineer')
+        assert [row['TITLE'] for row in results] == ['Data Engineer', 'Backend Developer']
+        first = results[0]
+        assert first['SITE'] == 'indeed' and first['IS_REMOTE'] is True and first['MIN_AMOUNT'] == 100000.0
+        assert first['DATE_POSTED'] == '2026-10-01'
+        assert 'MIN_AMOUNT' not in index.search('accountant')[0]
+        assert index.search('engineers')[0]['TITLE'] == 'Data Engineer'  # porter stemming
+        print("✅ Title matches rank first and rows keep JobSpy's column names")
+
+
+def test_location_filter_and_upsert():
+    with tempfile.TemporaryDirectory() as tmp:
+        index = _index(tmp)
+        index.add_frame(_frame('Nurse', city='Austin', state='TX'), 'indeed')
+        index.add_frame(_frame('Nurse', city='Boston', state='MA'), 'indeed')
+        assert len(index.search('nurse', 'Boston, MA')) == 1
+        assert len(index.search('nurse', 'tx')) == 1
+        assert len(index.search(None, None, limit=10)) == 2
+
+        # Re-crawling a posting updates it in place
+        index.add_frame(_frame('Nurse', city='Boston', state='MA', description='Night shift'), 'indeed')
+        assert len(index.search('nurse')) == 2
+        assert index.search('night shift')[0]['CITY'] == 'Boston'
+        assert index.search('"OR nurse') == index.search('or nurse')
+        print("✅ Location filters apply and postings are upserted by URL")
+
+
+def test_crawl_fills_index_and_expires_postings():
+    with tempfile.TemporaryDirectory() as tmp:
+        index = _index(tmp, queries=[('Data Engineer', ''), ('Nurse', 'Boston')], retention_days=1)
+        index.add_query('Data Engineer')
+        crawled = []
+
+        def fetch(search_term, location):
+            crawled.append((search_term, location))
+            if search_term == 'Nurse':
+                raise RuntimeError("blocked")
+            return {'indeed': _frame('Data Engineer'), 'linkedin': _frame('Senior Data Engineer')}
+
+        assert index.crawl(fetch) == 2
+        assert sorted(crawled) == [('Data Engineer', ''), ('Nurse', 'Boston')]
+        summary = index.summary()
+        assert summary['postings'] == 2 and summary['queries'] == 2 and summary['crawl_errors'] == 1
+
+        index.add_frame(_frame('Old Posting'), 'indeed')
+        with index._connect() as conn:
+            conn.execute("UPDATE jobs SET indexed_at = ? WHERE title = 'Old Posting'", (time.time() - 2 * 86400,))
+        assert index.purge_expired() == 1 and not index.search('old posting')
+        print("✅ The crawler fills the index and old postings expire")
+
+
+def test_search_skips_stale_postings_without_a_crawler():
+    with tempfile.TemporaryDirectory() as tmp:
+        index = _index(tmp, retention_days=1)
+        index.add_frame(_frame('Data Engineer', 'Old Engineer'), 'indeed')
+        with index._connect() as conn:
+            conn.execute("UPDATE jobs SET indexed_at = ? WHERE title = 'Old Engineer'", (time.time() - 2 * 86400,))
+            conn.execute("UPDATE jobs SET date_posted = '2000-01-01' WHERE title = 'Data Engineer'")
+        # Expired postings are hidden before any purge; max_age_hours filters on the posting date
+        assert [job['TITLE'] for job in index.search('engineer')] == ['Data Engineer']
+        assert index.search('engineer', max_age_hours=168) == []
+
+        # Maintenance (purge + dedupe) runs at most once per interval
+        assert not index.maintain(min_interval_seconds=3600)
+        assert index.maintain(min_interval_seconds=0) and index.summary()['postings'] == 1
+        assert not index.maintain(min_interval_seconds=3600)
+
+        # Purged ids are never handed to new postings (stored vectors refer to ids)
+        with index._connect() as conn:
+            top = conn.execute("SELECT MAX(id) FROM jobs").fetchone()[0]
+            conn.execute("DELETE FROM jobs WHERE id = ?", (top,))
+        index.add_frame(_frame('New Engineer'), 'indeed')
+        with index._connect() as conn:
+            assert conn.execute("SELECT MAX(id) FROM jobs").fetchone()[0] > top
+    print("✅ Old postings are not served and the index is maintained without the crawler")
+
+
+def test_crawler_survives_failed_crawls():
+    with tempfile.TemporaryDirectory() as tmp:
+        index = _index(tmp, queries=[('Data Engineer', '')])
+        calls = []
+
+        def crawl(fetch_fn):
+            calls.append(fetch_fn)
+            if len(calls) == 1:
+                raise RuntimeError("database is locked")
+            return 0
+
+        index.crawl = crawl
+        index.start_crawler(None, 0.01)
+        deadline = time.time() + 2
+        while len(calls) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        index.stop_crawler()
+        assert len(calls) >= 2 and index.summary()['crawl_errors'] == 1
+    print("✅ A failed crawl is logged and the crawler keeps running")
+
+
+def main():
+    """Run all job index tests."""
+    print("🧪 Job Index Test Suite")
+    print("=" * 50)
+    test_parse_queries_and_match_expression()
+    test_search_ranks_title_matches_first()
+    test_location_filter_and_upsert()
+    test_crawl_fills_index_and_expires_postings()
+    test_search_skips_stale_postings_without_a_crawler()
+    test_crawler_survives_failed_crawls()
+    print("\n🎉 All job index tests passed!")
+
+
+if __name__ == "__main__":
+    main()
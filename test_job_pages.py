@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script for paged job search result sets
+"""
+
+import os
+import tempfile
+import time
+
+from job_cache import MemoryBackend, SQLiteBackend
+from job_pages import CursorError, ResultSetExpired, ResultSets, decode_cursor, encode_cursor
+
+
+def _jobs(count):
+    return [{'title': f'Job {i}', 'url': f'https://indeed/{i}'} for i in range(count)]
+
+
+def test_pages_cover_the_set_in_order():
+    result_sets = ResultSets(MemoryBackend(), ttl_seconds=60, page_size=10, max_page_size=25)
+    page = result_sets.create(_jobs(53), {'source': 'index'})
+    assert page['total'] == 53 and page['source'] == 'index' and len(page['data']) == 10
+    seen = list(page['data'])
+    sizes = [7, None, 1000, 3]
+    while page['next_cursor']:
+        page = result_sets.page(page['next_cursor'], sizes.pop(0) if sizes else None)
+        seen.extend(page['data'])
+    assert seen == _jobs(53)
+    assert len(page['data']) == 53 - 10 - 7 - 10 - 25 and page['offset'] == 52
+    # The same cursor always returns the same page
+    cursor = result_sets.create(_jobs(30), page_size=5)['next_cursor']
+    assert result_sets.page(cursor) == result_sets.page(cursor)
+    assert result_sets.clamp_page_size('abc') == 10 and result_sets.clamp_page_size(0) == 1
+    print("✅ Pages follow each other without gaps or overlaps")
+
+
+def test_bad_and_expired_cursors():
+    result_sets = ResultSets(MemoryBackend(), ttl_seconds=0.2, page_size=2)
+    cursor = result_sets.create(_jobs(5))['next_cursor']
+    assert decode_cursor(cursor)[1] == 2
+    for bad in ['not a cursor', encode_cursor('abc', -1), encode_cursor('', 1)]:
+        try:
+            result_sets.page(bad)
+            assert False, bad
+        except ResultSetExpired:
+            assert False, bad
+        except CursorError:
+            pass
+    try:
+        result_sets.page(encode_cursor(decode_cursor(cursor)[0], 99))
+        assert False
+    except CursorError:
+        pass
+    time.sleep(0.25)
+    for stale in [cursor, encode_cursor('unknown', 0)]:
+        try:
+            result_sets.page(stale)
+            assert False
+        except ResultSetExpired:
+            pass
+    print("✅ Malformed cursors are rejected and expired sets need a new search")
+
+
+def test_sqlite_result_sets_are_shared():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'cache.db')
+        first = ResultSets(SQLiteBackend(path, table='job_result_sets'), page_size=3)
+        page = first.create(_jobs(7), {'sites': {'indeed': {'status': 'ok'}}})
+        second = ResultSets(SQLiteBackend(path, table='job_result_sets'), page_size=3)
+        following = second.page(page['next_cursor'])
+        assert following['data'] == _jobs(7)[3:6] and following['sites'] == {'indeed': {'status': 'ok'}}
+        # Result sets don't count against the search cache's table
+        assert len(SQLiteBackend(path)) == 0 and second.summary()['entries'] == 1
+    print("✅ SQLite result sets are shared between processes")
+
+
+def main():
+    """Run all result set tests."""
+    print("🧪 Job Result Set Test Suite")
+    print("=" * 50)
+    test_pages_cover_the_set_in_order()
+    test_bad_and_expired_cursors()
+    test_sqlite_result_sets_are_shared()
+    print("\n🎉 All result set tests passed!")
+
+
+if __name__ == "__main__":
+    main()
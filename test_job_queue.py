@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test script for the background job queue
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+from job_queue import JobQueue
+
+
+def _queue(tmp, **kwargs):
+    kwargs.setdefault('poll_interval', 0.02)
+    return JobQueue(os.path.join(tmp, 'jobs.db'), **kwargs)
+
+
+def test_priority_lanes_order_jobs():
+    """High priority jobs run before older normal and low ones."""
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = _queue(tmp)
+        order = []
+        queue.register('report', lambda payload: order.append(payload['name']) or payload['name'])
+        queue.submit('report', {'name': 'low'}, priority='low')
+        queue.submit('report', {'name': 'normal'})
+        queue.submit('report', {'name': 'high'}, priority='high')
+        while queue.run_next():
+            pass
+        assert order == ['high', 'normal', 'low']
+    print("✅ Priority lanes respected")
+
+
+def test_job_lifecycle_and_results():
+    """Workers process jobs; results and errors are stored for polling."""
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = _queue(tmp, max_workers=2)
+        queue.register('ok', lambda payload: {'summary': payload['x'] * 2})
+        queue.register('boom', lambda payload: 1 / 0)
+        queue.register('opaque', lambda payload: {'when': object()})
+        ok_id = queue.submit('ok', {'x': 21})
+        boom_id = queue.submit('boom', {})
+        opaque_id = queue.submit('opaque', {})
+        assert queue.get(ok_id)['status'] == 'queued'
+        queue.start()
+        try:
+            ok_job = queue.wait(ok_id, timeout=5)
+            boom_job = queue.wait(boom_id, timeout=5)
+            opaque_job = queue.wait(opaque_id, timeout=5)
+        finally:
+            queue.stop()
+        assert ok_job['status'] == 'succeeded' and ok_job['result'] == {'summary': 42}
+        assert boom_job['status'] == 'failed' and 'ZeroDivisionError' in boom_job['error']
+        # A result that can't be stored fails the job instead of leaving it running
+        assert opaque_job['status'] == 'failed' and 'TypeError' in opaque_job['error']
+    print("✅ Job results and failures stored")
+
+
+def test_low_lane_concurrency_limit():
+    """The low lane never uses more than its concurrency cap."""
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = _queue(tmp, max_workers=4, lane_limits={'low': 1})
+        running = []
+        peak = [0]
+        lock = threading.Lock()
+
+        def handler(payload):
+            with lock:
+                running.append(1)
+                peak[0] = max(peak[0], len(running))
+            time.sleep(0.05)
+            with lock:
+                running.pop()
+
+        queue.register('bulk', handler)
+        job_ids = [queue.submit('bulk', {}, priority='low') for _ in range(4)]
+        queue.start()
+        try:
+            for job_id in job_ids:
+                assert queue.wait(job_id, timeout=5)['status'] == 'succeeded'
+        finally:
+            queue.stop()
+        assert peak[0] == 1
+    print("✅ Lane concurrency limits enforced")
+
+
+def test_jobs_survive_restart_and_expire():
+    """Queued jobs persist across queue instances and finished jobs are purged."""
+    with tempfile.TemporaryDirectory() as tmp:
+        first = _queue(tmp)
+        first.register('report', lambda payload: 'done')
+        job_id = first.submit('report', {})
+
+        second = _queue(tmp, retention_seconds=0)
+        second.register('report', lambda payload: 'done')
+        assert second.run_next()
+        assert second.get(job_id)['result'] == 'done'
+        time.sleep(0.01)
+        assert second.purge_expired() == 1
+        assert second.get(job_id) is None
+    print("✅ Jobs persist and expire")
+
+
+def main():
+    """Run all job queue tests."""
+    print("🧪 Job Queue Test Suite")
+    print("=" * 50)
+    test_priority_lanes_order_jobs()
+    test_job_lifecycle_and_results()
+    test_low_lane_concurrency_limit()
+    test_jobs_survive_restart_and_expire()
+    print("\n🎉 All job queue tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for BM25 job ranking
+"""
+
+import math
+import random
+
+import numpy as np
+
+from job_ranking import JobTermIndex, profile_terms, rank_jobs, top_k
+
+PROFILE = {
+    'skills': ['Python', 'ML', 'K8s', 'SQL'],
+    'desired_roles': ['Machine Learning Engineer'],
+    'experience': [{'title': 'Data Engineer', 'company': 'Acme'}, 'not a dict'],
+}
+
+
+def _job(title, description):
+    return {'title': title, 'description': description, 'url': f'https://indeed/{title}'}
+
+
+def test_profile_terms_are_canonical():
+    terms = profile_terms(PROFILE)
+    assert terms['python'] == 1.0 and terms['kubernetes'] == 1.0
+    # Multi-word skills and titles match as phrases
+    assert terms['machine learning'] == 2.0 and 'ml' not in terms and 'learning' in terms
+    assert terms['data engineer'] == 1.0 and terms['engineer'] == 2.0
+    assert profile_terms({}) == {}
+    print("✅ Profile skills and titles become canonical query terms")
+
+
+def test_relevant_jobs_rank_first():
+    jobs = [
+        _job('Registered Nurse', 'Patient care in a busy hospital.'),
+        _job('Financial Analyst', 'Excel and SQL reporting.'),
+        _job('Machine Learning Engineer', 'Build ML models in Python and deploy them on Kubernetes.'),
+        _job('Backend Developer', 'Python services on k8s with SQL databases.'),
+    ]
+    ranked = rank_jobs(PROFILE, jobs)
+    assert [job['title'] for job in ranked] == ['Machine Learning Engineer', 'Backend Developer',
+                                                'Financial Analyst', 'Registered Nurse']
+    assert ranked[-1]['score'] == 0.0 and all(ranked[i]['score'] > ranked[i + 1]['score'] for i in range(3))
+    assert 'score' not in jobs[0]
+    assert rank_jobs(PROFILE, jobs, k=1) == ranked[:1] and rank_jobs(PROFILE, []) == []
+    # Without matching terms the original order is kept
+    assert [job['title'] for job in rank_jobs({'skills': ['Welding']}, jobs)] == [job['title'] for job in jobs]
+    print("✅ Jobs are ranked by relevance with a score each")
+
+
+def test_index_matches_plain_bm25():
+    rng = random.Random(5)
+    words = ['python', 'sql', 'java', 'care', 'sales', 'cloud', 'data', 'team']
+    jobs = [_job(' '.join(rng.choices(words, k=2)), ' '.join(rng.choices(words, k=rng.randint(0, 30))))
+            for _ in range(40)]
+    query = {'python': 1.0, 'cloud': 2.0, 'team': 0.5}
+    index = JobTermIndex(jobs, k1=1.2, b=0.75, title_boost=3.0)
+
+    # Reference: BM25 computed term by term in plain Python
+    docs = [{} for _ in jobs]
+    lengths = []
+    for doc, job in zip(docs, jobs):
+        for field, boost in (('title', 3.0), ('description', 1.0)):
+            for word in job[field].split():
+                doc[word] = doc.get(word, 0) + boost
+        lengths.append(3.0 * len(job['title'].split()) + len(job['description'].split()))
+    average = sum(lengths) / len(lengths)
+    expected = []
+    for doc, length in zip(docs, lengths):
+        score = 0.0
+        for term, weight in query.items():
+            df = sum(1 for other in docs if term in other)
+            tf = doc.get(term, 0)
+            idf = math.log(1 + (len(jobs) - df + 0.5) / (df + 0.5))
+            score += weight * idf * tf * 2.2 / (tf + 1.2 * (1 - 0.75 + 0.75 * length / average)) if tf else 0.0
+        expected.append(score)
+    assert np.allclose(index.score(query), expected)
+    print("✅ Sparse postings give the same scores as term-by-term BM25")
+
+
+def test_top_k_keeps_ties_in_order():
+    scores = np.array([1.0, 3.0, 2.0, 3.0, 2.0, 0.0])
+    assert top_k(scores).tolist() == [1, 3, 2, 4, 0, 5]
+    assert top_k(scores, 3).tolist() == [1, 3, 2] and top_k(scores, 0).tolist() == []
+    assert top_k(scores, 99).tolist() == top_k(scores).tolist()
+    print("✅ Top-k selection is stable")
+
+
+def main():
+    """Run all job ranking tests."""
+    print("🧪 Job Ranking Test Suite")
+    print("=" * 50)
+    test_profile_terms_are_canonical()
+    test_relevant_jobs_rank_first()
+    test_index_matches_plain_bm25()
+    test_top_k_keeps_ties_in_order()
+    print("\n🎉 All job ranking tests passed!")
+
+
+if __name__ == "__main__":
+    main()
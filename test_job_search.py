@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script for concurrent job search helpers
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from job_search import SearchTimeout, fan_out, iter_scrape_sites, parse_site_timeouts, scrape_sites
+from llm_transport import current_deadline, request_deadline
+
+
+def test_results_arrive_as_they_complete():
+    delays = {'slow': 0.2, 'fast': 0.0, 'medium': 0.1}
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        outcomes = list(fan_out(lambda title: time.sleep(delays[title]) or [title], list(delays), 5, pool))
+    assert [title for title, _, _ in outcomes] == ['fast', 'medium', 'slow']
+    assert all(error is None and result == [title] for title, result, error in outcomes)
+    print("✅ Search results arrive as they complete")
+
+
+def test_shared_deadline_returns_partial_results():
+    release = threading.Event()
+
+    def search(title):
+        if title == 'blocked':
+            release.wait(2)
+        if title == 'broken':
+            raise RuntimeError("board down")
+        return [title]
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        started = time.monotonic()
+        outcomes = {title: (result, error) for title, result, error in
+                    fan_out(search, ['ok', 'blocked', 'broken'], 0.1, pool)}
+        elapsed = time.monotonic() - started
+        release.set()
+    assert elapsed < 1
+    assert outcomes['ok'] == (['ok'], None)
+    assert isinstance(outcomes['blocked'][1], SearchTimeout)
+    assert isinstance(outcomes['broken'][1], RuntimeError)
+    print("✅ Shared deadline returns partial results")
+
+
+def test_workers_keep_request_context():
+    with ThreadPoolExecutor(max_workers=1) as pool, request_deadline(30):
+        outcomes = list(fan_out(lambda _: current_deadline() is not None, ['title'], 5, pool))
+    assert outcomes == [('title', True, None)]
+    print("✅ Workers keep the request deadline")
+
+
+def test_sites_scrape_independently():
+    release = threading.Event()
+    calls = []
+
+    def scrape_jobs(**params):
+        site = params['site_name'][0]
+        calls.append(params)
+        if site == 'linkedin':
+            release.wait(2)
+        if site == 'zip_recruiter':
+            raise ConnectionError("blocked")
+        return [f"{site} job"] * 2
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        frames, report = scrape_sites(scrape_jobs, ['indeed', 'linkedin', 'zip_recruiter'],
+                                      {'search_term': 'engineer'}, 5, {'linkedin': 0.1}, pool)
+        release.set()
+    assert frames == {'indeed': ['indeed job'] * 2}
+    assert report['indeed']['status'] == 'ok' and report['indeed']['count'] == 2
+    assert report['linkedin']['status'] == 'timeout' and report['linkedin']['latency_ms'] >= 100
+    assert report['zip_recruiter']['status'] == 'error' and 'blocked' in report['zip_recruiter']['error']
+    assert all(params['search_term'] == 'engineer' for params in calls)
+    assert parse_site_timeouts('linkedin:30, indeed:x') == {'linkedin': 30.0}
+    print("✅ Job boards are scraped with independent timeouts")
+
+
+def test_sites_stream_in_completion_order():
+    def scrape_jobs(**params):
+        site = params['site_name'][0]
+        time.sleep({'indeed': 0.2, 'linkedin': 0.01, 'glassdoor': 0.1}[site])
+        if site == 'glassdoor':
+            raise ConnectionError("blocked")
+        return [f"{site} job"]
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        started = time.monotonic()
+        stream = iter_scrape_sites(scrape_jobs, ['indeed', 'linkedin', 'glassdoor'], {}, 5, executor=pool)
+        site, jobs_df, entry = next(stream)
+        assert site == 'linkedin' and jobs_df == ['linkedin job'] and time.monotonic() - started < 0.15
+        rest = list(stream)
+    assert [(site, jobs_df, entry['status']) for site, jobs_df, entry in rest] == \
+        [('glassdoor', None, 'error'), ('indeed', ['indeed job'], 'ok')]
+    print("✅ Job boards are yielded as soon as each one finishes")
+
+
+def main():
+    """Run all job search tests."""
+    print("🧪 Job Search Test Suite")
+    print("=" * 50)
+    test_results_arrive_as_they_complete()
+    test_shared_deadline_returns_partial_results()
+    test_workers_keep_request_context()
+    test_sites_scrape_independently()
+    test_sites_stream_in_completion_order()
+    print("\n🎉 All job search tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test script for hashed-embedding job matching
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from job_index import JobIndex
+from job_vectors import JobVectorStore, encode, job_vectors, profile_features, profile_vector
+
+PROFILE = {
+    'skills': ['Python', 'ML', 'K8s', 'SQL'],
+    'experience': [{'title': 'Data Engineer', 'company': 'Acme'}],
+    'education': [],
+    'industries': ['Technology'],
+    'desired_roles': ['Python Specialist', 'ML Specialist'],
+}
+
+JOBS = [
+    {'title': 'Registered Nurse', 'description': 'Patient care in a busy hospital ward.'},
+    {'title': 'Machine Learning Engineer', 'description': 'Train models in Python, deploy on Kubernetes.'},
+    {'title': 'Financial Analyst', 'description': 'Budgets, forecasting and Excel.'},
+    {'title': 'Data Engineering Lead', 'description': 'SQL pipelines and Python services.'},
+]
+
+
+def test_similar_postings_score_higher():
+    features = profile_features(PROFILE)
+    assert 'machine learning' in features and 'kubernetes' in features and 'ml' not in features
+    vectors = job_vectors(JOBS, 256)
+    assert vectors.shape == (4, 256) and vectors.dtype == np.float32
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+    scores = vectors @ profile_vector(PROFILE, 256)
+    assert scores.argmax() in (1, 3) and min(scores[1], scores[3]) > max(scores[0], scores[2])
+    # Character trigrams relate word forms ("engineering" and "engineer")
+    engineer = encode([{'#eng': 1.0, '#ngi': 1.0, '#nee': 1.0, '#eer': 1.0}])
+    assert (job_vectors([JOBS[3]]) @ engineer[0])[0] > 0
+    assert encode([]).shape == (0, 512) and not profile_vector({}).any()
+    print("✅ Profiles and postings hash into comparable unit vectors")
+
+
+def test_blocked_search_matches_brute_force():
+    rng = np.random.default_rng(7)
+    vectors = rng.standard_normal((1000, 64)).astype(np.float32)
+    queries = rng.standard_normal((3, 64)).astype(np.float32)
+    ids = np.arange(1000) * 10 + 5
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'vectors.f32')
+        store = JobVectorStore(path, 64, block_rows=97)
+        assert store.write((ids[start:start + 300], vectors[start:start + 300]) for start in range(0, 1000, 300)) \
+            == 1000
+        found, scores = store.search(queries, 10)
+        expected = np.argsort(-(queries @ vectors.T), axis=1)[:, :10]
+        assert (found == ids[expected]).all()
+        assert np.allclose(scores, np.take_along_axis(queries @ vectors.T, expected, axis=1), atol=1e-5)
+        single_ids, single_scores = store.search(queries[0], 2000)
+        assert single_ids.shape == (1000,) and (np.diff(single_scores) <= 0).all()
+
+        # Another process sees the same matrix; a rebuild replaces it
+        assert isinstance(JobVectorStore(path, 64)._matrix, np.memmap)
+        assert JobVectorStore(path, 64).search(queries[0], 1)[0][0] == found[0][0]
+        assert len(JobVectorStore(path, 32)) == 0
+        store.write([(ids[:5], vectors[:5])])
+        assert len(store) == 5 and len(JobVectorStore(path, 64)) == 5
+        assert store.search(queries[0], 0)[0].shape == (0,)
+    print("✅ Blocked argpartition top-k equals a full sort")
+
+
+def test_rebuilds_are_published_in_one_step():
+    rng = np.random.default_rng(3)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'vectors.f32')
+        store = JobVectorStore(path, 16)
+        first = rng.standard_normal((50, 16)).astype(np.float32)
+        store.write([(np.arange(50), first)])
+        reader = JobVectorStore(path, 16)
+        store.write([(np.arange(100, 120), rng.standard_normal((20, 16)).astype(np.float32))])
+        # An open reader keeps its own matrix and ids until its next search reloads them
+        matrix = reader._matrix
+        assert len(reader) == 50 and np.array_equal(np.asarray(matrix), first)
+        assert reader.search(first[7], 1)[0][0] >= 100 and len(reader) == 20
+        assert np.array_equal(np.asarray(matrix), first)
+        assert len(JobVectorStore(path, 16)) == 20 and os.listdir(tmp) == ['vectors.f32']
+
+        # A failed rebuild leaves the published store alone
+        try:
+            store.write([(np.arange(3), np.zeros((3, 8)))])
+            assert False
+        except ValueError:
+            pass
+        assert len(JobVectorStore(path, 16)) == 20 and os.listdir(tmp) == ['vectors.f32']
+        with open(path, 'wb') as f:
+            f.write(b'not vectors')
+        assert len(JobVectorStore(path, 16)) == 0
+    print("✅ Rebuilds replace the whole store at once")
+
+
+def test_job_index_matches_profiles():
+    frame = pd.DataFrame({
+        'title': [job['title'] for job in JOBS],
+        'company': ['Acme', 'Initech', 'Globex', 'Hooli'],
+        'description': [job['description'] for job in JOBS],
+        'job_url': [f'https://jobs.example/{i}' for i in range(len(JOBS))],
+    })
+    with tempfile.TemporaryDirectory() as tmp:
+        index = JobIndex(os.path.join(tmp, 'job_index.db'),
+                         vectors=JobVectorStore(os.path.join(tmp, 'vectors.f32'), 256))
+        assert index.match(PROFILE) == []
+        index.add_frame(frame, 'indeed')
+        assert index.crawl(lambda term, location: {}) == 0 and len(index.vectors) == 4
+        matches = index.match(PROFILE, 2)
+        assert {row['TITLE'] for row in matches} == {'Machine Learning Engineer', 'Data Engineering Lead'}
+        assert matches[0]['SCORE'] >= matches[1]['SCORE'] > 0 and matches[0]['SITE'] == 'indeed'
+        assert index.get([matches[1]['ID'], 999, matches[0]['ID']]) == [
+            {key: value for key, value in row.items() if key != 'SCORE'} for row in matches[::-1]]
+        assert index.summary()['vectors']['vectors'] == 4
+        assert JobIndex(os.path.join(tmp, 'other.db')).vectorize() == 0
+    print("✅ The job index rebuilds its vectors on crawl and matches profiles")
+
+
+def main():
+    """Run all job vector tests."""
+    print("🧪 Job Vector Test Suite")
+    print("=" * 50)
+    test_similar_postings_score_higher()
+    test_blocked_search_matches_brute_force()
+    test_rebuilds_are_published_in_one_step()
+    test_job_index_matches_profiles()
+    print("\n🎉 All job vector tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for the LLM provider abstraction
+Exercises the deterministic fake provider end to end through generate_json
+"""
+
+import statistics
+
+from llm_provider import FakeProvider, RateLimitError, ProviderUnavailableError, detect_prompt_type
+from llm_transport import Deadline, ResilientTransport
+from structured_output import SCHEMAS, generate_json, validate
+
+
+def _no_sleep(seconds):
+    pass
+
+
+def test_fake_replies_are_schema_valid():
+    """Every prompt type gets JSON that validates against its schema."""
+    provider = FakeProvider(sleep=_no_sleep)
+    for prompt_type, schema in SCHEMAS.items():
+        result = generate_json(provider, f"provider test prompt for {prompt_type}", prompt_type)
+        assert validate(result, schema) == [], prompt_type
+    assert provider.stats['input_tokens'] > 0 and provider.stats['output_tokens'] > 0
+    print("✅ Fake replies validate against every schema")
+
+
+def test_prompt_type_detection():
+    """Without a response_schema the fake picks the schema from the prompt's JSON keys."""
+    prompt = 'Return JSON with: {"skill_gaps": [], "learning_path": [], "career_growth": {}}'
+    assert detect_prompt_type(prompt) == 'upskilling_plan'
+    assert detect_prompt_type('Return only a JSON array of job titles') == 'job_titles'
+    assert detect_prompt_type('Hello') is None
+    print("✅ Prompt types detected from prompt text")
+
+
+def test_latency_distributions_are_seeded():
+    """Same seed, same latencies; heavy_tail has a longer tail than fixed."""
+    first = FakeProvider(latency='lognormal', latency_ms=100, seed=7)
+    second = FakeProvider(latency='lognormal', latency_ms=100, seed=7)
+    samples = [first.sample_latency_ms() for _ in range(500)]
+    assert samples == [second.sample_latency_ms() for _ in range(500)]
+    assert 80 < statistics.median(samples) < 120
+
+    fixed = FakeProvider(latency='fixed', latency_ms=100)
+    assert {fixed.sample_latency_ms() for _ in range(10)} == {100}
+
+    heavy = FakeProvider(latency='heavy_tail', latency_ms=100, seed=7)
+    tail = sorted(heavy.sample_latency_ms() for _ in range(500))
+    assert min(tail) >= 100 and tail[int(len(tail) * 0.99)] > 500
+    print("✅ Latency distributions are deterministic")
+
+
+def test_error_injection():
+    """error_rate and rate_limit_rate raise retryable 503s and 429s."""
+    provider = FakeProvider(error_rate=0.2, rate_limit_rate=0.2, seed=1, sleep=_no_sleep)
+    failures = {RateLimitError: 0, ProviderUnavailableError: 0}
+    for _ in range(500):
+        try:
+            provider.generate_content("prompt")
+        except (RateLimitError, ProviderUnavailableError) as e:
+            failures[type(e)] += 1
+    assert 60 < failures[RateLimitError] < 140 and 60 < failures[ProviderUnavailableError] < 140
+    assert provider.stats['rate_limited'] == failures[RateLimitError]
+
+    transport = ResilientTransport(max_retries=5, base_delay=0, sleep=_no_sleep)
+    flaky = FakeProvider(rate_limit_rate=0.5, seed=3, sleep=_no_sleep)
+    response = transport.generate_content(flaky, "prompt", deadline=Deadline(5))
+    assert response.text
+    print("✅ Injected errors are retried by the transport")
+
+
+def test_slow_reply_honours_request_timeout():
+    """A sampled latency above the request timeout raises TimeoutError."""
+    slept = []
+    provider = FakeProvider(latency='fixed', latency_ms=5000, sleep=slept.append)
+    try:
+        provider.generate_content("prompt", request_options={'timeout': 0.5})
+    except TimeoutError:
+        pass
+    else:
+        raise AssertionError("expected TimeoutError")
+    assert slept == [0.5]
+    print("✅ Fake provider honours request timeouts")
+
+
+def main():
+    """Run all provider tests."""
+    print("🧪 LLM Provider Test Suite")
+    print("=" * 50)
+    test_fake_replies_are_schema_valid()
+    test_prompt_type_detection()
+    test_latency_distributions_are_seeded()
+    test_error_injection()
+    test_slow_reply_honours_request_timeout()
+    print("\n🎉 All provider tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Test script for the resilient LLM transport
+Uses a scripted fake provider so every behaviour is reproducible offline
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+from llm_transport import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Deadline,
+    LLMDeadlineExceeded,
+    LLMOverloaded,
+    ResilientTransport,
+    TransientLLMError,
+    request_deadline,
+)
+
+
+class ScriptedProvider:
+    """
+    Fake generate_content backend.
+
+    Each call consumes one step: a number (seconds to sleep before answering)
+    or an exception instance to raise. The last step repeats.
+    """
+
+    def __init__(self, *steps):
+        self.steps = list(steps)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, generation_config=None):
+        with self._lock:
+            index = self.calls
+            self.calls += 1
+        step = self.steps[min(index, len(self.steps) - 1)]
+        if isinstance(step, Exception):
+            raise step
+        time.sleep(step)
+        return SimpleNamespace(text=f'{{"call": {index}}}')
+
+
+def _transport(**kwargs):
+    kwargs.setdefault('base_delay', 0.01)
+    kwargs.setdefault('sleep', lambda seconds: None)
+    return ResilientTransport(**kwargs)
+
+
+class QuotaError(Exception):
+    code = 429
+
+
+def test_transient_errors_are_retried():
+    """429s and timeouts are retried, then the call succeeds."""
+    provider = ScriptedProvider(QuotaError("rate limited"), TransientLLMError("overloaded"), 0)
+    transport = _transport(max_retries=2)
+    response = transport.generate_content(provider, "prompt")
+    assert response.text == '{"call": 2}'
+    assert provider.calls == 3
+    assert transport.stats['retries'] == 2
+    print("✅ Transient errors retried with backoff")
+
+
+def test_permanent_errors_are_not_retried():
+    """Bad requests fail immediately."""
+    provider = ScriptedProvider(ValueError("invalid argument"))
+    transport = _transport(max_retries=3)
+    try:
+        transport.generate_content(provider, "prompt")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+    assert provider.calls == 1
+    assert transport.breaker.failures == 0
+    print("✅ Permanent errors are not retried")
+
+
+def test_backoff_has_full_jitter():
+    """Backoff delays are random but bounded by the exponential cap."""
+    transport = _transport(base_delay=0.5, max_delay=4.0)
+    delays = [transport.backoff(3) for _ in range(200)]
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert len(set(delays)) > 100
+    print("✅ Backoff uses full jitter")
+
+
+def test_deadline_is_enforced():
+    """A slow provider cannot hold the caller past the request deadline."""
+    provider = ScriptedProvider(2.0)
+    transport = _transport(max_retries=0)
+    started = time.monotonic()
+    with request_deadline(0.2):
+        try:
+            transport.generate_content(provider, "prompt")
+        except LLMDeadlineExceeded:
+            pass
+        else:
+            raise AssertionError("expected LLMDeadlineExceeded")
+    assert time.monotonic() - started < 1.0
+    print("✅ Request deadline propagated and enforced")
+
+
+def test_circuit_breaker_fails_fast():
+    """Sustained failures open the breaker; a probe closes it again."""
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=10, clock=lambda: now[0])
+    provider = ScriptedProvider(QuotaError("down"), QuotaError("down"), QuotaError("down"), 0)
+    transport = _transport(max_retries=0, breaker=breaker)
+
+    for _ in range(3):
+        try:
+            transport.generate_content(provider, "prompt")
+        except QuotaError:
+            pass
+    assert breaker.state == CircuitBreaker.OPEN
+
+    try:
+        transport.generate_content(provider, "prompt")
+    except CircuitOpenError:
+        pass
+    else:
+        raise AssertionError("expected CircuitOpenError")
+    assert provider.calls == 3
+
+    now[0] = 11
+    transport.generate_content(provider, "prompt")
+    assert breaker.state == CircuitBreaker.CLOSED
+    print("✅ Circuit breaker opens and recovers")
+
+
+def test_failed_or_lost_probes_reopen_the_breaker():
+    """A probe failing with a non-transient error reopens the breaker; a lost probe times out."""
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10, clock=lambda: now[0], probe_timeout=20)
+    provider = ScriptedProvider(QuotaError("down"), KeyError("bad payload"), 0)
+    transport = _transport(max_retries=0, breaker=breaker)
+    try:
+        transport.generate_content(provider, "prompt")
+    except QuotaError:
+        pass
+    now[0] = 11
+    try:
+        transport.generate_content(provider, "prompt")
+    except KeyError:
+        pass
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+    now[0] = 22
+    transport.generate_content(provider, "prompt")
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    # Non-transient errors while closed don't count toward opening
+    breaker.record_error()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.failures == 0
+
+    # A probe that never reports back is replaced after probe_timeout
+    breaker.record_failure()
+    now[0] = 40
+    assert breaker.allow() and breaker.state == CircuitBreaker.HALF_OPEN
+    now[0] = 50
+    assert not breaker.allow()
+    now[0] = 61
+    assert breaker.allow()
+    print("✅ Probes settle the breaker on every outcome")
+
+
+def test_hedged_request_cuts_tail_latency():
+    """A hedge fired after hedge_after beats a stuck primary."""
+    provider = ScriptedProvider(1.0, 0.0)
+    transport = _transport(hedge_after=0.05)
+    started = time.monotonic()
+    response = transport.generate_content(provider, "prompt", deadline=Deadline(5))
+    assert time.monotonic() - started < 0.5
+    assert response.text == '{"call": 1}'
+    assert transport.stats['hedges'] == 1 and transport.stats['hedge_wins'] == 1
+    print("✅ Hedged requests cut tail latency")
+
+
+def test_deadline_expiry_is_not_a_provider_failure():
+    """Our own deadlines don't open the breaker, and abandoned calls can't pile up past max_workers."""
+    provider = ScriptedProvider(0.5)
+    transport = _transport(max_retries=0, max_workers=2, breaker=CircuitBreaker(failure_threshold=1))
+    for _ in range(2):
+        try:
+            transport.generate_content(provider, "prompt", deadline=Deadline(0.05))
+        except LLMDeadlineExceeded:
+            pass
+    assert transport.breaker.state == CircuitBreaker.CLOSED and transport.breaker.failures == 0
+
+    # Both abandoned calls still hold their worker: the next one fails fast instead of queueing
+    started = time.monotonic()
+    try:
+        transport.generate_content(provider, "prompt", deadline=Deadline(5))
+    except LLMOverloaded:
+        pass
+    else:
+        raise AssertionError("expected LLMOverloaded")
+    assert time.monotonic() - started < 0.1 and provider.calls == 2
+    assert transport.stats['overloaded'] == 1 and transport.breaker.state == CircuitBreaker.CLOSED
+
+    # Slots come back once the SDK calls return
+    time.sleep(0.6)
+    assert transport.generate_content(provider, "prompt", deadline=Deadline(5)).text == '{"call": 2}'
+    print("✅ Deadline expiry skips the breaker and abandoned calls are bounded")
+
+
+def main():
+    """Run all transport tests."""
+    print("🧪 LLM Transport Test Suite")
+    print("=" * 50)
+    test_transient_errors_are_retried()
+    test_permanent_errors_are_not_retried()
+    test_backoff_has_full_jitter()
+    test_deadline_is_enforced()
+    test_circuit_breaker_fails_fast()
+    test_failed_or_lost_probes_reopen_the_breaker()
+    test_hedged_request_cuts_tail_latency()
+    test_deadline_expiry_is_not_a_provider_failure()
+    print("\n🎉 All transport tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for LLM usage and latency accounting
+"""
+
+import json
+import os
+import tempfile
+import threading
+
+from llm_provider import FakeProvider, RateLimitError
+from llm_transport import Deadline, ResilientTransport
+from llm_usage import UsageAccountant, llm_usage, note_response, usage_context
+from structured_output import generate_json
+
+
+def _no_sleep(seconds):
+    pass
+
+
+def test_generate_json_is_accounted():
+    """Calls are tagged with endpoint and user and carry tokens, latency and cache status."""
+    llm_usage.reset()
+    provider = FakeProvider(model_name='usage-fake', latency='fixed', latency_ms=5)
+    with usage_context('get_career_intelligence', 'alice'):
+        generate_json(provider, "usage test: career intelligence", 'intelligence_report')
+    snapshot = llm_usage.snapshot()
+
+    route = snapshot['routes'][0]
+    assert (route['endpoint'], route['prompt_type'], route['model']) == \
+        ('get_career_intelligence', 'intelligence_report', 'usage-fake')
+    assert route['calls'] == 1 and route['input_tokens'] > 0 and route['output_tokens'] > 0
+    assert route['cache'] == {'miss': 1} and route['latency_ms']['p50'] >= 5
+    assert snapshot['users']['alice']['calls'] == 1
+    print("✅ generate_json calls are accounted per endpoint and user")
+
+
+def test_coalesced_calls_are_marked_shared():
+    """Followers of an in-flight request are counted as shared, with no tokens."""
+    llm_usage.reset()
+    provider = FakeProvider(latency='fixed', latency_ms=100)
+    threads = [threading.Thread(target=generate_json, args=(provider, "usage test: shared", 'job_titles'))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = llm_usage.snapshot()['prompt_types']['job_titles']
+    assert stats['calls'] == 4 and stats['cache'] == {'miss': 1, 'shared': 3}
+    assert provider.stats['calls'] == 1
+    print("✅ Coalesced calls are marked as shared")
+
+
+def test_parse_failures_are_counted():
+    """Unusable replies count as parse failures and the call as an error."""
+    llm_usage.reset()
+
+    class BrokenProvider:
+        model_name = 'broken'
+
+        def generate_content(self, prompt, generation_config=None):
+            return FakeProvider(sleep=_no_sleep).generate_content("plain text")
+
+    try:
+        generate_json(BrokenProvider(), "usage test: broken", 'upskilling_plan')
+    except ValueError:
+        pass
+    stats = llm_usage.snapshot()['prompt_types']['upskilling_plan']
+    assert stats['parse_failures'] == 2 and stats['errors'] == 1
+    print("✅ Parse failures and errors are counted")
+
+
+def test_retries_and_compact_log():
+    """Transport retries are attributed to the call and every call writes one log line."""
+    log_path = os.path.join(tempfile.mkdtemp(), 'usage.jsonl')
+    accountant = UsageAccountant(log_path)
+    transport = ResilientTransport(max_retries=3, base_delay=0, sleep=_no_sleep)
+
+    class FlakyProvider:
+        model_name = 'flaky'
+        calls = 0
+
+        def generate_content(self, prompt, generation_config=None):
+            self.calls += 1
+            if self.calls < 3:
+                raise RateLimitError("slow down")
+            return FakeProvider(sleep=_no_sleep).generate_content(prompt)
+
+    with usage_context('cli', 'bob'), accountant.track('career_advice', 'flaky'):
+        note_response(transport.generate_content(FlakyProvider(), "advice please", deadline=Deadline(5)),
+                      "advice please")
+
+    with open(log_path) as f:
+        lines = [json.loads(line) for line in f]
+    assert len(lines) == 1
+    assert lines[0]['ep'] == 'cli' and lines[0]['u'] == 'bob' and lines[0]['r'] == 2 and lines[0]['ok'] == 1
+    assert accountant.snapshot()['users']['bob']['retries'] == 2
+    print("✅ Retries are attributed and logged")
+
+
+def main():
+    """Run all usage accounting tests."""
+    print("🧪 LLM Usage Test Suite")
+    print("=" * 50)
+    test_generate_json_is_accounted()
+    test_coalesced_calls_are_marked_shared()
+    test_parse_failures_are_counted()
+    test_retries_and_compact_log()
+    print("\n🎉 All usage tests passed!")
+
+
+if __name__ == "__main__":
+    main()
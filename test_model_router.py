@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test script for per-prompt-type model routing
+"""
+
+import threading
+
+from config import Config
+from llm_provider import FakeProvider, RateLimitError
+from model_router import (TIER_LIMITS, TIER_ORDER, ModelRouter, ModelTier, model_price, parse_prices, parse_routes,
+                          route_model)
+from structured_output import generate_json
+
+
+class RecordingProvider(FakeProvider):
+    """Fake provider that remembers the generation configs it was sent."""
+
+    def __init__(self, model_name, **kwargs):
+        super().__init__(model_name=model_name, **kwargs)
+        self.configs = []
+
+    def generate_content(self, prompt, generation_config=None):
+        self.configs.append(generation_config)
+        return super().generate_content(prompt, generation_config=generation_config)
+
+
+PRICES = {'fake-fast': (0.10, 0.40), 'fake-standard': (0.30, 2.50), 'fake-large': (1.25, 10.00)}
+
+
+def _router(routes=None, models=None, **limits):
+    models = models or {name: f"fake-{name}" for name in TIER_ORDER}
+    tiers = [ModelTier(name, RecordingProvider(models[name]), **dict(TIER_LIMITS[name], **limits))
+             for name in TIER_ORDER]
+    return ModelRouter(tiers, routes, prices=PRICES)
+
+
+def test_prompt_types_go_to_their_tier():
+    router = _router()
+    generate_json(router, "Five titles please", 'job_titles')
+    generate_json(router, "Deep analysis please", 'career_analysis')
+    assert len(router.tiers['fast'].provider.configs) == 1
+    assert len(router.tiers['large'].provider.configs) == 1
+    assert route_model(router, 'unknown_type').tier.name == 'standard'
+    assert route_model('plain provider', 'job_titles') == 'plain provider'
+    assert parse_routes('job_titles:large, bogus:huge') == {'job_titles': 'large'}
+    print("✅ Prompt types are routed to their tier")
+
+
+def test_tier_token_and_latency_limits():
+    router = _router(max_output_tokens=128, latency_limit_seconds=3)
+    routed = route_model(router, 'career_analysis')
+    assert routed.latency_limit_seconds == 3
+    generate_json(router, "Deep analysis please", 'career_analysis')
+    assert router.tiers['large'].provider.configs[0]['max_output_tokens'] == 128
+    print("✅ Tier token and latency limits are applied")
+
+
+def test_busy_tier_falls_back_to_cheaper_one():
+    router = _router(max_in_flight=1)
+    release = threading.Event()
+    router.tiers['large'].provider.generate_content = lambda prompt, generation_config=None: release.wait(2)
+    worker = threading.Thread(target=route_model(router, 'career_analysis').generate_content, args=("hold",))
+    worker.start()
+    try:
+        assert route_model(router, 'career_analysis').tier.name == 'standard'
+    finally:
+        release.set()
+        worker.join()
+    assert route_model(router, 'career_analysis').tier.name == 'large'
+
+    # A rate-limited tier cools down
+    def rate_limited(prompt, generation_config=None):
+        raise RateLimitError("429")
+    router.tiers['standard'].provider.generate_content = rate_limited
+    try:
+        route_model(router, 'intelligence_report').generate_content("x")
+    except RateLimitError:
+        pass
+    assert route_model(router, 'intelligence_report').tier.name == 'fast'
+    print("✅ Busy or rate-limited tiers fall back to a cheaper tier")
+
+
+def test_report_shows_cost_and_latency_per_route():
+    router = _router()
+    for i in range(3):
+        generate_json(router, f"titles {i}", 'job_titles')
+    report = router.report()
+    route = next(route for route in report['routes'] if route['prompt_type'] == 'job_titles')
+    assert route['tier'] == 'fast' and route['calls'] == 3 and route['fallbacks'] == 0
+    assert 0 < route['cost_usd'] < route['baseline_cost_usd']
+    assert report['total_saved_usd'] > 0 and report['baseline_tier'] == 'large'
+    print("✅ Report shows latency and cost per route")
+
+
+def test_costs_are_priced_by_model():
+    """Tiers that resolve to the same model cost the same, so routing between them saves nothing."""
+    router = _router(models={name: 'fake-standard' for name in TIER_ORDER})
+    for i in range(3):
+        generate_json(router, f"titles {i}", 'job_titles')
+    report = router.report()
+    assert report['total_cost_usd'] > 0 and report['total_saved_usd'] == 0
+    assert report['baseline_model'] == 'fake-standard' and report['unpriced_models'] == []
+
+    # Versioned names match their longest known prefix
+    prices = {'gemini-2.5-flash': (0.3, 2.5), 'gemini-2.5-flash-lite': (0.1, 0.4)}
+    assert model_price('gemini-2.5-flash-lite-001', prices) == (0.1, 0.4)
+    assert model_price('gemini-2.5-flash', prices) == (0.3, 2.5) and model_price('other', prices) is None
+    assert parse_prices('my-model:0.5/1.5, broken:1, ft:gpt-4o:org:2/8') == {'my-model': (0.5, 1.5),
+                                                                         'ft:gpt-4o:org': (2.0, 8.0)}
+    unpriced = _router(models={name: 'fake-unknown' for name in TIER_ORDER})
+    assert unpriced.report()['unpriced_models'] == ['fake-unknown']
+    print("✅ Costs are priced by model name")
+
+
+def test_unset_tiers_use_the_configured_model():
+    saved = {name: getattr(Config, name) for name in
+             ('LLM_PROVIDER', 'GOOGLE_MODEL', 'LLM_FAST_MODEL', 'LLM_STANDARD_MODEL', 'LLM_LARGE_MODEL')}
+    try:
+        Config.LLM_PROVIDER, Config.GOOGLE_MODEL = 'gemini', 'gemini-custom'
+        Config.LLM_FAST_MODEL, Config.LLM_STANDARD_MODEL, Config.LLM_LARGE_MODEL = 'gemini-lite', '', ''
+        router = ModelRouter.from_config(lambda model_name: FakeProvider(model_name=model_name))
+    finally:
+        for name, value in saved.items():
+            setattr(Config, name, value)
+    assert router.tiers['fast'].model_name == 'gemini-lite'
+    assert router.tiers['standard'].model_name == router.tiers['large'].model_name == 'gemini-custom'
+    assert router.tiers['standard'].provider is router.tiers['large'].provider
+    print("✅ Tiers without their own model use GOOGLE_MODEL / OPENAI_MODEL")
+
+
+def main():
+    """Run all model routing tests."""
+    print("🧪 Model Routing Test Suite")
+    print("=" * 50)
+    test_prompt_types_go_to_their_tier()
+    test_tier_token_and_latency_limits()
+    test_busy_tier_falls_back_to_cheaper_one()
+    test_report_shows_cost_and_latency_per_route()
+    test_costs_are_priced_by_model()
+    test_unset_tiers_use_the_configured_model()
+    print("\n🎉 All model routing tests passed!")
+
+
+if __name__ == "__main__":
+    main()
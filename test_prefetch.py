@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test script for speculative prefetch after resume parsing
+"""
+
+import threading
+import time
+
+from llm_transport import LLMDeadlineExceeded, request_deadline
+from prefetch import Prefetcher, parse_policy, profile_key
+
+PROFILE = {'skills': ['Python', 'SQL'], 'industries': ['technology'], 'parsed_at': '2024-01-01T00:00:00'}
+
+
+class SlowStage:
+    """Stage function that counts calls and can be held until released."""
+
+    def __init__(self, delay=0.0, fail=False):
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def __call__(self, user_profile):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("LLM down")
+        return {'skills': list(user_profile['skills'])}
+
+
+def _prefetcher(**kwargs):
+    prefetcher = Prefetcher(**kwargs)
+    stages = {'intelligence': SlowStage(0.1), 'recommendations': SlowStage()}
+    for name, fn in stages.items():
+        prefetcher.register(name, fn)
+    return prefetcher, stages
+
+
+def test_profile_key_ignores_parse_time():
+    assert profile_key(PROFILE) == profile_key(dict(PROFILE, parsed_at='2025-06-01T12:00:00'))
+    assert profile_key(PROFILE) != profile_key(dict(PROFILE, skills=['Go']))
+    print("✅ Profile keys ignore parse timestamps")
+
+
+def test_policy_parsing():
+    stages = {'intelligence': None, 'recommendations': None}
+    assert parse_policy('all', stages) == ['intelligence', 'recommendations']
+    assert parse_policy('off', stages) == []
+    assert parse_policy('intelligence, unknown', stages) == ['intelligence']
+    print("✅ Prefetch policies parse")
+
+
+def test_requests_attach_to_prefetch():
+    """In-flight and finished prefetches are reused instead of recomputed."""
+    prefetcher, stages = _prefetcher()
+    assert prefetcher.prefetch(PROFILE) == ['intelligence', 'recommendations']
+    assert prefetcher.prefetch(PROFILE) == []
+
+    # Returned by the client with a new parse timestamp: still the same profile
+    returned = dict(PROFILE, parsed_at='later')
+    assert prefetcher.get('intelligence', returned) == {'skills': ['Python', 'SQL']}
+    time.sleep(0.05)
+    assert prefetcher.get('recommendations', returned) == {'skills': ['Python', 'SQL']}
+    assert stages['intelligence'].calls == 1 and stages['recommendations'].calls == 1
+    assert prefetcher.stats['hits_in_flight'] + prefetcher.stats['hits_ready'] == 2
+
+    prefetcher.get('intelligence', {'skills': ['Rust']})
+    assert prefetcher.stats['misses'] == 1 and stages['intelligence'].calls == 2
+    print("✅ Requests attach to prefetched results")
+
+
+def test_unused_prefetches_count_as_waste():
+    prefetcher, _ = _prefetcher(ttl_seconds=0.05)
+    prefetcher.prefetch(PROFILE)
+    time.sleep(0.2)
+    prefetcher.prefetch({'skills': ['Go']})
+    summary = prefetcher.summary()
+    assert summary['wasted'] == 2 and summary['wasted_seconds'] > 0
+    assert 0 < summary['waste_rate'] <= 1
+    print("✅ Expired prefetches are tracked as waste")
+
+
+def test_policy_and_admission_limit_prefetch():
+    prefetcher, stages = _prefetcher(policy='recommendations')
+    assert prefetcher.prefetch(PROFILE) == ['recommendations']
+
+    prefetcher, _ = _prefetcher(admit=lambda: False)
+    assert prefetcher.prefetch(PROFILE) == [] and prefetcher.stats['skipped'] == 2
+    print("✅ Policy and admission control limit prefetching")
+
+
+def test_failed_prefetch_is_recomputed():
+    prefetcher = Prefetcher()
+    failing = SlowStage(fail=True)
+    prefetcher.register('intelligence', failing)
+    prefetcher.prefetch(PROFILE)
+    try:
+        prefetcher.get('intelligence', PROFILE)
+    except RuntimeError:
+        pass
+    assert failing.calls == 2 and prefetcher.stats['errors'] == 1
+    print("✅ Failed prefetches are recomputed inline")
+
+
+def test_fallback_results_are_not_served():
+    """A stage's fallback dict (with 'error') is recomputed, never reused by later requests."""
+    prefetcher = Prefetcher()
+    results = [{'error': 'LLM down', 'skills': []}, {'skills': ['Python']}]
+    prefetcher.register('intelligence', lambda user_profile: results.pop(0))
+    prefetcher.prefetch(PROFILE)
+    assert prefetcher.get('intelligence', PROFILE) == {'skills': ['Python']}
+    assert prefetcher.stats['errors'] == 1 and prefetcher.summary()['entries'] == 0
+    print("✅ Fallback results are not served from the prefetch")
+
+
+def test_deadline_spent_waiting_is_not_recomputed():
+    prefetcher = Prefetcher()
+    slow = SlowStage(0.3)
+    prefetcher.register('intelligence', slow)
+    prefetcher.prefetch(PROFILE)
+    with request_deadline(0.05):
+        try:
+            prefetcher.get('intelligence', PROFILE)
+            assert False, "expected LLMDeadlineExceeded"
+        except LLMDeadlineExceeded:
+            pass
+    assert slow.calls == 1
+    # The prefetch kept running and serves the next request
+    assert prefetcher.get('intelligence', PROFILE) == {'skills': ['Python', 'SQL']} and slow.calls == 1
+    print("✅ A spent deadline is not followed by an inline recompute")
+
+
+def main():
+    """Run all prefetch tests."""
+    print("🧪 Prefetch Test Suite")
+    print("=" * 50)
+    test_profile_key_ignores_parse_time()
+    test_policy_parsing()
+    test_requests_attach_to_prefetch()
+    test_unused_prefetches_count_as_waste()
+    test_policy_and_admission_limit_prefetch()
+    test_failed_prefetch_is_recomputed()
+    test_fallback_results_are_not_served()
+    test_deadline_spent_waiting_is_not_recomputed()
+    print("\n🎉 All prefetch tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script for the prompt token budgeter
+"""
+
+from prompt_budget import (
+    compact_profile,
+    dedupe_items,
+    estimate_tokens,
+    fit_profile,
+    split_sections,
+    truncate_resume_text,
+)
+
+SAMPLE_RESUME = """Jane Doe
+Senior Data Engineer
+
+SUMMARY
+Data engineer with 8 years of experience building pipelines.
+
+EXPERIENCE
+Senior Data Engineer, Acme Corp 2019 - Present
+- Built streaming pipelines with Kafka and Spark processing 2B events a day
+- Led a team of 4 engineers
+
+EDUCATION
+BS Computer Science, State University 2015
+
+HOBBIES
+Climbing, chess, baking sourdough bread every weekend
+"""
+
+
+def test_dedupe_and_cap_skills():
+    """Skills are de-duplicated case-insensitively and capped."""
+    skills = ["Python", "python ", "SQL", "Python", "sql", "Docker"] + [f"Skill {i}" for i in range(50)]
+    assert dedupe_items(skills)[:3] == ["Python", "SQL", "Docker"]
+    compact = compact_profile({"skills": skills}, max_items=10)
+    assert len(compact["skills"]) == 10
+    print("✅ Skill lists deduped and capped")
+
+
+def test_sections_split_in_order():
+    """Resume text is split into known sections."""
+    names = [name for name, _ in split_sections(SAMPLE_RESUME)]
+    assert names == ['header', 'summary', 'experience', 'education', 'other']
+    print("✅ Resume sections detected")
+
+
+def test_truncation_keeps_priority_sections():
+    """Experience survives truncation while low-priority sections are dropped."""
+    text = truncate_resume_text(SAMPLE_RESUME, 60)
+    assert estimate_tokens(text) <= 62
+    assert "Kafka" in text
+    assert "sourdough" not in text
+    print("✅ Raw text truncated by section priority")
+
+
+def test_fit_profile_respects_budget():
+    """Large resumes are shrunk until they fit the payload budget."""
+    profile = {
+        "skills": [f"Skill {i}" for i in range(200)],
+        "job_titles": ["Engineer"] * 30,
+        "raw_text": SAMPLE_RESUME * 40,
+        "parsed_at": "2024-01-01T00:00:00",
+    }
+    compact = fit_profile(profile, 'job_recommendations')
+    assert estimate_tokens(compact) <= 900
+    assert "parsed_at" not in compact
+    assert compact["job_titles"] == ["Engineer"]
+    print("✅ Profile payload fits its token budget")
+
+
+def main():
+    """Run all prompt budget tests."""
+    print("🧪 Prompt Budget Test Suite")
+    print("=" * 50)
+    test_dedupe_and_cap_skills()
+    test_sections_split_in_order()
+    test_truncation_keeps_priority_sections()
+    test_fit_profile_respects_budget()
+    print("\n🎉 All prompt budget tests passed!")
+
+
+if __name__ == "__main__":
+    main()
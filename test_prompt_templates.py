@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test script for the prompt template registry and prefix caching
+"""
+
+import threading
+import time
+
+from llm_provider import FakeProvider
+from prompt_templates import PromptTemplate, TemplateRegistry, prompt_templates
+from structured_output import SCHEMAS, validate
+
+
+def _no_sleep(seconds):
+    pass
+
+
+def _registry():
+    registry = TemplateRegistry(cache_ttl_seconds=60)
+    registry.register(PromptTemplate(
+        'demo', 'job_titles',
+        prefix="""
+            Suggest job titles. Return ONLY a JSON array like ["Title"].
+        """,
+        suffix="""
+            SKILLS: {skills}
+        """,
+    ))
+    return registry
+
+
+def test_templates_compile_without_dynamic_prefix():
+    """Built-in prefixes are static and every suffix placeholder is known."""
+    for template in prompt_templates.templates.values():
+        assert template.fields
+        assert template.prefix_hash and template.prefix_tokens > 100
+        assert template.prefix.startswith('As a career')
+    analysis = prompt_templates.get('career_analysis')
+    assert 'salary_min' in analysis.fields
+    rendered = analysis.render_suffix(**{field: 1000 if field == 'salary_min' else 'x' for field in analysis.fields})
+    assert 'Salary Min: $1,000' in rendered
+    print("✅ Templates compile with static prefixes")
+
+
+def test_missing_field_is_reported():
+    registry = _registry()
+    try:
+        registry.get('demo').render_suffix()
+    except KeyError as e:
+        assert 'skills' in str(e)
+    else:
+        raise AssertionError("expected KeyError")
+    print("✅ Missing template fields are reported")
+
+
+def test_cached_prefix_is_sent_once():
+    """With context caching only the suffix is sent and the prefix is billed as cached."""
+    registry = _registry()
+    provider = FakeProvider(sleep=_no_sleep)
+    assert registry.precompile(provider) == 1
+
+    for i in range(5):
+        result = registry.generate(provider, 'demo', skills=['python', f'skill {i}'])
+        assert validate(result, SCHEMAS['job_titles']) == []
+
+    assert provider.stats['prefix_caches'] == 1
+    assert all(prompt.startswith('SKILLS:') for prompt in provider.prompts)
+    template = registry.get('demo')
+    assert provider.stats['cached_input_tokens'] == 5 * template.prefix_tokens
+    summary = registry.summary()['demo']
+    assert summary['prefix_reuse'] == 1.0 and summary['tokens_saved'] == 5 * template.prefix_tokens
+    print("✅ Cached prefixes are reused across calls")
+
+
+def test_providers_without_caching_get_full_prompt():
+    registry = _registry()
+
+    class PlainProvider:
+        model_name = 'plain'
+        prompts = []
+
+        def generate_content(self, prompt, generation_config=None):
+            self.prompts.append(prompt)
+            return FakeProvider(sleep=_no_sleep).generate_content(prompt, generation_config)
+
+    provider = PlainProvider()
+    registry.generate(provider, 'demo', skills=['go'])
+    assert provider.prompts[0].startswith('Suggest job titles.') and 'SKILLS:' in provider.prompts[0]
+    assert registry.summary()['demo']['prefix_reuse'] == 0.0
+    print("✅ Providers without context caching get the full prompt")
+
+
+def test_cache_creation_runs_once_outside_the_lock():
+    registry = _registry()
+    started, release = threading.Event(), threading.Event()
+
+    class SlowCachingProvider(FakeProvider):
+        def cache_prefix(self, prefix, ttl_seconds=None):
+            started.set()
+            release.wait(5)
+            return super().cache_prefix(prefix, ttl_seconds)
+
+    provider = SlowCachingProvider(sleep=_no_sleep)
+    threads = [threading.Thread(target=registry.generate, args=(provider, 'demo'), kwargs={'skills': ['go']})
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    assert started.wait(5)
+    # The registry lock is free while the provider creates the cache
+    assert registry._lock.acquire(timeout=1)
+    registry._lock.release()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert provider.stats['prefix_caches'] == 1 and registry.summary()['demo']['cached_calls'] == 4
+    print("✅ Concurrent first calls share one cache creation")
+
+
+def test_small_prefixes_are_not_cached():
+    registry = _registry()
+    provider = FakeProvider(sleep=_no_sleep, min_cache_tokens=1024)
+    assert registry.precompile(provider) == 0
+    registry.generate(provider, 'demo', skills=['go'])
+    assert provider.stats['prefix_caches'] == 0 and provider.prompts[0].startswith('Suggest job titles.')
+    print("✅ Prefixes below the provider's cache minimum are sent in full")
+
+
+def main():
+    """Run all template tests."""
+    print("🧪 Prompt Template Test Suite")
+    print("=" * 50)
+    test_templates_compile_without_dynamic_prefix()
+    test_missing_field_is_reported()
+    test_cached_prefix_is_sent_once()
+    test_providers_without_caching_get_full_prompt()
+    test_cache_creation_runs_once_outside_the_lock()
+    test_small_prefixes_are_not_cached()
+    print("\n🎉 All template tests passed!")
+
+
+if __name__ == "__main__":
+    main()
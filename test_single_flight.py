@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Test script for single-flight LLM request coalescing
+"""
+
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+from single_flight import SingleFlight, SQLiteLease, flight_key
+
+
+def _run_concurrently(count, target):
+    results = [None] * count
+    errors = [None] * count
+
+    def worker(index):
+        try:
+            results[index] = target()
+        except Exception as error:
+            errors[index] = error
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_concurrent_callers_share_one_call():
+    """Ten concurrent callers with one key trigger a single call."""
+    flights = SingleFlight()
+    calls = []
+
+    def slow_call():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"titles": ["Data Engineer"]}
+
+    results, errors = _run_concurrently(10, lambda: flights.do("same-prompt", slow_call))
+    assert len(calls) == 1
+    assert all(result == {"titles": ["Data Engineer"]} for result in results)
+    assert errors == [None] * 10
+    assert flights.in_flight() == 0
+    print("✅ Identical in-flight calls coalesced")
+
+
+def test_errors_are_shared_and_not_cached():
+    """Followers see the leader's error; the next call runs again."""
+    flights = SingleFlight()
+    calls = []
+
+    def failing_call():
+        calls.append(1)
+        time.sleep(0.1)
+        raise RuntimeError("quota exceeded")
+
+    _, errors = _run_concurrently(5, lambda: flights.do("k", failing_call))
+    assert len(calls) == 1
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    assert flights.do("k", lambda: "ok") == "ok"
+    print("✅ Errors shared with followers and not cached")
+
+
+def test_follower_timeout_does_not_cancel_leader():
+    """A follower giving up leaves the leader running."""
+    flights = SingleFlight()
+    leader_done = threading.Event()
+
+    def slow_call():
+        time.sleep(0.3)
+        leader_done.set()
+        return "done"
+
+    leader = threading.Thread(target=lambda: flights.do("k", slow_call))
+    leader.start()
+    time.sleep(0.05)
+    try:
+        flights.do("k", slow_call, timeout=0.05)
+    except TimeoutError:
+        pass
+    else:
+        raise AssertionError("expected TimeoutError")
+    leader.join()
+    assert leader_done.is_set()
+    print("✅ Follower timeouts do not cancel the leader")
+
+
+def test_interrupted_leader_hands_over():
+    """If the leader is interrupted, a waiting follower runs the call itself."""
+    flights = SingleFlight()
+    started = threading.Event()
+
+    def interrupted_call():
+        started.set()
+        time.sleep(0.1)
+        raise KeyboardInterrupt
+
+    def leader():
+        try:
+            flights.do("k", interrupted_call)
+        except KeyboardInterrupt:
+            pass
+
+    thread = threading.Thread(target=leader)
+    thread.start()
+    started.wait()
+    assert flights.do("k", lambda: "recovered") == "recovered"
+    thread.join()
+    assert flights.stats['takeovers'] == 1
+    print("✅ Interrupted leaders hand over to followers")
+
+
+def _process_worker(db_path, counter_path, queue):
+    lease = SQLiteLease(db_path, lease_seconds=5)
+
+    def call():
+        with open(counter_path, 'a') as counter:
+            counter.write('x')
+        time.sleep(0.5)
+        return {"report": "shared"}
+
+    queue.put(SingleFlight(lease).do(flight_key("prompt", 1), call))
+
+
+def test_cross_process_lease():
+    """Processes sharing a SQLite lease run the call once."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'flights.db')
+        counter_path = os.path.join(tmp, 'calls.txt')
+        SQLiteLease(db_path)
+        queue = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=_process_worker, args=(db_path, counter_path, queue))
+                     for _ in range(3)]
+        for process in processes:
+            process.start()
+        results = [queue.get(timeout=10) for _ in processes]
+        for process in processes:
+            process.join()
+        with open(counter_path) as counter:
+            assert counter.read() == 'x'
+        assert results == [{"report": "shared"}] * 3
+    print("✅ Cross-process lease shares one call")
+
+
+def test_lease_does_not_replay_finished_flights():
+    """A caller arriving after a flight finished runs the call itself instead of reading the stored row."""
+    with tempfile.TemporaryDirectory() as tmp:
+        lease = SQLiteLease(os.path.join(tmp, 'flights.db'))
+        calls = []
+
+        def failing():
+            calls.append('fail')
+            raise ConnectionError("transient")
+
+        try:
+            lease.do("k", failing)
+        except ConnectionError:
+            pass
+        assert lease.do("k", lambda: calls.append('ok') or {"report": "fresh"}) == {"report": "fresh"}
+        assert lease.do("k", lambda: calls.append('again') or {"report": "newer"}) == {"report": "newer"}
+        assert calls == ['fail', 'ok', 'again']
+    print("✅ Finished lease flights are not replayed to later callers")
+
+
+def main():
+    """Run all single-flight tests."""
+    print("🧪 Single-flight Test Suite")
+    print("=" * 50)
+    test_concurrent_callers_share_one_call()
+    test_errors_are_shared_and_not_cached()
+    test_follower_timeout_does_not_cancel_leader()
+    test_interrupted_leader_hands_over()
+    test_cross_process_lease()
+    test_lease_does_not_replay_finished_flights()
+    print("\n🎉 All single-flight tests passed!")
+
+
+if __name__ == "__main__":
+    main()
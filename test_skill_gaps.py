@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script for the local skill-gap ranker
+"""
+
+from skill_gaps import SkillGapRanker, normalize_skill
+
+POSTINGS = [
+    {'title': 'Platform Engineer', 'description': 'Kubernetes, Docker and AWS. Go is a plus.'},
+    {'title': 'Backend Engineer', 'description': 'Python services on Kubernetes.'},
+    {'title': 'Data Engineer', 'description': 'Spark and AWS'},
+]
+
+
+def test_ranking_is_deterministic():
+    ranker = SkillGapRanker()
+    ranker.observe_postings(POSTINGS)
+    demand = ['Kubernetes', 'AWS', 'Go', 'Spark', 'Terraform']
+    first = ranker.rank(['Python', 'Docker'], demand, k=5)
+    again = ranker.rank(['Docker', 'Python'], demand, k=5)
+    assert first == again
+    assert [gap['skill'] for gap in first][:2] == ['Kubernetes', 'AWS']
+    print("✅ Skill gaps are ranked deterministically")
+
+
+def test_owned_skills_and_aliases_are_excluded():
+    ranker = SkillGapRanker()
+    gaps = ranker.rank(['K8s', 'golang'], ['Kubernetes', 'go', 'Rust', 'rust'], k=5)
+    assert [gap['skill'] for gap in gaps] == ['Rust']
+    assert normalize_skill(' Node ') == 'node.js'
+    print("✅ Owned skills and aliases are excluded")
+
+
+def test_graph_distance_and_adjacency():
+    ranker = SkillGapRanker()
+    # Without postings, a skill next to the user's skills beats an unrelated one listed first
+    gaps = ranker.rank(['Docker'], ['Accounting', 'Kubernetes'], k=2)
+    assert [gap['skill'] for gap in gaps] == ['Kubernetes', 'Accounting']
+    assert gaps[0]['adjacent_to'] == ['docker'] and gaps[0]['distance'] == 1
+    assert gaps[1]['distance'] is None
+    assert ranker.distance[ranker.index['python'], ranker.index['sql']] == 2
+    print("✅ Graph distance and adjacency shape the ranking")
+
+
+def test_demand_uses_whole_words():
+    ranker = SkillGapRanker()
+    ranker.observe_postings(["Good governance", "We use Go."])
+    assert list(ranker.demand_counts(['go'])) == [1.0]
+    assert ranker.rank([], [], k=3) == []
+    print("✅ Demand counts match whole words")
+
+
+def main():
+    """Run all skill-gap tests."""
+    print("🧪 Skill Gap Ranker Test Suite")
+    print("=" * 50)
+    test_ranking_is_deterministic()
+    test_owned_skills_and_aliases_are_excluded()
+    test_graph_distance_and_adjacency()
+    test_demand_uses_whole_words()
+    print("\n🎉 All skill-gap tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Test script for structured LLM output parsing
+Runs offline with a scripted model, no API key needed
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import structured_output
+from structured_output import (
+    StructuredOutputError,
+    extract_json,
+    flight_scope,
+    generate_json,
+    get_metrics,
+    reset_metrics,
+)
+
+
+class ScriptedModel:
+    """Returns canned replies in order and records the prompts it saw."""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.prompts = []
+
+    def generate_content(self, prompt, generation_config=None):
+        self.prompts.append(prompt)
+        return SimpleNamespace(text=self.replies.pop(0))
+
+
+VALID_REPORT = (
+    '{"market_intelligence_summary": "Growing", "key_industry_skills": ["Python"], '
+    '"macroeconomic_shifts": "AI regulation", "salary_insights": "Up 5%", "growth_opportunities": "ML roles"}'
+)
+
+
+def test_extract_fenced_json():
+    """Markdown fences and surrounding prose are ignored."""
+    data, repaired = extract_json('Sure!\n```json\n{"a": [1, 2]}\n```\nHope this helps')
+    assert data == {"a": [1, 2]}
+    assert not repaired
+    print("✅ Fenced JSON extracted")
+
+
+def test_repair_trailing_commas_and_truncation():
+    """Trailing commas and truncated arrays are repaired locally."""
+    data, repaired = extract_json('{"skills": ["Python", "SQL",], "level": "senior",}')
+    assert data == {"skills": ["Python", "SQL"], "level": "senior"}
+    assert repaired
+
+    data, _ = extract_json('{"titles": ["Data Engineer", "ML Engin')
+    assert data == {"titles": ["Data Engineer", "ML Engin"]}
+
+    data, _ = extract_json('{"a": 1, "b": {"c": 2}, "d"')
+    assert data == {"a": 1, "b": {"c": 2}}
+
+    data, _ = extract_json('Here you go: ["Software Engineer", "Data Analyst", ', expected_type='array')
+    assert data == ["Software Engineer", "Data Analyst"]
+    print("✅ Near-valid JSON repaired")
+
+
+def test_unrecoverable_text_raises():
+    """Plain prose raises with the raw text attached."""
+    try:
+        extract_json("I cannot help with that.")
+    except StructuredOutputError as error:
+        assert error.raw_text == "I cannot help with that."
+    else:
+        raise AssertionError("expected StructuredOutputError")
+    print("✅ Unrecoverable replies raise StructuredOutputError")
+
+
+def test_reask_only_when_invalid():
+    """A schema-invalid reply triggers exactly one re-ask."""
+    reset_metrics()
+    model = ScriptedModel(['{"market_intelligence_summary": "Growing"}', VALID_REPORT])
+    data = generate_json(model, "prompt", 'intelligence_report')
+    assert data["key_industry_skills"] == ["Python"]
+    assert len(model.prompts) == 2
+    assert "missing required key" in model.prompts[1]
+
+    metrics = get_metrics()['intelligence_report']
+    assert metrics['calls'] == 1 and metrics['reasks'] == 1 and metrics['clean'] == 1
+    print("✅ Re-ask used only as a last resort")
+
+
+def test_repaired_reply_needs_no_reask():
+    """A truncated but repairable reply costs no extra round trip."""
+    reset_metrics()
+    model = ScriptedModel(['```json\n["Software Engineer", "Data Analyst",\n```'])
+    assert generate_json(model, "prompt", 'job_titles') == ["Software Engineer", "Data Analyst"]
+    assert len(model.prompts) == 1
+    assert get_metrics()['job_titles']['repaired'] == 1
+    print("✅ Repaired replies skip the re-ask")
+
+
+def test_failure_after_reasks():
+    """Exhausting re-asks raises and is counted as a failure."""
+    reset_metrics()
+    model = ScriptedModel(["nope", "still nope"])
+    try:
+        generate_json(model, "prompt", 'intelligence_report', max_reasks=1)
+    except StructuredOutputError:
+        pass
+    else:
+        raise AssertionError("expected StructuredOutputError")
+    assert get_metrics()['intelligence_report']['failures'] == 1
+    print("✅ Failures are reported in metrics")
+
+
+def test_schemas_are_self_consistent():
+    """Every required key is declared in properties."""
+    def check(schema):
+        if schema.get('type') == 'object':
+            assert set(schema['required']) <= set(schema['properties'])
+            for sub_schema in schema['properties'].values():
+                check(sub_schema)
+        elif schema.get('type') == 'array':
+            check(schema['items'])
+
+    for schema in structured_output.SCHEMAS.values():
+        check(schema)
+    print("✅ Schemas are consistent")
+
+
+def test_only_json_mode_rejections_disable_the_schema():
+    """Unrelated errors propagate; only an SDK refusing response_schema drops JSON mode."""
+
+    class FailingModel(ScriptedModel):
+        def __init__(self, error, replies=()):
+            super().__init__(replies)
+            self.error = error
+
+        def generate_content(self, prompt, generation_config=None):
+            if self.error is not None and 'response_schema' in (generation_config or {}):
+                error, self.error = self.error, None
+                raise error
+            return super().generate_content(prompt, generation_config)
+
+    try:
+        generate_json(FailingModel(KeyError('candidates')), "bug prompt", 'job_titles')
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("expected KeyError")
+    assert structured_output.USE_RESPONSE_SCHEMA
+
+    rejection = TypeError("__init__() got an unexpected keyword argument 'response_schema'")
+    try:
+        model = FailingModel(rejection, ['["Data Analyst"]'])
+        assert generate_json(model, "old sdk prompt", 'job_titles') == ["Data Analyst"]
+        assert not structured_output.USE_RESPONSE_SCHEMA
+    finally:
+        structured_output.USE_RESPONSE_SCHEMA = True
+    print("✅ JSON mode is dropped only when the SDK rejects it")
+
+
+def test_flight_scopes_do_not_share_calls():
+    """A background job's call never waits on a request's identical in-flight call."""
+
+    class SlowModel(ScriptedModel):
+        def generate_content(self, prompt, generation_config=None):
+            time.sleep(0.1)
+            return super().generate_content(prompt, generation_config)
+
+    def in_scope(scope):
+        with flight_scope(scope):
+            generate_json(model, "scoped prompt", 'job_titles')
+
+    model = SlowModel(['["Data Analyst"]'] * 3)
+    threads = [threading.Thread(target=in_scope, args=(scope,)) for scope in ('request', 'job', 'job')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(model.prompts) == 2
+    print("✅ Job and request calls use separate single-flight scopes")
+
+
+def main():
+    """Run all structured output tests."""
+    print("🧪 Structured Output Test Suite")
+    print("=" * 50)
+    test_extract_fenced_json()
+    test_repair_trailing_commas_and_truncation()
+    test_unrecoverable_text_raises()
+    test_reask_only_when_invalid()
+    test_repaired_reply_needs_no_reask()
+    test_failure_after_reasks()
+    test_schemas_are_self_consistent()
+    test_only_json_mode_rejections_disable_the_schema()
+    test_flight_scopes_do_not_share_calls()
+    print("\n🎉 All structured output tests passed!")
+
+
+if __name__ == "__main__":
+    main()
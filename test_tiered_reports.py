@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for latency-SLO tiered reports
+"""
+
+import os
+import tempfile
+import threading
+
+from llm_transport import current_deadline, request_deadline
+from market_precompute import MarketIntelligenceStore
+from skill_gaps import SkillGapRanker
+from tiered_reports import TieredResponder, local_intelligence_report, local_upskilling_plan, parse_slos
+
+PROFILE = {'skills': ['Python', 'Docker'], 'industries': ['Technology'], 'desired_roles': ['Software Engineer']}
+
+
+def test_parse_slos():
+    assert parse_slos('get_career_intelligence:8, get_upskilling_plan:2.5') == {
+        'get_career_intelligence': 8.0, 'get_upskilling_plan': 2.5}
+    assert parse_slos('off') == {} and parse_slos('a:0,b:x') == {}
+    print("✅ Latency SLOs parse")
+
+
+def test_fast_llm_answers_within_slo():
+    responder = TieredResponder({'report': 1.0})
+    report, upgrade = responder.respond('report', lambda: {'source': 'llm'}, lambda: {'source': 'local'})
+    assert report == {'source': 'llm'} and upgrade is None
+    assert responder.summary()['endpoints']['report']['within_slo'] == 1
+
+    # The call may outlive the request, so it runs under the background deadline
+    with request_deadline(5):
+        remaining, _ = TieredResponder({'report': 1.0}, llm_deadline=60).respond(
+            'report', lambda: current_deadline().remaining(), lambda: None)
+    assert remaining > 30
+    print("✅ Fast LLM answers are returned as is")
+
+
+def test_slow_llm_gets_provisional_report_and_upgrade():
+    release = threading.Event()
+    upgrades = []
+    responder = TieredResponder({'report': 0.05})
+
+    def slow_llm():
+        release.wait(2)
+        return {'source': 'llm'}
+
+    report, upgrade = responder.respond('report', slow_llm, lambda: {'source': 'local'},
+                                        lambda token: upgrades.append(token) or {'job_id': 'job-1'})
+    assert report == {'source': 'local', 'provisional': True}
+    assert upgrade == {'job_id': 'job-1'} and len(upgrades) == 1
+    assert responder.summary()['endpoints']['report']['provisional'] == 1
+
+    # The upgrade picks up the still running call instead of making another
+    release.set()
+    assert responder.result(upgrades[0], timeout=2) == {'source': 'llm'}
+    try:
+        responder.result(upgrades[0])
+        assert False
+    except KeyError:
+        pass
+    assert responder.summary()['endpoints']['report']['upgrades_reused'] == 1
+
+    # Endpoints without an SLO call the LLM inline
+    assert responder.respond('other', lambda: 'inline', lambda: 'local') == ('inline', None)
+    print("✅ Slow LLM answers get a provisional local report and an upgrade")
+
+
+def test_local_reports_use_market_data_and_demand():
+    ranker = SkillGapRanker()
+    ranker.observe_postings([{'title': 'Engineer', 'description': 'Kubernetes and AWS'},
+                             {'title': 'Engineer', 'description': 'Kubernetes, Python'}])
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MarketIntelligenceStore(os.path.join(tmp, 'market.db'))
+        store.put('Technology', 'Software Engineer', {
+            'job_market': {'hiring_trends': 'Hiring is steady', 'demand_forecast': 'Platform roles grow'},
+            'compensation_insights': {'salary_trends': 'Salaries up 3%'},
+        })
+        report = local_intelligence_report(PROFILE, store, ranker)
+    assert report['key_industry_skills'][0] == 'kubernetes'
+    assert report['salary_insights'] == 'Salaries up 3%.'
+    assert 'Hiring is steady.' in report['market_intelligence_summary']
+    assert 'kubernetes' in report['growth_opportunities']
+    assert not any('Contact for' in str(value) for value in report.values())
+
+    plan = local_upskilling_plan(PROFILE, ['Kubernetes', 'AWS', 'Python'], ranker)
+    assert [gap['skill'] for gap in plan['skill_gaps']] == ['Kubernetes', 'AWS']
+    assert plan['priority_order'] == 'Start with Kubernetes, then AWS'
+    print("✅ Local reports use precomputed market data and skill demand")
+
+
+def main():
+    """Run all tiered report tests."""
+    print("🧪 Tiered Report Test Suite")
+    print("=" * 50)
+    test_parse_slos()
+    test_fast_llm_answers_within_slo()
+    test_slow_llm_gets_provisional_report_and_upgrade()
+    test_local_reports_use_market_data_and_demand()
+    print("\n🎉 All tiered report tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Latency-SLO tiered reports for Career AI Agent
+If the LLM has not answered within an endpoint's latency budget, serve a
+locally computed report (precomputed market data, skill demand, gap
+ranking) marked provisional and let a background job upgrade it
+"""
+
+import contextvars
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from config import Config
+from llm_transport import request_deadline
+from skill_gaps import skill_gap_ranker
+
+
+def parse_slos(spec):
+    """Parse "endpoint:seconds,endpoint:seconds" into a dict ('off' or empty disables every SLO)."""
+    slos = {}
+    for item in (spec or '').split(','):
+        if ':' in item:
+            endpoint, seconds = item.split(':', 1)
+            try:
+                slos[endpoint.strip()] = float(seconds)
+            except ValueError:
+                print(f"⚠️  Ignoring invalid latency SLO '{item.strip()}'")
+    return {endpoint: seconds for endpoint, seconds in slos.items() if endpoint and seconds > 0}
+
+
+def _text(*values):
+    """Join the non-empty string/list values of a precomputed report into one sentence run."""
+    parts = []
+    for value in values:
+        if isinstance(value, list):
+            value = ', '.join(str(item) for item in value if item)
+        if isinstance(value, str) and value.strip():
+            parts.append(value.strip().rstrip('.') + '.')
+    return ' '.join(parts)
+
+
+def local_intelligence_report(user_profile, market_store=None, ranker=skill_gap_ranker):
+    """
+    Intelligence report built without the LLM.
+
+    Uses the precomputed market report for the profile's first (industry,
+    role) pair when there is one, and the skill-demand table of recently
+    scraped postings.
+    """
+    industry = (user_profile.get('industries') or ['Technology'])[0]
+    role = (user_profile.get('desired_roles') or ['Professional'])[0]
+    market = (market_store.get(industry, role) if market_store is not None else None) or {}
+    job_market = market.get('job_market') or {}
+    macro = market.get('macroeconomic_factors') or {}
+    compensation = market.get('compensation_insights') or {}
+    startups = market.get('startup_landscape') or {}
+
+    demand = ranker.top_skills(5)
+    key_skills = [skill for skill, _ in demand] or list(user_profile.get('skills', []))[:5]
+    if demand:
+        demand_text = (f"Across {ranker.postings_observed()} recently scraped postings the most requested skills are "
+                       + ', '.join(f"{skill} ({count})" for skill, count in demand))
+    else:
+        demand_text = "No recent postings have been sampled yet"
+    gaps = [gap['skill'] for gap in ranker.rank(user_profile.get('skills', []), key_skills, k=3)]
+
+    return {
+        "market_intelligence_summary": _text(job_market.get('hiring_trends'), startups.get('funding_trends'),
+                                             demand_text),
+        "key_industry_skills": key_skills,
+        "macroeconomic_shifts": _text(macro.get('regulations'), macro.get('market_forces'), macro.get('ai_impact'))
+        or f"No precomputed market data for {industry} / {role} yet; it is added to the next precompute run.",
+        "salary_insights": _text(compensation.get('salary_trends'), compensation.get('remote_work_impact'))
+        or f"Compensation data for {role} roles is not precomputed yet.",
+        "growth_opportunities": _text(job_market.get('demand_forecast'),
+                                      f"In-demand skills to add next: {', '.join(gaps)}" if gaps else ''),
+        "source": "local",
+    }
+
+
+def local_upskilling_plan(user_profile, in_demand_skills, ranker=skill_gap_ranker):
+    """Upskilling plan built from the gap ranking alone (generic projects and search links)."""
+    ranked_gaps = ranker.rank(user_profile.get('skills', []), in_demand_skills, k=3)
+    skills = [gap['skill'] for gap in ranked_gaps]
+    return {
+        "skill_gaps": [
+            {
+                "skill": skill,
+                "project_idea": f"Build a portfolio project demonstrating {skill}",
+                "learning_resources": [
+                    {
+                        "name": f"{skill} Tutorial",
+                        "url": f"https://example.com/{skill.lower().replace(' ', '-')}",
+                        "type": "course"
+                    }
+                ]
+            } for skill in skills
+        ],
+        "timeline": "3-6 months",
+        "priority_order": f"Start with {', then '.join(skills)}" if skills else "No skill gaps found",
+        "ranked_gaps": ranked_gaps,
+        "source": "local",
+    }
+
+
+class TieredResponder:
+    """
+    Runs the LLM tier with a per-endpoint latency SLO.
+
+    respond() runs llm_fn in the background under llm_deadline (the
+    background job deadline, not the request's) and waits up to the
+    endpoint's SLO for it; on a miss it returns local_fn()'s report marked
+    provisional, plus whatever upgrade_fn(token) returns (typically a
+    background job that picks up the still running call with
+    result(token) instead of making a second one). Endpoints without an
+    SLO call llm_fn inline.
+    """
+
+    def __init__(self, slos=None, max_workers=16, llm_deadline=None):
+        self.slos = dict(slos or {})
+        self.llm_deadline = llm_deadline
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='slo-llm')
+        self._lock = threading.Lock()
+        self._pending = {}
+        self.stats = defaultdict(lambda: {'calls': 0, 'within_slo': 0, 'provisional': 0, 'errors': 0,
+                                          'upgrades_reused': 0})
+
+    @classmethod
+    def from_config(cls):
+        return cls(parse_slos(Config.LATENCY_SLO_SECONDS), max_workers=Config.LATENCY_SLO_WORKERS,
+                   llm_deadline=Config.JOB_LLM_DEADLINE_SECONDS)
+
+    def _count(self, endpoint, key):
+        with self._lock:
+            self.stats[endpoint][key] += 1
+
+    def respond(self, endpoint, llm_fn, local_fn, upgrade_fn=None):
+        """
+        Answer within the endpoint's SLO.
+
+        Returns:
+            tuple: (report, upgrade) where upgrade is None unless the report is provisional
+        """
+        slo = self.slos.get(endpoint)
+        if slo is None:
+            return llm_fn(), None
+
+        self._count(endpoint, 'calls')
+
+        def run():
+            # Outlives the request on an SLO miss, so it gets the background deadline
+            if self.llm_deadline is None:
+                return llm_fn()
+            with request_deadline(self.llm_deadline):
+                return llm_fn()
+
+        # The worker keeps the request's usage tags
+        future = self._executor.submit(contextvars.copy_context().run, run)
+        try:
+            report = future.result(timeout=slo)
+            self._count(endpoint, 'within_slo')
+            return report, None
+        except FutureTimeoutError:
+            print(f"⏱️  {endpoint} missed its {slo:g}s latency SLO; serving a provisional local report")
+        except Exception as e:
+            self._count(endpoint, 'errors')
+            print(f"⚠️  {endpoint} LLM tier failed, serving a local report: {e}")
+
+        self._count(endpoint, 'provisional')
+        report = dict(local_fn(), provisional=True)
+        upgrade = None
+        if upgrade_fn is not None:
+            token = uuid.uuid4().hex
+            with self._lock:
+                self._prune()
+                self._pending[token] = (endpoint, future, time.monotonic())
+            try:
+                upgrade = upgrade_fn(token)
+            except Exception as e:
+                print(f"⚠️  Could not schedule the upgrade for {endpoint}: {e}")
+                with self._lock:
+                    self._pending.pop(token, None)
+        return report, upgrade
+
+    def _prune(self):
+        # Calls no upgrade came for (e.g. its job ran in another process)
+        horizon = time.monotonic() - (self.llm_deadline or 0) - 600
+        for token, (_, future, started) in list(self._pending.items()):
+            if future.done() and started < horizon:
+                del self._pending[token]
+
+    def result(self, token, timeout=None):
+        """
+        Result of the LLM call a provisional report was served for.
+
+        Raises:
+            KeyError: If this process has no call for token (or it was claimed)
+            Exception: Whatever the call raised
+        """
+        with self._lock:
+            endpoint, future, _ = self._pending.pop(token)
+        self._count(endpoint, 'upgrades_reused')
+        return future.result(timeout)
+
+    def summary(self):
+        """SLOs and per-endpoint counts (for /health)."""
+        with self._lock:
+            return {'slos': dict(self.slos), 'endpoints': {endpoint: dict(counts)
+                                                           for endpoint, counts in self.stats.items()}}